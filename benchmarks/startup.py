@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Startup benchmark for the `cpt` proxy: in-process dispatch vs. subprocess.
+
+Runs ``python -m cypilot_proxy <command>`` repeatedly against a throwaway
+project whose root AGENTS.md points at this checkout's skill, once with the
+default in-process dispatch and once with CYPILOT_PROXY_SUBPROCESS=1, and
+reports wall-clock statistics per mode.
+
+Usage:
+    python3 benchmarks/startup.py [--runs 20] [--json] [-- <command args>]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _make_project(root: Path) -> None:
+    (root / ".git").mkdir()
+    (root / "AGENTS.md").write_text(
+        f'<!-- @cpt:root-agents -->\n```toml\ncypilot_path = "{REPO_ROOT.as_posix()}"\n```\n',
+        encoding="utf-8",
+    )
+
+
+def _time_runs(command: List[str], cwd: Path, env: Dict[str, str], runs: int) -> List[float]:
+    argv = [sys.executable, "-m", "cypilot_proxy", *command]
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "max_ms": round(max(samples), 1),
+    }
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Benchmark cpt proxy startup (in-process vs subprocess dispatch)")
+    p.add_argument("--runs", type=int, default=20, help="Invocations per mode (default: 20)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    p.add_argument("command", nargs="*", default=["--help"], help="Skill command to run (default: --help)")
+    args = p.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT / "src"), env.get("PYTHONPATH")]))
+    env["CYPILOT_TELEMETRY"] = "0"
+    env.pop("CYPILOT_PROXY_SUBPROCESS", None)
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as td:
+        project = Path(td)
+        _make_project(project)
+        _time_runs(args.command, project, env, 2)  # warm the OS page cache and .pyc files
+        results["in_process"] = _summary(_time_runs(args.command, project, env, args.runs))
+        results["subprocess"] = _summary(
+            _time_runs(args.command, project, {**env, "CYPILOT_PROXY_SUBPROCESS": "1"}, args.runs)
+        )
+    saved = results["subprocess"]["median_ms"] - results["in_process"]["median_ms"]
+
+    if args.json:
+        print(json.dumps({"command": args.command, "runs": args.runs, "modes": results, "saved_ms": round(saved, 1)}, indent=2))
+    else:
+        print(f"cpt {' '.join(args.command)}  ({args.runs} runs per mode)")
+        for mode, stats in results.items():
+            print(f"  {mode:<11} median {stats['median_ms']:7.1f} ms  (min {stats['min_ms']:.1f}, max {stats['max_ms']:.1f})")
+        print(f"  saved       {saved:7.1f} ms per invocation")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
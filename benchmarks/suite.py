@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""Performance suite for the validation pipeline.
+
+Generates a deterministic synthetic project (see ``synthetic.py``) and times
+the hot paths against it in-process: context loading, ``scan_cpt_ids``,
+``cross_validate_artifacts``, ``cross_validate_code``, ``cpt validate`` (cold
+and with a warm parse index), ``spec-coverage`` and batch ``where-defined``.
+
+Each scenario is timed ``--repeat`` times after an untimed setup, then run
+once more under tracemalloc for its peak Python allocation. Results are a
+JSON document that can be stored per commit and compared with ``--compare``;
+the suite exits with status 1 when any scenario's median time (or memory
+peak) grew past ``--threshold``.
+
+Usage:
+    python3 benchmarks/suite.py [--preset small|medium|large] [--repeat 5] [--scenario NAME ...]
+                                [--output results.json] [--compare baseline.json] [--threshold 0.25]
+
+The ``large`` preset is a ~10k-ID project.
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from synthetic import REPO_ROOT, ProjectSpec, generate_project
+
+from cypilot.cli import run_command
+from cypilot.utils.codebase import CodeFile, cross_validate_code
+from cypilot.utils.constraints import ArtifactRecord, cross_validate_artifacts
+from cypilot.utils.context import CypilotContext, set_context
+from cypilot.utils.document import scan_cpt_ids
+from cypilot.utils.scan_cache import set_shared_scan_cache
+from cypilot.utils.ui import set_json_mode
+
+RESULTS_SCHEMA = 1
+
+PRESETS: Dict[str, ProjectSpec] = {
+    "small": ProjectSpec(systems=2, features=4, ids_per_artifact=20, code_files=5),
+    "medium": ProjectSpec(),
+    "large": ProjectSpec(systems=10, features=20, ids_per_artifact=40, code_files=20),
+}
+
+# A scenario's setup returns the zero-argument callable that gets timed.
+Setup = Callable[[Path], Callable[[], object]]
+
+
+def _reset_globals() -> None:
+    set_context(None)
+    set_shared_scan_cache(None)
+
+
+def _load_context(root: Path) -> CypilotContext:
+    ctx = CypilotContext.load(root)
+    if ctx is None:
+        raise RuntimeError(f"no Cypilot project at {root}")
+    return ctx
+
+
+def _artifact_paths(ctx: CypilotContext) -> List[Tuple[Path, str, str]]:
+    """(path, kind, kit) of every registered artifact."""
+    out = []
+    for art, system_node in ctx.meta.iter_all_artifacts():
+        out.append(((ctx.project_root / art.path).resolve(), str(art.kind), str(system_node.kit)))
+    return out
+
+
+def _run_cli(root: Path, argv: List[str]) -> int:
+    _reset_globals()
+    prev = os.getcwd()
+    os.chdir(root)
+    set_json_mode(True)
+    try:
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            set_context(_load_context(root))
+            return run_command(argv[0], argv[1:])
+    finally:
+        set_json_mode(False)
+        os.chdir(prev)
+
+
+def _setup_context_load(root: Path) -> Callable[[], object]:
+    return lambda: _load_context(root)
+
+
+def _setup_scan_cpt_ids(root: Path) -> Callable[[], object]:
+    paths = [p for p, _kind, _kit in _artifact_paths(_load_context(root))]
+    return lambda: [scan_cpt_ids(p) for p in paths]
+
+
+def _setup_cross_validate_artifacts(root: Path) -> Callable[[], object]:
+    ctx = _load_context(root)
+    records = []
+    for path, kind, kit in _artifact_paths(ctx):
+        loaded = ctx.kits.get(kit)
+        constraints = loaded.constraints.by_kind.get(kind) if loaded and loaded.constraints else None
+        records.append(ArtifactRecord(path=path, artifact_kind=kind, constraints=constraints))
+    return lambda: cross_validate_artifacts(records, registered_systems=ctx.registered_systems)
+
+
+def _setup_cross_validate_code(root: Path) -> Callable[[], object]:
+    ctx = _load_context(root)
+    to_code_kinds = {
+        c.kind
+        for loaded in ctx.kits.values() if loaded.constraints
+        for kc in loaded.constraints.by_kind.values()
+        for c in kc.defined_id if c.to_code
+    }
+    artifact_ids = set()
+    for path, _kind, _kit in _artifact_paths(ctx):
+        artifact_ids.update(str(h["id"]) for h in scan_cpt_ids(path) if h.get("type") == "definition")
+    to_code_ids = {i for i in artifact_ids if i.split("-")[2] in to_code_kinds}
+    code_files = []
+    for cf_path in sorted((root / "src").rglob("*.py")):
+        cf, errs = CodeFile.from_path(cf_path)
+        if cf is not None and not errs:
+            code_files.append(cf)
+    return lambda: cross_validate_code(code_files, artifact_ids, to_code_ids)
+
+
+def _setup_validate_cold(root: Path) -> Callable[[], object]:
+    return lambda: _run_cli(root, ["validate", "--no-cache"])
+
+
+def _setup_validate_warm(root: Path) -> Callable[[], object]:
+    _run_cli(root, ["validate"])
+    return lambda: _run_cli(root, ["validate"])
+
+
+def _setup_spec_coverage(root: Path) -> Callable[[], object]:
+    return lambda: _run_cli(root, ["spec-coverage"])
+
+
+def _setup_where_defined_batch(root: Path) -> Callable[[], object]:
+    ids = sorted({
+        str(h["id"])
+        for path, _kind, _kit in _artifact_paths(_load_context(root))
+        for h in scan_cpt_ids(path) if h.get("type") == "definition"
+    })
+    ids_file = root / "bench-ids.txt"
+    ids_file.write_text("\n".join(ids[:: max(1, len(ids) // 200)]) + "\n", encoding="utf-8")
+    return lambda: _run_cli(root, ["where-defined", "--no-cache", "--ids-from", str(ids_file)])
+
+
+SCENARIOS: Dict[str, Setup] = {
+    "context_load": _setup_context_load,
+    "scan_cpt_ids": _setup_scan_cpt_ids,
+    "cross_validate_artifacts": _setup_cross_validate_artifacts,
+    "cross_validate_code": _setup_cross_validate_code,
+    "validate_cold": _setup_validate_cold,
+    "validate_warm": _setup_validate_warm,
+    "spec_coverage": _setup_spec_coverage,
+    "where_defined_batch": _setup_where_defined_batch,
+}
+
+
+def run_scenario(root: Path, setup: Setup, repeat: int) -> Dict[str, float]:
+    """Time one scenario *repeat* times and measure its tracemalloc peak."""
+    fn = setup(root)
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    _reset_globals()
+    return {
+        "median_ms": round(statistics.median(samples), 2),
+        "min_ms": round(min(samples), 2),
+        "max_ms": round(max(samples), 2),
+        "peak_kib": round(peak / 1024.0, 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=False,
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[Dict[str, object]]:
+    """Per-scenario ratios of *current* vs *baseline*; ``regressed`` marks growth past *threshold*."""
+    rows = []
+    base_scenarios = baseline.get("scenarios") or {}
+    for name, cur in (current.get("scenarios") or {}).items():
+        base = base_scenarios.get(name)
+        if not base:
+            continue
+        row: Dict[str, object] = {"scenario": name, "regressed": False}
+        for metric in ("median_ms", "peak_kib"):
+            if not base.get(metric):
+                continue
+            ratio = cur[metric] / base[metric]
+            row[f"{metric}_ratio"] = round(ratio, 3)
+            if ratio > 1.0 + threshold:
+                row["regressed"] = True
+        rows.append(row)
+    return rows
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Benchmark the Cypilot validation pipeline on a synthetic project")
+    p.add_argument("--preset", choices=sorted(PRESETS), default="medium", help="Project size (default: medium)")
+    p.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario (default: 5)")
+    p.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Run only these scenarios (repeatable)")
+    p.add_argument("--output", default=None, help="Write results JSON to this file")
+    p.add_argument("--compare", default=None, help="Baseline results JSON to compare against")
+    p.add_argument("--threshold", type=float, default=0.25, help="Allowed relative growth before a regression is reported (default: 0.25)")
+    p.add_argument("--keep", default=None, help="Generate the project into this directory and keep it")
+    args = p.parse_args()
+
+    spec = PRESETS[args.preset]
+    names = args.scenario or list(SCENARIOS)
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(args.keep).resolve() if args.keep else Path(td) / "project"
+        project = generate_project(root, spec)
+        scenarios = {}
+        for name in names:
+            scenarios[name] = run_scenario(root, SCENARIOS[name], args.repeat)
+            print(f"{name:<26} median {scenarios[name]['median_ms']:9.1f} ms  peak {scenarios[name]['peak_kib']:10.1f} KiB", file=sys.stderr)
+
+    results: Dict[str, object] = {
+        "schema": RESULTS_SCHEMA,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "preset": args.preset,
+        "spec": asdict(spec),
+        "project": project,
+        "repeat": args.repeat,
+        "scenarios": scenarios,
+    }
+    rc = 0
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if baseline.get("spec") != results["spec"]:
+            print("warning: baseline was produced with a different project spec", file=sys.stderr)
+        rows = compare(results, baseline, args.threshold)
+        results["comparison"] = {"baseline_commit": baseline.get("commit"), "threshold": args.threshold, "rows": rows}
+        rc = 1 if any(r["regressed"] for r in rows) else 0
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return rc
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
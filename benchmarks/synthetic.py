@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Deterministic synthetic Cypilot project generator for benchmarks.
+
+Builds a project with N systems, each holding PRD / DESIGN / DECOMPOSITION /
+ADR / FEATURE artifacts and a code tree with traceability markers. Artifact
+shape follows the real SDLC kit constraints shipped in ``.bootstrap``: every
+artifact walks its kind's heading outline, each identifier kind is defined
+under the headings its constraint names (with task/priority decorations as
+required), references are placed in the artifact kinds listed under
+``references``, and ``to_code`` IDs get CDSL steps plus matching scope and
+block markers in code.
+
+The same parameters always produce byte-identical trees.
+
+Usage:
+    python3 benchmarks/synthetic.py OUT_DIR [--systems 4] [--features 8] [--ids-per-artifact 40] [--code-files 20]
+"""
+
+import argparse
+import json
+import re
+import shutil
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+KIT_SOURCE = REPO_ROOT / ".bootstrap" / "config" / "kits" / "sdlc"
+sys.path.insert(0, str(REPO_ROOT / "skills" / "cypilot" / "scripts"))
+
+from cypilot.utils import toml_utils  # noqa: E402
+from cypilot.utils.constraints import (  # noqa: E402
+    ArtifactKindConstraints,
+    HeadingConstraint,
+    IdConstraint,
+    KitConstraints,
+    load_constraints_toml,
+)
+from cypilot.utils.toc import insert_toc_markers  # noqa: E402
+
+ADAPTER = "cypilot"
+_SINGLE_KINDS = ("PRD", "DESIGN", "DECOMPOSITION", "ADR")
+_STEPS_PER_CODE_ID = 3
+_PLACEHOLDER_RE = re.compile(r"\{([a-z-]+)\}")
+
+
+@dataclass(frozen=True)
+class ProjectSpec:
+    """Size knobs of a synthetic project."""
+
+    systems: int = 4
+    features: int = 8
+    ids_per_artifact: int = 40
+    code_files: int = 20
+
+
+def _heading_title(h: HeadingConstraint, kind: str, slug: str) -> str:
+    if h.pattern and re.fullmatch(r"[\w ,/&()'-]+", h.pattern):
+        return h.pattern
+    if h.level == 1:
+        return f"{kind} — {slug}"
+    return str(h.id or "Section").replace("-", " ").title()
+
+
+def _numbered(h: HeadingConstraint, title: str, counters: Dict[int, int]) -> str:
+    """Apply ``1.`` / ``1.2`` style numbering to headings the kit requires to be numbered."""
+    counters[h.level] = counters.get(h.level, 0) + 1
+    for deeper in [lvl for lvl in counters if lvl > h.level]:
+        del counters[deeper]
+    if not h.numbered:
+        return title
+    parts = [str(counters.get(lvl, 1)) for lvl in range(2, h.level + 1)]
+    return f"{'.'.join(parts)}{'.' if len(parts) == 1 else ''} {title}"
+
+
+def _render_id(template: str, system: str, kind: str, artifact_slug: str, n: int) -> str:
+    def _sub(m: "re.Match[str]") -> str:
+        name = m.group(1)
+        if name == "system":
+            return system
+        if name == "slug":
+            return f"{kind.lower()}-{n}"
+        return artifact_slug
+
+    return _PLACEHOLDER_RE.sub(_sub, template)
+
+
+def _definition_line(c: IdConstraint, id_value: str) -> str:
+    prefix = "- [x] " if c.task else ""
+    priority = "`p1` - " if c.priority else ""
+    return f"{prefix}{priority}**ID**: `{id_value}`"
+
+
+def _split(total: int, parts: int) -> List[int]:
+    base, extra = divmod(total, parts) if parts else (0, 0)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
+
+
+def _id_kinds(kc: ArtifactKindConstraints, total: int) -> List[Tuple[IdConstraint, int]]:
+    """Placeable identifier kinds of *kc* with how many IDs of each to define.
+
+    Kinds whose template has no ``{slug}`` are singletons; the rest share *total*.
+    """
+    kinds = [c for c in kc.defined_id if c.template and c.headings]
+    singletons = [c for c in kinds if "{slug}" not in c.template]
+    many = [c for c in kinds if "{slug}" in c.template]
+    counts = dict(zip((c.kind for c in many), _split(max(total - len(singletons), 0), len(many))))
+    return [(c, counts.get(c.kind, 1)) for c in kinds]
+
+
+def _render_artifact(
+    system: str,
+    kind: str,
+    slug: str,
+    kc: ArtifactKindConstraints,
+    ids_per_artifact: int,
+    incoming: Dict[str, List[str]],
+    code_ids: List[str],
+) -> List[str]:
+    """Walk the heading outline of *kind*, defining IDs and placing incoming references."""
+    id_kinds = _id_kinds(kc, ids_per_artifact)
+    placed = set()
+    counters: Dict[int, int] = {}
+    lines: List[str] = []
+    for h in kc.headings or []:
+        hid = h.id
+        lines.extend([f"{'#' * h.level} {_numbered(h, _heading_title(h, kind, slug), counters)}", ""])
+        for c, count in id_kinds:
+            if c.kind in placed or hid not in (c.headings or []):
+                continue
+            placed.add(c.kind)
+            for n in range(count):
+                id_value = _render_id(c.template, system, kind, slug, n)
+                lines.extend([_definition_line(c, id_value), "", f"Synthetic {c.kind} {n} of {slug}.", ""])
+                if c.to_code:
+                    code_ids.append(id_value)
+                    lines.extend(
+                        f"{s + 1}. [x] - `p1` - Step {s + 1} of {c.kind} {n} - `inst-step-{s + 1}`"
+                        for s in range(_STEPS_PER_CODE_ID)
+                    )
+                    lines.append("")
+        for ref in incoming.pop(hid, []) if hid else []:
+            lines.extend([f"Covers `{ref}`.", ""])
+    for refs in incoming.values():
+        lines.extend(f"Covers `{ref}`." for ref in refs)
+    return lines
+
+
+def _plan_artifacts(spec: ProjectSpec, systems: List[str]) -> List[Tuple[str, str, str, str]]:
+    plan = []
+    for system in systems:
+        for kind in _SINGLE_KINDS:
+            rel = f"docs/{system}/ADR/0001-{system}-decision.md" if kind == "ADR" else f"docs/{system}/{kind}.md"
+            plan.append((system, kind, rel, f"{system}-{kind.lower()}"))
+        for j in range(spec.features):
+            plan.append((system, "FEATURE", f"docs/{system}/features/feature-{j}.md", f"feat-{j}"))
+    return plan
+
+
+def _references_by_target(
+    kit: KitConstraints,
+    plan: List[Tuple[str, str, str, str]],
+    spec: ProjectSpec,
+) -> Dict[Tuple[str, str], Dict[str, List[str]]]:
+    """(system, target kind) -> heading id -> IDs defined elsewhere that must be referenced there."""
+    out: Dict[Tuple[str, str], Dict[str, List[str]]] = {}
+    for system, kind, _rel, slug in plan:
+        kc = kit.by_kind.get(kind)
+        if kc is None:
+            continue
+        for c, count in _id_kinds(kc, spec.ids_per_artifact):
+            for target_kind, rule in (c.references or {}).items():
+                if target_kind == kind or target_kind not in kit.by_kind or rule.coverage is False:
+                    continue
+                heading = (rule.headings or [""])[0]
+                bucket = out.setdefault((system, target_kind), {}).setdefault(heading, [])
+                bucket.extend(_render_id(c.template, system, kind, slug, n) for n in range(count))
+    return out
+
+
+def _code_file(ids: List[str]) -> str:
+    body = ['"""Synthetic module."""', ""]
+    for k, id_value in enumerate(ids):
+        body.append(f"# @cpt-{id_value.split('-')[2]}:{id_value}:p1")
+        body.append(f"def handler_{k}(value):")
+        for s in range(_STEPS_PER_CODE_ID):
+            inst = f"inst-step-{s + 1}"
+            body.extend([
+                f"    # @cpt-begin:{id_value}:p1:{inst}",
+                f"    value = value + {s}",
+                f"    # @cpt-end:{id_value}:p1:{inst}",
+            ])
+        body.extend(["    return value", "", ""])
+    return "\n".join(body).rstrip() + "\n"
+
+
+def generate_project(root: Path, spec: ProjectSpec) -> Dict[str, int]:
+    """Write a synthetic project described by *spec* into *root* and return its size counters."""
+    kit, errs = load_constraints_toml(KIT_SOURCE)
+    if kit is None:
+        raise RuntimeError(f"cannot load kit constraints from {KIT_SOURCE}: {errs}")
+
+    root.mkdir(parents=True, exist_ok=True)
+    (root / ".git").mkdir(exist_ok=True)
+    (root / "AGENTS.md").write_text(
+        f'<!-- @cpt:root-agents -->\n```toml\ncypilot_path = "{ADAPTER}"\n```\n',
+        encoding="utf-8",
+    )
+    config = root / ADAPTER / "config"
+    kit_dir = config / "kits" / "sdlc"
+    kit_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(KIT_SOURCE / "constraints.toml", kit_dir / "constraints.toml")
+    (config / "AGENTS.md").write_text("# Synthetic benchmark project\n", encoding="utf-8")
+    toml_utils.dump(
+        {"version": "1.0", "project_root": "..", "kits": {"sdlc": {"format": "Cypilot", "path": "config/kits/sdlc"}}},
+        config / "core.toml",
+    )
+
+    systems = [f"sys{i}" for i in range(spec.systems)]
+    plan = _plan_artifacts(spec, systems)
+    incoming = _references_by_target(kit, plan, spec)
+    code_ids: Dict[str, List[str]] = {s: [] for s in systems}
+    id_count = 0
+    for system, kind, rel, slug in plan:
+        kc = kit.by_kind[kind]
+        refs = incoming.get((system, kind), {}) if kind != "FEATURE" or slug == "feat-0" else {}
+        lines = _render_artifact(system, kind, slug, kc, spec.ids_per_artifact, dict(refs), code_ids[system])
+        id_count += sum(1 for ln in lines if "**ID**:" in ln)
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = "\n".join(lines).rstrip() + "\n"
+        path.write_text(insert_toc_markers(content, max_level=3) if kc.toc else content, encoding="utf-8")
+
+    marker_count = 0
+    for system in systems:
+        ids = code_ids[system]
+        for f, chunk in enumerate(_split(len(ids), spec.code_files)):
+            start = sum(_split(len(ids), spec.code_files)[:f])
+            path = root / "src" / system / f"module_{f}.py"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(_code_file(ids[start:start + chunk]), encoding="utf-8")
+            marker_count += chunk * (1 + 2 * _STEPS_PER_CODE_ID)
+
+    toml_utils.dump(
+        {
+            "version": "1.0",
+            "project_root": "..",
+            "systems": [
+                {
+                    "name": system.upper(),
+                    "slug": system,
+                    "kit": "sdlc",
+                    "artifacts": [
+                        {"path": rel, "kind": kind, "traceability": "FULL"}
+                        for s, kind, rel, _slug in plan if s == system
+                    ],
+                    "codebase": [{"path": f"src/{system}", "extensions": [".py"]}],
+                }
+                for system in systems
+            ],
+        },
+        config / "artifacts.toml",
+    )
+    return {
+        "systems": spec.systems,
+        "artifacts": len(plan),
+        "ids": id_count,
+        "code_files": spec.systems * spec.code_files,
+        "code_markers": marker_count,
+    }
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Generate a deterministic synthetic Cypilot project")
+    p.add_argument("out", help="Output directory (created if missing)")
+    for name, default in asdict(ProjectSpec()).items():
+        p.add_argument(f"--{name.replace('_', '-')}", type=int, default=default, help=f"(default: {default})")
+    args = p.parse_args()
+    spec = ProjectSpec(**{k: getattr(args, k) for k in asdict(ProjectSpec())})
+    print(json.dumps(generate_project(Path(args.out), spec), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -158,32 +158,21 @@ def _cmd_delegate(argv: List[str]) -> int:
 def _cmd_check_language(argv: List[str]) -> int:
     from .commands.check_language import cmd_check_language
     return cmd_check_language(argv)
-# @cpt-end:cpt-cypilot-algo-core-infra-route-command:p1:inst-route-helpers
 
-# =============================================================================
-# MAIN ENTRY POINT
-# =============================================================================
+# Context parts commands need beyond the default CONTEXT_FULL (see utils.context).
+_CONTEXT_NEEDS = {
+    "check-language": "registry",
+    "validate-kits": "kits",
+    "validate-rules": "kits",
+    "self-check": "kits",
+}
 
-# @cpt-begin:cpt-cypilot-algo-core-infra-route-command:p1:inst-route-helpers
-def main(argv: Optional[List[str]] = None) -> int:
-    argv_list = list(argv) if argv is not None else sys.argv[1:]
+# Read-only queries a running `cpt serve` daemon can answer.
+_DAEMON_COMMANDS = frozenset({"list-ids", "list-id-kinds", "get-content", "where-defined", "where-used"})
 
-    # Extract global --json flag (must come before command dispatch)
-    from .utils.ui import set_json_mode
-    if "--json" in argv_list:
-        set_json_mode(True)
-        while "--json" in argv_list:
-            argv_list.remove("--json")
-
-    # Load base Cypilot context on startup (templates, systems, etc.)
-    # Workspace upgrade is deferred — get_context() will lazily attempt it
-    # on first access, so commands like --help and init avoid network I/O.
-    from .utils.context import CypilotContext, set_context
-    ctx = CypilotContext.load()
-    set_context(ctx)
-    # Context may be None if Cypilot not initialized - that's OK for some commands like init
 
-    # Define all available commands
+def _all_commands() -> List[str]:
+    """All available top-level commands (used for the unknown-command hint)."""
     analysis_commands = ["validate", "validate-kits", "validate-toc", "spec-coverage", "check-language"]
     legacy_aliases = ["validate-code", "validate-rules"]
     kit_commands = ["kit"]
@@ -202,8 +191,43 @@ def main(argv: Optional[List[str]] = None) -> int:
         "workspace-init", "workspace-add", "workspace-info", "workspace-sync",
     ]
     delegation_commands = ["delegate"]
-    diagnostics_commands = ["doctor"]
-    all_commands = analysis_commands + kit_commands + migration_commands + search_commands + workspace_commands + utility_commands + delegation_commands + diagnostics_commands + legacy_aliases
+    diagnostics_commands = ["doctor", "serve"]
+    return analysis_commands + kit_commands + migration_commands + search_commands + workspace_commands + utility_commands + delegation_commands + diagnostics_commands + legacy_aliases
+
+def _cmd_serve(argv: List[str]) -> int:
+    from .commands.serve import cmd_serve
+    return cmd_serve(argv)
+# @cpt-end:cpt-cypilot-algo-core-infra-route-command:p1:inst-route-helpers
+
+# =============================================================================
+# MAIN ENTRY POINT
+# =============================================================================
+
+# @cpt-begin:cpt-cypilot-algo-core-infra-route-command:p1:inst-route-helpers
+def main(argv: Optional[List[str]] = None) -> int:
+    argv_list = list(argv) if argv is not None else sys.argv[1:]
+
+    # Extract global --json / --ndjson flags (must come before command dispatch)
+    from .utils.ui import set_json_mode, set_ndjson_mode
+    if "--json" in argv_list:
+        set_json_mode(True)
+        while "--json" in argv_list:
+            argv_list.remove("--json")
+    if "--ndjson" in argv_list:
+        set_ndjson_mode(True)
+        while "--ndjson" in argv_list:
+            argv_list.remove("--ndjson")
+
+    # Hand read-only queries to a running `cpt serve` daemon when one is up
+    # for this project; it answers from a warm context and ID index. The
+    # daemon replies with buffered output, so NDJSON streams stay in-process.
+    from .utils.ui import is_ndjson_mode
+    if argv_list and argv_list[0] in _DAEMON_COMMANDS and not ({"-h", "--help"} & set(argv_list)) and not is_ndjson_mode():
+        from .utils.daemon import try_forward
+        from .utils.ui import is_json_mode
+        rc = try_forward(argv_list, json_mode=is_json_mode())
+        if rc is not None:
+            return rc
 
     # Handle --help / -h at top level (or no subcommand)
     if not argv_list or argv_list[0] in ("-h", "--help"):
@@ -236,6 +260,7 @@ def main(argv: Optional[List[str]] = None) -> int:
             "workspace-sync": "Fetch and update Git URL source worktrees",
             "delegate": "Compile and delegate a Cypilot plan to ralphex",
             "doctor": "Run environment health checks",
+            "serve": "Run a resident query daemon with a warm context",
         }
         _sections = [
             ("Setup & Configuration", ["init", "update", "info", "resolve-vars", "generate-agents", "agents"]),
@@ -246,7 +271,7 @@ def main(argv: Optional[List[str]] = None) -> int:
             ("Workspace", ["workspace-init", "workspace-add", "workspace-info", "workspace-sync"]),
             ("Migration", ["migrate", "migrate-config"]),
             ("Delegation", ["delegate"]),
-            ("Diagnostics", ["doctor"]),
+            ("Diagnostics", ["doctor", "serve"]),
         ]
         if is_json_mode():
             import json  # pylint: disable=import-outside-toplevel  # lazy: only needed in JSON output mode
@@ -267,6 +292,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                 ui.blank()
             ui.info("Global flags:")
             sys.stderr.write(f"      {'--json':<22} Machine-readable JSON output (for AI agents)\n")
+            sys.stderr.write(f"      {'--ndjson':<22} Stream results as newline-delimited JSON records\n")
             ui.blank()
             ui.hint("Run 'cpt <command> --help' for command-specific options.")
             ui.hint("Legacy aliases: validate-code → validate, validate-rules/self-check → validate-kits")
@@ -284,19 +310,36 @@ def main(argv: Optional[List[str]] = None) -> int:
         rest = argv_list[1:]
     # @cpt-end:cpt-cypilot-algo-core-infra-route-command:p1:inst-parse-command
 
+    # Defer loading the Cypilot context (registry, kits, autodetect) to the
+    # first get_context() call, limited to the parts the command declares.
+    # Commands that never ask for it (toc, doctor, resolve-vars, ...) skip it;
+    # the workspace upgrade stays lazy so --help and init avoid network I/O.
+    # Context may be None if Cypilot not initialized - that's OK for some commands like init
+    from .utils.context import CONTEXT_FULL, defer_context
+    defer_context(needs=_CONTEXT_NEEDS.get(cmd, CONTEXT_FULL))
+
+    return run_command(cmd, rest)
+
+
+def run_command(cmd: str, rest: List[str], *, initialized: bool = True) -> int:
+    """Verify root agent files and dispatch *cmd* with its arguments.
+
+    Shared by :func:`main` and the ``cpt serve`` daemon, which runs commands
+    against its already-loaded context.
+    """
     # @cpt-dod:cpt-cypilot-dod-core-infra-agents-integrity:p1
     # @cpt-begin:cpt-cypilot-algo-core-infra-route-command:p1:inst-verify-agents
-    # Verify root AGENTS.md and CLAUDE.md integrity on every invocation (silent re-inject if stale)
-    if ctx is not None and cmd != "init":
+    # Verify root AGENTS.md and CLAUDE.md integrity on every invocation (silent re-inject if stale;
+    # a stored fingerprint short-circuits the check while neither file changed)
+    if initialized and cmd != "init":
         try:
-            from .commands.init import _inject_root_agents, _inject_root_claude
+            from .commands.init import _verify_root_files
             from .utils.files import find_project_root, _read_cypilot_var
             project_root = find_project_root(Path.cwd())
             if project_root is not None:
                 install_rel = _read_cypilot_var(project_root)
-                if install_rel:
-                    _inject_root_agents(project_root, install_rel)
-                    _inject_root_claude(project_root, install_rel)
+                if install_rel and (project_root / install_rel / "config").is_dir():
+                    _verify_root_files(project_root, install_rel)
         except (OSError, ValueError, KeyError):
             pass  # Non-fatal: don't block command execution
     # @cpt-end:cpt-cypilot-algo-core-infra-route-command:p1:inst-verify-agents
@@ -366,15 +409,17 @@ def main(argv: Optional[List[str]] = None) -> int:
         return _cmd_doctor(rest)
     elif cmd == "check-language":
         return _cmd_check_language(rest)
+    elif cmd == "serve":
+        return _cmd_serve(rest)
     else:
         # @cpt-begin:cpt-cypilot-algo-core-infra-route-command:p1:inst-if-no-handler
         # @cpt-begin:cpt-cypilot-algo-core-infra-route-command:p1:inst-return-unknown
         from .utils.ui import ui
         ui.result(
-            {"status": "ERROR", "message": f"Unknown command: {cmd}", "available": all_commands},
+            {"status": "ERROR", "message": f"Unknown command: {cmd}", "available": _all_commands()},
             human_fn=lambda d: (
                 ui.error(f"Unknown command: {cmd}"),
-                ui.hint(f"Available commands: {', '.join(all_commands)}"),
+                ui.hint(f"Available commands: {', '.join(_all_commands())}"),
                 ui.hint("Run 'cpt --help' for usage."),
             ),
         )
@@ -391,5 +436,5 @@ def main(argv: Optional[List[str]] = None) -> int:
 if __name__ == "__main__":
     raise SystemExit(main())
 
-__all__ = ["main"]
+__all__ = ["main", "run_command"]
 # @cpt-end:cpt-cypilot-algo-core-infra-route-command:p1:inst-route-helpers
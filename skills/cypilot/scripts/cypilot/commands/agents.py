@@ -30,6 +30,7 @@ import json
 import re
 import shutil
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
@@ -39,6 +40,7 @@ from ..utils._tomllib_compat import tomllib
 _VALID_AGENT_NAME_RE = re.compile(r"^[A-Za-z0-9_-]+$")
 
 from ..utils.files import core_subpath, config_subpath, find_project_root, _is_cypilot_root, _read_cypilot_var, load_project_config
+from ..utils.output_manifest import OutputManifest
 from ..utils.ui import ui
 
 _TMPL_NAME = "name: {name}"
@@ -335,6 +337,55 @@ def _load_json_file(path: Path) -> Optional[dict]:
     except (json.JSONDecodeError, OSError, IOError, UnicodeDecodeError):
         return None
 
+# Output manifest of the running generate-agents command; while set, outputs
+# are staged in it and written in one batch by _flush_outputs().
+_active_outputs: Optional[OutputManifest] = None
+
+
+def _set_active_outputs(outputs: Optional[OutputManifest]) -> Optional[OutputManifest]:
+    """Make *outputs* the staging manifest for generated files; returns the previous one."""
+    global _active_outputs  # pylint: disable=global-statement  # per-command staging manifest shared by all generators
+    previous = _active_outputs
+    _active_outputs = outputs
+    return previous
+
+
+def _open_output_manifest(cypilot_root: Path) -> OutputManifest:
+    """Persisted output manifest of the adapter at *cypilot_root* (in-memory outside an adapter)."""
+    if (cypilot_root / "config").is_dir():
+        return OutputManifest.for_adapter(cypilot_root)
+    return OutputManifest()
+
+
+def _stage_output(canonical: Path, content: str, dry_run: bool) -> str:
+    """Stage *content* for *canonical* and return ``created``/``updated``/``unchanged``.
+
+    Outside a generate-agents run the write happens immediately.
+    """
+    if _active_outputs is not None:
+        return _active_outputs.stage(canonical, content, dry_run)
+    outputs = OutputManifest()
+    action = outputs.stage(canonical, content, dry_run)
+    outputs.flush()
+    return action
+
+
+def _flush_outputs() -> Optional[str]:
+    """Write all staged outputs; returns an error message when a write fails."""
+    if _active_outputs is None:
+        return None
+    try:
+        _active_outputs.flush()
+    except OSError as exc:
+        return f"Failed to write generated files: {exc}"
+    return None
+
+
+@lru_cache(maxsize=16)
+def _resolved_root(project_root: Path) -> Path:
+    return project_root.resolve()
+
+
 def _write_or_skip(
     out_path: Path,
     content: str,
@@ -349,7 +400,7 @@ def _write_or_skip(
     # Path traversal prevention (S2083): canonicalize via resolve(), verify the
     # canonical path is inside project_root, then use ONLY the canonical path
     # for all filesystem operations — the tainted input is never written directly.
-    root_resolved = project_root.resolve()
+    root_resolved = _resolved_root(project_root)
     canonical = out_path.resolve()
     try:
         canonical.relative_to(root_resolved)
@@ -359,24 +410,10 @@ def _write_or_skip(
             "path traversal is not allowed"
         ) from exc
     rel = _safe_relpath(canonical, project_root)
-    if not canonical.exists():
-        result["created"].append(canonical.as_posix())
-        if not dry_run:
-            canonical.parent.mkdir(parents=True, exist_ok=True)
-            canonical.write_text(content, encoding="utf-8")  # NOSONAR
-        result["outputs"].append({"path": rel, "action": "created"})
-    else:
-        try:
-            old = out_path.read_text(encoding="utf-8")
-        except OSError:
-            old = ""
-        if old != content:
-            result["updated"].append(canonical.as_posix())
-            if not dry_run:
-                canonical.write_text(content, encoding="utf-8")  # NOSONAR
-            result["outputs"].append({"path": rel, "action": "updated"})
-        else:
-            result["outputs"].append({"path": rel, "action": "unchanged"})
+    action = _stage_output(canonical, content, dry_run)
+    if action != "unchanged":
+        result[action].append(canonical.as_posix())
+    result["outputs"].append({"path": rel, "action": action})
 # @cpt-end:cpt-cypilot-algo-agent-integration-generate-shims:p1:inst-write-helpers
 
 # @cpt-begin:cpt-cypilot-algo-agent-integration-discover-agents:p1:inst-resolve-kits
@@ -1423,23 +1460,8 @@ def _process_single_agent(
             existing_files = list(workflow_dir.glob("*.md")) if workflow_dir.is_dir() else []
 
             for p_str, meta in desired.items():
-                pth = Path(p_str)
-                if not pth.exists():
-                    workflows_result["created"].append(p_str)
-                    if not dry_run:
-                        pth.parent.mkdir(parents=True, exist_ok=True)
-                        pth.write_text(meta["content"], encoding="utf-8")
-                    continue
-                try:
-                    old = pth.read_text(encoding="utf-8")
-                except OSError:
-                    old = ""
-                if old != meta["content"]:
-                    workflows_result["updated"].append(p_str)
-                    if not dry_run:
-                        pth.write_text(meta["content"], encoding="utf-8")
-                else:
-                    workflows_result["unchanged"].append(p_str)
+                action = _stage_output(Path(p_str), meta["content"], dry_run)
+                workflows_result[action].append(p_str)
 
             desired_paths = set(desired.keys())
             for pth in existing_files:
@@ -2208,6 +2230,27 @@ def cmd_generate_agents(argv: List[str]) -> int:
     args, agents_to_process, project_root, cypilot_root, copy_report, cfg_path, cfg = ctx
     # @cpt-end:cpt-cypilot-flow-agent-integration-generate:p1:inst-user-agents
 
+    outputs = _open_output_manifest(cypilot_root)
+    previous = _set_active_outputs(outputs)
+    try:
+        return _generate_agents(args, agents_to_process, project_root, cypilot_root, copy_report, cfg_path, cfg)
+    finally:
+        _set_active_outputs(previous)
+        # Keeps the hashes learned by a dry run or a no-op run for the next one
+        outputs.save()
+
+
+def _generate_agents(
+    args: argparse.Namespace,
+    agents_to_process: List[str],
+    project_root: Path,
+    cypilot_root: Path,
+    copy_report: dict,
+    cfg_path: Optional[Path],
+    cfg: Any,
+) -> int:
+    """Preview, confirm and write generate-agents outputs (staged in the active output manifest)."""
+
     # @cpt-begin:cpt-cypilot-flow-agent-integration-generate:p1:inst-resolve-project
     # Resolved in _resolve_agents_context: project_root via find_project_root,
     # cypilot_root via AGENTS.md cypilot_path variable or __file__ ancestry.
@@ -2317,6 +2360,10 @@ def cmd_generate_agents(argv: List[str]) -> int:
         results, has_errors = _run_v2_pipeline(
             args, merged, agents_to_process, project_root, cypilot_root, variables, cfg, cfg_path, copy_report, trusted_roots=_trusted_roots,
         )
+        write_error = _flush_outputs()
+        if write_error is not None:
+            ui.result({"status": "ERROR", "message": write_error})
+            return 1
         agents_result = _build_result(results, agents_to_process, project_root, cypilot_root, cfg_path, copy_report, dry_run=args.dry_run)
         agents_result["manifest_v2"] = True
         agents_result["layers"] = len(resolved_layers)
@@ -2422,6 +2469,10 @@ def cmd_generate_agents(argv: List[str]) -> int:
         results[agent] = result
         if result.get("status") != "PASS":
             has_errors = True
+    write_error = _flush_outputs()
+    if write_error is not None:
+        ui.result({"status": "ERROR", "message": write_error})
+        return 1
     # @cpt-end:cpt-cypilot-flow-agent-integration-generate:p1:inst-for-each-agent
 
     # @cpt-begin:cpt-cypilot-flow-agent-integration-generate:p1:inst-return-report
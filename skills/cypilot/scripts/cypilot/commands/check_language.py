@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import List
 
 from ..utils import error_codes as EC
+from ..utils.parallel import resolve_jobs
 from ..utils.ui import ui
 # @cpt-end:cpt-cypilot-flow-traceability-validation-check-language:p1:inst-check-lang-imports
 
@@ -56,6 +57,12 @@ def cmd_check_language(argv: List[str]) -> int:
         help="Glob pattern of files to skip (e.g. 'translations/**/*.md'). "
              "Can be repeated. Also reads ignore_paths from workspace config.",
     )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for scanning many files (default: CPU count; 1 disables parallelism)",
+    )
     args = p.parse_args(argv)
 
     from ..utils.content_language import (
@@ -111,7 +118,9 @@ def cmd_check_language(argv: List[str]) -> int:
     # ── Scan ─────────────────────────────────────────────────────────────────
     allowed_ranges = build_allowed_ranges(allowed_langs)
     try:
-        violations = scan_paths(roots, allowed_ranges, ignore_patterns=ignore_patterns)
+        violations = scan_paths(
+            roots, allowed_ranges, ignore_patterns=ignore_patterns, jobs=resolve_jobs(args.jobs),
+        )
     except LangScanError as exc:
         ui.result({"status": "ERROR", "message": str(exc)})
         return 1
@@ -221,13 +230,15 @@ def _default_roots() -> List[Path]:
 
 
 def _count_md_files(roots: List[Path]) -> int:
+    from ..utils.document import walk_files
+
     count = 0
     for root in roots:
         if root.is_file():
             if root.suffix.lower() == ".md":
                 count += 1
         elif root.is_dir():
-            count += sum(1 for _ in root.rglob("*.md"))
+            count += len(walk_files(root, [".md"], ignore_case=True))
     return count
 
 # @cpt-end:cpt-cypilot-flow-traceability-validation-check-language:p1:inst-helpers
@@ -14,14 +14,15 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
-import math
 import re
 import shutil
 import sys
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Sequence, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
+from ..utils.toc import _HEADING_RE, _fence_update
+from ..utils.token_estimate import DEFAULT_ESTIMATOR, TokenEstimator, get_estimator
 from ..utils.ui import ui
 
 DEFAULT_MAX_LINES = 300
@@ -29,6 +30,12 @@ DEFAULT_THRESHOLD_LINES = 500
 CHUNK_FILE_RE = re.compile(r"^\d+-\d+-.+-part-\d+\.[^.]+$")
 DIRECT_PROMPT_FILE = "direct-prompt.md"
 PACKAGE_MANIFEST_FILE = "manifest.json"
+# stdin is spooled so it can be hashed and chunked without re-reading; it
+# stays in memory up to this size and moves to a temporary file beyond it.
+STDIN_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+# With --heading-breaks a full chunk is cut at its last Markdown heading
+# only when the part before the heading is at least this full.
+HEADING_BREAK_MIN_FILL = 0.5
 
 
 # @cpt-begin:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-parse-args
@@ -44,10 +51,6 @@ def _normalize_newlines(text: str) -> str:
 # @cpt-end:cpt-cypilot-algo-execution-plans-chunk-normalize-input:p1:inst-normalize-newlines
 
 
-def _line_count(text: str) -> int:
-    return len(_normalize_newlines(text).splitlines())
-
-
 # @cpt-begin:cpt-cypilot-algo-execution-plans-chunk-normalize-input:p1:inst-slugify-source
 def _slugify(value: str, fallback: str) -> str:
     slug = re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
@@ -57,26 +60,43 @@ def _slugify(value: str, fallback: str) -> str:
 
 # @cpt-begin:cpt-cypilot-algo-execution-plans-chunk-normalize-input:p1:inst-read-file-source
 def _read_source(path_str: str, index: int) -> Dict[str, object]:
+    """File source record; its content is streamed later (see ``_iter_source_pieces``)."""
     path = Path(path_str).expanduser().resolve()
     if not path.is_file():
         raise FileNotFoundError(f"Input file not found: {path}")
-    text = _normalize_newlines(path.read_text(encoding="utf-8"))
     label = _slugify(path.stem, f"input-{index:02d}")
     return {
         "kind": "file",
         "label": label,
         "display_name": path.name,
         "path": path.as_posix(),
-        "text": text,
-        "line_count": _line_count(text),
     }
 # @cpt-end:cpt-cypilot-algo-execution-plans-chunk-normalize-input:p1:inst-read-file-source
 
 
 # @cpt-begin:cpt-cypilot-algo-execution-plans-chunk-normalize-input:p1:inst-read-stdin-source
 def _read_stdin_source(stdin_label: str) -> Dict[str, object]:
-    text = _normalize_newlines(sys.stdin.read())
-    if not text.strip():
+    """Spool normalized stdin, hashing and counting lines on the way."""
+    spool = tempfile.SpooledTemporaryFile(
+        max_size=STDIN_SPOOL_MAX_BYTES, mode="w+", encoding="utf-8", newline="",
+    )
+    digest = hashlib.sha256()
+    line_count = 0
+    has_content = False
+    last = ""
+    try:
+        for raw in sys.stdin:
+            piece = _normalize_newlines(raw)
+            spool.write(piece)
+            digest.update(piece.encode("utf-8"))
+            line_count += len(piece.splitlines())
+            has_content = has_content or bool(piece.strip())
+            last = piece or last
+    except BaseException:
+        spool.close()
+        raise
+    if not has_content:
+        spool.close()
         raise ValueError("No stdin input provided")
     label = _slugify(stdin_label, "direct-input")
     return {
@@ -84,12 +104,62 @@ def _read_stdin_source(stdin_label: str) -> Dict[str, object]:
         "label": label,
         "display_name": stdin_label,
         "path": None,
-        "text": text,
-        "line_count": _line_count(text),
+        "spool": spool,
+        "ends_with_newline": last.endswith("\n"),
+        "line_count": line_count,
+        "content_sha256": digest.hexdigest(),
     }
 # @cpt-end:cpt-cypilot-algo-execution-plans-chunk-normalize-input:p1:inst-read-stdin-source
 
 
+def _close_sources(sources: Sequence[Dict[str, object]]) -> None:
+    for source in sources:
+        spool = source.get("spool")
+        if spool is not None:
+            spool.close()
+
+
+def _iter_source_pieces(source: Dict[str, object]) -> Iterator[str]:
+    """Stream a source as newline-normalized pieces, one input line at a time.
+
+    Files are decoded as UTF-8 with universal newlines; the spooled stdin is
+    already normalized. Concatenating the pieces gives the normalized text,
+    and ``piece.splitlines()`` over all pieces gives its ``splitlines()``.
+    """
+    spool = source.get("spool")
+    if spool is not None:
+        spool.seek(0)
+        yield from spool
+        return
+    with open(str(source["path"]), "r", encoding="utf-8") as f:
+        yield from f
+
+
+def _scan_source(source: Dict[str, object], policy: Optional["_ChunkPolicy"] = None) -> None:
+    """Record ``content_sha256`` and ``line_count`` of *source* without writing anything.
+
+    With a non line-only *policy* the chunk boundaries are computed too and
+    recorded as ``chunk_count``.
+    """
+    count_chunks = policy is not None and not policy.line_only
+    if "content_sha256" in source and (not count_chunks or "chunk_count" in source):
+        return
+    packer = _ChunkPacker(policy) if count_chunks else None
+    chunk_count = 0
+    digest = hashlib.sha256()
+    line_count = 0
+    for piece in _iter_source_pieces(source):
+        digest.update(piece.encode("utf-8"))
+        for line in piece.splitlines():
+            line_count += 1
+            if packer is not None:
+                chunk_count += len(packer.add(line))
+    source["content_sha256"] = digest.hexdigest()
+    source["line_count"] = line_count
+    if packer is not None:
+        source["chunk_count"] = chunk_count + len(packer.finish())
+
+
 # @cpt-begin:cpt-cypilot-algo-execution-plans-chunk-ranges:p1:inst-return-ranges
 def _chunk_ranges(total_lines: int, max_lines: int) -> List[Tuple[int, int]]:
     if total_lines <= 0:
@@ -104,6 +174,128 @@ def _chunk_ranges(total_lines: int, max_lines: int) -> List[Tuple[int, int]]:
 # @cpt-end:cpt-cypilot-algo-execution-plans-chunk-ranges:p1:inst-return-ranges
 
 
+# @cpt-begin:cpt-cypilot-algo-execution-plans-chunk-ranges:p1:inst-token-pack
+class _ChunkPolicy:
+    """How sources are cut into chunks: line cap, token budget, heading breaks.
+
+    Without ``max_tokens`` chunks hold exactly ``max_lines`` lines (the
+    ``_chunk_ranges`` windows). With ``max_tokens`` lines are packed
+    greedily up to the token budget, capped by ``max_lines`` when set.
+    """
+
+    __slots__ = ("max_lines", "max_tokens", "estimator_name", "estimate", "heading_breaks")
+
+    def __init__(
+        self,
+        max_lines: Optional[int],
+        max_tokens: Optional[int] = None,
+        estimator_name: str = DEFAULT_ESTIMATOR,
+        estimate: Optional[TokenEstimator] = None,
+        heading_breaks: bool = False,
+    ) -> None:
+        self.max_lines = max_lines
+        self.max_tokens = max_tokens
+        self.estimator_name = estimator_name if max_tokens is not None else None
+        self.estimate = estimate
+        self.heading_breaks = heading_breaks
+
+    @property
+    def line_only(self) -> bool:
+        return self.max_tokens is None and not self.heading_breaks
+
+    def manifest_fields(self) -> Dict[str, object]:
+        """Chunking parameters recorded in (and compared against) ``manifest.json``."""
+        fields: Dict[str, object] = {"max_lines": self.max_lines}
+        if self.max_tokens is not None:
+            fields["max_tokens"] = self.max_tokens
+            fields["token_estimator"] = self.estimator_name
+        if self.heading_breaks:
+            fields["heading_breaks"] = True
+        return fields
+
+    def matches(self, manifest: Dict[str, object]) -> bool:
+        return (
+            manifest.get("max_lines") == self.max_lines
+            and manifest.get("max_tokens") == self.max_tokens
+            and manifest.get("token_estimator") == self.estimator_name
+            and bool(manifest.get("heading_breaks")) == self.heading_breaks
+        )
+
+
+class _ChunkPacker:
+    """Greedy chunk boundaries for one streamed source.
+
+    ``add`` takes lines one at a time and returns the chunks they complete
+    as ``(lines, token_estimate)``; ``finish`` returns the rest (one empty
+    chunk for a source without lines). Only the pending chunk is buffered.
+    """
+
+    def __init__(self, policy: _ChunkPolicy) -> None:
+        self._policy = policy
+        self._lines: List[str] = []
+        self._costs: List[int] = []
+        self._total = 0
+        self._heading_at = 0
+        self._fence: Optional[Tuple[str, int]] = None
+        self._emitted = False
+
+    def _is_heading(self, line: str) -> bool:
+        new_fence = _fence_update(line, self._fence)
+        if new_fence != self._fence:
+            self._fence = new_fence
+            return False
+        return self._fence is None and _HEADING_RE.match(line) is not None
+
+    def _overflows(self, cost: int) -> bool:
+        policy = self._policy
+        if policy.max_lines is not None and len(self._lines) >= policy.max_lines:
+            return True
+        return policy.max_tokens is not None and self._total + cost > policy.max_tokens
+
+    def _fill(self, n: int) -> float:
+        """How full the first *n* pending lines are, by the tighter applicable limit."""
+        policy = self._policy
+        fill = 0.0
+        if policy.max_lines is not None:
+            fill = n / policy.max_lines
+        if policy.max_tokens is not None:
+            fill = max(fill, sum(self._costs[:n]) / policy.max_tokens)
+        return fill
+
+    def _cut(self) -> Tuple[List[str], int]:
+        n = len(self._lines)
+        if self._heading_at > 0 and self._fill(self._heading_at) >= HEADING_BREAK_MIN_FILL:
+            n = self._heading_at
+        lines, costs = self._lines[:n], self._costs[:n]
+        self._lines, self._costs = self._lines[n:], self._costs[n:]
+        tokens = sum(costs)
+        self._total -= tokens
+        self._heading_at = 0
+        self._emitted = True
+        return lines, tokens
+
+    def add(self, line: str) -> List[Tuple[List[str], int]]:
+        policy = self._policy
+        cost = policy.estimate(line + "\n") if policy.estimate is not None else 0
+        heading = policy.heading_breaks and self._is_heading(line)
+        done: List[Tuple[List[str], int]] = []
+        while self._lines and self._overflows(cost):
+            done.append(self._cut())
+        if heading:
+            self._heading_at = len(self._lines)
+        self._lines.append(line)
+        self._costs.append(cost)
+        self._total += cost
+        return done
+
+    def finish(self) -> List[Tuple[List[str], int]]:
+        if not self._lines and self._emitted:
+            return []
+        self._heading_at = 0
+        return [self._cut()]
+# @cpt-end:cpt-cypilot-algo-execution-plans-chunk-ranges:p1:inst-token-pack
+
+
 # @cpt-begin:cpt-cypilot-algo-execution-plans-chunk-write:p1:inst-write-direct-prompt
 def _write_special_source_files(
     sources: Sequence[Dict[str, object]],
@@ -113,10 +305,11 @@ def _write_special_source_files(
         if source["kind"] != "stdin":
             continue
         raw_path = output_dir / DIRECT_PROMPT_FILE
-        raw_text = str(source["text"])
-        if raw_text and not raw_text.endswith("\n"):
-            raw_text += "\n"
-        raw_path.write_text(raw_text, encoding="utf-8")
+        with open(raw_path, "w", encoding="utf-8") as f:
+            for piece in _iter_source_pieces(source):
+                f.write(piece)
+            if not source.get("ends_with_newline"):
+                f.write("\n")
         source["stored_file"] = DIRECT_PROMPT_FILE
 # @cpt-end:cpt-cypilot-algo-execution-plans-chunk-write:p1:inst-write-direct-prompt
 
@@ -144,7 +337,8 @@ def _build_input_signature(sources: Sequence[Dict[str, object]]) -> Tuple[str, L
     source_records: List[Dict[str, object]] = []
     signature_records: List[Dict[str, object]] = []
     for source in sources:
-        content_sha256 = hashlib.sha256(str(source["text"]).encode("utf-8")).hexdigest()
+        _scan_source(source)
+        content_sha256 = str(source["content_sha256"])
         source_records.append({
             "kind": source["kind"],
             "label": source["label"],
@@ -170,7 +364,7 @@ def _write_package_manifest(
     sources: Sequence[Dict[str, object]],
     chunks: Sequence[Dict[str, object]],
     output_dir: Path,
-    max_lines: int,
+    policy: _ChunkPolicy,
 ) -> str:
     input_signature, source_records = _build_input_signature(sources)
     manifest = {
@@ -178,7 +372,7 @@ def _write_package_manifest(
         "input_signature": input_signature,
         "total_sources": len(sources),
         "total_lines": sum(int(source["line_count"]) for source in sources),
-        "max_lines": max_lines,
+        **policy.manifest_fields(),
         "direct_prompt_file": next(
             (
                 str(source.get("stored_file"))
@@ -200,6 +394,7 @@ def _write_package_manifest(
                 "start_line": chunk["start_line"],
                 "end_line": chunk["end_line"],
                 "line_count": chunk["line_count"],
+                **({"token_estimate": chunk["token_estimate"]} if "token_estimate" in chunk else {}),
             }
             for chunk in chunks
         ],
@@ -226,10 +421,76 @@ def _finalize_written_paths(
 
 
 # @cpt-begin:cpt-cypilot-algo-execution-plans-chunk-write:p1:inst-write-chunk-file
+def _write_source_chunks(
+    source: Dict[str, object],
+    source_index: int,
+    chunk_index: int,
+    output_dir: Path,
+    policy: _ChunkPolicy,
+    chunks: List[Dict[str, object]],
+) -> int:
+    """Stream one source into chunk files cut by *policy*, hashing it on the way.
+
+    Only the lines of the chunk being filled are held in memory. Records the
+    source's ``content_sha256``/``line_count``/``chunk_count``, appends chunk
+    metadata to *chunks* and returns the next global chunk index.
+    """
+    digest = hashlib.sha256()
+    first = len(chunks)
+    packer = _ChunkPacker(policy)
+    line_count = 0
+
+    def _emit(done: List[Tuple[List[str], int]]) -> None:
+        nonlocal chunk_index
+        for lines, tokens in done:
+            chunk_text = "\n".join(lines)
+            if chunk_text and not chunk_text.endswith("\n"):
+                chunk_text += "\n"
+            part_number = len(chunks) - first + 1
+            filename = (
+                f"{chunk_index:03d}-{source_index:02d}-{source['label']}-"
+                f"part-{part_number:02d}.md"
+            )
+            (output_dir / filename).write_text(chunk_text, encoding="utf-8")
+            start = int(chunks[-1]["end_line"]) + 1 if len(chunks) > first else 1
+            chunk: Dict[str, object] = {
+                "file": filename,
+                "source_kind": source["kind"],
+                "source": source["display_name"],
+                "source_path": source["path"],
+                "source_label": source["label"],
+                "part": part_number,
+                "part_count": 0,
+                "start_line": start,
+                "end_line": start + len(lines) - 1,
+                "line_count": len(lines),
+            }
+            if policy.max_tokens is not None:
+                chunk["token_estimate"] = tokens
+            chunks.append(chunk)
+            chunk_index += 1
+
+    for piece in _iter_source_pieces(source):
+        digest.update(piece.encode("utf-8"))
+        for line in piece.splitlines():
+            line_count += 1
+            _emit(packer.add(line))
+    # A source without lines still gets one empty chunk (range 1..0)
+    _emit(packer.finish())
+
+    part_count = len(chunks) - first
+    for chunk in chunks[first:]:
+        chunk["part_count"] = part_count
+    source["content_sha256"] = digest.hexdigest()
+    source["line_count"] = line_count
+    source["chunk_count"] = part_count
+    return chunk_index
+
+
 def _write_chunks(
     sources: Sequence[Dict[str, object]],
     output_dir: Path,
-    max_lines: int,
+    policy: _ChunkPolicy,
 ) -> Tuple[List[Dict[str, object]], str, str]:
     output_dir.parent.mkdir(parents=True, exist_ok=True)
     staging_dir = Path(tempfile.mkdtemp(prefix=f".{output_dir.name}.tmp-", dir=output_dir.parent))
@@ -240,35 +501,8 @@ def _write_chunks(
         _write_special_source_files(sources, staging_dir)
         chunk_index = 1
         for source_index, source in enumerate(sources, start=1):
-            text = str(source["text"])
-            lines = text.splitlines() if text else []
-            ranges = _chunk_ranges(len(lines), max_lines)
-            total_parts = len(ranges)
-            for part_number, (start, end) in enumerate(ranges, start=1):
-                selected = lines[start - 1 : end] if end >= start else []
-                chunk_text = "\n".join(selected)
-                if chunk_text and not chunk_text.endswith("\n"):
-                    chunk_text += "\n"
-                filename = (
-                    f"{chunk_index:03d}-{source_index:02d}-{source['label']}-"
-                    f"part-{part_number:02d}.md"
-                )
-                chunk_path = staging_dir / filename
-                chunk_path.write_text(chunk_text, encoding="utf-8")
-                chunks.append({
-                    "file": filename,
-                    "source_kind": source["kind"],
-                    "source": source["display_name"],
-                    "source_path": source["path"],
-                    "source_label": source["label"],
-                    "part": part_number,
-                    "part_count": total_parts,
-                    "start_line": start,
-                    "end_line": end,
-                    "line_count": max(0, end - start + 1),
-                })
-                chunk_index += 1
-        input_signature = _write_package_manifest(sources, chunks, staging_dir, max_lines)
+            chunk_index = _write_source_chunks(source, source_index, chunk_index, staging_dir, policy, chunks)
+        input_signature = _write_package_manifest(sources, chunks, staging_dir, policy)
         preserve_ok = True
         if output_dir.exists():
             backup_dir = Path(tempfile.mkdtemp(prefix=f".{output_dir.name}.backup-", dir=output_dir.parent))
@@ -306,6 +540,45 @@ def _write_chunks(
 # @cpt-end:cpt-cypilot-algo-execution-plans-chunk-write:p1:inst-write-chunk-file
 
 
+# @cpt-begin:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-reuse-package
+def _reusable_manifest(
+    output_dir: Path,
+    policy: _ChunkPolicy,
+    sources: Sequence[Dict[str, object]],
+) -> Optional[Dict[str, object]]:
+    """Manifest of the package at *output_dir* if it was built from the same input.
+
+    Requires the same chunking parameters, the same ordered source kinds/paths and
+    every listed file still present; sources are then hashed one at a time
+    (nothing is written) and the first content mismatch ends the check.
+    """
+    try:
+        manifest = json.loads((output_dir / PACKAGE_MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or not policy.matches(manifest):
+        return None
+    records = manifest.get("sources")
+    chunks = manifest.get("chunks")
+    if not isinstance(records, list) or not isinstance(chunks, list) or len(records) != len(sources):
+        return None
+    for record, source in zip(records, sources):
+        if not isinstance(record, dict) or record.get("kind") != source["kind"] or record.get("path") != source["path"]:
+            return None
+    files = [chunk.get("file") if isinstance(chunk, dict) else None for chunk in chunks]
+    if manifest.get("direct_prompt_file") is not None:
+        files.append(manifest["direct_prompt_file"])
+    if any(not isinstance(name, str) or not (output_dir / name).is_file() for name in files):
+        return None
+    for record, source in zip(records, sources):
+        _scan_source(source)
+        if record.get("content_sha256") != source["content_sha256"]:
+            return None
+    input_signature, _ = _build_input_signature(sources)
+    return manifest if input_signature == manifest.get("input_signature") else None
+# @cpt-end:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-reuse-package
+
+
 def cmd_chunk_input(argv: List[str]) -> int:
     """Chunk workflow input into deterministic files bounded by max lines."""
     # @cpt-begin:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-parse-args
@@ -326,8 +599,30 @@ def cmd_chunk_input(argv: List[str]) -> int:
     parser.add_argument(
         "--max-lines",
         type=int,
-        default=DEFAULT_MAX_LINES,
-        help=f"Maximum lines per chunk (default: {DEFAULT_MAX_LINES})",
+        default=None,
+        help=(
+            f"Maximum lines per chunk (default: {DEFAULT_MAX_LINES}; "
+            "with --max-tokens only an explicit value caps chunks)"
+        ),
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=None,
+        help="Pack lines greedily into chunks of at most this many estimated tokens",
+    )
+    parser.add_argument(
+        "--token-estimator",
+        default=DEFAULT_ESTIMATOR,
+        help=(
+            f"Token estimator for --max-tokens: a built-in name or module:function "
+            f"(default: {DEFAULT_ESTIMATOR})"
+        ),
+    )
+    parser.add_argument(
+        "--heading-breaks",
+        action="store_true",
+        help="Prefer ending a full chunk before its last Markdown heading",
     )
     parser.add_argument(
         "--threshold-lines",
@@ -357,12 +652,31 @@ def cmd_chunk_input(argv: List[str]) -> int:
         return 1
     # @cpt-end:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-parse-args
 
-    if args.max_lines <= 0:
+    if args.max_lines is not None and args.max_lines <= 0:
         ui.result({"status": "ERROR", "message": "--max-lines must be > 0"})
         return 1
+    if args.max_tokens is not None and args.max_tokens <= 0:
+        ui.result({"status": "ERROR", "message": "--max-tokens must be > 0"})
+        return 1
     if args.threshold_lines <= 0:
         ui.result({"status": "ERROR", "message": "--threshold-lines must be > 0"})
         return 1
+    estimate: Optional[TokenEstimator] = None
+    if args.max_tokens is not None:
+        try:
+            estimate = get_estimator(args.token_estimator)
+        except ValueError as exc:
+            ui.result({"status": "ERROR", "message": str(exc)})
+            return 1
+    elif args.max_lines is None:
+        args.max_lines = DEFAULT_MAX_LINES
+    policy = _ChunkPolicy(
+        args.max_lines,
+        max_tokens=args.max_tokens,
+        estimator_name=args.token_estimator,
+        estimate=estimate,
+        heading_breaks=args.heading_breaks,
+    )
 
     # @cpt-begin:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-read-sources
     try:
@@ -376,8 +690,21 @@ def cmd_chunk_input(argv: List[str]) -> int:
         return 1
     # @cpt-end:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-read-sources
 
+    try:
+        return _chunk_sources(args, policy, sources)
+    finally:
+        _close_sources(sources)
+
+
+def _source_chunk_count(source: Dict[str, object], policy: _ChunkPolicy) -> int:
+    if "chunk_count" in source:
+        return int(source["chunk_count"])
+    return len(_chunk_ranges(int(source["line_count"]), int(policy.max_lines)))
+
+
+def _chunk_sources(args: argparse.Namespace, policy: _ChunkPolicy, sources: List[Dict[str, object]]) -> int:
+    """Dry-run, reuse or (re)write the package for the prepared *sources*."""
     # @cpt-begin:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-evaluate-threshold
-    total_lines = sum(int(source["line_count"]) for source in sources)
     output_dir = Path(args.output_dir).expanduser().resolve()
     if output_dir.exists() and not output_dir.is_dir():
         ui.result({"status": "ERROR", "message": f"--output-dir path exists and is not a directory: {output_dir}"})
@@ -386,14 +713,21 @@ def cmd_chunk_input(argv: List[str]) -> int:
 
     # @cpt-begin:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-dry-run
     if args.dry_run:
-        input_signature, _ = _build_input_signature(sources)
+        try:
+            for source in sources:
+                _scan_source(source, policy)
+            input_signature, _ = _build_input_signature(sources)
+        except (OSError, UnicodeDecodeError) as exc:
+            ui.result({"status": "ERROR", "message": str(exc)})
+            return 1
+        total_lines = sum(int(source["line_count"]) for source in sources)
         result = {
             "status": "OK",
             "dry_run": True,
             "output_dir": output_dir.as_posix(),
             "total_sources": len(sources),
             "total_lines": total_lines,
-            "max_lines": args.max_lines,
+            **policy.manifest_fields(),
             "threshold_lines": args.threshold_lines,
             "input_signature": input_signature,
             "plan_required": total_lines > args.threshold_lines,
@@ -404,7 +738,7 @@ def cmd_chunk_input(argv: List[str]) -> int:
                     "display_name": source["display_name"],
                     "path": source["path"],
                     "line_count": source["line_count"],
-                    "chunk_count": math.ceil(int(source["line_count"]) / args.max_lines) if int(source["line_count"]) else 1,
+                    "chunk_count": _source_chunk_count(source, policy),
                 }
                 for source in sources
             ],
@@ -424,10 +758,28 @@ def cmd_chunk_input(argv: List[str]) -> int:
 
     # @cpt-begin:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-prepare-output
     try:
-        chunks, input_signature, package_manifest = _write_chunks(sources, output_dir, args.max_lines)
+        manifest = _reusable_manifest(output_dir, policy, sources)
+        if manifest is not None:
+            # Same input, same chunking: the package on disk is already the result
+            chunks = [dict(chunk, path=(output_dir / str(chunk["file"])).as_posix()) for chunk in manifest["chunks"]]
+            input_signature = str(manifest["input_signature"])
+            package_manifest = (output_dir / PACKAGE_MANIFEST_FILE).as_posix()
+            # Chunks are stored in source order; each source's run starts at part 1
+            first_parts = [chunk for chunk in manifest["chunks"] if chunk.get("part") == 1]
+            for source, first_part in zip(sources, first_parts):
+                source["chunk_count"] = first_part["part_count"]
+            for source in sources:
+                if source["kind"] == "stdin" and manifest.get("direct_prompt_file"):
+                    source["stored_path"] = (output_dir / str(manifest["direct_prompt_file"])).as_posix()
+        else:
+            chunks, input_signature, package_manifest = _write_chunks(sources, output_dir, policy)
+    except UnicodeDecodeError as exc:
+        ui.result({"status": "ERROR", "message": str(exc)})
+        return 1
     except OSError as exc:
         ui.result({"status": "ERROR", "message": f"Failed to write chunks: {exc}"})
         return 1
+    total_lines = sum(int(source["line_count"]) for source in sources)
     # @cpt-end:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-prepare-output
 
     # @cpt-begin:cpt-cypilot-flow-execution-plans-chunk-raw-input:p1:inst-return-result
@@ -436,10 +788,11 @@ def cmd_chunk_input(argv: List[str]) -> int:
         "output_dir": output_dir.as_posix(),
         "total_sources": len(sources),
         "total_lines": total_lines,
-        "max_lines": args.max_lines,
+        **policy.manifest_fields(),
         "threshold_lines": args.threshold_lines,
         "input_signature": input_signature,
         "package_manifest": package_manifest,
+        "reused": manifest is not None,
         "plan_required": total_lines > args.threshold_lines,
         "direct_prompt_file": next(
             (
@@ -459,7 +812,7 @@ def cmd_chunk_input(argv: List[str]) -> int:
                 "path": source["path"],
                 "stored_path": source.get("stored_path"),
                 "line_count": source["line_count"],
-                "chunk_count": math.ceil(int(source["line_count"]) / args.max_lines) if int(source["line_count"]) else 1,
+                "chunk_count": _source_chunk_count(source, policy),
             }
             for source in sources
         ],
@@ -467,8 +820,9 @@ def cmd_chunk_input(argv: List[str]) -> int:
 
     def _human(data: Dict[str, object]) -> None:
         ui.header("Chunk Input")
+        verb = "Reused" if data["reused"] else "Prepared"
         ui.info(
-            f"Prepared {data['chunk_count']} chunk(s) from {data['total_sources']} input source(s) "
+            f"{verb} {data['chunk_count']} chunk(s) from {data['total_sources']} input source(s) "
             f"({data['total_lines']} lines total)"
         )
         ui.detail("output_dir", str(data["output_dir"]))
@@ -476,7 +830,7 @@ def cmd_chunk_input(argv: List[str]) -> int:
             ui.detail("direct_prompt_file", str(data["direct_prompt_file"]))
         ui.detail("plan_required", "yes" if bool(data["plan_required"]) else "no")
         for chunk in data["chunks"]:
-            ui.file_action(str(chunk["path"]), "created")
+            ui.file_action(str(chunk["path"]), "unchanged" if data["reused"] else "created")
 
     ui.result(result, human_fn=_human)
     return 0
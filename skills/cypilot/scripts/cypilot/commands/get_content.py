@@ -1,103 +1,196 @@
 # @cpt-begin:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-imports
 import argparse
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
 from ..utils.codebase import CodeFile
+from ..utils.content_index import ContentIndex, ContentLocation
+from ..utils.context import collect_target_ids
 from ..utils.document import get_content_scoped
 from ..utils.ui import ui
 # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-imports
 
 # @cpt-flow:cpt-cypilot-flow-traceability-validation-query:p1
 def cmd_get_content(argv: List[str]) -> int:
-    """Get best-effort content block for a specific Cypilot ID."""
+    """Get best-effort content blocks for one or more Cypilot IDs.
+
+    Without ``--artifact`` / ``--code`` the IDs are resolved through the
+    content offset index over every registered artifact and codebase file.
+    """
     p = argparse.ArgumentParser(prog="get-content", description="Get content block for a specific Cypilot ID")
-    p.add_argument("--artifact", default=None, help="Path to Cypilot artifact file")
+    p.add_argument("id_positional", nargs="?", default=None, help="Cypilot ID to retrieve content for")
+    p.add_argument("--artifact", default=None, help="Path to Cypilot artifact file (optional)")
     p.add_argument("--code", default=None, help="Path to code file (alternative to --artifact)")
-    p.add_argument("--id", required=True, help="Cypilot ID to retrieve content for")
+    p.add_argument("--id", action="append", default=None, help="Cypilot ID to retrieve content for (repeatable)")
+    p.add_argument("--ids-from", default=None, help="Read IDs from a file, one per line ('-' for stdin)")
     p.add_argument("--inst", default=None, help="Instruction ID for code blocks (e.g., 'inst-validate-input')")
+    p.add_argument("--no-cache", action="store_true", help="Ignore and do not update the persistent parse index")
     args = p.parse_args(argv)
 
     # @cpt-begin:cpt-cypilot-flow-traceability-validation-query:p1:inst-if-get-content
-    # Handle code file path
+    target_ids, err = collect_target_ids(args)
+    if err:
+        ui.result({"status": "ERROR", "message": err})
+        return 1
+
     if args.code:
-        code_path = Path(args.code).resolve()
-        if not code_path.is_file():
-            ui.result({"status": "ERROR", "message": f"Code file not found: {code_path}"})
-            return 1
+        results = _from_code_file(Path(args.code).resolve(), target_ids, args.inst)
+    elif args.artifact:
+        results = _from_artifact(Path(args.artifact).resolve(), target_ids)
+    else:
+        results = _from_index(target_ids, args.inst, use_cache=not args.no_cache)
+    if isinstance(results, dict):
+        ui.result(results)
+        return 1
+
+    if not args.ids_from and len(results) == 1:
+        result = results[0]
+        ui.result(result, human_fn=lambda d: _human_get_content(d))
+        return 0 if result["status"] == "FOUND" else 2
+
+    all_found = all(r["status"] == "FOUND" for r in results)
+    ui.result(
+        {"status": "FOUND" if all_found else "PARTIAL", "count": len(results), "results": results},
+        human_fn=lambda d: _human_get_content_batch(d),
+        stream=("results", "result"),
+    )
+    # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-if-get-content
+    return 0 if all_found else 2
+
 
-        cf, errs = CodeFile.from_path(code_path)
-        if errs or cf is None:
-            ui.result({"status": "ERROR", "message": f"Failed to parse code file: {errs}"})
-            return 1
+def _from_code_file(code_path: Path, target_ids: List[str], inst: Optional[str]) -> object:
+    """Results for *target_ids* in one code file, or an ERROR dict."""
+    if not code_path.is_file():
+        return {"status": "ERROR", "message": f"Code file not found: {code_path}"}
 
+    cf, errs = CodeFile.from_path(code_path)
+    if errs or cf is None:
+        return {"status": "ERROR", "message": f"Failed to parse code file: {errs}"}
+
+    results: List[Dict[str, object]] = []
+    for target_id in target_ids:
         # Try to get content by ID or inst
-        content = None
-        if args.inst:
-            content = cf.get_by_inst(args.inst)
+        content = cf.get_by_inst(inst) if inst else None
         if content is None:
-            content = cf.get(args.id)
-
+            content = cf.get(target_id)
         if content is None:
-            ui.result({"status": "NOT_FOUND", "id": args.id, "inst": args.inst})
-            return 2
+            results.append({"status": "NOT_FOUND", "id": target_id, "inst": inst})
+        else:
+            results.append({"status": "FOUND", "id": target_id, "inst": inst, "text": content})
+    return results
 
-        ui.result({"status": "FOUND", "id": args.id, "inst": args.inst, "text": content}, human_fn=lambda d: _human_get_content(d))
-        return 0
-
-    # Handle artifact path
-    if not args.artifact:
-        ui.result({"status": "ERROR", "message": "Either --artifact or --code must be specified"})
-        return 1
 
-    artifact_path = Path(args.artifact).resolve()
+def _from_artifact(artifact_path: Path, target_ids: List[str]) -> object:
+    """Results for *target_ids* in one registered artifact, or an ERROR dict."""
     if not artifact_path.is_file():
-        ui.result({"status": "ERROR", "message": f"Artifact not found: {artifact_path}"})
-        return 1
+        return {"status": "ERROR", "message": f"Artifact not found: {artifact_path}"}
 
-    # Load CypilotContext from artifact's location
-    from ..utils.context import CypilotContext
+    # The global context usually registers the artifact; only an artifact of
+    # another project needs its own context.
+    from ..utils.context import context_for_artifact
 
-    ctx = CypilotContext.load(artifact_path.parent)
+    ctx = context_for_artifact(artifact_path)
     if not ctx:
-        ui.result({"status": "ERROR", "message": "Cypilot not initialized"})
-        return 1
-
-    meta = ctx.meta
-    project_root = ctx.project_root
+        return {"status": "ERROR", "message": "Cypilot not initialized"}
 
     # Find artifact in registry to get its template
     try:
-        rel_path = artifact_path.relative_to(project_root).as_posix()
+        rel_path = artifact_path.relative_to(ctx.project_root).as_posix()
     except ValueError:
-        ui.result({"status": "ERROR", "message": f"Artifact not under project root: {artifact_path}"})
-        return 1
+        return {"status": "ERROR", "message": f"Artifact not under project root: {artifact_path}"}
 
-    artifact_entry = meta.get_artifact_by_path(rel_path)
+    artifact_entry = ctx.meta.get_artifact_by_path(rel_path)
     if artifact_entry is None:
-        ui.result({"status": "ERROR", "message": f"Artifact not registered: {rel_path}"})
-        return 1
+        return {"status": "ERROR", "message": f"Artifact not registered: {rel_path}"}
 
     artifact_meta, system = artifact_entry
-    result = get_content_scoped(artifact_path, id_value=args.id)
-    if result is None:
-        ui.result({"status": "NOT_FOUND", "id": args.id})
-        return 2
+    results: List[Dict[str, object]] = []
+    for target_id in target_ids:
+        found = get_content_scoped(artifact_path, id_value=target_id)
+        if found is None:
+            results.append({"status": "NOT_FOUND", "id": target_id})
+            continue
+        text, start_line, end_line = found
+        results.append({
+            "status": "FOUND",
+            "id": target_id,
+            "text": text,
+            "artifact": str(artifact_path),
+            "start_line": start_line,
+            "end_line": end_line,
+            "kind": artifact_meta.kind,
+            "system": system.name,
+            "traceability": artifact_meta.traceability,
+        })
+    return results
+
+
+def _from_index(target_ids: List[str], inst: Optional[str], *, use_cache: bool) -> object:
+    """Results for *target_ids* across all artifacts and code, or an ERROR dict."""
+    from ..utils.context import collect_artifacts_to_scan, get_context
+    from ..utils.id_index import codebase_paths
+    from ..utils.parse_index import ParseIndex
+
+    ctx = get_context()
+    if not ctx:
+        return {"status": "ERROR", "message": "Cypilot not initialized. Run 'cypilot init' first."}
+
+    artifacts, path_to_source = collect_artifacts_to_scan(ctx, use_cache)
+    adapter_dir = getattr(ctx, "adapter_dir", None)
+    index = ContentIndex(ParseIndex.for_adapter(adapter_dir) if use_cache and isinstance(adapter_dir, Path) else None)
+    index.add_artifacts(artifacts, path_to_source)
+    # Code is only scanned for IDs the artifacts do not cover (or for --inst).
+    if inst or any(index.artifact_location(t) is None for t in target_ids):
+        index.add_code_files(codebase_paths(ctx))
+    index.save()
 
-    text, start_line, end_line = result
-    ui.result({
+    results: List[Dict[str, object]] = []
+    for target_id in target_ids:
+        loc = (
+            (index.code_location(target_id, inst) if inst else None)
+            or index.artifact_location(target_id)
+            or index.code_location(target_id)
+        )
+        text = loc.read_text() if loc is not None else None
+        if loc is None or text is None:
+            results.append({"status": "NOT_FOUND", "id": target_id, "inst": inst} if inst else {"status": "NOT_FOUND", "id": target_id})
+        else:
+            results.append(_location_result(ctx, loc, text))
+    return results
+
+
+def _location_result(ctx: object, loc: ContentLocation, text: str) -> Dict[str, object]:
+    if loc.is_code:
+        return {
+            "status": "FOUND",
+            "id": loc.id,
+            "inst": loc.inst,
+            "text": text,
+            "code": loc.path,
+            "start_line": loc.start_line,
+            "end_line": loc.end_line,
+        }
+    result: Dict[str, object] = {
         "status": "FOUND",
-        "id": args.id,
+        "id": loc.id,
         "text": text,
-        "artifact": str(artifact_path),
-        "start_line": start_line,
-        "end_line": end_line,
-        "kind": artifact_meta.kind,
-        "system": system.name,
-        "traceability": artifact_meta.traceability,
-    }, human_fn=lambda d: _human_get_content(d))
-    # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-if-get-content
-    return 0
+        "artifact": loc.path,
+        "start_line": loc.start_line,
+        "end_line": loc.end_line,
+        "kind": loc.artifact_type,
+    }
+    try:
+        rel_path = Path(loc.path).relative_to(ctx.project_root).as_posix()
+    except ValueError:
+        rel_path = None
+    entry = ctx.meta.get_artifact_by_path(rel_path) if rel_path else None
+    if entry is not None:
+        artifact_meta, system = entry
+        result["system"] = system.name
+        result["traceability"] = artifact_meta.traceability
+    if loc.source:
+        result["source"] = loc.source
+    return result
 
 # @cpt-begin:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-format
 def _human_get_content(data: dict) -> None:
@@ -125,6 +218,12 @@ def _human_get_content(data: dict) -> None:
     if artifact:
         artifact = ui.relpath(str(artifact))
         ui.detail("Artifact", str(artifact))
+    code = data.get("code")
+    if code:
+        ui.detail("Code", ui.relpath(str(code)))
+    source = data.get("source")
+    if source:
+        ui.detail("Source", str(source))
     kind = data.get("kind")
     if kind:
         ui.detail("Kind", str(kind))
@@ -151,4 +250,10 @@ def _human_get_content(data: dict) -> None:
         ui.divider()
 
     ui.blank()
+
+def _human_get_content_batch(data: dict) -> None:
+    for r in data.get("results", []):
+        _human_get_content(r)
+    ui.detail("IDs resolved", f"{sum(1 for r in data.get('results', []) if r.get('status') == 'FOUND')}/{data.get('count', 0)}")
+    ui.blank()
 # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-format
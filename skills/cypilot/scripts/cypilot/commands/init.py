@@ -340,6 +340,57 @@ def _inject_managed_block(target_file: Path, install_dir: str, dry_run: bool = F
     return "updated"
     # @cpt-end:cpt-cypilot-algo-core-infra-inject-root-agents:p1:inst-return-agents-path
 
+_ROOT_STATE_FILENAME = "root-agents.json"
+
+
+def _root_file_signatures(project_root: Path) -> Dict[str, Optional[List[int]]]:
+    sigs: Dict[str, Optional[List[int]]] = {}
+    for name in (_AGENTS_FILENAME, "CLAUDE.md"):
+        try:
+            st = (project_root / name).stat()
+            sigs[name] = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            sigs[name] = None
+    return sigs
+
+
+def _verify_root_files(project_root: Path, install_dir: str) -> bool:
+    """Re-inject root AGENTS.md/CLAUDE.md managed blocks if they may be stale.
+
+    A fingerprint (managed block hash + both files' mtime/size) is kept in
+    ``{install_dir}/cache/root-agents.json``; while it matches, the check is
+    a state-file read and two ``stat`` calls. Returns True when the full
+    read/compare/write pass ran.
+    """
+    import hashlib
+    from ..utils.parse_index import CACHE_DIRNAME, prepare_cache_dir
+
+    state_path = project_root / install_dir / CACHE_DIRNAME / _ROOT_STATE_FILENAME
+    block_hash = hashlib.sha256(_compute_managed_block(install_dir).encode("utf-8")).hexdigest()
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = None
+    if (
+        isinstance(state, dict)
+        and state.get("block_sha256") == block_hash
+        and state.get("files") == _root_file_signatures(project_root)
+    ):
+        return False
+
+    _inject_root_agents(project_root, install_dir)
+    _inject_root_claude(project_root, install_dir)
+
+    payload = {"block_sha256": block_hash, "files": _root_file_signatures(project_root)}
+    tmp = state_path.with_name(f".{state_path.name}.tmp")
+    try:
+        prepare_cache_dir(state_path.parent)
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(state_path)
+    except OSError:
+        pass  # Fingerprint is an optimization; the next run simply re-checks
+    return True
+
 _DEFAULT_KIT_SOURCE = "cyberfabric/cyber-pilot-kit-sdlc"
 
 
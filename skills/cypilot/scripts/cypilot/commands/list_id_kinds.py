@@ -8,9 +8,11 @@ List ID Kinds Command — list all ID kind tokens found in artifacts.
 # @cpt-begin:cpt-cypilot-algo-traceability-validation-list-id-kinds:p1:inst-kinds-imports
 import argparse
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Set, Tuple
 
 from ..utils.document import scan_cpt_ids
+from ..utils.id_grammar import compile_id_grammar
+from ..utils.scan_cache import get_shared_scan_cache
 from ..utils.ui import ui
 # @cpt-end:cpt-cypilot-algo-traceability-validation-list-id-kinds:p1:inst-kinds-imports
 
@@ -106,21 +108,11 @@ def cmd_list_id_kinds(argv: List[str]) -> int:
     # @cpt-end:cpt-cypilot-algo-traceability-validation-list-id-kinds:p1:inst-kinds-build-known
 
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-list-id-kinds:p1:inst-kinds-scan-ids
-    def _match_system_prefix(cpt_id: str) -> Optional[str]:
-        best: Optional[str] = None
-        for sys_slug in registered_systems:
-            prefix = f"cpt-{sys_slug}-"
-            if cpt_id.lower().startswith(prefix.lower()):
-                if best is None or len(sys_slug) > len(best):
-                    best = sys_slug
-        return best
+    grammar = compile_id_grammar(registered_systems)
 
     def _infer_kinds(cpt_id: str) -> List[str]:
-        sys_slug = _match_system_prefix(cpt_id)
-        if not sys_slug:
-            return []
-        remainder = cpt_id[len(f"cpt-{sys_slug}-"):]
-        if not remainder:
+        sys_slug, remainder = grammar.split_system(cpt_id)
+        if not sys_slug or not remainder:
             return []
         parts = [p for p in remainder.split("-") if p]
         out: List[str] = []
@@ -131,8 +123,10 @@ def cmd_list_id_kinds(argv: List[str]) -> int:
             out.append(k)
         return out
 
+    scan_cache = get_shared_scan_cache()
     for artifact_path, artifact_type in artifacts_to_scan:
-        for h in scan_cpt_ids(artifact_path):
+        hits_in_file = scan_cache.id_hits(artifact_path) if scan_cache is not None else scan_cpt_ids(artifact_path)
+        for h in hits_in_file:
             if h.get("type") != "definition":
                 continue
             cid = str(h.get("id") or "").strip()
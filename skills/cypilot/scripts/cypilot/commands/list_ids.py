@@ -4,8 +4,10 @@ import re
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
-from ..utils.codebase import CodeFile
+from ..utils.codebase import CodeFile, collect_code_files
 from ..utils.document import scan_cpt_ids
+from ..utils.id_grammar import compile_id_grammar
+from ..utils.scan_cache import get_shared_scan_cache
 from ..utils.ui import ui
 # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-imports
 
@@ -87,19 +89,10 @@ def cmd_list_ids(argv: List[str]) -> int:
         else:
             # --source filter: skip primary, scan only matching remote source
             if is_workspace:
-                from ..utils.context import get_expanded_meta as _get_expanded_meta
-                for sc in ctx.sources.values():
-                    if not sc.reachable or sc.meta is None:
-                        continue
-                    if sc.name != args.source:
-                        continue
-                    _meta = _get_expanded_meta(sc)
-                    if _meta is None:
-                        continue
-                    for art, _sys in _meta.iter_all_artifacts():
-                        art_path = (sc.path / art.path).resolve()
-                        if art_path.exists():
-                            artifacts_to_scan.append((art_path, str(art.kind)))
+                sc = ctx.sources.get(args.source)
+                if sc is not None:
+                    artifacts_to_scan.extend(ctx.source_artifacts(sc))
+                    ctx.source_snapshots().save()
 
         if not artifacts_to_scan:
             ui.result({"count": 0, "artifacts_scanned": 0, "ids": []})
@@ -117,21 +110,11 @@ def cmd_list_ids(argv: List[str]) -> int:
         registered_systems = set((ctx.registered_systems or set()) if ctx else set())
     known_kinds = set((ctx.get_known_id_kinds() if ctx else set()) or set())
 
-    def _match_system_prefix(cpt_id: str) -> Optional[str]:
-        best: Optional[str] = None
-        for sys_slug in registered_systems:
-            prefix = f"cpt-{sys_slug}-"
-            if cpt_id.lower().startswith(prefix.lower()):
-                if best is None or len(sys_slug) > len(best):
-                    best = sys_slug
-        return best
+    grammar = compile_id_grammar(registered_systems)
 
     def _infer_kind(cpt_id: str) -> Optional[str]:
-        sys_slug = _match_system_prefix(cpt_id)
-        if not sys_slug:
-            return None
-        remainder = cpt_id[len(f"cpt-{sys_slug}-"):]
-        if not remainder:
+        sys_slug, remainder = grammar.split_system(cpt_id)
+        if not sys_slug or not remainder:
             return None
         parts = [p for p in remainder.split("-") if p]
         if not parts:
@@ -144,8 +127,10 @@ def cmd_list_ids(argv: List[str]) -> int:
                 return k
         return None
 
+    scan_cache = get_shared_scan_cache()
     for artifact_path, artifact_type in artifacts_to_scan:
-        for fh in scan_cpt_ids(artifact_path):
+        hits_in_file = scan_cache.id_hits(artifact_path) if scan_cache is not None else scan_cpt_ids(artifact_path)
+        for fh in hits_in_file:
             cid = str(fh.get("id") or "").strip()
             if not cid:
                 continue
@@ -175,22 +160,8 @@ def cmd_list_ids(argv: List[str]) -> int:
             if not code_path.exists():
                 continue
 
-            if code_path.is_file():
-                files = [code_path]
-            else:
-                files = []
-                for ext in extensions:
-                    files.extend(code_path.rglob(f"*{ext}"))
-
-            for file_path in files:
-                # Apply registry root ignore rules as a hard visibility filter.
-                try:
-                    rel = file_path.resolve().relative_to(ctx.project_root).as_posix()
-                except (OSError, ValueError):
-                    rel = None
-                if rel and ctx.meta.is_ignored(rel):
-                    continue
-
+            # Registry root ignore rules are a hard visibility filter (applied by the walker).
+            for file_path in collect_code_files(code_path, extensions, project_root=ctx.project_root, meta=ctx.meta):
                 cf, errs = CodeFile.from_path(file_path)
                 if errs or cf is None:
                     continue
@@ -252,7 +223,7 @@ def cmd_list_ids(argv: List[str]) -> int:
 
     # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-if-list
     # @cpt-begin:cpt-cypilot-flow-traceability-validation-query:p1:inst-return-query
-    ui.result(result, human_fn=lambda d: _human_list_ids(d))
+    ui.result(result, human_fn=lambda d: _human_list_ids(d), stream=("ids", "id"))
     return 0
     # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-return-query
 
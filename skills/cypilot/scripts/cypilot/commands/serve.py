@@ -0,0 +1,98 @@
+"""
+Serve Command — resident query daemon for the current project.
+
+Keeps the Cypilot context and artifact ID scans warm in memory so repeated
+``where-defined``/``where-used``/``list-ids``/``list-id-kinds``/``get-content``
+calls skip context loading. The CLI forwards those commands automatically
+while the daemon runs and falls back to in-process execution otherwise.
+"""
+
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..utils.ui import ui
+
+
+def cmd_serve(argv: List[str]) -> int:
+    """Start, query or stop the per-project query daemon."""
+    from ..utils.daemon import (
+        DEFAULT_IDLE_TIMEOUT,
+        QueryServer,
+        daemon_supported,
+        send_request,
+        socket_path,
+    )
+    from ..utils.files import find_project_root
+
+    p = argparse.ArgumentParser(
+        prog="serve",
+        description="Run a resident query daemon with a warm context and ID index",
+    )
+    p.add_argument("--root", default=".", help="Project directory (default: current directory)")
+    p.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help=f"Exit after this many idle seconds; 0 disables (default: {int(DEFAULT_IDLE_TIMEOUT)})",
+    )
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument("--status", action="store_true", help="Report whether a daemon is running and exit")
+    mode.add_argument("--stop", action="store_true", help="Stop a running daemon and exit")
+    args = p.parse_args(argv)
+
+    if not daemon_supported():
+        ui.result({"status": "ERROR", "message": "Unix domain sockets are not available on this platform"})
+        return 1
+
+    start = Path(args.root).resolve()
+    project_root = find_project_root(start) or start
+    path = socket_path(project_root)
+
+    if args.status or args.stop:
+        resp = send_request(path, {"op": "stop" if args.stop else "ping"})
+        running = resp is not None and bool(resp.get("ok"))
+        data: Dict[str, object] = {
+            "status": "OK" if running else "NOT_RUNNING",
+            "socket": str(path),
+            "project_root": str(project_root),
+        }
+        if args.status and running:
+            for key in ("pid", "requests", "reloads"):
+                data[key] = resp.get(key)
+        if args.stop:
+            data["stopped"] = running
+        ui.result(data, human_fn=_human_status)
+        return 0 if running else 1
+
+    server = QueryServer(project_root, path, idle_timeout=args.idle_timeout)
+    try:
+        srv = server.bind()
+    except OSError as exc:
+        ui.result({"status": "ERROR", "message": f"Cannot start daemon: {exc}", "socket": str(path)})
+        return 1
+    server.refresh()
+    ui.info(f"cpt serve: listening on {path} (project {project_root})")
+    try:
+        server.serve_forever(srv)
+    except KeyboardInterrupt:
+        pass
+    ui.info(f"cpt serve: stopped after {server.requests} request(s)")
+    return 0
+
+
+def _human_status(data: Dict[str, object]) -> None:
+    running = data.get("status") == "OK"
+    pid: Optional[object] = data.get("pid")
+    if "stopped" in data:
+        if running:
+            ui.success(f"Daemon stopped ({data['socket']})")
+        else:
+            ui.warn(f"No daemon running at {data['socket']}")
+        return
+    if running:
+        ui.success(f"Daemon running (pid {pid}) at {data['socket']}")
+        ui.detail("Requests served", str(data.get("requests")))
+        ui.detail("Context reloads", str(data.get("reloads")))
+    else:
+        ui.warn(f"No daemon running at {data['socket']}")
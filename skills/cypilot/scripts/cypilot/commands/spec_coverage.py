@@ -12,7 +12,9 @@ import json
 from pathlib import Path
 from typing import List
 
+from ..utils.codebase import collect_code_files
 from ..utils.coverage import FileCoverage, calculate_metrics, generate_report, scan_file_coverage
+from ..utils.parallel import map_ordered, resolve_jobs
 from ..utils.ui import ui
 # @cpt-end:cpt-cypilot-flow-spec-coverage-report:p1:inst-coverage-imports
 
@@ -32,6 +34,7 @@ def cmd_spec_coverage(argv: List[str]) -> int:
     p.add_argument("--system", action="append", default=None, dest="systems", help="Limit to system slug(s). Can be repeated. Default: all systems.")
     p.add_argument("--verbose", action="store_true", help="Include per-file marker details and covered ranges")
     p.add_argument("--output", default=None, help="Write report to file instead of stdout")
+    p.add_argument("--jobs", type=int, default=None, help="Worker processes for file scanning (default: CPU count; 1 disables parallelism)")
     args = p.parse_args(argv)
     # @cpt-end:cpt-cypilot-flow-spec-coverage-report:p1:inst-user-spec-coverage
 
@@ -60,11 +63,8 @@ def cmd_spec_coverage(argv: List[str]) -> int:
             if not code_path.exists():
                 continue
 
-            if code_path.is_file():
-                code_files_to_scan.append(code_path)
-            else:
-                for ext in extensions:
-                    code_files_to_scan.extend(code_path.rglob(f"*{ext}"))
+            # Registry ignore rules are applied (and ignored subtrees pruned) by the walker.
+            code_files_to_scan.extend(collect_code_files(code_path, extensions, project_root=project_root, meta=meta))
 
         for child in getattr(system_node, "children", []):
             collect_codebase_files(child)
@@ -83,15 +83,7 @@ def cmd_spec_coverage(argv: List[str]) -> int:
             continue
         collect_codebase_files(system_node)
 
-    filtered_files: List[Path] = []
-    for fp in code_files_to_scan:
-        try:
-            rel = fp.resolve().relative_to(project_root).as_posix()
-        except ValueError:
-            rel = None
-        if rel and meta.is_ignored(rel):
-            continue
-        filtered_files.append(fp)
+    filtered_files: List[Path] = code_files_to_scan
     # @cpt-end:cpt-cypilot-flow-spec-coverage-report:p1:inst-resolve-code-files
 
     # @cpt-begin:cpt-cypilot-flow-spec-coverage-report:p1:inst-coverage-helpers
@@ -111,11 +103,8 @@ def cmd_spec_coverage(argv: List[str]) -> int:
     # @cpt-end:cpt-cypilot-flow-spec-coverage-report:p1:inst-coverage-helpers
 
     # @cpt-begin:cpt-cypilot-flow-spec-coverage-report:p1:inst-foreach-file
-    file_coverages: List[FileCoverage] = []
-    for fp in sorted(set(filtered_files)):
-        fc = scan_file_coverage(fp)
-        if fc is not None:
-            file_coverages.append(fc)
+    scanned = map_ordered(scan_file_coverage, sorted(set(filtered_files)), resolve_jobs(args.jobs))
+    file_coverages: List[FileCoverage] = [fc for fc in scanned if fc is not None]
     # @cpt-end:cpt-cypilot-flow-spec-coverage-report:p1:inst-foreach-file
 
     # @cpt-begin:cpt-cypilot-flow-spec-coverage-report:p1:inst-calc-metrics
@@ -8,13 +8,9 @@ Thin CLI wrapper around the unified ``cypilot.utils.toc`` module.
 
 # @cpt-begin:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-imports
 import argparse
-from pathlib import Path
 from typing import List
 
-from cypilot.utils.toc import (
-    process_file as _process_file,
-    validate_toc as _validate_toc,
-)
+from ..utils.toc_batch import MODE_TOC, expand_markdown_args, run_batch, summarize
 from ..utils.ui import ui
 # @cpt-end:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-imports
 
@@ -28,7 +24,7 @@ def cmd_toc(argv: List[str]) -> int:
     p.add_argument(
         "files",
         nargs="+",
-        help="Markdown file path(s) to process",
+        help="Markdown file(s), directories (searched recursively for *.md) or glob patterns",
     )
     p.add_argument(
         "--max-level",
@@ -52,56 +48,53 @@ def cmd_toc(argv: List[str]) -> int:
         action="store_true",
         help="Skip post-generation validation",
     )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for large batches (default: CPU count)",
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the per-file heading cache",
+    )
     args = p.parse_args(argv)
     # @cpt-end:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-parse-args
 
-    results = []
     # @cpt-begin:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-foreach-file
-    validation_errors = 0
-    for filepath_str in args.files:
-        filepath = Path(filepath_str).resolve()
-        # @cpt-begin:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-process
-        result = _process_file(
-            filepath,
-            max_level=args.max_level,
-            dry_run=args.dry_run,
-            indent_size=args.indent,
-        )
-        # @cpt-end:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-process
+    files, unmatched = expand_markdown_args(args.files)
+    # @cpt-begin:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-process
+    # Each file is read once, regenerated and (unless skipped or dry-run)
+    # validated in memory; unchanged heading structures are served from cache
+    results = [
+        {"file": pattern, "status": "ERROR", "message": "No Markdown files matched"}
+        for pattern in unmatched
+    ]
+    results.extend(run_batch(
+        files,
+        mode=MODE_TOC,
+        max_level=args.max_level,
+        indent=args.indent,
+        dry_run=args.dry_run,
+        validate=not args.skip_validate,
+        jobs=args.jobs,
+        use_cache=not args.no_cache,
+    ))
+    # @cpt-end:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-process
 
-        # @cpt-begin:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-validate
-        # Auto-validate after generation (unless skipped or dry-run)
-        if (not args.skip_validate
-                and not args.dry_run
-                and filepath.is_file()
-                and result.get("status") not in ("ERROR", "SKIP")):
-            content = filepath.read_text(encoding="utf-8")
-            report = _validate_toc(
-                content,
-                artifact_path=filepath,
-                max_heading_level=args.max_level,
-            )
-            errs = report.get("errors", [])
-            warns = report.get("warnings", [])
-            if errs or warns:
-                result["validation"] = {
-                    "status": "FAIL" if errs else "WARN",
-                    "errors": len(errs),
-                    "warnings": len(warns),
-                    "details": errs + warns,
-                }
-                validation_errors += len(errs)
-            else:
-                result["validation"] = {"status": "PASS"}
-        # @cpt-end:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-validate
-
-        results.append(result)
+    # @cpt-begin:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-validate
+    validation_errors = sum(
+        int(r.get("validation", {}).get("errors", 0)) for r in results
+    )
+    # @cpt-end:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-validate
     # @cpt-end:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-foreach-file
 
     # @cpt-begin:cpt-cypilot-flow-developer-experience-toc:p1:inst-toc-gen-return
     output = {
         "status": "OK",
         "files_processed": len(results),
+        "summary": summarize(results),
         "results": results,
     }
 
@@ -110,7 +103,7 @@ def cmd_toc(argv: List[str]) -> int:
     elif any(r["status"] == "ERROR" for r in results):
         output["status"] = "PARTIAL" if len(results) > 1 else "ERROR"
 
-    ui.result(output, human_fn=lambda d: _human_toc(d))
+    ui.result(output, human_fn=lambda d: _human_toc(d), stream=("results", "result"))
 
     if validation_errors:
         return 2
@@ -138,6 +131,9 @@ def _human_toc(data: dict) -> None:
             for detail in val.get("details", []):
                 ui.warn(f"  {detail}")
     n = data.get("files_processed", 0)
+    cached = data.get("summary", {}).get("cached", 0)
+    if cached:
+        ui.substep(f"{cached} file(s) unchanged since the last run (cached).")
     overall = data.get("status", "")
     if overall in ("OK", "PASS"):
         ui.success(f"{n} file(s) processed.")
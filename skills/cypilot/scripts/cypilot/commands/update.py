@@ -27,6 +27,7 @@ Pipeline:
 import argparse
 import shutil
 import sys
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -428,7 +429,8 @@ def cmd_update(argv: List[str]) -> int:
                 ui.warn(f"Validate kits: {vk_status}")
                 # Show top errors inline so the user doesn't have to re-run
                 for e in (vk_report.get("errors") or [])[:5]:
-                    if isinstance(e, dict):
+                    # Issue records are Mappings, not dicts
+                    if isinstance(e, Mapping):
                         msg = e.get("message", "")
                         path = e.get("path", "")
                         if path:
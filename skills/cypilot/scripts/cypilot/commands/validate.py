@@ -1,14 +1,18 @@
 # @cpt-begin:cpt-cypilot-flow-traceability-validation-validate:p1:inst-validate-imports
 import argparse
 import json
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
 from ..utils import error_codes as EC
-from ..utils.codebase import CodeFile, cross_validate_code
+from ..utils.codebase import CodeFile, collect_code_files, cross_validate_code, load_code_files
 from ..utils.constraints import ArtifactRecord, cross_validate_artifacts, error as constraints_error, validate_artifact_file
-from ..utils.document import scan_cdsl_instructions, scan_cpt_ids
 from ..utils.fixing import enrich_issues
+from ..utils.parallel import resolve_jobs
+from ..utils.parse_index import ParseIndex
+from ..utils.records import json_default
+from ..utils.scan_cache import ArtifactScanCache
 from ..utils.ui import ui
 # @cpt-end:cpt-cypilot-flow-traceability-validation-validate:p1:inst-validate-imports
 
@@ -42,35 +46,64 @@ def _resolve_source_context(source_name: str, ws_ctx: Optional["WorkspaceContext
 def _collect_cross_repo_artifacts(
     ws_ctx: "WorkspaceContext",
     already_seen: Set[str],
+    use_cache: bool = True,
 ) -> List[ArtifactRecord]:
     """Collect artifacts from remote workspace sources for cross-reference context.
 
     Remote artifacts are NOT validated themselves — only used so that
     cross-references FROM validated (local) artifacts can be resolved.
     """
-    from ..utils.context import get_expanded_meta as _get_expanded_meta
-
     result: List[ArtifactRecord] = []
     seen = set(already_seen)
     for sc in ws_ctx.sources.values():
-        if not sc.reachable or sc.meta is None or sc.path is None or sc.role not in ("artifacts", "full"):
-            continue
-        expanded = _get_expanded_meta(sc)
-        if expanded is None:
+        if sc.role not in ("artifacts", "full"):
             continue
-        for art, _sys in expanded.iter_all_artifacts():
-            art_path = (sc.path / art.path).resolve()
-            if not art_path.exists() or str(art_path) in seen:
+        for art_path, kind in ws_ctx.source_artifacts(sc, use_cache):
+            if str(art_path) in seen:
                 continue
             seen.add(str(art_path))
             result.append(ArtifactRecord(
                 path=art_path,
-                artifact_kind=str(art.kind),
+                artifact_kind=kind,
                 constraints=None,
             ))
+    ws_ctx.source_snapshots(use_cache).save()
     return result
 
 
+class _IssueLog:
+    """Errors or warnings of one run: kept for the final report, or streamed (``--ndjson``).
+
+    When streaming, each issue is enriched and written as its own record as
+    soon as it is added, and only the count is retained.
+    """
+
+    def __init__(self, record: str, *, stream: bool, meta: object, project_root: Path) -> None:
+        self.record = record
+        self.stream = stream
+        self.meta = meta
+        self.project_root = project_root
+        self.items: List[Dict[str, object]] = []
+        self.count = 0
+
+    def append(self, issue: Dict[str, object]) -> None:
+        self.count += 1
+        if not self.stream:
+            self.items.append(issue)
+            return
+        if self.record == "error":
+            _enrich_target_artifact_paths([issue], meta=self.meta, project_root=self.project_root)
+        enrich_issues([issue], project_root=self.project_root)
+        ui.emit(self.record, issue)
+
+    def extend(self, issues: List[Dict[str, object]]) -> None:
+        for issue in issues:
+            self.append(issue)
+
+    def __len__(self) -> int:
+        return self.count
+
+
 # @cpt-flow:cpt-cypilot-flow-traceability-validation-validate:p1
 # @cpt-dod:cpt-cypilot-dod-traceability-validation-cross-refs:p1
 # @cpt-dod:cpt-cypilot-dod-traceability-validation-cdsl:p1
@@ -93,7 +126,13 @@ def cmd_validate(argv: List[str]) -> int:
     p.add_argument("--output", default=None, help="Write report to file instead of stdout")
     p.add_argument("--local-only", action="store_true", help="Skip cross-repo workspace validation (validate local repo only)")
     p.add_argument("--source", default=None, help="Target a specific workspace source for validation (uses that source's adapter context)")
+    p.add_argument("--jobs", type=int, default=None, help="Worker processes for code-marker scanning (default: CPU count; 1 disables parallelism)")
+    p.add_argument("--no-cache", action="store_true", help="Ignore and do not update the persistent parse index ({adapter}/cache/index.json)")
     args = p.parse_args(argv)
+    stream = ui.is_ndjson()
+    if stream and args.output:
+        ui.result({"status": "ERROR", "message": "--output cannot be combined with --ndjson"})
+        return 1
     # @cpt-end:cpt-cypilot-flow-traceability-validation-validate:p1:inst-user-validate
 
     # @cpt-begin:cpt-cypilot-flow-traceability-validation-validate:p1:inst-load-context
@@ -269,37 +308,49 @@ def cmd_validate(argv: List[str]) -> int:
                 "error_count": len(ctx_errors),
                 "warning_count": 0,
                 "errors": ctx_errors,
-            }, human_fn=lambda d: _human_validate(d))
+            }, human_fn=lambda d: _human_validate(d), stream=("errors", "error"))
             return 2
         ui.result({"status": "PASS", "artifacts_validated": 0, "error_count": 0, "warning_count": 0, "message": "No Cypilot artifacts found in registry"})
         return 0
     # @cpt-end:cpt-cypilot-flow-traceability-validation-validate:p1:inst-resolve-artifacts
 
     # @cpt-begin:cpt-cypilot-flow-traceability-validation-validate:p1:inst-if-registry-fail
+    # Every phase below reads artifacts through this cache so that each file
+    # is read, decoded and scanned exactly once per run. The persistent parse
+    # index lets warm runs skip re-parsing files that did not change.
+    parse_index: Optional[ParseIndex] = None
+    if not args.no_cache and isinstance(getattr(ctx, "adapter_dir", None), Path):
+        parse_index = ParseIndex.for_adapter(ctx.adapter_dir)
+    scan_cache = ArtifactScanCache(parse_index)
+    # The content-language check rides along in the same per-file scan pass.
+    lang_policy = _content_language_policy(project_root)
+    if lang_policy[0]:
+        _add_content_language_visitor(scan_cache, lang_policy[0])
+
     # Validate each artifact
-    all_errors: List[Dict[str, object]] = []
-    all_warnings: List[Dict[str, object]] = []
+    all_errors = _IssueLog("error", stream=stream, meta=meta, project_root=project_root)
+    all_warnings = _IssueLog("warning", stream=stream, meta=meta, project_root=project_root)
     artifact_reports: List[Dict[str, object]] = []
     artifact_report_by_path: Dict[str, Dict[str, object]] = {}
     artifact_records: List[ArtifactRecord] = []
 
+    # Registry-level errors make further checks unreliable — stop early.
+    has_registry_errors = any(str(e.get("type", "")) == "registry" for e in ctx_errors)
     if ctx_errors:
         all_errors.extend(ctx_errors)
-
-    # Registry-level errors make further checks unreliable — stop early.
-    has_registry_errors = any(str(e.get("type", "")) == "registry" for e in all_errors)
     if has_registry_errors:
-        enrich_issues(all_errors, project_root=project_root)
+        enrich_issues(all_errors.items, project_root=project_root)
         out = {
             "status": "FAIL",
             "project_root": project_root.as_posix(),
             "artifact_count": len(artifacts_to_validate),
             "error_count": len(all_errors),
             "warning_count": 0,
-            "errors": all_errors,
         }
+        if not stream:
+            out["errors"] = all_errors.items
         if args.output:
-            Path(args.output).write_text(json.dumps(out, indent=2, ensure_ascii=False), encoding="utf-8")
+            Path(args.output).write_text(json.dumps(out, indent=2, ensure_ascii=False, default=json_default), encoding="utf-8")
         else:
             ui.result(out, human_fn=lambda d: _human_validate(d))
         return 2
@@ -338,6 +389,7 @@ def cmd_validate(argv: List[str]) -> int:
             registered_systems=registered_systems,
             constraints_path=constraints_path,
             kit_id=str(kit_id),
+            scan_cache=scan_cache,
         )
         errors = result.get("errors", [])
         warnings = result.get("warnings", [])
@@ -353,13 +405,13 @@ def cmd_validate(argv: List[str]) -> int:
         }
 
         # On FAIL, include detailed error/warning lists by default so `validate` output is actionable
-        # without requiring `--verbose`.
-        if args.verbose or errors:
+        # without requiring `--verbose`. Streamed runs emit the issues as their own records.
+        if (args.verbose or errors) and not stream:
             artifact_report["errors"] = errors
-        if args.verbose or warnings:
+        if (args.verbose or warnings) and not stream:
             artifact_report["warnings"] = warnings
             try:
-                _hits = scan_cpt_ids(artifact_path)
+                _hits = scan_cache.id_hits(artifact_path)
                 artifact_report["id_definitions"] = len([h for h in _hits if h.get("type") == "definition"])
                 artifact_report["id_references"] = len([h for h in _hits if h.get("type") == "reference"])
             except (OSError, ValueError):
@@ -373,6 +425,7 @@ def cmd_validate(argv: List[str]) -> int:
     # @cpt-end:cpt-cypilot-flow-traceability-validation-validate:p1:inst-foreach-artifact
 
     # @cpt-begin:cpt-cypilot-flow-traceability-validation-validate:p1:inst-validate-helpers
+    # Attach before logging: a streamed issue is enriched (its "path" stripped) when logged.
     def _attach_issue_to_artifact_report(issue: Dict[str, object], *, is_error: bool) -> None:
         ipath = str(issue.get("path", "") or "")
         rep = artifact_report_by_path.get(ipath)
@@ -388,23 +441,30 @@ def cmd_validate(argv: List[str]) -> int:
             rep["warning_count"] = int(rep.get("warning_count", 0) or 0) + 1
             if args.verbose and isinstance(rep.get("warnings"), list):
                 rep["warnings"].append(issue)
+
+    def _emit_artifact_reports() -> None:
+        # Streamed only once every phase has attached its issues, so statuses are final.
+        for rep in artifact_reports:
+            ui.emit("artifact", rep)
     # @cpt-end:cpt-cypilot-flow-traceability-validation-validate:p1:inst-validate-helpers
 
     # Content language check — runs after per-artifact structure validation.
     # Skipped if structure has already failed (all_errors non-empty) so language
     # issues never obscure structural errors.
     if not all_errors:
-        _lang_errs = _run_content_language_check(artifacts_to_validate, project_root)
+        _lang_errs = _run_content_language_check(artifacts_to_validate, project_root, scan_cache, lang_policy)
         for _le in _lang_errs:
-            all_errors.append(_le)
             _attach_issue_to_artifact_report(_le, is_error=True)
+            all_errors.append(_le)
 
     # @cpt-begin:cpt-cypilot-flow-traceability-validation-validate:p1:inst-if-structure-fail
     # Stop early: cross-artifact reference checks and code traceability checks are run only
     # after per-artifact structure/content checks pass.
     if all_errors:
-        enrich_issues(all_errors, project_root=project_root)
-        enrich_issues(all_warnings, project_root=project_root)
+        if parse_index is not None:
+            parse_index.save()
+        enrich_issues(all_errors.items, project_root=project_root)
+        enrich_issues(all_warnings.items, project_root=project_root)
         out = {
             "status": "FAIL",
             "project_root": project_root.as_posix(),
@@ -412,12 +472,14 @@ def cmd_validate(argv: List[str]) -> int:
             "error_count": len(all_errors),
             "warning_count": len(all_warnings),
         }
-        out["errors"] = all_errors
-        if all_warnings:
-            out["warnings"] = all_warnings
+        if not stream:
+            out["errors"] = all_errors.items
+            if all_warnings:
+                out["warnings"] = all_warnings.items
         if args.output:
-            Path(args.output).write_text(json.dumps(out, indent=2, ensure_ascii=False), encoding="utf-8")
+            Path(args.output).write_text(json.dumps(out, indent=2, ensure_ascii=False, default=json_default), encoding="utf-8")
         else:
+            _emit_artifact_reports()
             ui.result(out, human_fn=lambda d: _human_validate(d))
         return 2
     # @cpt-end:cpt-cypilot-flow-traceability-validation-validate:p1:inst-if-structure-fail
@@ -449,28 +511,33 @@ def cmd_validate(argv: List[str]) -> int:
 
     if not args.local_only and ws_ctx is not None and ws_ctx.cross_repo and ws_ctx.resolve_remote_ids:
         _seen_cross = {str(r.path) for r in all_artifacts_for_cross}
-        all_artifacts_for_cross.extend(_collect_cross_repo_artifacts(ws_ctx, _seen_cross))
+        all_artifacts_for_cross.extend(_collect_cross_repo_artifacts(ws_ctx, _seen_cross, not args.no_cache))
 
     if len(all_artifacts_for_cross) > 0:
-        cross_result = cross_validate_artifacts(all_artifacts_for_cross, registered_systems=registered_systems, known_kinds=known_kinds)
+        cross_result = cross_validate_artifacts(
+            all_artifacts_for_cross,
+            registered_systems=registered_systems,
+            known_kinds=known_kinds,
+            scan_cache=scan_cache,
+        )
         cross_errors = cross_result.get("errors", [])
         cross_warnings = cross_result.get("warnings", [])
         # Only include cross-ref errors for artifacts we're validating
         for err in cross_errors:
             err_path = err.get("path", "")
             if err_path in validated_paths:
-                all_errors.append(err)
                 _attach_issue_to_artifact_report(err, is_error=True)
+                all_errors.append(err)
         for warn in cross_warnings:
             warn_path = warn.get("path", "")
             if warn_path in validated_paths:
-                all_warnings.append(warn)
                 _attach_issue_to_artifact_report(warn, is_error=False)
+                all_warnings.append(warn)
     # @cpt-end:cpt-cypilot-flow-traceability-validation-validate:p1:inst-cross-validate
 
     # @cpt-begin:cpt-cypilot-flow-traceability-validation-validate:p1:inst-if-code
     # Code traceability validation (unless skipped)
-    code_files_scanned: List[Dict[str, object]] = []
+    code_files_scanned = 0
     parsed_code_files_full: List[CodeFile] = []
     code_ids_found: Set[str] = set()
     to_code_ids: Set[str] = set()
@@ -488,9 +555,7 @@ def cmd_validate(argv: List[str]) -> int:
         if traceability != "FULL":
             continue
         try:
-            for h in scan_cpt_ids(artifact_path):
-                if h.get("type") != "definition" or not h.get("id"):
-                    continue
+            for h in scan_cache.definitions(artifact_path):
                 full_ids_to_check.add(str(h["id"]))
         except (OSError, ValueError):
             continue
@@ -502,9 +567,7 @@ def cmd_validate(argv: List[str]) -> int:
         # Build complete set of defined artifact IDs for orphan checks.
         for art in all_artifacts_for_cross:
             art_traceability = traceability_by_path.get(str(art.path), "FULL")
-            for h in scan_cpt_ids(art.path):
-                if h.get("type") != "definition" or not h.get("id"):
-                    continue
+            for h in scan_cache.definitions(art.path):
                 did = str(h["id"])
                 artifact_ids.add(did)
                 if art_traceability == "FULL":
@@ -531,7 +594,7 @@ def cmd_validate(argv: List[str]) -> int:
 
     # Workspace: expand artifact_ids with IDs from all workspace sources (primary + remote)
     if not args.local_only and ws_ctx is not None:
-        artifact_ids.update(ws_ctx.get_all_artifact_ids())
+        artifact_ids.update(ws_ctx.get_all_artifact_ids(use_cache=not args.no_cache))
 
     if should_scan_code:
         # Scan code files from all systems
@@ -542,6 +605,8 @@ def cmd_validate(argv: List[str]) -> int:
             pth = getattr(entry, "path", "") if not isinstance(entry, dict) else entry.get("path", "")
             return (project_root / pth).resolve()
 
+        code_files_to_scan: List[Tuple[Path, str]] = []
+
         def scan_codebase_entry(entry: object, traceability: str) -> None:
             code_path = resolve_code_path(entry)
             extensions = (getattr(entry, "extensions", None) if not isinstance(entry, dict) else entry.get("extensions", None)) or [".py"]
@@ -549,48 +614,8 @@ def cmd_validate(argv: List[str]) -> int:
             if code_path is None or not code_path.exists():
                 return
 
-            if code_path.is_file():
-                files_to_scan = [code_path]
-            else:
-                files_to_scan = []
-                for ext in extensions:
-                    files_to_scan.extend(code_path.rglob(f"*{ext}"))
-
-            for file_path in files_to_scan:
-                # Apply registry root ignore rules as a hard visibility filter.
-                try:
-                    rel = file_path.resolve().relative_to(project_root).as_posix()
-                except ValueError:
-                    rel = None
-                if rel and meta.is_ignored(rel):
-                    continue
-
-                cf, errs = CodeFile.from_path(file_path)
-                if errs or cf is None:
-                    if strict_code_validation and errs:
-                        all_errors.extend(errs)
-                    continue
-
-                if traceability == "FULL":
-                    parsed_code_files_full.append(cf)
-
-                if strict_code_validation:
-                    # Validate structure
-                    result = cf.validate()
-                    all_errors.extend(result.get("errors", []))
-                    all_warnings.extend(result.get("warnings", []))
-
-                # Track IDs found
-                file_ids = cf.list_ids()
-                code_ids_found.update(file_ids)
-
-                if file_ids or cf.scope_markers or cf.block_markers:
-                    code_files_scanned.append({
-                        "path": str(file_path),
-                        "scope_markers": len(cf.scope_markers),
-                        "block_markers": len(cf.block_markers),
-                        "ids_referenced": len(file_ids),
-                    })
+            for file_path in collect_code_files(code_path, extensions, project_root=project_root, meta=meta):
+                code_files_to_scan.append((file_path, traceability))
 
         def scan_system_codebase(system_node: "SystemNode") -> None:
             for cb_entry in system_node.codebase:
@@ -609,6 +634,37 @@ def cmd_validate(argv: List[str]) -> int:
         for system_node in meta.systems:
             scan_system_codebase(system_node)
 
+        # Parse all collected files up front (index hits + process pool), then
+        # consume the results in collection order so output stays deterministic.
+        loaded_code_files = load_code_files([fp for fp, _ in code_files_to_scan], parse_index, resolve_jobs(args.jobs))
+        for (file_path, traceability), (cf, errs) in zip(code_files_to_scan, loaded_code_files):
+            if errs or cf is None:
+                if strict_code_validation and errs:
+                    all_errors.extend(errs)
+                continue
+
+            if traceability == "FULL":
+                parsed_code_files_full.append(cf)
+
+            if strict_code_validation:
+                # Validate structure
+                result = cf.validate()
+                all_errors.extend(result.get("errors", []))
+                all_warnings.extend(result.get("warnings", []))
+
+            # Track IDs found
+            file_ids = cf.list_ids()
+            code_ids_found.update(file_ids)
+
+            if file_ids or cf.scope_markers or cf.block_markers:
+                code_files_scanned += 1
+                ui.emit("code_file", {
+                    "path": str(file_path),
+                    "scope_markers": len(cf.scope_markers),
+                    "block_markers": len(cf.block_markers),
+                    "ids_referenced": len(file_ids),
+                })
+
         if strict_code_validation and parsed_code_files_full:
             # Collect CDSL instructions per ID from FULL-traceability artifacts
             artifact_instances: Dict[str, Set[str]] = {}
@@ -618,7 +674,7 @@ def cmd_validate(argv: List[str]) -> int:
                 if art_traceability != "FULL":
                     continue
                 try:
-                    for step in scan_cdsl_instructions(art.path):
+                    for step in scan_cache.cdsl_steps(art.path):
                         pid = str(step.get("parent_id") or "")
                         inst = str(step.get("inst") or "")
                         checked = bool(step.get("checked", False))
@@ -654,7 +710,7 @@ def cmd_validate(argv: List[str]) -> int:
             present_kinds.add(kind)
 
             try:
-                for h in scan_cpt_ids(art.path):
+                for h in scan_cache.id_hits(art.path):
                     if h.get("type") != "reference":
                         continue
                     rid = str(h.get("id") or "").strip()
@@ -677,7 +733,7 @@ def cmd_validate(argv: List[str]) -> int:
             art_traceability = traceability_by_path.get(art_path_str, "FULL")
 
             try:
-                defs = [h for h in scan_cpt_ids(art.path) if h.get("type") == "definition" and h.get("id")]
+                defs = scan_cache.definitions(art.path)
             except (OSError, ValueError):
                 defs = []
 
@@ -696,8 +752,8 @@ def cmd_validate(argv: List[str]) -> int:
                         line=line,
                         id=did,
                     )
-                    all_warnings.append(warn)
                     _attach_issue_to_artifact_report(warn, is_error=False)
+                    all_warnings.append(warn)
                     continue
 
                 referenced_kinds = sorted(k for k in refs_by_id.get(did, set()) if k != kind)
@@ -717,17 +773,21 @@ def cmd_validate(argv: List[str]) -> int:
                     id=did,
                     other_kinds=other_kinds,
                 )
-                all_errors.append(err)
                 _attach_issue_to_artifact_report(err, is_error=True)
+                all_errors.append(err)
+
+    if parse_index is not None:
+        parse_index.save()
     # @cpt-end:cpt-cypilot-flow-traceability-validation-validate:p1:inst-if-code
 
     # @cpt-begin:cpt-cypilot-flow-traceability-validation-validate:p1:inst-enrich-errors
     # Resolve target artifact paths for cross-ref errors (before enrich_issues strips 'path')
-    _enrich_target_artifact_paths(all_errors, meta=meta, project_root=project_root)
+    # (streamed issues were enriched as they were emitted)
+    _enrich_target_artifact_paths(all_errors.items, meta=meta, project_root=project_root)
 
     # Enrich errors/warnings with fixing prompts for LLM agents
-    enrich_issues(all_errors, project_root=project_root)
-    enrich_issues(all_warnings, project_root=project_root)
+    enrich_issues(all_errors.items, project_root=project_root)
+    enrich_issues(all_warnings.items, project_root=project_root)
     # @cpt-end:cpt-cypilot-flow-traceability-validation-validate:p1:inst-enrich-errors
 
     # @cpt-begin:cpt-cypilot-flow-traceability-validation-validate:p1:inst-return-report
@@ -743,7 +803,7 @@ def cmd_validate(argv: List[str]) -> int:
 
     # Add code validation stats if code was validated
     if not args.skip_code and not args.artifact:
-        report["code_files_scanned"] = len(code_files_scanned)
+        report["code_files_scanned"] = code_files_scanned
         report["to_code_ids_total"] = len(to_code_ids)
         report["code_ids_found"] = len(code_ids_found)
         if to_code_ids:
@@ -753,14 +813,17 @@ def cmd_validate(argv: List[str]) -> int:
     if overall_status == "PASS":
         report["next_step"] = "Deterministic validation passed. Now perform semantic validation: review content quality against checklist.md criteria."
 
-    if args.verbose:
-        report["errors"] = all_errors
-        report["warnings"] = all_warnings
-    elif overall_status != "PASS":
+    if args.verbose and parse_index is not None:
+        report["parse_index"] = {"hits": parse_index.hits, "misses": parse_index.misses}
+    # Streamed runs already emitted every issue as its own record.
+    if args.verbose and not stream:
+        report["errors"] = all_errors.items
+        report["warnings"] = all_warnings.items
+    elif overall_status != "PASS" and not stream:
         # On failure, always print a detailed, pretty report.
-        report["errors"] = all_errors
+        report["errors"] = all_errors.items
         if all_warnings:
-            report["warnings"] = all_warnings
+            report["warnings"] = all_warnings.items
     else:
         # Compact summary on PASS
         failed_artifacts = [r for r in artifact_reports if r.get("status") == "FAIL"]
@@ -772,11 +835,12 @@ def cmd_validate(argv: List[str]) -> int:
 
     if args.output:
         pretty = bool(args.verbose) or (overall_status != "PASS")
-        out_text = json.dumps(report, indent=2 if pretty else None, ensure_ascii=False)
+        out_text = json.dumps(report, indent=2 if pretty else None, ensure_ascii=False, default=json_default)
         if pretty:
             out_text += "\n"
         Path(args.output).write_text(out_text, encoding="utf-8")
     else:
+        _emit_artifact_reports()
         ui.result(report, human_fn=lambda d: _human_validate(d))
 
     if overall_status == "PASS":
@@ -910,15 +974,11 @@ def _suggest_path_from_autodetect(node: object, target_kind: str) -> Optional[st
 # Content language check helper
 # ---------------------------------------------------------------------------
 
-def _run_content_language_check(
-    artifacts_to_validate: list,
-    project_root: "Path",
-) -> list:
-    """Return language-violation error dicts for all validated .md artifacts.
+_LANGUAGE_FACET = "language"
 
-    Uses project_root to discover the workspace config so the check works in
-    both workspace mode and single-repo mode.  Returns an empty list when
-    allowed_content_languages is not configured.
+
+def _content_language_policy(project_root: "Path") -> Tuple[Optional[List[str]], list]:
+    """Return ``(allowed_content_languages or None, config error dicts)``.
 
     Config failures (malformed .cypilot-workspace.toml) are surfaced as
     FILE_LOAD_ERROR entries rather than silently disabling validation.
@@ -927,13 +987,13 @@ def _run_content_language_check(
         from ..utils.constraints import error as _error
         from ..utils import error_codes as _EC
     except ImportError:
-        return []
+        return None, []
 
     try:
         from ..utils.workspace import find_workspace_config as _find_ws
         _ws_cfg, _ws_err = _find_ws(project_root)
     except (ImportError, OSError, AttributeError) as exc:
-        return [_error(
+        return None, [_error(
             "language",
             f"Cannot load workspace config for language check: {exc}",
             path=project_root,
@@ -942,7 +1002,7 @@ def _run_content_language_check(
         )]
 
     if _ws_err:
-        return [_error(
+        return None, [_error(
             "language",
             f"Workspace config error, language validation skipped: {_ws_err}",
             path=project_root,
@@ -951,12 +1011,45 @@ def _run_content_language_check(
         )]
 
     if _ws_cfg is None or _ws_cfg.validation is None:
-        return []
-    allowed_langs = _ws_cfg.validation.allowed_content_languages
-    if not allowed_langs:
-        return []
+        return None, []
+    return (_ws_cfg.validation.allowed_content_languages or None), []
 
+
+def _add_content_language_visitor(scan_cache: ArtifactScanCache, allowed_langs: List[str]) -> bool:
+    """Scan for language violations in the same pass as the ID/CDSL/heading scans."""
     try:
+        from ..utils.content_language import LangScanVisitor, build_allowed_ranges
+    except ImportError:
+        return False
+    allowed_ranges = build_allowed_ranges(allowed_langs)
+    scan_cache.add_line_visitor(_LANGUAGE_FACET, lambda path: LangScanVisitor(path, allowed_ranges))
+    return True
+
+
+def _run_content_language_check(
+    artifacts_to_validate: list,
+    project_root: "Path",
+    scan_cache: Optional[ArtifactScanCache] = None,
+    policy: Optional[Tuple[Optional[List[str]], list]] = None,
+) -> list:
+    """Return language-violation error dicts for all validated .md artifacts.
+
+    Uses project_root to discover the workspace config so the check works in
+    both workspace mode and single-repo mode (unless *policy* from
+    ``_content_language_policy`` is passed in). Returns an empty list when
+    allowed_content_languages is not configured.
+
+    Violations come from the scan cache's shared line pass, so artifacts
+    already read for structure validation are not read again. Files that are
+    not strict UTF-8 are reported as FILE_READ_ERROR with the decode error.
+    """
+    allowed_langs, config_errors = policy if policy is not None else _content_language_policy(project_root)
+    if config_errors or not allowed_langs:
+        return list(config_errors)
+
+    try:
+        from ..utils.constraints import error as _error
+        from ..utils import error_codes as _EC
         from ..utils.content_language import (
             LangScanError as _LangScanError,
             build_allowed_ranges,
@@ -965,28 +1058,47 @@ def _run_content_language_check(
     except ImportError:
         return []
 
-    allowed_ranges = build_allowed_ranges(allowed_langs)
+    cache = scan_cache if scan_cache is not None else ArtifactScanCache()
+    if not cache.has_line_visitor(_LANGUAGE_FACET) and not _add_content_language_visitor(cache, allowed_langs):
+        return []
+
     results = []
     for artifact_path, _template_path, _artifact_type, _traceability, _kit_id in artifacts_to_validate:
         if artifact_path.suffix.lower() != ".md":
             continue
-        try:
-            for v in _scan_file(artifact_path, allowed_ranges):
+        read_error = cache.read_error(artifact_path)
+        if read_error is not None:
+            results.append(_error(
+                "language",
+                f"Cannot read file for language check: {read_error}",
+                path=artifact_path,
+                line=1,
+                code=_EC.FILE_READ_ERROR,
+            ))
+            continue
+        if cache.lines(artifact_path) is None:
+            # Valid UTF-8 with NUL bytes: binary to the shared pass, but still text here.
+            try:
+                violations = _scan_file(artifact_path, build_allowed_ranges(allowed_langs))
+            except _LangScanError as exc:
                 results.append(_error(
                     "language",
-                    f"Non-allowed characters [{v.bad_chars_preview()}] — {v.line_preview()}",
+                    f"Cannot read file for language check: {exc.cause}",
                     path=artifact_path,
-                    line=v.lineno,
-                    code=_EC.CONTENT_LANGUAGE_VIOLATION,
-                    allowed_languages=allowed_langs,
+                    line=1,
+                    code=_EC.FILE_READ_ERROR,
                 ))
-        except _LangScanError as exc:
+                continue
+        else:
+            violations = cache.line_facet(artifact_path, _LANGUAGE_FACET)
+        for v in violations:
             results.append(_error(
                 "language",
-                f"Cannot read file for language check: {exc.cause}",
+                f"Non-allowed characters [{v.bad_chars_preview()}] — {v.line_preview()}",
                 path=artifact_path,
-                line=1,
-                code=_EC.FILE_READ_ERROR,
+                line=v.lineno,
+                code=_EC.CONTENT_LANGUAGE_VIOLATION,
+                allowed_languages=allowed_langs,
             ))
     return results
 
@@ -1062,7 +1174,7 @@ def _format_issue(issue: object, *, is_error: bool) -> None:
     Special formatting for known structural keys (location, message, code,
     reasons, fixing_prompt); everything else auto-formatted as key: value.
     """
-    if not isinstance(issue, dict):
+    if not isinstance(issue, Mapping):
         if is_error:
             ui.warn(str(issue))
         else:
@@ -8,6 +8,7 @@ consistency against constraints.
 
 # @cpt-begin:cpt-cypilot-flow-kit-validate-cli:p1:inst-validate-kits-imports
 import argparse
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -62,7 +63,7 @@ def run_validate_kits(
                 rep.pop("errors", None)
 
     for err in (getattr(ctx, "_errors", []) or []):
-        if not isinstance(err, dict) or err.get("type") != "resources":
+        if not isinstance(err, Mapping) or err.get("type") != "resources":
             continue
         err_kit = str(err.get("kit", "") or "")
         if kit_filter and err_kit != str(kit_filter):
@@ -370,7 +371,7 @@ def _validate_kit_by_path(kit_path: Path, *, verbose: bool = False) -> Tuple[int
 # @cpt-begin:cpt-cypilot-flow-kit-validate-cli:p1:inst-validate-kits-format
 def _show_error(e: object, *, prefix: str = "\u2717") -> None:
     """Display a single error/warning dict with nested details."""
-    if not isinstance(e, dict):
+    if not isinstance(e, Mapping):
         ui.substep(f"  {prefix} {e}")
         return
     msg = e.get("message", "")
@@ -456,11 +457,11 @@ def _human_validate_kits(data: dict) -> None:
         _shown_msgs: set = set()
         for r in sc_results:
             for e in r.get("errors", []):
-                if isinstance(e, dict):
+                if isinstance(e, Mapping):
                     _shown_msgs.add(e.get("message", ""))
         _top = (data.get("errors") or [])[:10]
         _unseen = [e for e in _top
-                   if not isinstance(e, dict) or e.get("message", "") not in _shown_msgs]
+                   if not isinstance(e, Mapping) or e.get("message", "") not in _shown_msgs]
         for e in _unseen:
             _show_error(e)
         truncated = data.get("errors_truncated", 0)
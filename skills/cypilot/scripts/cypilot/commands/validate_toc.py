@@ -11,10 +11,9 @@ covered, and the TOC is not stale.  Thin CLI wrapper around
 
 # @cpt-begin:cpt-cypilot-algo-traceability-validation-validate-toc:p1:inst-toc-imports
 import argparse
-from pathlib import Path
 from typing import List
 
-from ..utils.toc import validate_toc
+from ..utils.toc_batch import MODE_VALIDATE, expand_markdown_args, run_batch, summarize
 from ..utils.ui import ui
 # @cpt-end:cpt-cypilot-algo-traceability-validation-validate-toc:p1:inst-toc-imports
 
@@ -28,7 +27,7 @@ def cmd_validate_toc(argv: List[str]) -> int:
     p.add_argument(
         "files",
         nargs="+",
-        help="Markdown file path(s) to validate",
+        help="Markdown file(s), directories (searched recursively for *.md) or glob patterns",
     )
     p.add_argument(
         "--max-level",
@@ -41,54 +40,41 @@ def cmd_validate_toc(argv: List[str]) -> int:
         action="store_true",
         help="Include full error details in output",
     )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for large batches (default: CPU count)",
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the per-file heading cache",
+    )
     args = p.parse_args(argv)
     # @cpt-end:cpt-cypilot-algo-traceability-validation-validate-toc:p1:inst-toc-parse-args
 
-    results = []
-    total_errors = 0
-    total_warnings = 0
-
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-validate-toc:p1:inst-toc-resolve-files
-    files_to_validate = [Path(f).resolve() for f in args.files]
+    files_to_validate, unmatched = expand_markdown_args(args.files)
     # @cpt-end:cpt-cypilot-algo-traceability-validation-validate-toc:p1:inst-toc-resolve-files
 
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-validate-toc:p1:inst-toc-foreach-file
-    for filepath in files_to_validate:
-
-        if not filepath.is_file():
-            results.append({
-                "file": str(filepath),
-                "status": "ERROR",
-                "message": "File not found",
-            })
-            total_errors += 1
-            continue
-
-        content = filepath.read_text(encoding="utf-8")
-        report = validate_toc(
-            content,
-            artifact_path=filepath,
-            max_heading_level=args.max_level,
-        )
-
-        errors = report.get("errors", [])
-        warnings = report.get("warnings", [])
-        total_errors += len(errors)
-        total_warnings += len(warnings)
-
-        file_result: dict = {
-            "file": str(filepath),
-            "status": "FAIL" if errors else ("WARN" if warnings else "PASS"),
-            "error_count": len(errors),
-            "warning_count": len(warnings),
-        }
-
-        if args.verbose or errors:
-            file_result["errors"] = errors
-        if args.verbose or warnings:
-            file_result["warnings"] = warnings
-
-        results.append(file_result)
+    results = [
+        {"file": pattern, "status": "ERROR", "message": "No Markdown files matched"}
+        for pattern in unmatched
+    ]
+    results.extend(run_batch(
+        files_to_validate,
+        mode=MODE_VALIDATE,
+        max_level=args.max_level,
+        verbose=args.verbose,
+        jobs=args.jobs,
+        use_cache=not args.no_cache,
+    ))
+    total_errors = sum(
+        1 if r["status"] == "ERROR" else int(r.get("error_count", 0)) for r in results
+    )
+    total_warnings = sum(int(r.get("warning_count", 0)) for r in results)
     # @cpt-end:cpt-cypilot-algo-traceability-validation-validate-toc:p1:inst-toc-foreach-file
 
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-validate-toc:p1:inst-toc-return
@@ -103,10 +89,11 @@ def cmd_validate_toc(argv: List[str]) -> int:
         "files_validated": len(results),
         "error_count": total_errors,
         "warning_count": total_warnings,
+        "summary": summarize(results),
         "results": results,
     }
 
-    ui.result(output, human_fn=lambda d: _human_validate_toc(d))
+    ui.result(output, human_fn=lambda d: _human_validate_toc(d), stream=("results", "result"))
 
     if total_errors:
         return 2
@@ -133,6 +120,9 @@ def _human_validate_toc(data: dict) -> None:
             ui.substep(f"{path}: {status}")
     overall = data.get("status", "")
     n = data.get("files_validated", 0)
+    cached = data.get("summary", {}).get("cached", 0)
+    if cached:
+        ui.substep(f"{cached} file(s) unchanged since the last run (cached).")
     if overall == "PASS":
         ui.success(f"{n} file(s) validated, all TOCs correct.")
     elif overall == "FAIL":
@@ -2,62 +2,63 @@
 import argparse
 from typing import Dict, List
 
-from ..utils.context import resolve_target_and_artifacts
-from ..utils.document import scan_cpt_ids
+from ..utils.context import resolve_targets_and_artifacts
+from ..utils.id_index import IdIndex, build_id_index
 from ..utils.ui import ui
 # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-imports
 
 # @cpt-flow:cpt-cypilot-flow-traceability-validation-query:p1
 # @cpt-begin:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-resolve
 def cmd_where_defined(argv: List[str]) -> int:
-    """Find where a Cypilot ID is defined."""
+    """Find where one or more Cypilot IDs are defined."""
     p = argparse.ArgumentParser(prog="where-defined", description="Find where an Cypilot ID is defined")
     p.add_argument("id_positional", nargs="?", default=None, help="Cypilot ID to find definition for")
-    p.add_argument("--id", default=None, help="Cypilot ID to find definition for")
+    p.add_argument("--id", action="append", default=None, help="Cypilot ID to find definition for (repeatable)")
+    p.add_argument("--ids-from", default=None, help="Read IDs from a file, one per line ('-' for stdin)")
     p.add_argument("--artifact", default=None, help="Limit search to specific artifact (optional)")
+    p.add_argument("--no-cache", action="store_true", help="Ignore and do not update the persistent parse index")
     args = p.parse_args(argv)
 
-    target_id, _, artifacts_to_scan, path_to_source, err = resolve_target_and_artifacts(args)
+    target_ids, ctx, artifacts_to_scan, path_to_source, err = resolve_targets_and_artifacts(args)
     if err:
         ui.result({"status": "ERROR", "message": err}, human_fn=lambda d: _human_where_defined(d))
         return 1
-
-    if not artifacts_to_scan:
-        ui.result({"status": "NO_ARTIFACTS", "id": target_id, "artifacts_scanned": 0, "count": 0, "definitions": []}, human_fn=lambda d: _human_where_defined(d))
-        return 0
+    batch = bool(args.ids_from) or len(target_ids) > 1
     # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-resolve
 
     # @cpt-begin:cpt-cypilot-flow-traceability-validation-query:p1:inst-if-where-def
+    index = build_id_index(ctx, artifacts_to_scan, path_to_source, use_cache=not args.no_cache)
+    results = [_lookup(index, target_id) for target_id in target_ids]
+
+    if not batch:
+        result = results[0]
+        ui.result(result, human_fn=lambda d: _human_where_defined(d), stream=("definitions", "definition"))
+        return 0 if result["status"] in ("FOUND", "NO_ARTIFACTS") else 2
+
+    all_found = all(r["status"] in ("FOUND", "NO_ARTIFACTS") for r in results)
+    ui.result(
+        {
+            "status": "FOUND" if all_found else "PARTIAL",
+            "artifacts_scanned": index.artifacts_scanned,
+            "count": len(results),
+            "results": results,
+        },
+        human_fn=lambda d: _human_where_defined_batch(d),
+        stream=("results", "result"),
+    )
+    # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-if-where-def
+    return 0 if all_found else 2
 
-    # Search for definitions
-    definitions: List[Dict[str, object]] = []
-
-    for artifact_path, artifact_type in artifacts_to_scan:
-        for h in scan_cpt_ids(artifact_path):
-            if h.get("type") != "definition":
-                continue
-            if str(h.get("id") or "") != target_id:
-                continue
-            d: Dict[str, object] = {
-                "artifact": str(artifact_path),
-                "artifact_type": artifact_type,
-                "line": int(h.get("line", 1) or 1),
-                "kind": None,
-                "checked": bool(h.get("checked", False)),
-            }
-            src = path_to_source.get(str(artifact_path))
-            if src:
-                d["source"] = src
-            definitions.append(d)
 
+def _lookup(index: IdIndex, target_id: str) -> Dict[str, object]:
+    if not index.artifacts_scanned:
+        return {"status": "NO_ARTIFACTS", "id": target_id, "artifacts_scanned": 0, "count": 0, "definitions": []}
+    definitions = index.definitions(target_id)
     if not definitions:
-        ui.result({"status": "NOT_FOUND", "id": target_id, "artifacts_scanned": len(artifacts_to_scan), "count": 0, "definitions": []}, human_fn=lambda d: _human_where_defined(d))
-        return 2
-
-    status = "FOUND" if len(definitions) == 1 else "AMBIGUOUS"
-    ui.result({"status": status, "id": target_id, "artifacts_scanned": len(artifacts_to_scan), "count": len(definitions), "definitions": definitions}, human_fn=lambda d: _human_where_defined(d))
-    # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-if-where-def
-    return 0 if status == "FOUND" else 2
+        status = "NOT_FOUND"
+    else:
+        status = "FOUND" if len(definitions) == 1 else "AMBIGUOUS"
+    return {"status": status, "id": target_id, "artifacts_scanned": index.artifacts_scanned, "count": len(definitions), "definitions": definitions}
 
 # @cpt-begin:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-format
 def _human_where_defined(data: dict) -> None:
@@ -103,4 +104,10 @@ def _human_where_defined(data: dict) -> None:
         ui.step(f"{art}{loc}  ({art_type}){src_tag}{suffix}")
 
     ui.blank()
+
+def _human_where_defined_batch(data: dict) -> None:
+    for r in data.get("results", []):
+        _human_where_defined(r)
+    ui.detail("IDs resolved", f"{sum(1 for r in data.get('results', []) if r.get('status') == 'FOUND')}/{data.get('count', 0)}")
+    ui.blank()
 # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-format
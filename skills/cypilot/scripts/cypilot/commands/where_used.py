@@ -2,63 +2,59 @@
 import argparse
 from typing import Dict, List
 
-from ..utils.context import resolve_target_and_artifacts
-from ..utils.document import scan_cpt_ids
+from ..utils.context import resolve_targets_and_artifacts
+from ..utils.id_index import IdIndex, build_id_index
 from ..utils.ui import ui
 # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-imports
 
 # @cpt-flow:cpt-cypilot-flow-traceability-validation-query:p1
 # @cpt-begin:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-resolve
 def cmd_where_used(argv: List[str]) -> int:
-    """Find all references to a Cypilot ID."""
+    """Find all references to one or more Cypilot IDs."""
     p = argparse.ArgumentParser(prog="where-used", description="Find all references to an Cypilot ID")
     p.add_argument("id_positional", nargs="?", default=None, help="Cypilot ID to find references for")
-    p.add_argument("--id", default=None, help="Cypilot ID to find references for")
+    p.add_argument("--id", action="append", default=None, help="Cypilot ID to find references for (repeatable)")
+    p.add_argument("--ids-from", default=None, help="Read IDs from a file, one per line ('-' for stdin)")
     p.add_argument("--artifact", default=None, help="Limit search to specific artifact (optional)")
     p.add_argument("--include-definitions", action="store_true", help="Include definitions in results")
+    p.add_argument("--include-code", action="store_true", help="Also report code markers referencing the ID")
+    p.add_argument("--no-cache", action="store_true", help="Ignore and do not update the persistent parse index")
     args = p.parse_args(argv)
 
-    target_id, _, artifacts_to_scan, path_to_source, err = resolve_target_and_artifacts(args)
+    target_ids, ctx, artifacts_to_scan, path_to_source, err = resolve_targets_and_artifacts(args)
     if err:
         ui.result({"status": "ERROR", "message": err})
         return 1
-
-    if not artifacts_to_scan:
-        ui.result({"id": target_id, "artifacts_scanned": 0, "count": 0, "references": []}, human_fn=lambda d: _human_where_used(d))
-        return 0
+    batch = bool(args.ids_from) or len(target_ids) > 1
+    include_code = bool(args.include_code) and not args.artifact
     # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-resolve
 
     # @cpt-begin:cpt-cypilot-flow-traceability-validation-query:p1:inst-if-where-used
-
-    # Search for references
-    references: List[Dict[str, object]] = []
-
-    for artifact_path, artifact_type in artifacts_to_scan:
-        for h in scan_cpt_ids(artifact_path):
-            if str(h.get("id") or "") != target_id:
-                continue
-            if h.get("type") == "definition" and not bool(args.include_definitions):
-                continue
-            r: Dict[str, object] = {
-                "artifact": str(artifact_path),
-                "artifact_type": artifact_type,
-                "line": int(h.get("line", 1) or 1),
-                "kind": None,
-                "type": str(h.get("type")),
-                "checked": bool(h.get("checked", False)),
-            }
-            src = path_to_source.get(str(artifact_path))
-            if src:
-                r["source"] = src
-            references.append(r)
-
-    # Sort by artifact and line
-    references = sorted(references, key=lambda r: (str(r.get("artifact", "")), int(r.get("line", 0))))
+    index = build_id_index(ctx, artifacts_to_scan, path_to_source, include_code=include_code, use_cache=not args.no_cache)
+    results = [_lookup(index, target_id, bool(args.include_definitions), include_code) for target_id in target_ids]
 
     # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-if-where-used
-    ui.result({"id": target_id, "artifacts_scanned": len(artifacts_to_scan), "count": len(references), "references": references}, human_fn=lambda d: _human_where_used(d))
+    if not batch:
+        ui.result(results[0], human_fn=lambda d: _human_where_used(d), stream=("references", "reference"))
+        return 0
+    data: Dict[str, object] = {
+        "artifacts_scanned": index.artifacts_scanned,
+        "count": len(results),
+        "results": results,
+    }
+    if include_code:
+        data["code_files_scanned"] = index.code_files_scanned
+    ui.result(data, human_fn=lambda d: _human_where_used_batch(d), stream=("results", "result"))
     return 0
 
+
+def _lookup(index: IdIndex, target_id: str, include_definitions: bool, include_code: bool) -> Dict[str, object]:
+    references = index.references(target_id, include_definitions=include_definitions)
+    r: Dict[str, object] = {"id": target_id, "artifacts_scanned": index.artifacts_scanned, "count": len(references), "references": references}
+    if include_code:
+        r["code_references"] = index.code_references(target_id)
+    return r
+
 # @cpt-begin:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-format
 def _human_where_used(data: dict) -> None:
     target = data.get("id", "?")
@@ -74,6 +70,7 @@ def _human_where_used(data: dict) -> None:
         ui.blank()
         ui.info("No references found.")
         ui.blank()
+        _human_code_refs(data)
         return
 
     ui.blank()
@@ -90,4 +87,21 @@ def _human_where_used(data: dict) -> None:
         ui.step(f"{art}{loc}  ({ref_type}, {art_type}){src_tag}{suffix}")
 
     ui.blank()
+    _human_code_refs(data)
+
+
+def _human_code_refs(data: dict) -> None:
+    code_refs = data.get("code_references")
+    if not code_refs:
+        return
+    ui.detail("Code references", str(len(code_refs)))
+    for c in code_refs:
+        inst = f":inst-{c['inst']}" if c.get("inst") else ""
+        ui.substep(f"{ui.relpath(c.get('file', '?'))}:{c.get('line', '')}  ({c.get('marker_type', '')} {c.get('kind', '')}{inst})")
+    ui.blank()
+
+
+def _human_where_used_batch(data: dict) -> None:
+    for r in data.get("results", []):
+        _human_where_used(r)
 # @cpt-end:cpt-cypilot-flow-traceability-validation-query:p1:inst-query-format
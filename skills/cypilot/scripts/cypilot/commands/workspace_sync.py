@@ -6,9 +6,10 @@ workspace-sync: Fetch and update worktrees for Git URL workspace sources.
 # @cpt-dod:cpt-cypilot-dod-workspace-sync:p1
 import argparse
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 from ..utils.git_utils import _redact_url
+from ..utils.parallel import resolve_jobs
 from ..utils.ui import ui
 
 
@@ -44,22 +45,47 @@ def _collect_git_sources(ws_cfg, source_name):
     return {name: src for name, src in ws_cfg.sources.items() if src.url}, None
 
 
-def _sync_sources(git_sources, resolve_cfg, base, *, force=False):
-    """Run sync for each git source. Returns (results, synced, failed)."""
-    from ..utils.git_utils import sync_git_source
+def _sync_sources(git_sources, resolve_cfg, base, *, force=False, jobs=1, timeout=None):
+    """Run sync for each git source. Returns (results, synced, failed).
 
-    results = []
-    synced = 0
-    failed = 0
-    for name, src in git_sources.items():
-        result = sync_git_source(src, resolve_cfg, base, force=force)
+    With ``jobs > 1`` sources are fetched concurrently on a thread pool (the
+    work is git subprocesses waiting on the network). Sources that resolve to
+    the same local directory (e.g. one repo on two branches) share a worktree
+    and are synced one after another. Results always follow the configured
+    source order. *timeout* bounds each source's git commands.
+    """
+    from ..utils.git_utils import peek_git_source_path, sync_git_source
+
+    def _sync_one(item):
+        name, src = item
+        try:
+            result = sync_git_source(src, resolve_cfg, base, force=force, timeout=timeout)
+        except Exception as exc:  # pylint: disable=broad-exception-caught  # one source must not abort the others
+            result = {"status": "failed", "error": str(exc)}
         result["name"] = name
-        results.append(result)
-        if result["status"] == "synced":
-            synced += 1
-        else:
-            failed += 1
-    return results, synced, failed
+        return result
+
+    items = list(git_sources.items())
+    groups: Dict[object, List[int]] = {}
+    for i, (_name, src) in enumerate(items):
+        local = peek_git_source_path(src, resolve_cfg, base)
+        # Sources without a computable path fail on their own; keep them apart.
+        groups.setdefault(local.resolve() if local is not None else i, []).append(i)
+
+    def _sync_group(indices):
+        return [(i, _sync_one(items[i])) for i in indices]
+
+    workers = min(max(1, int(jobs or 1)), len(groups))
+    if workers <= 1:
+        done = [_sync_group(g) for g in groups.values()]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="workspace-sync") as ex:
+            done = list(ex.map(_sync_group, groups.values()))
+    results = [r for _i, r in sorted((pair for group in done for pair in group), key=lambda pair: pair[0])]
+    synced = sum(1 for r in results if r["status"] == "synced")
+    return results, synced, len(results) - synced
 
 
 def cmd_workspace_sync(argv: List[str]) -> int:
@@ -75,6 +101,10 @@ def cmd_workspace_sync(argv: List[str]) -> int:
     )
     p.add_argument("--dry-run", action="store_true", help="Show which sources would be synced without network operations")
     p.add_argument("--force", action="store_true", help="Skip dirty worktree check — WARNING: uncommitted changes will be discarded via git reset --hard")
+    p.add_argument("--jobs", type=int, default=None, help="Sources synced concurrently (default: CPU count; 1 syncs one at a time)")
+    p.add_argument("--timeout", type=float, default=None, help="Seconds allowed for all git commands of one source (default: GIT_TIMEOUT per command)")
+    p.add_argument("--depth", type=int, default=None, help="Shallow-clone sources that are not cloned yet (overrides resolve.clone_depth)")
+    p.add_argument("--filter", dest="clone_filter", default=None, help="Partial-clone filter for new clones, e.g. blob:none (overrides resolve.clone_filter)")
     args = p.parse_args(argv)
     # @cpt-end:cpt-cypilot-flow-workspace-sync:p1:inst-user-workspace-sync
 
@@ -129,8 +159,19 @@ def cmd_workspace_sync(argv: List[str]) -> int:
 
     # @cpt-begin:cpt-cypilot-flow-workspace-sync:p1:inst-sync-foreach-source
     resolve_cfg = ws_cfg.resolve or ResolveConfig()
+    if args.depth is not None or args.clone_filter is not None:
+        from dataclasses import replace
+
+        resolve_cfg = replace(
+            resolve_cfg,
+            clone_depth=args.depth if args.depth is not None else resolve_cfg.clone_depth,
+            clone_filter=args.clone_filter if args.clone_filter is not None else resolve_cfg.clone_filter,
+        )
     base = _resolve_sync_base(ws_cfg, project_root)
-    results, synced, failed = _sync_sources(git_sources, resolve_cfg, base, force=args.force)
+    results, synced, failed = _sync_sources(
+        git_sources, resolve_cfg, base,
+        force=args.force, jobs=resolve_jobs(args.jobs), timeout=args.timeout,
+    )
     # @cpt-end:cpt-cypilot-flow-workspace-sync:p1:inst-sync-foreach-source
 
     # @cpt-begin:cpt-cypilot-flow-workspace-sync:p1:inst-sync-return-ok
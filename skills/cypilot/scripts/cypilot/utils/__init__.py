@@ -61,6 +61,9 @@ from .codebase import (
 )
 
 from .context import (
+    CONTEXT_FULL,
+    CONTEXT_KITS,
+    CONTEXT_REGISTRY,
     CypilotContext,
     LoadedKit,
     SourceContext,
@@ -73,7 +76,9 @@ from .context import (
     resolve_adapter_context,
     resolve_artifacts_for_command,
     resolve_target_and_artifacts,
+    resolve_targets_and_artifacts,
     set_context,
+    defer_context,
     ensure_context,
     is_workspace,
 )
@@ -140,6 +145,9 @@ __all__ = [
     "validate_code_file",
     "cross_validate_code",
     # Context
+    "CONTEXT_FULL",
+    "CONTEXT_KITS",
+    "CONTEXT_REGISTRY",
     "CypilotContext",
     "LoadedKit",
     "SourceContext",
@@ -152,7 +160,9 @@ __all__ = [
     "resolve_adapter_context",
     "resolve_artifacts_for_command",
     "resolve_target_and_artifacts",
+    "resolve_targets_and_artifacts",
     "set_context",
+    "defer_context",
     "ensure_context",
     "is_workspace",
     # Workspace
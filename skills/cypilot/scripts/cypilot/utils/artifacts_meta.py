@@ -531,6 +531,15 @@ class ArtifactsMeta:
                     return True
         return False
 
+    def is_ignored_dir(self, rel_dir: str) -> bool:
+        """Return True if every path under rel_dir is ignored, so walkers may prune it.
+
+        Only patterns ending in ``*`` can ignore a whole subtree: if such a
+        pattern matches ``rel_dir/`` it matches every descendant too.
+        """
+        probe = self._normalize_path(rel_dir).rstrip("/") + "/"
+        return any(pat.endswith("*") and fnmatch.fnmatch(probe, pat) for pat in self._ignore_patterns)
+
     def _build_indices(self) -> None:
         """Build lookup indices from the system tree."""
         for root_system in self.systems:
@@ -16,9 +16,13 @@ from __future__ import annotations
 import re
 
 from . import error_codes as EC
+from .records import Issue
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from .parse_index import ParseIndex
 
 # Scope marker: @cpt-{kind}:{full-id}:p{N}
 # {kind} is kit-defined; parser accepts any lowercase slug.
@@ -39,16 +43,9 @@ _BLOCK_END_RE = re.compile(
 # Generic SID reference (backticked or in markers)
 _SID_RE = re.compile(r"cpt-[a-z0-9][a-z0-9-]+")
 
-def error(kind: str, message: str, *, path: Path, line: int = 1, code: Optional[str] = None, **extra) -> Dict[str, object]:
+def error(kind: str, message: str, *, path: Path, line: int = 1, code: Optional[str] = None, **extra) -> Issue:
     """Uniform error factory for code validation."""
-    path_s = str(path)
-    out: Dict[str, object] = {"type": kind, "message": message, "line": int(line), "path": path_s}
-    if code:
-        out["code"] = code
-    out["location"] = f"{path_s}:{int(line)}" if (path_s and not path_s.startswith("<")) else path_s
-    extra = {k: v for k, v in extra.items() if v is not None}
-    out.update(extra)
-    return out
+    return Issue(kind, message, int(line), str(path), code, {k: v for k, v in extra.items() if v is not None})
 
 @dataclass(frozen=True)
 class ScopeMarker:
@@ -101,8 +98,51 @@ class CodeFile:
         if errs:
             return None, errs
         return cf, []
+
+    @classmethod
+    def from_summary(cls, code_path: Path, summary: Dict[str, object]) -> "CodeFile":
+        """Rebuild a parsed CodeFile from ``to_summary()`` output.
+
+        Block marker content is not part of the summary and is restored empty.
+        """
+        return cls(
+            path=code_path,
+            scope_markers=[
+                ScopeMarker(kind=k, id=i, phase=int(ph), line=int(ln), raw=raw)
+                for k, i, ph, ln, raw in summary.get("scopes", [])
+            ],
+            block_markers=[
+                BlockMarker(id=i, phase=int(ph), inst=inst, start_line=int(s), end_line=int(e), content=())
+                for i, ph, inst, s, e in summary.get("blocks", [])
+            ],
+            references=[
+                CodeReference(id=i, line=int(ln), kind=k, phase=ph, inst=inst, marker_type=mt)
+                for i, ln, k, ph, inst, mt in summary.get("refs", [])
+            ],
+            _errors=list(summary.get("errors", [])),
+            _loaded=True,
+        )
+
+    def to_summary(self) -> Dict[str, object]:
+        """Compact JSON-serializable form of the parsed markers (without block content)."""
+        return {
+            "scopes": [[m.kind, m.id, m.phase, m.line, m.raw] for m in self.scope_markers],
+            "blocks": [[b.id, b.phase, b.inst, b.start_line, b.end_line] for b in self.block_markers],
+            "refs": [[r.id, r.line, r.kind, r.phase, r.inst, r.marker_type] for r in self.references],
+            "errors": list(self._errors),
+        }
     # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-code:p1:inst-code-datamodel
 
+    @classmethod
+    def from_text(cls, code_path: Path, text: str) -> Tuple[Optional["CodeFile"], List[Dict[str, object]]]:
+        """Parse already-decoded *text* of *code_path*, returning (CodeFile, errors)."""
+        cf = cls(path=code_path)
+        cf._parse_markers(text.splitlines())
+        cf._loaded = True
+        if cf._errors:
+            return None, list(cf._errors)
+        return cf, []
+
     def load(self) -> List[Dict[str, object]]:
         """Load and parse the code file."""
         if self._loaded:
@@ -475,6 +515,86 @@ def load_code_file(code_path: Path) -> Tuple[Optional[CodeFile], List[Dict[str,
     """Convenience wrapper returning (CodeFile|None, errors)."""
     return CodeFile.from_path(code_path)
 
+def collect_code_files(
+    code_path: Path,
+    extensions: Optional[Sequence[str]],
+    *,
+    project_root: Path,
+    meta: object = None,
+) -> List[Path]:
+    """List the files of one registry codebase entry in a single directory walk.
+
+    A file entry is returned regardless of *extensions*. Registry ignore rules
+    of *meta* (``is_ignored`` / ``is_ignored_dir``) hide files and prune whole
+    ignored subtrees.
+    """
+    from .document import walk_files
+
+    is_ignored = getattr(meta, "is_ignored", None)
+    if code_path.is_file():
+        try:
+            rel = code_path.resolve().relative_to(project_root).as_posix()
+        except (OSError, ValueError):
+            rel = None
+        if rel and is_ignored is not None and is_ignored(rel):
+            return []
+        return [code_path]
+    return walk_files(
+        code_path,
+        list(extensions or [".py"]),
+        rel_to=project_root,
+        ignore_file=is_ignored,
+        ignore_dir=getattr(meta, "is_ignored_dir", None),
+    )
+
+def summarize_code_file(code_path: Path) -> Dict[str, object]:
+    """Parse *code_path* and return its compact ``CodeFile.to_summary()``.
+
+    Load/marker errors are returned as ``{"errors": [...]}``. Module-level so it
+    can run in worker processes.
+    """
+    cf, errs = CodeFile.from_path(Path(code_path))
+    if errs or cf is None:
+        return {"errors": errs}
+    return cf.to_summary()
+
+def _from_summary(code_path: Path, summary: Dict[str, object]) -> Tuple[Optional[CodeFile], List[Dict[str, object]]]:
+    if "scopes" not in summary:
+        return None, list(summary.get("errors") or [])
+    return CodeFile.from_summary(code_path, summary), []
+
+def load_code_files(
+    code_paths: Sequence[Path],
+    index: Optional["ParseIndex"] = None,
+    jobs: int = 1,
+) -> List[Tuple[Optional[CodeFile], List[Dict[str, object]]]]:
+    """Load many code files, returning ``(CodeFile|None, errors)`` per path in input order.
+
+    Unchanged files are served from the persistent parse *index*; the rest are
+    parsed across *jobs* worker processes and recorded back into the index.
+    Load errors are cached too; unreadable files never are.
+    """
+    from .parallel import map_ordered
+    from .scan_cache import file_signature
+
+    summaries: List[Optional[Dict[str, object]]] = [None] * len(code_paths)
+    misses: List[int] = []
+    for i, pth in enumerate(code_paths):
+        stored = index.get(pth, "code") if index is not None else None
+        if isinstance(stored, dict):
+            summaries[i] = stored
+        else:
+            misses.append(i)
+
+    signatures = [file_signature(code_paths[i]) for i in misses] if index is not None else []
+    parsed = map_ordered(summarize_code_file, [code_paths[i] for i in misses], jobs)
+    for n, (i, summary) in enumerate(zip(misses, parsed)):
+        summaries[i] = summary
+        if index is not None and all(e.get("code") != EC.FILE_READ_ERROR for e in summary.get("errors") or []):
+            index.put(code_paths[i], "code", summary, signature=signatures[n])
+
+    return [_from_summary(pth, summary) for pth, summary in zip(code_paths, summaries)]
+
 def validate_code_file(code_path: Path) -> Dict[str, List[Dict[str, object]]]:
     """Validate a single code file's marker structure."""
     cf, errs = CodeFile.from_path(code_path)
@@ -488,6 +608,9 @@ __all__ = [
     "BlockMarker",
     "CodeReference",
     "load_code_file",
+    "collect_code_files",
+    "load_code_files",
+    "summarize_code_file",
     "validate_code_file",
     "cross_validate_code",
 ]
@@ -4,9 +4,16 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from . import error_codes as EC
+from .heading_scope import HeadingScopeMap
+from .id_grammar import compile_id_grammar
+from .line_pass import LineVisitor, run_line_pass
+from .records import IdRow, Issue
+
+if TYPE_CHECKING:
+    from .scan_cache import ArtifactScanCache
 
 @dataclass(frozen=True)
 class ReferenceRule:
@@ -70,16 +77,8 @@ class ArtifactKindConstraints:
 class KitConstraints:
     by_kind: Dict[str, ArtifactKindConstraints]
 
-def error(kind: str, message: str, *, path: Path | str, line: int = 1, code: Optional[str] = None, **extra) -> Dict[str, object]:
-    out: Dict[str, object] = {"type": kind, "message": message, "line": int(line)}
-    if code:
-        out["code"] = code
-    path_s = str(path)
-    out["path"] = path_s
-    out["location"] = f"{path_s}:{int(line)}" if (path_s and not path_s.startswith("<")) else path_s
-    extra = {k: v for k, v in extra.items() if v is not None}
-    out.update(extra)
-    return out
+def error(kind: str, message: str, *, path: Path | str, line: int = 1, code: Optional[str] = None, **extra) -> Issue:
+    return Issue(kind, message, int(line), str(path), code, {k: v for k, v in extra.items() if v is not None})
 # @cpt-end:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-structure-datamodel
 
 # @cpt-begin:cpt-cypilot-algo-traceability-validation-headings-contract:p1:inst-match-headings-helpers
@@ -186,7 +185,7 @@ def _pick_best_heading_match(
 
 
 # @cpt-algo:cpt-cypilot-algo-traceability-validation-headings-contract:p1
-def heading_constraint_ids_by_line(path: Path, heading_constraints: Sequence[HeadingConstraint]) -> List[List[str]]:
+def heading_constraint_ids_by_line(path: Path, heading_constraints: Sequence[HeadingConstraint]) -> HeadingScopeMap:
     """Return active heading constraint ids for each line (1-indexed).
 
     This is similar to document.headings_by_line(), but instead of returning
@@ -200,10 +199,17 @@ def heading_constraint_ids_by_line(path: Path, heading_constraints: Sequence[Hea
 
     lines = read_text_safe(path)
     if lines is None:
-        return [[]]
+        return HeadingScopeMap((), 0)
+
+    return heading_constraint_ids_from_headings(_scan_headings_from_lines(lines), len(lines), heading_constraints)
 
-    headings = _scan_headings(path)
 
+def heading_constraint_ids_from_headings(
+    headings: Sequence[Dict[str, object]],
+    line_count: int,
+    heading_constraints: Sequence[HeadingConstraint],
+) -> HeadingScopeMap:
+    """Same as heading_constraint_ids_by_line(), from pre-scanned headings and a line count."""
     matched_ids_by_line: Dict[int, str] = {}
 
     compiled = _compile_heading_patterns(heading_constraints)
@@ -244,28 +250,15 @@ def heading_constraint_ids_by_line(path: Path, heading_constraints: Sequence[Hea
         if matched_id:
             matched_ids_by_line[ln] = matched_id
 
-    # Convert heading events into a per-line active stack.
-    events_by_line: Dict[int, Tuple[int, Optional[str]]] = {}
+    # Unmatched headings still close deeper scopes; they just carry no id.
+    events: List[Tuple[int, int, Optional[str]]] = []
     for h in headings:
         ln = int(h.get("line", 0) or 0)
         lvl = int(h.get("level", 0) or 0)
-        if ln <= 0 or lvl <= 0:
+        if ln <= 0 or lvl <= 0 or ln > line_count:
             continue
-        events_by_line[ln] = (lvl, matched_ids_by_line.get(ln))
-
-    out: List[List[str]] = [[] for _ in range(len(lines) + 1)]
-    stack: List[Tuple[int, str]] = []
-    for idx0 in range(len(lines)):
-        line_no = idx0 + 1
-        ev = events_by_line.get(line_no)
-        if ev is not None:
-            lvl, hid = ev
-            while stack and stack[-1][0] >= lvl:
-                stack.pop()
-            if hid:
-                stack.append((lvl, hid))
-        out[line_no] = [hid for _, hid in stack]
-    return out
+        events.append((ln, lvl, matched_ids_by_line.get(ln)))
+    return HeadingScopeMap(events, line_count)
     # @cpt-end:cpt-cypilot-algo-traceability-validation-headings-contract:p1:inst-resolve-scope
 
 # @cpt-begin:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-structure-datamodel
@@ -294,13 +287,7 @@ def parse_cpt(
     if len(parts) < 3:
         return None
 
-    systems = sorted({str(s) for s in registered_systems if str(s).strip()}, key=len, reverse=True)
-    system: Optional[str] = None
-    for s in systems:
-        prefix = f"cpt-{s}-"
-        if cpt.lower().startswith(prefix.lower()):
-            system = s
-            break
+    system = compile_id_grammar(registered_systems).match_system(cpt)
     if system is None:
         return None
 
@@ -423,7 +410,7 @@ def _validate_id_heading_constraint(
     line: int,
     kind: str,
     artifact_path: Path,
-    headings_at: List[List[str]],
+    headings_at: HeadingScopeMap,
     heading_desc_by_id: Dict[str, str],
     errors: List[Dict[str, object]],
     id_kind_name: Optional[str],
@@ -434,7 +421,7 @@ def _validate_id_heading_constraint(
     if not allowed_headings:
         return
     allowed_norm = set(allowed_headings)
-    active_raw = headings_at[line] if 0 <= line < len(headings_at) else []
+    active_raw = headings_at.scopes_at(line)
     active_norm = _normalize_heading_identifiers(active_raw)
     if any(a in allowed_norm for a in active_norm):
         return
@@ -473,9 +460,11 @@ def validate_artifact_file(
     registered_systems: Optional[Iterable[str]] = None,
     constraints_path: Optional[Path] = None,
     kit_id: Optional[str] = None,
+    scan_cache: Optional["ArtifactScanCache"] = None,
 ) -> Dict[str, List[Dict[str, object]]]:
-    from .document import headings_by_line, scan_cpt_ids, scan_cdsl_instructions
+    from .scan_cache import ArtifactScanCache
 
+    cache = scan_cache if scan_cache is not None else ArtifactScanCache()
     errors: List[Dict[str, object]] = []
     warnings: List[Dict[str, object]] = []
 
@@ -495,6 +484,7 @@ def validate_artifact_file(
             artifact_kind=kind,
             constraints_path=constraints_path,
             kit_id=kit_id,
+            scan_cache=cache,
         )
         errors.extend(rep.get("errors", []))
         warnings.extend(rep.get("warnings", []))
@@ -510,9 +500,8 @@ def validate_artifact_file(
     # Phase 1b: TOC validation (only when toc=true in constraints)
     if getattr(constraints, "toc", True):
         from .toc import validate_toc as _validate_toc
-        from .document import read_text_safe as _read_text_safe
 
-        _toc_lines = _read_text_safe(artifact_path)
+        _toc_lines = cache.lines(artifact_path)
         if _toc_lines is not None:
             _toc_content = "\n".join(_toc_lines)
             _max_hl = 3
@@ -527,7 +516,7 @@ def validate_artifact_file(
 
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-scan-ids
     # Phase 2: identifier/content validation
-    hits = scan_cpt_ids(artifact_path)
+    hits = cache.id_hits(artifact_path)
     defs = [h for h in hits if str(h.get("type")) == "definition"]
     refs = [h for h in hits if str(h.get("type")) == "reference"]
     # @cpt-end:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-scan-ids
@@ -541,7 +530,7 @@ def validate_artifact_file(
     # @cpt-end:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-build-defs-index
 
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-scan-cdsl
-    cdsl_hits = scan_cdsl_instructions(artifact_path)
+    cdsl_hits = cache.cdsl_steps(artifact_path)
     # @cpt-end:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-scan-cdsl
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-foreach-cdsl-mismatch
     for ch in cdsl_hits:
@@ -572,29 +561,13 @@ def validate_artifact_file(
     # @cpt-end:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-foreach-cdsl-mismatch
 
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-check-cdsl-heading-ctx
-    headings_scanned = _scan_headings(artifact_path)
+    outline = cache.heading_titles_by_line(artifact_path)
 
     def _heading_ctx_for_line(ln: int) -> Tuple[int, Optional[int]]:
-        last_idx: Optional[int] = None
-        for i, h in enumerate(headings_scanned):
-            if int(h.get("line", 0) or 0) <= ln:
-                last_idx = i
-                continue
-            break
-        if last_idx is None:
+        hidx = outline.innermost(ln)
+        if hidx is None:
             return 0, None
-        lvl = int(headings_scanned[last_idx].get("level", 0) or 0)
-        return lvl, last_idx
-
-    def _scope_end_for_heading_idx(hidx: int) -> int:
-        if hidx < 0 or hidx >= len(headings_scanned):
-            return 10**9
-        lvl = int(headings_scanned[hidx].get("level", 0) or 0)
-        for j in range(hidx + 1, len(headings_scanned)):
-            jlvl = int(headings_scanned[j].get("level", 0) or 0)
-            if jlvl <= lvl:
-                return int(headings_scanned[j].get("line", 1) or 1) - 1
-        return 10**9
+        return outline.levels[hidx], hidx
     # @cpt-end:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-check-cdsl-heading-ctx
 
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-validate-structure:p1:inst-foreach-parent-child
@@ -616,7 +589,7 @@ def validate_artifact_file(
         parent_lvl, parent_hidx = _heading_ctx_for_line(parent_line)
         if parent_hidx is None:
             continue
-        scope_end = _scope_end_for_heading_idx(parent_hidx)
+        scope_end = outline.ends[parent_hidx]
 
         children: List[Dict[str, object]] = []
         for child in defs_sorted:
@@ -707,96 +680,13 @@ def validate_artifact_file(
             heading_desc_by_id[hid] = desc
 
     # Heading scope cache
-    heading_constraints = getattr(constraints, "headings", None)
-    if heading_constraints:
-        headings_at = heading_constraint_ids_by_line(artifact_path, heading_constraints)
-    else:
-        headings_at = headings_by_line(artifact_path)
+    headings_at = cache.heading_scopes(artifact_path, getattr(constraints, "headings", None))
 
     # Use registered systems to extract id kind
     systems_set: set[str] = set()
     if registered_systems is not None:
         systems_set = {str(s).lower() for s in registered_systems}
-
-    def match_system(cpt: str) -> Optional[str]:
-        if not cpt.lower().startswith("cpt-"):
-            return None
-        matched: Optional[str] = None
-        for sys in systems_set:
-            prefix = f"cpt-{sys}-"
-            if cpt.lower().startswith(prefix):
-                if matched is None or len(sys) > len(matched):
-                    matched = sys
-        if matched is not None:
-            return matched
-        if not systems_set:
-            # No registered systems (kit examples) — use kind tokens to
-            # find the system boundary.  Prefer the RIGHTMOST kind-token
-            # split (longest system) so that system names containing kind
-            # tokens (e.g. "task-flow" with kind "flow") are not truncated.
-            remainder = cpt[4:]  # strip "cpt-"
-            best_pos: Optional[int] = None
-            for kt in _all_kind_tokens:
-                marker = f"-{kt}-"
-                idx = remainder.find(marker)
-                if idx > 0 and (best_pos is None or idx > best_pos):
-                    best_pos = idx
-            if best_pos is not None:
-                return remainder[:best_pos].lower()
-            parts = cpt.split("-")
-            return parts[1].lower() if len(parts) >= 3 else None
-        return None
-
-    composite_nested_by_base: Dict[str, set[str]] = {}
-    base_kind = kind.strip().lower()
-    nested = {str(getattr(ic, "kind", "") or "").strip().lower() for ic in (constraints.defined_id or []) if str(getattr(ic, "kind", "") or "").strip()}
-    if nested:
-        composite_nested_by_base[base_kind] = nested
-
-    def extract_kind_from_id(cpt: str, system: Optional[str]) -> Optional[str]:
-        if not cpt.lower().startswith("cpt-"):
-            return None
-        if system is None:
-            return None
-        prefix = f"cpt-{system}-"
-        if not cpt.lower().startswith(prefix.lower()):
-            return None
-        remainder = cpt[len(prefix):]
-        if not remainder:
-            return None
-        parts = [p for p in remainder.split("-") if p]
-        if not parts:
-            return None
-        base = parts[0].strip().lower()
-        nested_kinds = composite_nested_by_base.get(base)
-        if nested_kinds and len(parts) >= 4:
-            for p in reversed(parts[2:]):
-                pp = p.strip().lower()
-                if pp in nested_kinds and pp != base:
-                    return pp
-
-        # Standard IDs are cpt-{system}-{kind}-{slug}. In practice, when a
-        # registered root system is used (e.g. "cf"), authors may include a
-        # hyphenated subsystem segment before kind (e.g. "cf-errors").
-        # In that case, the first token in remainder is not the kind.
-        # Prefer explicit kind-token markers in remainder.
-        kind_tokens = {str(k).strip().lower() for k in _all_kind_tokens if str(k).strip()}
-        if base in kind_tokens:
-            return base
-
-        rem_l = remainder.lower()
-        best_pos: Optional[int] = None
-        best_kind: Optional[str] = None
-        for kt in kind_tokens:
-            marker = f"-{kt}-"
-            idx = rem_l.find(marker)
-            if idx > 0 and (best_pos is None or idx < best_pos):
-                best_pos = idx
-                best_kind = kt
-
-        if best_kind is not None:
-            return best_kind
-        return base
+    grammar = compile_id_grammar(systems_set, _all_kind_tokens, {kind.strip().lower(): allowed_defs})
 
     defs_by_kind: Dict[str, List[Dict[str, object]]] = {}
     for h in defs:
@@ -804,7 +694,7 @@ def validate_artifact_file(
         if not hid:
             continue
         line = int(h.get("line", 1) or 1)
-        system = match_system(hid)
+        system, id_kind = grammar.parse(hid)
         if system is None and systems_set and hid.lower().startswith("cpt-"):
             errors.append(error(
                 "constraints",
@@ -817,7 +707,6 @@ def validate_artifact_file(
                 registered_systems=sorted(systems_set),
             ))
             continue
-        id_kind = extract_kind_from_id(hid, system)
         if not id_kind:
             continue
         defs_by_kind.setdefault(id_kind, []).append(h)
@@ -894,10 +783,12 @@ def cross_validate_artifacts(
     artifacts: Sequence[ArtifactRecord],
     registered_systems: Optional[Iterable[str]] = None,
     known_kinds: Optional[Iterable[str]] = None,
+    scan_cache: Optional["ArtifactScanCache"] = None,
 ) -> Dict[str, List[Dict[str, object]]]:
-    from .document import headings_by_line, scan_cpt_ids
+    from .scan_cache import ArtifactScanCache
 
     _ = known_kinds
+    cache = scan_cache if scan_cache is not None else ArtifactScanCache()
     errors: List[Dict[str, object]] = []
     warnings: List[Dict[str, object]] = []
 
@@ -961,84 +852,7 @@ def cross_validate_artifacts(
             if _k:
                 _cross_all_kind_tokens.add(_k)
 
-    def match_system_from_id(cpt: str) -> Optional[str]:
-        if not cpt.lower().startswith("cpt-"):
-            return None
-        if not systems_set:
-            # No registered systems — use rightmost kind-token split
-            # (longest system) to handle system names containing kind tokens.
-            remainder = cpt[4:]  # strip "cpt-"
-            best_pos: Optional[int] = None
-            for kt in _cross_all_kind_tokens:
-                marker = f"-{kt}-"
-                idx = remainder.find(marker)
-                if idx > 0 and (best_pos is None or idx > best_pos):
-                    best_pos = idx
-            if best_pos is not None:
-                return remainder[:best_pos].lower()
-            parts = cpt.split("-")
-            return parts[1].lower() if len(parts) >= 3 else None
-        matched: Optional[str] = None
-        for sys in systems_set:
-            prefix = f"cpt-{sys}-"
-            if cpt.lower().startswith(prefix):
-                if matched is None or len(sys) > len(matched):
-                    matched = sys
-        return matched
-
-    def extract_kind_from_id(cpt: str, system: Optional[str]) -> Optional[str]:
-        if not cpt.lower().startswith("cpt-"):
-            return None
-        if system is None:
-            return None
-        prefix = f"cpt-{system}-"
-        if not cpt.lower().startswith(prefix.lower()):
-            return None
-        remainder = cpt[len(prefix):]
-        if not remainder:
-            return None
-        parts = [p for p in remainder.split("-") if p]
-        if not parts:
-            return None
-
-        base = parts[0].strip().lower()
-        nested_kinds = composite_nested_kinds_by_base_kind.get(base)
-        if nested_kinds and len(parts) >= 4:
-            for p in reversed(parts[2:]):
-                pp = p.strip().lower()
-                if pp in nested_kinds and pp != base:
-                    return pp
-
-        # Handle IDs like cpt-cf-errors-actor-ci-pipeline where "cf" is the
-        # registered system and "errors" is a subsystem segment.
-        kind_tokens = {str(k).strip().lower() for k in _cross_all_kind_tokens if str(k).strip()}
-        if base in kind_tokens:
-            return base
-
-        rem_l = remainder.lower()
-        best_pos: Optional[int] = None
-        best_kind: Optional[str] = None
-        for kt in kind_tokens:
-            marker = f"-{kt}-"
-            idx = rem_l.find(marker)
-            if idx > 0 and (best_pos is None or idx < best_pos):
-                best_pos = idx
-                best_kind = kt
-
-        if best_kind is not None:
-            return best_kind
-        return base
-
-    def is_external_system_ref(cpt: str) -> bool:
-        if not systems_set:
-            return False
-        if not cpt.lower().startswith("cpt-"):
-            return False
-        for sys in systems_set:
-            prefix = f"cpt-{sys}-"
-            if cpt.lower().startswith(prefix):
-                return False
-        return True
+    grammar = compile_id_grammar(systems_set, _cross_all_kind_tokens, composite_nested_kinds_by_base_kind)
 
     def headings_info_for_kind(kind: str, heading_ids: Sequence[str]) -> List[Dict[str, object]]:
         km = heading_desc_by_kind.get(str(kind).strip().upper(), {})
@@ -1058,51 +872,27 @@ def cross_validate_artifacts(
     present_kinds_by_system: Dict[str, set[str]] = {}
     refs_by_system_kind: Dict[str, Dict[str, List[Dict[str, object]]]] = {}
 
-    headings_cache: Dict[str, List[List[str]]] = {}
     for art in artifacts:
         ak = str(art.artifact_kind).strip().upper()
-        hits = scan_cpt_ids(art.path)
-        hkey = str(art.path)
-        if hkey not in headings_cache:
-            # Prefer constraint heading ids when available; else fallback to raw titles.
-            hc = getattr(getattr(art, "constraints", None), "headings", None)
-            if hc:
-                headings_cache[hkey] = heading_constraint_ids_by_line(art.path, hc)
-            else:
-                headings_cache[hkey] = headings_by_line(art.path)
-        headings_at = headings_cache[hkey]
+        hits = cache.id_hits(art.path)
+        # Prefer constraint heading ids when available; else fallback to raw titles.
+        headings_at = cache.heading_scopes(art.path, getattr(getattr(art, "constraints", None), "headings", None))
 
         for h in hits:
-            hid = str(h.get("id", "")).strip()
+            hid = str(h.id or "").strip()
             if not hid:
                 continue
-            line = int(h.get("line", 1) or 1)
-            checked = bool(h.get("checked", False))
-            system = match_system_from_id(hid)
-            id_kind = extract_kind_from_id(hid, system)
-            active_headings = _normalize_heading_identifiers(
-                headings_at[line] if 0 <= line < len(headings_at) else []
+            system, id_kind = grammar.parse(hid)
+            row = IdRow(
+                h, ak, art.path, system, id_kind,
+                _normalize_heading_identifiers(headings_at.scopes_at(int(h.line or 1))),
             )
 
-            row = {
-                "id": hid,
-                "line": line,
-                "checked": checked,
-                "priority": h.get("priority"),
-                "has_task": bool(h.get("has_task", False)),
-                "has_priority": bool(h.get("has_priority", False)),
-                "artifact_kind": ak,
-                "artifact_path": art.path,
-                "system": system,
-                "id_kind": id_kind,
-                "headings": active_headings,
-            }
-
-            if str(h.get("type")) == "definition":
+            if h.type == "definition":
                 defs_by_id.setdefault(hid, []).append(row)
                 if system:
                     present_kinds_by_system.setdefault(system, set()).add(ak)
-            elif str(h.get("type")) == "reference":
+            elif h.type == "reference":
                 refs_by_id.setdefault(hid, []).append(row)
                 if system:
                     present_kinds_by_system.setdefault(system, set()).add(ak)
@@ -1115,18 +905,18 @@ def cross_validate_artifacts(
         if len(drows) < 2:
             continue
         # Group by artifact path — same ID in the same file is not a cross-file collision
-        paths = {str(d.get("artifact_path", "")) for d in drows}
+        paths = {str(d.artifact_path) for d in drows}
         if len(paths) < 2:
             continue
         sorted_paths = sorted(paths)
         for d in drows:
-            other_paths = [p for p in sorted_paths if p != str(d.get("artifact_path", ""))]
+            other_paths = [p for p in sorted_paths if p != str(d.artifact_path)]
             errors.append(error(
                 "structure",
                 f"Duplicate definition of `{did}` — also defined in: {', '.join(other_paths)}",
                 code=EC.DUPLICATE_DEFINITION,
-                path=d.get("artifact_path"),
-                line=int(d.get("line", 1) or 1),
+                path=d.artifact_path,
+                line=int(d.line or 1),
                 id=did,
             ))
     # @cpt-end:cpt-cypilot-algo-traceability-validation-cross-validate:p1:inst-duplicate-defs
@@ -1134,7 +924,7 @@ def cross_validate_artifacts(
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-cross-validate:p1:inst-foreach-ref
     # Definition existence for internal systems
     for rid, rows in refs_by_id.items():
-        if is_external_system_ref(rid):
+        if grammar.is_external(rid):
             continue
         if rid in defs_by_id:
             continue
@@ -1144,8 +934,8 @@ def cross_validate_artifacts(
                 "structure",
                 f"Reference to `{rid}` has no matching definition in any artifact",
                 code=EC.REF_NO_DEFINITION,
-                path=r.get("artifact_path"),
-                line=int(r.get("line", 1) or 1),
+                path=r.artifact_path,
+                line=int(r.line or 1),
                 id=rid,
             ))
             # @cpt-end:cpt-cypilot-algo-traceability-validation-cross-validate:p1:inst-if-no-def
@@ -1155,23 +945,23 @@ def cross_validate_artifacts(
     # Done status consistency
     for rid, rrows in refs_by_id.items():
         for r in rrows:
-            if not bool(r.get("has_task", False)):
+            if not bool(r.has_task):
                 continue
-            if not bool(r.get("checked", False)):
+            if not bool(r.checked):
                 continue
             defs = defs_by_id.get(rid, [])
             for d in defs:
-                if not bool(d.get("has_task", False)):
+                if not bool(d.has_task):
                     continue
-                if bool(d.get("checked", False)):
+                if bool(d.checked):
                     continue
                 # @cpt-begin:cpt-cypilot-algo-traceability-validation-cross-validate:p1:inst-if-ref-done-def-not
                 errors.append(error(
                     "structure",
                     f"Reference to `{rid}` is checked [x] but its definition is still unchecked",
                     code=EC.REF_DONE_DEF_NOT_DONE,
-                    path=r.get("artifact_path"),
-                    line=int(r.get("line", 1) or 1),
+                    path=r.artifact_path,
+                    line=int(r.line or 1),
                     id=rid,
                 ))
                 # @cpt-end:cpt-cypilot-algo-traceability-validation-cross-validate:p1:inst-if-ref-done-def-not
@@ -1184,25 +974,25 @@ def cross_validate_artifacts(
         if not defs:
             continue
         # Check if ALL definitions with tasks are checked
-        defs_with_task = [d for d in defs if bool(d.get("has_task", False))]
+        defs_with_task = [d for d in defs if bool(d.has_task)]
         if not defs_with_task:
             continue
-        if not all(bool(d.get("checked", False)) for d in defs_with_task):
+        if not all(bool(d.checked) for d in defs_with_task):
             continue
         # Definition is done — flag any task-tracked reference that is NOT done
         for r in rrows:
-            if not bool(r.get("has_task", False)):
+            if not bool(r.has_task):
                 continue
-            if bool(r.get("checked", False)):
+            if bool(r.checked):
                 continue
             errors.append(error(
                 "structure",
-                f"Definition of `{rid}` is checked [x] but reference in {r.get('artifact_kind', '?')} artifact is still unchecked",
+                f"Definition of `{rid}` is checked [x] but reference in {r.artifact_kind} artifact is still unchecked",
                 code=EC.DEF_DONE_REF_NOT_DONE,
-                path=r.get("artifact_path"),
-                line=int(r.get("line", 1) or 1),
+                path=r.artifact_path,
+                line=int(r.line or 1),
                 id=rid,
-                def_artifact_kind=defs_with_task[0].get("artifact_kind"),
+                def_artifact_kind=defs_with_task[0].artifact_kind,
             ))
             # @cpt-begin:cpt-cypilot-algo-traceability-validation-cross-validate:p1:inst-if-def-done-ref-not
             # (error emitted above)
@@ -1213,16 +1003,16 @@ def cross_validate_artifacts(
         if not defs:
             continue
         for r in rrows:
-            if not bool(r.get("has_task", False)):
+            if not bool(r.has_task):
                 continue
-            if any(bool(d.get("has_task", False)) for d in defs):
+            if any(bool(d.has_task) for d in defs):
                 continue
             errors.append(error(
                 "structure",
                 f"Reference to `{rid}` has task checkbox but its definition has no task tracking",
                 code=EC.REF_TASK_DEF_NO_TASK,
-                path=r.get("artifact_path"),
-                line=int(r.get("line", 1) or 1),
+                path=r.artifact_path,
+                line=int(r.line or 1),
                 id=rid,
             ))
     # @cpt-end:cpt-cypilot-algo-traceability-validation-cross-validate:p1:inst-foreach-checked-def
@@ -1237,30 +1027,30 @@ def cross_validate_artifacts(
 
         defs_in_file = [
             d for rows in defs_by_id.values() for d in rows
-            if str(d.get("artifact_path")) == str(art.path) and d.get("system") is not None
+            if str(d.artifact_path) == str(art.path) and d.system is not None
         ]
 
         allowed_kinds = {str(getattr(ic, "kind", "")).strip().lower() for ic in getattr(c, "defined_id", []) or []}
         for d in defs_in_file:
-            k = str(d.get("id_kind") or "").lower()
+            k = str(d.id_kind or "").lower()
             if not k:
                 continue
             if allowed_kinds and k not in allowed_kinds:
                 errors.append(error(
                     "constraints",
-                    f"`{d.get('id')}` uses kind `{k}` not allowed in {ak} artifact",
+                    f"`{d.id}` uses kind `{k}` not allowed in {ak} artifact",
                     code=EC.ID_KIND_NOT_ALLOWED,
                     path=art.path,
-                    line=int(d.get("line", 1) or 1),
+                    line=int(d.line or 1),
                     artifact_kind=ak,
                     id_kind=k,
-                    id=str(d.get("id")),
+                    id=str(d.id),
                 ))
 
         for ic in getattr(c, "defined_id", []) or []:
             k = str(getattr(ic, "kind", "")).strip().lower()
             is_required = bool(getattr(ic, "required", True))
-            defs_of_kind = [d for d in defs_in_file if str(d.get("id_kind") or "").lower() == k]
+            defs_of_kind = [d for d in defs_in_file if str(d.id_kind or "").lower() == k]
             if is_required and k and not defs_of_kind:
                 id_headings = _normalize_heading_identifiers(getattr(ic, "headings", None) or [])
                 id_headings_info = headings_info_for_kind(ak, id_headings) if id_headings else None
@@ -1285,18 +1075,18 @@ def cross_validate_artifacts(
                 allowed_sorted = sorted(allowed_headings)
                 allowed_info = headings_info_for_kind(ak, allowed_sorted)
                 for d in defs_of_kind:
-                    active = d.get("headings") or []
+                    active = d.headings or []
                     if any(h in allowed_headings for h in active):
                         continue
                     errors.append(error(
                         "constraints",
-                        f"`{d.get('id')}` (kind `{k}`) in {ak} artifact is under {d.get('headings') or []} but must be under one of {allowed_sorted}",
+                        f"`{d.id}` (kind `{k}`) in {ak} artifact is under {d.headings or []} but must be under one of {allowed_sorted}",
                         code=EC.DEF_WRONG_HEADINGS,
                         path=art.path,
-                        line=int(d.get("line", 1) or 1),
+                        line=int(d.line or 1),
                         artifact_kind=ak,
                         id_kind=k,
-                        id=str(d.get("id")),
+                        id=str(d.id),
                         headings=allowed_sorted,
                         headings_info=allowed_info,
                         found_headings=active,
@@ -1318,11 +1108,11 @@ def cross_validate_artifacts(
 
             for did, drows in defs_by_id.items():
                 for drow in drows:
-                    if str(drow.get("artifact_kind")) != ak:
+                    if str(drow.artifact_kind) != ak:
                         continue
-                    if str(drow.get("id_kind") or "").lower() != id_kind:
+                    if str(drow.id_kind or "").lower() != id_kind:
                         continue
-                    system = drow.get("system")
+                    system = drow.system
                     if system is None:
                         continue
 
@@ -1332,15 +1122,15 @@ def cross_validate_artifacts(
                     for target_kind, rule in refs_rules.items():
                         tk = str(target_kind).strip().upper()
                         cov = getattr(rule, "coverage", None)  # True=required, False=prohibited, None=optional
-                        def_has_task = bool(drow.get("has_task", False))
-                        def_checked = bool(drow.get("checked", False))
+                        def_has_task = bool(drow.has_task)
+                        def_checked = bool(drow.checked)
                         task_rule = getattr(rule, "task", None)  # True=required, False=prohibited, None=allowed
                         prio_rule = getattr(rule, "priority", None)  # True=required, False=prohibited, None=allowed
                         allowed_headings = set(_normalize_heading_identifiers(getattr(rule, "headings", None) or []))
                         allowed_headings_sorted = sorted(allowed_headings)
                         allowed_headings_info = headings_info_for_kind(tk, allowed_headings_sorted)
 
-                        refs_in_kind = [r for r in system_refs_by_kind.get(tk, []) if str(r.get("id")) == did]
+                        refs_in_kind = [r for r in system_refs_by_kind.get(tk, []) if str(r.id) == did]
 
                         if cov is True:
                             if def_has_task and (not def_checked):
@@ -1350,8 +1140,8 @@ def cross_validate_artifacts(
                                     "constraints",
                                     f"`{did}` (defined in {ak}) requires reference in `{tk}` artifact but no `{tk}` artifact exists in scope",
                                     code=EC.REF_TARGET_NOT_IN_SCOPE,
-                                    path=drow.get("artifact_path"),
-                                    line=int(drow.get("line", 1) or 1),
+                                    path=drow.artifact_path,
+                                    line=int(drow.line or 1),
                                     id=did,
                                     artifact_kind=ak,
                                     target_kind=tk,
@@ -1362,8 +1152,8 @@ def cross_validate_artifacts(
                                     "constraints",
                                     f"`{did}` (defined in {ak}, kind `{id_kind}`) is not referenced from any `{tk}` artifact",
                                     code=EC.REF_MISSING_FROM_KIND,
-                                    path=drow.get("artifact_path"),
-                                    line=int(drow.get("line", 1) or 1),
+                                    path=drow.artifact_path,
+                                    line=int(drow.line or 1),
                                     id=did,
                                     artifact_kind=ak,
                                     target_kind=tk,
@@ -1378,22 +1168,22 @@ def cross_validate_artifacts(
 
                             if allowed_headings:
                                 if not any(
-                                    any(h in allowed_headings for h in (rr.get("headings") or []))
+                                    any(h in allowed_headings for h in (rr.headings or []))
                                     for rr in refs_in_kind
                                 ):
                                     first = refs_in_kind[0]
                                     errors.append(error(
                                         "constraints",
-                                        f"Reference to `{did}` in `{tk}` artifact is under {first.get('headings') or []} but must be under one of {allowed_headings_sorted}",
+                                        f"Reference to `{did}` in `{tk}` artifact is under {first.headings or []} but must be under one of {allowed_headings_sorted}",
                                         code=EC.REF_WRONG_HEADINGS,
-                                        path=first.get("artifact_path"),
-                                        line=int(first.get("line", 1) or 1),
+                                        path=first.artifact_path,
+                                        line=int(first.line or 1),
                                         id=did,
                                         artifact_kind=ak,
                                         target_kind=tk,
                                         headings=allowed_headings_sorted,
                                         headings_info=allowed_headings_info,
-                                        found_headings=first.get("headings") or [],
+                                        found_headings=first.headings or [],
                                         id_kind=id_kind,
                                         id_kind_name=id_kind_name,
                                         id_kind_description=id_kind_description,
@@ -1406,8 +1196,8 @@ def cross_validate_artifacts(
                                 "constraints",
                                 f"`{did}` is referenced in `{tk}` artifact but references from `{tk}` are prohibited for {ak} IDs",
                                 code=EC.REF_FROM_PROHIBITED_KIND,
-                                path=first.get("artifact_path"),
-                                line=int(first.get("line", 1) or 1),
+                                path=first.artifact_path,
+                                line=int(first.line or 1),
                                 id=did,
                                 artifact_kind=ak,
                                 target_kind=tk,
@@ -1421,14 +1211,14 @@ def cross_validate_artifacts(
                         if refs_in_kind:
                             if task_rule is True:
                                 for rr in refs_in_kind:
-                                    if bool(rr.get("has_task", False)):
+                                    if bool(rr.has_task):
                                         continue
                                     errors.append(error(
                                         "constraints",
                                         f"Reference to `{did}` in `{tk}` artifact is missing required task checkbox `- [ ]`",
                                         code=EC.REF_MISSING_TASK,
-                                        path=rr.get("artifact_path"),
-                                        line=int(rr.get("line", 1) or 1),
+                                        path=rr.artifact_path,
+                                        line=int(rr.line or 1),
                                         id=did,
                                         artifact_kind=ak,
                                         target_kind=tk,
@@ -1440,14 +1230,14 @@ def cross_validate_artifacts(
                                     break
                             elif task_rule is False:
                                 for rr in refs_in_kind:
-                                    if not bool(rr.get("has_task", False)):
+                                    if not bool(rr.has_task):
                                         continue
                                     errors.append(error(
                                         "constraints",
                                         f"Reference to `{did}` in `{tk}` artifact has task checkbox but task tracking is prohibited",
                                         code=EC.REF_PROHIBITED_TASK,
-                                        path=rr.get("artifact_path"),
-                                        line=int(rr.get("line", 1) or 1),
+                                        path=rr.artifact_path,
+                                        line=int(rr.line or 1),
                                         id=did,
                                         artifact_kind=ak,
                                         target_kind=tk,
@@ -1460,14 +1250,14 @@ def cross_validate_artifacts(
 
                             if prio_rule is True:
                                 for rr in refs_in_kind:
-                                    if bool(rr.get("has_priority", False)):
+                                    if bool(rr.has_priority):
                                         continue
                                     errors.append(error(
                                         "constraints",
                                         f"Reference to `{did}` in `{tk}` artifact is missing required priority marker",
                                         code=EC.REF_MISSING_PRIORITY,
-                                        path=rr.get("artifact_path"),
-                                        line=int(rr.get("line", 1) or 1),
+                                        path=rr.artifact_path,
+                                        line=int(rr.line or 1),
                                         id=did,
                                         artifact_kind=ak,
                                         target_kind=tk,
@@ -1479,14 +1269,14 @@ def cross_validate_artifacts(
                                     break
                             elif prio_rule is False:
                                 for rr in refs_in_kind:
-                                    if not bool(rr.get("has_priority", False)):
+                                    if not bool(rr.has_priority):
                                         continue
                                     errors.append(error(
                                         "constraints",
                                         f"Reference to `{did}` in `{tk}` artifact has priority marker but priority is prohibited",
                                         code=EC.REF_PROHIBITED_PRIORITY,
-                                        path=rr.get("artifact_path"),
-                                        line=int(rr.get("line", 1) or 1),
+                                        path=rr.artifact_path,
+                                        line=int(rr.line or 1),
                                         id=did,
                                         artifact_kind=ak,
                                         target_kind=tk,
@@ -1966,18 +1756,26 @@ def _scan_headings(path: Path) -> List[Dict[str, object]]:
     lines = read_text_safe(path)
     if lines is None:
         return []
+    return _scan_headings_from_lines(lines)
 
-    out: List[Dict[str, object]] = []
-    in_fence = False
-    for idx0, raw in enumerate(lines):
-        if raw.strip().startswith("```"):
-            in_fence = not in_fence
-            continue
-        if in_fence:
-            continue
+def _scan_headings_from_lines(lines: Sequence[str]) -> List[Dict[str, object]]:
+    return run_line_pass(lines, {"headings": HeadingScanVisitor()})["headings"]
+
+
+class HeadingScanVisitor(LineVisitor):
+    """``run_line_pass`` visitor collecting markdown headings outside ``` fences."""
+
+    __slots__ = ("headings",)
+
+    def __init__(self) -> None:
+        self.headings: List[Dict[str, object]] = []
+
+    def visit(self, lineno: int, raw: str, stripped: str, fenced: bool) -> None:
+        if fenced or not stripped.startswith("#"):
+            return
         m = _HEADING_LINE_RE.match(raw)
         if not m:
-            continue
+            return
         level = len(m.group(1))
         raw_title = str(m.group(2) or "").strip()
         numbered = False
@@ -1994,8 +1792,8 @@ def _scan_headings(path: Path) -> List[Dict[str, object]]:
                 except ValueError:
                     number_parts = None
             title_text = str(mp.group("title") or "").strip()
-        out.append({
-            "line": idx0 + 1,
+        self.headings.append({
+            "line": lineno,
             "level": level,
             "raw_title": raw_title,
             "title_text": title_text,
@@ -2003,7 +1801,9 @@ def _scan_headings(path: Path) -> List[Dict[str, object]]:
             "number_prefix": number_prefix,
             "number_parts": number_parts,
         })
-    return out
+
+    def result(self) -> List[Dict[str, object]]:
+        return self.headings
     # @cpt-end:cpt-cypilot-algo-traceability-validation-headings-contract:p1:inst-scan-headings
 
 # @cpt-begin:cpt-cypilot-algo-traceability-validation-headings-contract:p1:inst-validate-headings-entry
@@ -2015,6 +1815,7 @@ def validate_headings_contract(
     artifact_kind: str,
     constraints_path: Optional[Path] = None,
     kit_id: Optional[str] = None,
+    scan_cache: Optional["ArtifactScanCache"] = None,
 ) -> Dict[str, List[Dict[str, object]]]:
     """Validate artifact outline against constraints.headings.
 
@@ -2066,7 +1867,7 @@ def validate_headings_contract(
             "heading_description": getattr(hc, "description", None),
         }
 
-    headings = _scan_headings(path)
+    headings = scan_cache.headings(path) if scan_cache is not None else _scan_headings(path)
     # @cpt-end:cpt-cypilot-algo-traceability-validation-headings-contract:p1:inst-validate-init
 
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-headings-contract:p1:inst-check-numbering
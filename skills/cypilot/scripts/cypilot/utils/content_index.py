@@ -0,0 +1,355 @@
+"""
+Cypilot Validator - Content Offset Index
+
+Maps each Cypilot ID to the location of its content block: the file, the
+1-based line span and the byte range of that span. Artifact blocks follow the
+same scoping rules as ``get_content_scoped`` (hash-fence segments, then
+heading scopes, then ``**ID**`` definition scopes); code blocks are the
+lines between ``@cpt-begin``/``@cpt-end`` markers, with ``@cpt-{kind}`` scope
+marker lines as a fallback.
+
+Spans are computed in one pass per file and persisted as the ``"content"``
+(artifacts) and ``"code_content"`` (code) facets of the ``ParseIndex``
+(``{adapter_dir}/cache/index.json``), so unchanged files are neither read
+nor scanned again. Serving a block then reads only its byte range with
+``seek``; files that are not valid UTF-8 have no byte ranges and fall back
+to a full ``get_content_scoped`` read.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from .document import (
+    _CODE_FENCE_RE,
+    _CPT_ID_RE,
+    _HEADING_RE,
+    _ID_DEF_RE,
+    _normalize_cpt_id_from_line,
+    decode_text_lines,
+)
+
+if TYPE_CHECKING:
+    from .parse_index import ParseIndex
+
+PathLike = Union[str, Path]
+
+ARTIFACT_FACET = "content"
+CODE_FACET = "code_content"
+
+# 0-based inclusive line span
+LineSpan = Tuple[int, int]
+
+
+def _trim(lines: Sequence[str], start: int, end: int) -> Optional[LineSpan]:
+    """Drop blank lines at both ends of ``lines[start:end+1]``; None when nothing is left."""
+    while start <= end and not lines[start].strip():
+        start += 1
+    while end >= start and not lines[end].strip():
+        end -= 1
+    return (start, end) if start <= end else None
+
+
+def _fence_spans(lines: Sequence[str]) -> Dict[str, Optional[LineSpan]]:
+    """Segments of ``##``/``###`` hash-fence blocks, split at ID lines."""
+    spans: Dict[str, Optional[LineSpan]] = {}
+    fence_idxs = [i for i, ln in enumerate(lines) if ln.strip() in {"##", "###"}]
+    for start_i, end_i in zip(fence_idxs[0::2], fence_idxs[1::2]):
+        boundaries: List[Tuple[int, str]] = []
+        for i in range(start_i + 1, end_i):
+            sid = _normalize_cpt_id_from_line(lines[i])
+            if sid:
+                boundaries.append((i, sid))
+        for bi, (b_idx, sid) in enumerate(boundaries):
+            if sid in spans:
+                continue
+            seg_end = boundaries[bi + 1][0] - 1 if bi + 1 < len(boundaries) else end_i - 1
+            spans[sid] = _trim(lines, b_idx + 1, seg_end)
+    return spans
+
+
+def _heading_spans(lines: Sequence[str]) -> Dict[str, Optional[LineSpan]]:
+    """Heading scopes (until the next heading of the same or higher level) keyed by title IDs."""
+    headings: List[Tuple[int, List[str]]] = []  # (line, ids) in document order
+    ends: List[int] = []
+    stack: List[Tuple[int, int]] = []  # (heading number, level)
+    for idx, ln in enumerate(lines):
+        m = _HEADING_RE.match(ln)
+        if not m:
+            continue
+        level = len(m.group(1))
+        while stack and stack[-1][1] >= level:
+            ends[stack.pop()[0]] = idx - 1
+        stack.append((len(headings), level))
+        headings.append((idx, _CPT_ID_RE.findall(m.group(2))))
+        ends.append(len(lines) - 1)
+
+    spans: Dict[str, Optional[LineSpan]] = {}
+    for (idx, ids), end in zip(headings, ends):
+        for cid in ids:
+            if cid not in spans:
+                spans[cid] = _trim(lines, idx + 1, end)
+    return spans
+
+
+def _definition_spans(lines: Sequence[str]) -> Tuple[Dict[str, Optional[LineSpan]], Set[str]]:
+    """``**ID**`` definition scopes and the set of IDs defined outside code fences.
+
+    A definition's block runs to the next definition or to the next heading
+    at or above the level of the heading it sits under.
+    """
+    spans: Dict[str, Optional[LineSpan]] = {}
+    defined: Set[str] = set()
+    pending: Optional[Tuple[Optional[str], int, int]] = None  # (id, first line, cutoff level)
+    in_fence = False
+    last_heading_level: Optional[int] = None
+
+    def close(end: int) -> None:
+        cid, start, _cutoff = pending
+        if cid and cid not in spans:
+            spans[cid] = _trim(lines, start, end)
+
+    for idx, ln in enumerate(lines):
+        if _CODE_FENCE_RE.match(ln):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        mh = _HEADING_RE.match(ln)
+        if mh:
+            level = len(mh.group(1))
+            if pending is not None and level <= pending[2]:
+                close(idx - 1)
+                pending = None
+            last_heading_level = level
+            continue
+        mdef = _ID_DEF_RE.match(ln.strip())
+        if not mdef:
+            continue
+        if pending is not None:
+            close(idx - 1)
+        defined.add(mdef.group("id") or mdef.group("id2") or mdef.group("id3") or mdef.group("id4"))
+        cutoff = last_heading_level if last_heading_level is not None else 6
+        pending = (mdef.group("id") or mdef.group("id2") or mdef.group("id3"), idx + 1, cutoff)
+    if pending is not None:
+        close(len(lines) - 1)
+    return spans, defined
+
+
+def scoped_content_spans(lines: Sequence[str]) -> Tuple[Dict[str, LineSpan], Set[str]]:
+    """Content span of every ID in an artifact, as ``get_content_scoped`` would resolve it.
+
+    Returns ``({id: (start, end)}, defined_ids)`` with 0-based inclusive line
+    numbers. An ID whose winning scope is empty gets no span, even when a
+    lower-priority scope would have content.
+    """
+    defs, defined = _definition_spans(lines)
+    merged: Dict[str, Optional[LineSpan]] = dict(defs)
+    merged.update(_heading_spans(lines))
+    merged.update(_fence_spans(lines))
+    return {cid: span for cid, span in merged.items() if span is not None}, defined
+
+
+def _line_offsets(text: str) -> List[int]:
+    """Byte offset of the start of each line of *text*, plus the total length."""
+    offsets = [0]
+    pos = 0
+    for ln in text.splitlines(keepends=True):
+        pos += len(ln.encode("utf-8"))
+        offsets.append(pos)
+    return offsets
+
+
+def _strict_text(raw: bytes) -> Optional[str]:
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def _artifact_facet(raw: bytes) -> Dict[str, object]:
+    """``{"spans": {id: [start, end, byte_start, byte_end]}, "defined": [...]}``, 1-based lines.
+
+    Files that do not decode as text (e.g. contain NUL bytes) index as empty.
+    """
+    lines = decode_text_lines(raw)
+    if lines is None:
+        return {"spans": {}, "defined": []}
+    spans, defined = scoped_content_spans(lines)
+    text = _strict_text(raw)
+    offsets = _line_offsets(text) if text is not None else None
+    out: Dict[str, List[Optional[int]]] = {}
+    for cid, (start, end) in spans.items():
+        if offsets is not None:
+            out[cid] = [start + 1, end + 1, offsets[start], offsets[end + 1]]
+        else:
+            out[cid] = [start + 1, end + 1, None, None]
+    return {"spans": out, "defined": sorted(defined)}
+
+
+def _code_facet(path: Path, raw: bytes) -> Dict[str, object]:
+    """Block and scope marker spans of a code file; empty when it fails to parse."""
+    from .codebase import CodeFile
+
+    text = _strict_text(raw)
+    cf = CodeFile.from_text(path, text)[0] if text is not None else None
+    if cf is None:
+        return {"blocks": [], "scopes": []}
+    offsets = _line_offsets(text)
+    return {
+        # Block content is the lines strictly between the begin and end markers.
+        "blocks": [
+            [b.id, b.inst, b.start_line + 1, b.end_line - 1, offsets[b.start_line], offsets[b.end_line - 1]]
+            for b in cf.block_markers
+        ],
+        "scopes": [[m.id, m.line, m.line, offsets[m.line - 1], offsets[m.line]] for m in cf.scope_markers],
+    }
+
+
+def read_span(path: PathLike, byte_start: int, byte_end: int) -> Optional[str]:
+    """Lines stored in ``[byte_start, byte_end)`` of *path*, joined with ``\n``."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(byte_start)
+            raw = f.read(byte_end - byte_start)
+    except OSError:
+        return None
+    return "\n".join(raw.decode("utf-8", errors="replace").splitlines())
+
+
+class ContentLocation:
+    """Where the content block of one ID lives."""
+
+    __slots__ = ("id", "path", "start_line", "end_line", "byte_start", "byte_end", "artifact_type", "source", "inst")
+
+    def __init__(
+        self,
+        id_value: str,
+        path: str,
+        span: Sequence[Optional[int]],
+        *,
+        artifact_type: Optional[str] = None,
+        source: Optional[str] = None,
+        inst: Optional[str] = None,
+    ) -> None:
+        self.id = id_value
+        self.path = path
+        self.start_line, self.end_line, self.byte_start, self.byte_end = span
+        self.artifact_type = artifact_type
+        self.source = source
+        self.inst = inst
+
+    @property
+    def is_code(self) -> bool:
+        return self.artifact_type is None
+
+    def read_text(self) -> Optional[str]:
+        """Read the block from disk (only its byte range when known)."""
+        if self.byte_start is None or self.byte_end is None:
+            from .document import get_content_scoped
+
+            found = get_content_scoped(Path(self.path), id_value=self.id)
+            return found[0] if found is not None else None
+        text = read_span(self.path, self.byte_start, self.byte_end)
+        if text is None or self.is_code:
+            return text
+        return text.strip()
+
+
+class ContentIndex:
+    """ID → content block locations over a set of artifacts and code files.
+
+    Artifact blocks win over code blocks; among artifacts the one that
+    defines the ID wins, then scan order.
+    """
+
+    def __init__(self, parse_index: Optional["ParseIndex"] = None) -> None:
+        self._index = parse_index
+        self._artifact_spans: Dict[str, List[ContentLocation]] = {}
+        self._defined_in: Dict[str, Set[str]] = {}
+        self._blocks: Dict[str, List[ContentLocation]] = {}
+        self._scopes: Dict[str, List[ContentLocation]] = {}
+
+    def _facet(self, path: Path, facet: str, build) -> Optional[Dict[str, object]]:
+        """Stored *facet* of *path*, or build it from the file and store it."""
+        stored = self._index.get(path, facet) if self._index is not None else None
+        if isinstance(stored, dict):
+            return stored
+        from .parse_index import content_digest
+        from .scan_cache import file_signature
+
+        signature = file_signature(path)
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            return None
+        data = build(raw)
+        if self._index is not None:
+            self._index.put(path, facet, data, signature=signature, digest=content_digest(raw))
+        return data
+
+    def add_artifacts(
+        self,
+        artifacts: Sequence[Tuple[Path, str]],
+        path_to_source: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Index the content spans of *artifacts* (``(path, artifact_type)`` pairs)."""
+        sources = path_to_source or {}
+        for artifact_path, artifact_type in artifacts:
+            data = self._facet(artifact_path, ARTIFACT_FACET, _artifact_facet)
+            if data is None:
+                continue
+            path_s = str(artifact_path)
+            for cid in data.get("defined", ()):
+                self._defined_in.setdefault(cid, set()).add(path_s)
+            for cid, span in (data.get("spans") or {}).items():
+                self._artifact_spans.setdefault(cid, []).append(ContentLocation(
+                    cid, path_s, span, artifact_type=artifact_type, source=sources.get(path_s),
+                ))
+
+    def add_code_files(self, code_paths: Sequence[Path]) -> None:
+        """Index the block and scope marker spans of *code_paths*."""
+        for code_path in code_paths:
+            data = self._facet(code_path, CODE_FACET, lambda raw, p=code_path: _code_facet(p, raw))
+            if data is None:
+                continue
+            path_s = str(code_path)
+            for cid, inst, *span in data.get("blocks", ()):
+                self._blocks.setdefault(cid, []).append(ContentLocation(cid, path_s, span, inst=inst))
+            for cid, *span in data.get("scopes", ()):
+                self._scopes.setdefault(cid, []).append(ContentLocation(cid, path_s, span))
+
+    def artifact_location(self, id_value: str) -> Optional[ContentLocation]:
+        """Artifact block of *id_value*, preferring the artifact that defines it."""
+        locations = self._artifact_spans.get(id_value)
+        if not locations:
+            return None
+        defined_in = self._defined_in.get(id_value, set())
+        for loc in locations:
+            if loc.path in defined_in:
+                return loc
+        return locations[0]
+
+    def code_location(self, id_value: str, inst: Optional[str] = None) -> Optional[ContentLocation]:
+        """Code block of *id_value* (matching *inst*, with or without ``inst-``, when given), else its scope marker line."""
+        blocks = self._blocks.get(id_value, [])
+        if inst:
+            slug = inst[len("inst-"):] if inst.startswith("inst-") else inst
+            return next((b for b in blocks if b.inst == slug), None)
+        if blocks:
+            return blocks[0]
+        scopes = self._scopes.get(id_value)
+        return scopes[0] if scopes else None
+
+    def save(self) -> None:
+        if self._index is not None:
+            self._index.save()
+
+
+__all__ = [
+    "ContentIndex",
+    "ContentLocation",
+    "read_span",
+    "scoped_content_spans",
+]
@@ -13,8 +13,11 @@ outside all allowed ranges are flagged as violations.
 # @cpt-begin:cpt-cypilot-algo-traceability-validation-lang-scan:p1:inst-lang-scan-imports
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .line_pass import LineVisitor, run_line_pass
 # @cpt-end:cpt-cypilot-algo-traceability-validation-lang-scan:p1:inst-lang-scan-imports
 
 # ---------------------------------------------------------------------------
@@ -130,6 +133,9 @@ _SKIP_LINE_PATTERNS: List[re.Pattern] = [
     re.compile(r"^\s*\|.*`cpt-.*`"),    # Traceability ID table rows
     re.compile(r"^\s*@cpt"),            # Cypilot markers (@cpt-begin, etc.)
 ]
+
+# All skip patterns as one alternation, so each line costs a single match.
+_SKIP_LINE_RE: re.Pattern = re.compile("|".join(f"(?:{p.pattern})" for p in _SKIP_LINE_PATTERNS))
 # @cpt-end:cpt-cypilot-algo-traceability-validation-lang-scan:p1:inst-skip-patterns
 
 # ---------------------------------------------------------------------------
@@ -145,6 +151,10 @@ class LangScanError(Exception):
         self.path = path
         self.cause = cause
 
+    def __reduce__(self):
+        # Rebuild from (path, cause) when raised in a worker process.
+        return (type(self), (self.path, self.cause))
+
 
 @dataclass
 class LangViolation:
@@ -192,7 +202,7 @@ def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
 
 def build_allowed_ranges(languages: List[str]) -> List[Tuple[int, int]]:
     """Merge Unicode ranges for all given language codes into a sorted,
-    non-overlapping list suitable for binary search via is_allowed().
+    non-overlapping list suitable for is_allowed() and disallowed_chars_re().
 
     Unknown language codes are silently ignored — callers should validate
     against SUPPORTED_LANGUAGES before calling if they need strict checking.
@@ -217,6 +227,24 @@ def is_allowed(cp: int, ranges: List[Tuple[int, int]]) -> bool:
             lo = mid + 1
     return False
 
+
+@lru_cache(maxsize=32)
+def _compile_disallowed(ranges: Tuple[Tuple[int, int], ...]) -> re.Pattern:
+    if not ranges:
+        return re.compile(r"[\s\S]")
+    cls = "".join(f"\\U{start:08x}-\\U{end:08x}" for start, end in ranges)
+    return re.compile(f"[^{cls}]")
+
+
+def disallowed_chars_re(ranges: Sequence[Tuple[int, int]]) -> re.Pattern:
+    """Compile merged *ranges* into a regex matching any single disallowed character.
+
+    Equivalent to ``not is_allowed(ord(ch), ranges)`` per character, but a
+    clean line or file is rejected with one ``search`` call. Compiled
+    patterns are cached per range set.
+    """
+    return _compile_disallowed(tuple((int(a), int(b)) for a, b in ranges))
+
 # @cpt-end:cpt-cypilot-algo-traceability-validation-lang-scan:p1:inst-range-helpers
 
 # ---------------------------------------------------------------------------
@@ -233,37 +261,50 @@ def scan_file(
     Fenced code blocks (``` / ~~~) and structural lines (HTML comments,
     traceability table rows, @cpt markers) are automatically skipped.
     """
-    violations: List[LangViolation] = []
-    in_fence = False
-
     try:
         text = path.read_text(encoding="utf-8")
     except (UnicodeDecodeError, OSError) as exc:
         raise LangScanError(path, exc) from exc
 
-    for lineno, raw_line in enumerate(text.splitlines(), start=1):
-        if _FENCE_START.match(raw_line):
-            in_fence = not in_fence
-            continue
-        if in_fence:
-            continue
-        if any(p.match(raw_line) for p in _SKIP_LINE_PATTERNS):
-            continue
-
-        bad: List[Tuple[int, str]] = [
-            (ord(ch), ch)
-            for ch in raw_line
-            if not is_allowed(ord(ch), allowed_ranges)
-        ]
-        if bad:
-            violations.append(LangViolation(
-                path=path,
-                lineno=lineno,
-                line=raw_line.rstrip("\n"),
-                chars=bad,
-            ))
+    if disallowed_chars_re(allowed_ranges).search(text) is None:
+        return []
+    return run_line_pass(text.splitlines(), {"language": LangScanVisitor(path, allowed_ranges)})["language"]
 
-    return violations
+
+class LangScanVisitor(LineVisitor):
+    """``run_line_pass`` visitor collecting the language violations of *path*.
+
+    Lets the language check share the single read/scan pass over an artifact
+    with the ID, CDSL and heading scans. Clean lines are rejected by a single
+    ``disallowed.search`` per line, so no extra pass over the file is needed.
+    """
+
+    __slots__ = ("path", "disallowed", "in_fence", "violations")
+
+    def __init__(self, path: Path, allowed_ranges: Sequence[Tuple[int, int]]) -> None:
+        self.path = path
+        self.disallowed = disallowed_chars_re(allowed_ranges)
+        self.in_fence = False
+        self.violations: List[LangViolation] = []
+
+    def visit(self, lineno: int, raw: str, stripped: str, fenced: bool) -> None:
+        # Own fence tracking: ~~~ fences are skipped here too.
+        if _FENCE_START.match(raw):
+            self.in_fence = not self.in_fence
+            return
+        if self.in_fence:
+            return
+        if self.disallowed.search(raw) is None or _SKIP_LINE_RE.match(raw):
+            return
+        self.violations.append(LangViolation(
+            path=self.path,
+            lineno=lineno,
+            line=raw.rstrip("\n"),
+            chars=[(ord(ch), ch) for ch in self.disallowed.findall(raw)],
+        ))
+
+    def result(self) -> List[LangViolation]:
+        return self.violations
 
 # @cpt-end:cpt-cypilot-algo-traceability-validation-lang-scan:p1:inst-scan-file
 
@@ -273,6 +314,7 @@ def scan_paths(
     allowed_ranges: List[Tuple[int, int]],
     extensions: Optional[List[str]] = None,
     ignore_patterns: Optional[List[str]] = None,
+    jobs: int = 1,
 ) -> List[LangViolation]:
     """Recursively scan files under the given paths and return all violations.
 
@@ -280,14 +322,20 @@ def scan_paths(
     ``[".md"]``).  Files whose path matches any glob in *ignore_patterns*
     (matched against the absolute path string) are skipped — useful for
     translation specs, language-processor test fixtures, or vendor docs.
+
+    With ``jobs > 1`` large file sets are scanned across worker processes;
+    violations are still returned in file order.
     """
     import fnmatch
 
+    from .document import walk_files
+    from .parallel import map_ordered
+
     if extensions is None:
         extensions = [".md"]
     ext_set = {e.lower() for e in extensions}
     ignore_list = list(ignore_patterns) if ignore_patterns else []
-    all_violations: List[LangViolation] = []
+    files: List[Path] = []
 
     def _is_ignored(file_path: Path) -> bool:
         path_str = str(file_path)
@@ -296,14 +344,27 @@ def scan_paths(
     for root in roots:
         if root.is_file():
             if root.suffix.lower() in ext_set and not _is_ignored(root):
-                all_violations.extend(scan_file(root, allowed_ranges))
+                files.append(root)
         elif root.is_dir():
-            for file_path in sorted(root.rglob("*")):
-                if file_path.suffix.lower() in ext_set and not _is_ignored(file_path):
-                    all_violations.extend(scan_file(file_path, allowed_ranges))
+            files.extend(walk_files(
+                root,
+                sorted(ext_set),
+                ignore_file=lambda rel, _root=root: _is_ignored(_root / rel),
+                ignore_case=True,
+            ))
 
+    ranges = tuple(allowed_ranges)
+    all_violations: List[LangViolation] = []
+    for file_violations in map_ordered(_scan_file_job, [(fp, ranges) for fp in files], jobs):
+        all_violations.extend(file_violations)
     return all_violations
 
+
+def _scan_file_job(item: Tuple[Path, Tuple[Tuple[int, int], ...]]) -> List[LangViolation]:
+    """Process-pool entry point for ``scan_paths`` (must be module-level to pickle)."""
+    path, ranges = item
+    return scan_file(path, list(ranges))
+
 # @cpt-end:cpt-cypilot-algo-traceability-validation-lang-scan:p1:inst-scan-paths
 
 
@@ -311,8 +372,10 @@ __all__ = [
     "SCRIPT_RANGES",
     "SUPPORTED_LANGUAGES",
     "LangScanError",
+    "LangScanVisitor",
     "LangViolation",
     "build_allowed_ranges",
+    "disallowed_chars_re",
     "is_allowed",
     "scan_file",
     "scan_paths",
@@ -8,7 +8,9 @@ Loads and caches:
 - Registered system names
 - Workspace configuration (multi-repo federation)
 
-Use CypilotContext.load() to initialize on CLI startup.
+Use CypilotContext.load() to initialize on CLI startup, or defer_context()
+to load lazily on the first get_context() call with only the parts a command
+needs (CONTEXT_REGISTRY < CONTEXT_KITS < CONTEXT_FULL).
 
 @cpt-algo:cpt-cypilot-algo-core-infra-config-management:p1
 @cpt-flow:cpt-cypilot-flow-core-infra-cli-invocation:p1
@@ -21,6 +23,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple, Union
 
 if TYPE_CHECKING:
+    from .source_snapshot import SourceSnapshotCache
     from .workspace import SourceEntry, WorkspaceConfig
 
 from .artifacts_meta import Artifact, ArtifactsMeta, CodebaseEntry, Kit, load_artifacts_meta
@@ -28,6 +31,11 @@ from .constraints import KitConstraints, error, load_constraints_toml
 
 _CONSTRAINTS_FILE = "constraints.toml"
 
+# Context parts a command can ask for, cheapest first.
+CONTEXT_REGISTRY = "registry"  # artifacts.toml registry only (no kits, no autodetect)
+CONTEXT_KITS = "kits"  # registry + loaded kits and their constraints
+CONTEXT_FULL = "full"  # kits + autodetect expansion (+ lazy workspace upgrade)
+
 @dataclass
 class LoadedKit:
     """A kit with all its templates loaded."""
@@ -51,11 +59,12 @@ class CypilotContext:
     # @cpt-end:cpt-cypilot-algo-core-infra-context-loading:p1:inst-ctx-datamodel
 
     @classmethod
-    def load(cls, start_path: Optional[Path] = None) -> Optional["CypilotContext"]:
+    def load(cls, start_path: Optional[Path] = None, needs: str = CONTEXT_FULL) -> Optional["CypilotContext"]:
         """Load Cypilot context by discovering adapter directory.
 
         Args:
             start_path: Starting path to search for cypilot (default: cwd)
+            needs: Which parts to load (CONTEXT_REGISTRY, CONTEXT_KITS or CONTEXT_FULL)
 
         Returns:
             CypilotContext or None if cypilot not found or load failed
@@ -68,11 +77,15 @@ class CypilotContext:
         if not adapter_dir:
             return None
         # @cpt-end:cpt-cypilot-algo-core-infra-context-loading:p1:inst-ctx-find-and-load
-        return cls.load_from_dir(adapter_dir)
+        return cls.load_from_dir(adapter_dir, needs=needs)
 
     @classmethod
-    def load_from_dir(cls, adapter_dir: Path) -> Optional["CypilotContext"]:
-        """Load context from a known adapter directory (skip discovery)."""
+    def load_from_dir(cls, adapter_dir: Path, needs: str = CONTEXT_FULL) -> Optional["CypilotContext"]:
+        """Load context from a known adapter directory (skip discovery).
+
+        With ``needs=CONTEXT_REGISTRY`` kits are not loaded; below
+        ``CONTEXT_FULL`` autodetect rules are left unexpanded.
+        """
         meta, err = load_artifacts_meta(adapter_dir)
         if err or meta is None:
             return None
@@ -80,11 +93,15 @@ class CypilotContext:
         project_root = (adapter_dir / meta.project_root).resolve()
 
         # @cpt-begin:cpt-cypilot-algo-core-infra-context-loading:p1:inst-ctx-load-kits
-        kits, errors = _load_all_kits(meta, adapter_dir, project_root)
+        if needs == CONTEXT_REGISTRY:
+            kits, errors = {}, []
+        else:
+            kits, errors = _load_all_kits(meta, adapter_dir, project_root)
         # @cpt-end:cpt-cypilot-algo-core-infra-context-loading:p1:inst-ctx-load-kits
 
         # @cpt-begin:cpt-cypilot-algo-core-infra-context-loading:p1:inst-ctx-expand-autodetect
-        errors.extend(_expand_autodetect_errors(meta, adapter_dir, project_root, kits))
+        if needs == CONTEXT_FULL:
+            errors.extend(_expand_autodetect_errors(meta, adapter_dir, project_root, kits))
         # @cpt-end:cpt-cypilot-algo-core-infra-context-loading:p1:inst-ctx-expand-autodetect
 
         # @cpt-begin:cpt-cypilot-algo-core-infra-context-loading:p1:inst-ctx-collect-systems
@@ -410,6 +427,9 @@ class SourceContext:
     # @cpt-algo:cpt-cypilot-algo-workspace-resolve-adapter-context:p1
     adapter_context: Optional["CypilotContext"] = None
     _adapter_resolved: bool = False  # Sentinel: True means we already attempted loading
+    # Stand-ins for adapter_context facts when the source was served from its snapshot
+    snapshot_systems: Optional[Set[str]] = None
+    snapshot_id_kinds: Optional[Set[str]] = None
 
 
 @dataclass
@@ -421,6 +441,8 @@ class WorkspaceContext:
     workspace_file: Optional[Path] = None
     cross_repo: bool = True  # From traceability.cross_repo in workspace config
     resolve_remote_ids: bool = True  # From traceability.resolve_remote_ids
+    # Snapshot caches keyed by use_cache: the persistent one and a per-run one for --no-cache
+    _snapshots: Dict[bool, "SourceSnapshotCache"] = field(default_factory=dict, repr=False, compare=False)
 
     @property
     def adapter_dir(self) -> Path:
@@ -449,6 +471,8 @@ class WorkspaceContext:
                 continue
             if sc.adapter_context is not None:
                 kinds.update(sc.adapter_context.get_known_id_kinds())
+            elif sc.snapshot_id_kinds is not None:
+                kinds.update(sc.snapshot_id_kinds)
         return kinds
 
     def get_all_registered_systems(self) -> Set[str]:
@@ -463,6 +487,8 @@ class WorkspaceContext:
                 continue
             if sc.adapter_context is not None:
                 systems.update(sc.adapter_context.registered_systems)
+            elif sc.snapshot_systems is not None:
+                systems.update(sc.snapshot_systems)
             elif sc.registered_systems:
                 systems.update(sc.registered_systems)
         return systems
@@ -498,7 +524,7 @@ class WorkspaceContext:
         # @cpt-end:cpt-cypilot-algo-workspace-resolve-artifact:p1:inst-art-return-local
 
     # @cpt-algo:cpt-cypilot-algo-workspace-collect-ids:p1
-    def get_all_artifact_ids(self) -> Set[str]:
+    def get_all_artifact_ids(self, use_cache: bool = True) -> Set[str]:
         """Collect artifact IDs from all workspace sources (for cross-repo resolution)."""
         ids: Set[str] = set()
         # @cpt-begin:cpt-cypilot-algo-workspace-collect-ids:p1:inst-ids-collect-primary
@@ -515,13 +541,91 @@ class WorkspaceContext:
                 # @cpt-end:cpt-cypilot-algo-workspace-collect-ids:p1:inst-ids-foreach-source
                 # @cpt-begin:cpt-cypilot-algo-workspace-collect-ids:p1:inst-ids-scan-source-artifacts
                 # @cpt-begin:cpt-cypilot-algo-workspace-collect-ids:p1:inst-ids-add-with-warning
-                _collect_source_definition_ids(sc, ids)
+                if sc.role in ("artifacts", "full"):
+                    ids.update(self.source_definition_ids(sc, use_cache=use_cache))
                 # @cpt-end:cpt-cypilot-algo-workspace-collect-ids:p1:inst-ids-add-with-warning
                 # @cpt-end:cpt-cypilot-algo-workspace-collect-ids:p1:inst-ids-scan-source-artifacts
+            self.source_snapshots(use_cache).save()
         # @cpt-begin:cpt-cypilot-algo-workspace-collect-ids:p1:inst-ids-return
         return ids
         # @cpt-end:cpt-cypilot-algo-workspace-collect-ids:p1:inst-ids-return
 
+    def source_snapshots(self, use_cache: bool = True) -> "SourceSnapshotCache":
+        """Per-source snapshot cache stored under the primary adapter (loaded on first use).
+
+        With *use_cache* False the returned cache neither reads nor writes
+        ``sources.json`` and only lives as long as this context.
+        """
+        cache = self._snapshots.get(use_cache)
+        if cache is None:
+            from .source_snapshot import SourceSnapshotCache
+
+            cache = SourceSnapshotCache.for_adapter(self.primary.adapter_dir) if use_cache else SourceSnapshotCache()
+            self._snapshots[use_cache] = cache
+        return cache
+
+    def expire_source_states(self) -> None:
+        """Re-check each source's state (git HEAD, dirty files, config) on next use."""
+        for cache in self._snapshots.values():
+            cache.expire_states()
+
+    def source_artifacts(self, sc: SourceContext, use_cache: bool = True) -> List[Tuple[Path, str]]:
+        """Existing artifacts of a reachable source as ``(resolved path, kind)``.
+
+        Served from the source's snapshot when it is current; otherwise the
+        source's autodetect-expanded meta is loaded and a new snapshot recorded.
+        Callers persist new snapshots with ``source_snapshots().save()``.
+        """
+        if not sc.reachable or sc.meta is None or sc.path is None:
+            return []
+        cache = self.source_snapshots(use_cache)
+        if cache.state_moved(sc):
+            # The source changed under a long-lived context: drop its loaded adapter context.
+            sc.adapter_context = None
+            sc._adapter_resolved = False  # pylint: disable=protected-access  # same impl scope as SourceContext
+            sc.snapshot_systems = sc.snapshot_id_kinds = None
+        snap = cache.get(sc)
+        if snap is not None:
+            if sc.adapter_context is None:
+                sc.snapshot_systems = snap.registered_systems
+                sc.snapshot_id_kinds = snap.id_kinds
+        else:
+            from .source_snapshot import SourceSnapshot
+
+            meta = get_expanded_meta(sc)
+            if meta is None:
+                return []
+            adapter_ctx = sc.adapter_context
+            snap = SourceSnapshot(
+                [(str(art.path), str(art.kind)) for art, _sys in meta.iter_all_artifacts()],
+                set(adapter_ctx.registered_systems) if adapter_ctx is not None else None,
+                adapter_ctx.get_known_id_kinds() if adapter_ctx is not None else None,
+            )
+            cache.put(sc, snap)
+        out: List[Tuple[Path, str]] = []
+        for rel, kind in snap.artifacts:
+            art_path = (sc.path / rel).resolve()
+            if art_path.exists():
+                out.append((art_path, kind))
+        return out
+
+    def source_definition_ids(self, sc: SourceContext, use_cache: bool = True) -> Set[str]:
+        """Definition IDs of a reachable source's artifacts (cached in its snapshot)."""
+        artifacts = self.source_artifacts(sc, use_cache)
+        if not artifacts:
+            return set()
+        cache = self.source_snapshots(use_cache)
+        snap = cache.get(sc)
+        if snap is not None and snap.definition_ids is not None:
+            return snap.definition_ids
+        ids: Set[str] = set()
+        complete = True
+        for art_path, _kind in artifacts:
+            complete = _scan_definition_ids(art_path, ids) and complete
+        if complete:
+            cache.put_definition_ids(sc, ids)
+        return ids
+
     # @cpt-algo:cpt-cypilot-algo-workspace-load-context:p1
     # @cpt-dod:cpt-cypilot-dod-workspace-cross-repo:p1
     # @cpt-dod:cpt-cypilot-dod-workspace-graceful-degradation:p1
@@ -687,8 +791,8 @@ def determine_target_source(
 # ---------------------------------------------------------------------------
 
 
-def _scan_definition_ids(artifact_path: Path, ids: Set[str]) -> None:
-    """Scan an artifact file and add definition IDs to the set."""
+def _scan_definition_ids(artifact_path: Path, ids: Set[str]) -> bool:
+    """Scan an artifact file and add definition IDs to the set; False when the scan failed."""
     from .document import scan_cpt_ids
 
     try:
@@ -697,21 +801,8 @@ def _scan_definition_ids(artifact_path: Path, ids: Set[str]) -> None:
                 ids.add(str(h["id"]))
     except (OSError, ValueError) as exc:
         print(f"Warning: failed to scan IDs from {artifact_path}: {exc}", file=sys.stderr)
-
-
-def _collect_source_definition_ids(sc: "SourceContext", ids: Set[str]) -> None:
-    """Collect definition IDs from a single reachable source's artifacts."""
-    if not sc.reachable or sc.meta is None or sc.path is None:
-        return
-    if sc.role not in ("artifacts", "full"):
-        return
-    meta = get_expanded_meta(sc)
-    if meta is None:
-        return
-    for art, _sys in meta.iter_all_artifacts():
-        art_path = (sc.path / art.path).resolve()
-        if art_path.exists():
-            _scan_definition_ids(art_path, ids)
+        return False
+    return True
 
 
 # @cpt-state:cpt-cypilot-state-workspace-source-reachability:p1
@@ -798,6 +889,7 @@ def _collect_remote_artifacts(
     ctx: "WorkspaceContext",
     artifacts: List[Tuple[Path, str]],
     path_to_source: Dict[str, str],
+    use_cache: bool = True,
 ) -> None:
     """Append artifacts from reachable remote workspace sources.
 
@@ -806,23 +898,22 @@ def _collect_remote_artifacts(
     """
     seen = {str(p) for p, _ in artifacts}
     for sc in ctx.sources.values():
-        if not sc.reachable or sc.meta is None or sc.path is None or sc.role not in ("artifacts", "full"):
-            continue
-        meta = get_expanded_meta(sc)
-        if meta is None:
+        if sc.role not in ("artifacts", "full"):
             continue
-        for art, _sys in meta.iter_all_artifacts():
-            art_path = (sc.path / art.path).resolve()
+        for art_path, kind in ctx.source_artifacts(sc, use_cache):
             path_key = str(art_path)
-            if path_key not in seen and art_path.exists():
-                artifacts.append((art_path, str(art.kind)))
+            if path_key not in seen:
+                artifacts.append((art_path, kind))
                 path_to_source[path_key] = sc.name
             seen.add(path_key)
+    ctx.source_snapshots(use_cache).save()
 
 
 # Global context instance (set by CLI on startup)
 _global_context: Optional[Union[CypilotContext, WorkspaceContext]] = None
 _workspace_upgrade_attempted: bool = False
+# (start_path, needs) of a load deferred until the first get_context() call
+_deferred_load: Optional[Tuple[Optional[Path], str]] = None
 
 
 def get_context() -> Optional[Union[CypilotContext, WorkspaceContext]]:
@@ -833,7 +924,11 @@ def get_context() -> Optional[Union[CypilotContext, WorkspaceContext]]:
     operations for git URL sources) is deferred until a command actually
     needs the context.
     """
-    global _global_context, _workspace_upgrade_attempted  # pylint: disable=global-statement  # module-level singleton pattern for CLI context
+    global _global_context, _workspace_upgrade_attempted, _deferred_load  # pylint: disable=global-statement  # module-level singleton pattern for CLI context
+    if _deferred_load is not None:
+        start_path, needs = _deferred_load
+        _deferred_load = None
+        _global_context = CypilotContext.load(start_path, needs=needs)
     if not _workspace_upgrade_attempted and isinstance(_global_context, CypilotContext):
         _workspace_upgrade_attempted = True
         ws_ctx = WorkspaceContext.load(_global_context)
@@ -844,15 +939,41 @@ def get_context() -> Optional[Union[CypilotContext, WorkspaceContext]]:
 
 def set_context(ctx: Optional[Union[CypilotContext, WorkspaceContext]]) -> None:
     """Set the global Cypilot context."""
-    global _global_context, _workspace_upgrade_attempted  # pylint: disable=global-statement  # module-level singleton pattern for CLI context
+    global _global_context, _workspace_upgrade_attempted, _deferred_load  # pylint: disable=global-statement  # module-level singleton pattern for CLI context
+    _deferred_load = None
     _global_context = ctx
     # If caller already provides a WorkspaceContext, skip lazy upgrade
     _workspace_upgrade_attempted = isinstance(ctx, WorkspaceContext) or ctx is None
 
 
+def defer_context(start_path: Optional[Path] = None, needs: str = CONTEXT_FULL) -> None:
+    """Load the global context on the first get_context() call instead of now.
+
+    Only the *needs* parts are loaded; partial (non-CONTEXT_FULL) contexts
+    are never upgraded to a WorkspaceContext. Commands that never ask for
+    the context never pay for loading it.
+    """
+    global _global_context, _workspace_upgrade_attempted, _deferred_load  # pylint: disable=global-statement  # module-level singleton pattern for CLI context
+    _global_context = None
+    _deferred_load = (start_path, needs)
+    _workspace_upgrade_attempted = needs != CONTEXT_FULL
+
+
+def expire_source_states() -> None:
+    """Make the global workspace context re-check its sources' state on next use.
+
+    Called by long-lived processes (``cpt serve``) before each request; never
+    loads a context.
+    """
+    if isinstance(_global_context, WorkspaceContext):
+        _global_context.expire_source_states()
+
+
 def ensure_context(start_path: Optional[Path] = None) -> Optional[Union[CypilotContext, WorkspaceContext]]:
     """Ensure context is loaded, loading if necessary."""
     global _global_context, _workspace_upgrade_attempted  # pylint: disable=global-statement  # module-level singleton pattern for CLI context
+    if _deferred_load is not None:
+        get_context()
     if _global_context is None:
         base_ctx = CypilotContext.load(start_path)
         if base_ctx is not None:
@@ -886,9 +1007,12 @@ def get_primary_context() -> Optional[CypilotContext]:
 
 def collect_artifacts_to_scan(
     ctx: Union[CypilotContext, WorkspaceContext],
+    use_cache: bool = True,
 ) -> Tuple[List[Tuple[Path, str]], Dict[str, str]]:
     """Collect all artifact paths for scanning, with workspace-aware resolution.
 
+    With *use_cache* False remote sources bypass the persistent snapshot cache.
+
     Returns:
         (artifacts_to_scan, path_to_source) where artifacts_to_scan is a list of
         (artifact_path, artifact_kind) tuples and path_to_source maps absolute
@@ -913,11 +1037,31 @@ def collect_artifacts_to_scan(
 
     # Remote source artifacts (workspace mode with cross-repo and remote ID resolution enabled)
     if is_ws and ctx.cross_repo and ctx.resolve_remote_ids:
-        _collect_remote_artifacts(ctx, artifacts, path_to_source)
+        _collect_remote_artifacts(ctx, artifacts, path_to_source, use_cache)
 
     return artifacts, path_to_source
 
 
+def context_for_artifact(artifact_path: Path) -> Optional[CypilotContext]:
+    """Context that registers *artifact_path*, reusing the global one when possible.
+
+    In workspace mode the owning source's adapter context is used. Only when
+    the global context does not register the artifact (e.g. it belongs to
+    another project) is a context loaded from the artifact's directory.
+    """
+    ctx = get_context()
+    if isinstance(ctx, WorkspaceContext):
+        _sc, ctx = determine_target_source(artifact_path, ctx)
+    if ctx is not None:
+        try:
+            rel_path = artifact_path.resolve().relative_to(ctx.project_root.resolve()).as_posix()
+        except ValueError:
+            rel_path = None
+        if rel_path and ctx.meta.get_artifact_by_path(rel_path) is not None:
+            return ctx
+    return CypilotContext.load(artifact_path.parent)
+
+
 def _resolve_single_artifact(
     artifact_arg: str,
 ) -> Tuple[
@@ -933,7 +1077,7 @@ def _resolve_single_artifact(
     if not artifact_path.exists():
         return None, [], f"Artifact not found: {artifact_path}"
 
-    ctx = CypilotContext.load(artifact_path.parent)
+    ctx = context_for_artifact(artifact_path)
     if not ctx:
         return None, [], "Cypilot not initialized. Run 'cypilot init' first."
 
@@ -955,6 +1099,7 @@ def _resolve_single_artifact(
 
 def resolve_artifacts_for_command(
     artifact_arg: Optional[str],
+    use_cache: bool = True,
 ) -> Tuple[
     Optional[Union[CypilotContext, WorkspaceContext]],
     List[Tuple[Path, str]],
@@ -977,7 +1122,7 @@ def resolve_artifacts_for_command(
     if not ctx:
         return None, [], {}, "Cypilot not initialized. Run 'cypilot init' first."
 
-    artifacts_to_scan, path_to_source = collect_artifacts_to_scan(ctx)
+    artifacts_to_scan, path_to_source = collect_artifacts_to_scan(ctx, use_cache)
     return ctx, artifacts_to_scan, path_to_source, None
 
 
@@ -1005,19 +1150,100 @@ def resolve_target_and_artifacts(
     if not target_id:
         return None, None, [], {}, "ID cannot be empty"
 
-    ctx, artifacts_to_scan, path_to_source, err = resolve_artifacts_for_command(args.artifact)
+    ctx, artifacts_to_scan, path_to_source, err = resolve_artifacts_for_command(
+        args.artifact, use_cache=not getattr(args, "no_cache", False),
+    )
     if err:
         return None, None, [], {}, err
 
     return target_id, ctx, artifacts_to_scan, path_to_source, None
 
 
+def _read_ids_file(path: str) -> List[str]:
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        text = Path(path).read_text(encoding="utf-8")
+    ids = []
+    for line in text.splitlines():
+        s = line.strip()
+        if s and not s.startswith("#"):
+            ids.append(s)
+    return ids
+
+
+def collect_target_ids(args: object) -> Tuple[List[str], Optional[str]]:
+    """Target IDs of a batch query command, in order and without duplicates.
+
+    IDs come from ``id_positional``, repeatable ``--id`` (a list) and
+    ``--ids-from`` (one ID per line, ``#`` comments, ``-`` for stdin). A
+    positional ID plus a single ``--id`` keeps the single-ID behaviour
+    (positional wins, with a warning).
+
+    Returns:
+        (target_ids, error_message).
+    """
+    ids_from = getattr(args, "ids_from", None)
+    flag_ids = list(args.id or [])
+    if args.id_positional and len(flag_ids) == 1 and not ids_from:
+        # Legacy single-ID form: the positional ID wins over one --id.
+        sys.stderr.write("WARNING: both positional ID and --id given; using positional\n")
+        flag_ids = []
+    raw: List[str] = []
+    if args.id_positional:
+        raw.append(args.id_positional)
+    raw.extend(flag_ids)
+    if ids_from:
+        try:
+            raw.extend(_read_ids_file(ids_from))
+        except (OSError, UnicodeDecodeError) as e:
+            return [], f"Cannot read --ids-from {ids_from}: {e}"
+    target_ids = list(dict.fromkeys(t.strip() for t in raw if t and t.strip()))
+    if not target_ids:
+        return [], "ID cannot be empty"
+    return target_ids, None
+
+
+def resolve_targets_and_artifacts(
+    args: object,
+) -> Tuple[
+    List[str],
+    Optional[Union[CypilotContext, WorkspaceContext]],
+    List[Tuple[Path, str]],
+    Dict[str, str],
+    Optional[str],
+]:
+    """Batch variant of :func:`resolve_target_and_artifacts`.
+
+    Target IDs are gathered by :func:`collect_target_ids`.
+
+    Returns:
+        (target_ids, ctx, artifacts_to_scan, path_to_source, error_message).
+    """
+    target_ids, err = collect_target_ids(args)
+    if err:
+        return [], None, [], {}, err
+
+    ctx, artifacts_to_scan, path_to_source, err = resolve_artifacts_for_command(
+        args.artifact, use_cache=not getattr(args, "no_cache", False),
+    )
+    if err:
+        return [], None, [], {}, err
+
+    return target_ids, ctx, artifacts_to_scan, path_to_source, None
+
+
 __all__ = [
+    "CONTEXT_FULL",
+    "CONTEXT_KITS",
+    "CONTEXT_REGISTRY",
     "CypilotContext",
     "LoadedKit",
     "SourceContext",
     "WorkspaceContext",
     "collect_artifacts_to_scan",
+    "collect_target_ids",
+    "context_for_artifact",
     "determine_target_source",
     "get_context",
     "get_primary_context",
@@ -1025,8 +1251,11 @@ __all__ = [
     "resolve_adapter_context",
     "resolve_artifacts_for_command",
     "resolve_target_and_artifacts",
+    "resolve_targets_and_artifacts",
     "set_context",
+    "defer_context",
     "ensure_context",
+    "expire_source_states",
     "is_workspace",
 ]
 # @cpt-end:cpt-cypilot-algo-core-infra-context-loading:p1:inst-ctx-globals
@@ -0,0 +1,390 @@
+"""
+Cypilot Validator - Query Daemon
+
+Resident server behind ``cpt serve``. It keeps the project context (config,
+kits, autodetected artifacts, workspace sources) and a shared artifact scan
+cache warm in memory, and answers read-only queries (``where-defined``,
+``where-used``, ``list-ids``, ``list-id-kinds``, ``get-content``) sent by the
+CLI over a per-project Unix domain socket in a per-user 0700 directory.
+
+Protocol: one newline-terminated JSON request per connection, answered by one
+newline-terminated JSON response.
+
+- ``{"op": "ping"}`` → ``{"ok": true, "pid": ..., "project_root": ...}``
+- ``{"op": "stop"}`` → ``{"ok": true}`` and the server exits
+- ``{"op": "run", "argv": [...], "cwd": "...", "json": bool}`` →
+  ``{"ok": true, "rc": int, "stdout": "...", "stderr": "..."}``
+
+Every request carries the protocol number and cypilot version; the server
+refuses mismatches and the client then runs the command in-process. Any
+failure to reach the daemon (no socket, stale socket, timeout, refusal) also
+falls back to in-process execution, so the daemon is purely an accelerator.
+
+The context is reloaded when its fingerprint changes: signatures of every
+file under ``{adapter_dir}/config``, kit constraint files, root ``AGENTS.md``,
+the standalone workspace file, and the mtimes of directories holding
+registered artifacts (new files in those directories may change autodetect
+results). Artifact contents are revalidated per file by the scan cache.
+Workspace sources are not fingerprinted; their git/config state is re-checked
+on every request instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DAEMON_PROTOCOL = 1
+DEFAULT_IDLE_TIMEOUT = 1800.0
+# Set to any non-empty value to bypass the daemon entirely.
+NO_DAEMON_ENV = "CYPILOT_NO_DAEMON"
+
+_CONNECT_TIMEOUT = 0.5
+_REQUEST_TIMEOUT = 300.0
+_MAX_MESSAGE = 64 * 1024 * 1024
+
+
+def daemon_supported() -> bool:
+    """Whether this platform has Unix domain sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def _uid() -> int:
+    return os.getuid() if hasattr(os, "getuid") else 0
+
+
+def socket_dir() -> Path:
+    """Per-user directory holding daemon sockets.
+
+    ``$XDG_RUNTIME_DIR`` is already private to the user; otherwise a
+    ``cpt-{uid}`` directory in the shared temp dir is used, which
+    :func:`ensure_socket_dir` creates with mode 0700.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir)
+    return Path(tempfile.gettempdir()) / f"cpt-{_uid()}"
+
+
+def socket_path(project_root: Path) -> Path:
+    """Per-user, per-project socket path inside :func:`socket_dir`."""
+    digest = hashlib.sha256(str(project_root.resolve()).encode("utf-8")).hexdigest()[:16]
+    return socket_dir() / f"cpt-{_uid()}-{digest}.sock"
+
+
+def _is_private_dir(path: Path) -> bool:
+    """True if *path* is a real directory owned by us and closed to everyone else."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == _uid() and not st.st_mode & 0o077
+
+
+def ensure_socket_dir(path: Path) -> None:
+    """Create the socket directory *path* (mode 0700) and verify it is private.
+
+    Raises OSError when it exists but is not a directory owned by the current
+    user with mode 0700 — another user could otherwise plant the socket.
+    """
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    if not _is_private_dir(path):
+        raise OSError(f"socket directory {path} is not a private directory owned by the current user")
+
+
+def _is_trusted_socket(path: Path) -> bool:
+    """True if *path* is a socket owned by us inside a private directory.
+
+    Checked with ``lstat`` before every connection so a socket planted by
+    another local user is never talked to.
+    """
+    if not _is_private_dir(path.parent):
+        return False
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == _uid()
+
+
+def _project_socket(start: Path) -> Optional[Path]:
+    from .files import find_project_root
+
+    project_root = find_project_root(start)
+    if project_root is None:
+        return None
+    return socket_path(project_root)
+
+
+def _envelope(request: Dict[str, object]) -> Dict[str, object]:
+    from .. import __version__
+
+    return {**request, "protocol": DAEMON_PROTOCOL, "version": __version__}
+
+
+def _recv_line(conn: socket.socket) -> Optional[bytes]:
+    chunks: List[bytes] = []
+    size = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            return None
+        nl = chunk.find(b"\n")
+        if nl >= 0:
+            chunks.append(chunk[:nl])
+            return b"".join(chunks)
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > _MAX_MESSAGE:
+            return None
+
+
+def send_request(
+    path: Path,
+    request: Dict[str, object],
+    *,
+    timeout: float = _REQUEST_TIMEOUT,
+) -> Optional[Dict[str, object]]:
+    """Send one request to the daemon at *path*; None if it cannot be reached or answers garbage."""
+    if not daemon_supported() or not _is_trusted_socket(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)  # pylint: disable=no-member  # guarded by daemon_supported()
+    try:
+        sock.settimeout(_CONNECT_TIMEOUT)
+        sock.connect(str(path))
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(_envelope(request)).encode("utf-8") + b"\n")
+        raw = _recv_line(sock)
+    except OSError:
+        return None
+    finally:
+        sock.close()
+    if raw is None:
+        return None
+    try:
+        resp = json.loads(raw.decode("utf-8"))
+    except ValueError:
+        return None
+    return resp if isinstance(resp, dict) else None
+
+
+def try_forward(argv: List[str], *, json_mode: bool, cwd: Optional[Path] = None) -> Optional[int]:
+    """Run *argv* on this project's daemon and replay its output.
+
+    Returns the command exit code, or None when the caller should run the
+    command in-process (daemon disabled, absent, unreachable or refusing).
+    """
+    if os.environ.get(NO_DAEMON_ENV) or not daemon_supported():
+        return None
+    # "-" arguments read the caller's stdin, which the daemon cannot see.
+    if any(a == "-" or a.endswith("=-") for a in argv):
+        return None
+    work_dir = (cwd or Path.cwd()).resolve()
+    path = _project_socket(work_dir)
+    if path is None or not _is_trusted_socket(path):
+        return None
+    resp = send_request(path, {"op": "run", "argv": list(argv), "cwd": str(work_dir), "json": bool(json_mode)})
+    if resp is None or not resp.get("ok"):
+        return None
+    sys.stdout.write(str(resp.get("stdout") or ""))
+    sys.stderr.write(str(resp.get("stderr") or ""))
+    sys.stdout.flush()
+    try:
+        return int(resp.get("rc", 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+Fingerprint = Tuple[Tuple[str, Optional[Tuple[int, int]]], ...]
+
+
+def _stat_sig(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def context_fingerprint(project_root: Path, ctx: object) -> Fingerprint:
+    """Cheap stat-only fingerprint of everything the loaded context depends on."""
+    paths: List[Path] = [project_root / "AGENTS.md", project_root / ".cypilot-workspace.toml"]
+    adapter_dir = getattr(ctx, "adapter_dir", None)
+    if isinstance(adapter_dir, Path):
+        config_dir = adapter_dir / "config"
+        paths.append(config_dir)
+        for dirpath, _dirnames, filenames in os.walk(config_dir):
+            paths.extend(Path(dirpath) / fn for fn in filenames)
+    for loaded_kit in (getattr(ctx, "kits", None) or {}).values():
+        constraints_path = getattr(loaded_kit, "constraints_path", None)
+        if isinstance(constraints_path, Path):
+            paths.append(constraints_path)
+    meta = getattr(ctx, "meta", None)
+    if meta is not None:
+        dirs = {(project_root / art.path).parent for art, _system in meta.iter_all_artifacts()}
+        paths.extend(sorted(dirs))
+    return tuple((str(p), _stat_sig(p)) for p in paths)
+
+
+class QueryServer:
+    """Single-threaded request loop holding a warm context for one project."""
+
+    def __init__(self, project_root: Path, path: Path, *, idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT) -> None:
+        self.project_root = project_root.resolve()
+        self.path = path
+        self.idle_timeout = idle_timeout if idle_timeout and idle_timeout > 0 else None
+        self.requests = 0
+        self.reloads = 0
+        self._fingerprint: Optional[Fingerprint] = None
+        self._ctx: object = None
+        self._stopping = False
+
+    def refresh(self) -> None:
+        """(Re)load the project context if its inputs changed since the last request."""
+        from .context import CypilotContext, expire_source_states, set_context
+        from .scan_cache import ArtifactScanCache, get_shared_scan_cache, set_shared_scan_cache
+
+        if get_shared_scan_cache() is None:
+            set_shared_scan_cache(ArtifactScanCache())
+        if self._fingerprint is not None and context_fingerprint(self.project_root, self._ctx) == self._fingerprint:
+            # Remote sources are not fingerprinted; re-check their git/config state.
+            expire_source_states()
+            return
+        self._ctx = CypilotContext.load(self.project_root)
+        set_context(self._ctx)
+        self._fingerprint = context_fingerprint(self.project_root, self._ctx)
+        self.reloads += 1
+
+    def handle(self, request: Dict[str, object]) -> Dict[str, object]:
+        """Answer one decoded request."""
+        from .. import __version__
+
+        if request.get("protocol") != DAEMON_PROTOCOL or request.get("version") != __version__:
+            return {"ok": False, "error": "version mismatch"}
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "project_root": str(self.project_root),
+                    "requests": self.requests, "reloads": self.reloads}
+        if op == "stop":
+            self._stopping = True
+            return {"ok": True}
+        if op == "run":
+            return self._run(request)
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    def _run(self, request: Dict[str, object]) -> Dict[str, object]:
+        from ..cli import run_command
+        from .ui import set_json_mode
+
+        argv = request.get("argv")
+        cwd = request.get("cwd")
+        if not isinstance(argv, list) or not argv or not isinstance(cwd, str):
+            return {"ok": False, "error": "malformed run request"}
+        out, err = io.StringIO(), io.StringIO()
+        prev_cwd = os.getcwd()
+        try:
+            os.chdir(cwd)
+            self.refresh()
+            set_json_mode(bool(request.get("json")))
+            with redirect_stdout(out), redirect_stderr(err):
+                try:
+                    rc = run_command(str(argv[0]), [str(a) for a in argv[1:]], initialized=self._ctx is not None)
+                except SystemExit as exc:
+                    rc = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+        except Exception as exc:  # pylint: disable=broad-exception-caught  # a failing query must not take the daemon down; the client re-runs it in-process
+            self._fingerprint = None
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        finally:
+            set_json_mode(False)
+            try:
+                os.chdir(prev_cwd)
+            except OSError:
+                pass
+        self.requests += 1
+        return {"ok": True, "rc": rc, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+    def _serve_connection(self, conn: socket.socket) -> None:
+        conn.settimeout(_REQUEST_TIMEOUT)
+        try:
+            raw = _recv_line(conn)
+            if raw is None:
+                return
+            try:
+                request = json.loads(raw.decode("utf-8"))
+            except ValueError:
+                request = None
+            if isinstance(request, dict):
+                resp = self.handle(request)
+            else:
+                resp = {"ok": False, "error": "malformed request"}
+            conn.sendall(json.dumps(resp, ensure_ascii=False).encode("utf-8") + b"\n")
+        except OSError:
+            pass
+
+    def bind(self) -> socket.socket:
+        """Create the listening socket (owner-only), replacing a stale one."""
+        ensure_socket_dir(self.path.parent)
+        if os.path.lexists(self.path):
+            if not _is_trusted_socket(self.path):
+                raise OSError(f"refusing to replace {self.path}: not a socket owned by the current user")
+            if send_request(self.path, {"op": "ping"}, timeout=_CONNECT_TIMEOUT) is not None:
+                raise OSError(f"daemon already running at {self.path}")
+            self.path.unlink()
+        srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)  # pylint: disable=no-member  # callers check daemon_supported()
+        old_umask = os.umask(0o177)
+        try:
+            srv.bind(str(self.path))
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.path, 0o600)
+        srv.listen(16)
+        return srv
+
+    def serve_forever(self, srv: socket.socket) -> None:
+        """Accept requests until stopped or idle for ``idle_timeout`` seconds."""
+        srv.settimeout(self.idle_timeout)
+        try:
+            while not self._stopping:
+                try:
+                    conn, _addr = srv.accept()
+                except socket.timeout:
+                    break
+                with conn:
+                    self._serve_connection(conn)
+        finally:
+            srv.close()
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+
+__all__ = [
+    "DAEMON_PROTOCOL",
+    "DEFAULT_IDLE_TIMEOUT",
+    "NO_DAEMON_ENV",
+    "QueryServer",
+    "context_fingerprint",
+    "daemon_supported",
+    "ensure_socket_dir",
+    "send_request",
+    "socket_dir",
+    "socket_path",
+    "try_forward",
+]
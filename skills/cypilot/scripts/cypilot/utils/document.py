@@ -7,7 +7,11 @@ Functions for working with documents and file paths.
 # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-scan-ids-datamodel
 from pathlib import Path
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .heading_scope import HeadingScopeMap
+from .line_pass import LineVisitor, run_line_pass
+from .records import IdHit
 
 _CPT_ID_RE = re.compile(r"(cpt-[a-z0-9][a-z0-9-]+)")
 _HEADING_RE = re.compile(r"^\s*(#{1,6})\s+(.+?)\s*$")
@@ -59,7 +63,7 @@ def _normalize_cpt_id_from_line(line: str) -> Optional[str]:
 # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-scan-ids-datamodel
 
 # @cpt-algo:cpt-cypilot-algo-traceability-validation-scan-ids:p1
-def scan_cpt_ids(path: Path) -> List[Dict[str, object]]:
+def scan_cpt_ids(path: Path) -> List[IdHit]:
     """Scan a file for Cypilot IDs by scanning document text.
 
     Heuristics:
@@ -73,21 +77,27 @@ def scan_cpt_ids(path: Path) -> List[Dict[str, object]]:
     if lines is None:
         return []
     # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-read-file
+    return scan_cpt_ids_from_lines(lines)
 
-    hits: List[Dict[str, object]] = []
-    in_fence = False
+def scan_cpt_ids_from_lines(lines: List[str]) -> List[IdHit]:
+    """Scan already-decoded document lines for Cypilot IDs (see scan_cpt_ids)."""
+    return run_line_pass(lines, {"id_hits": IdScanVisitor()})["id_hits"]
 
-    # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-foreach-line
-    for idx0, raw in enumerate(lines):
-        if _CODE_FENCE_RE.match(raw):
-            in_fence = not in_fence
-            continue
-        if in_fence:
-            continue
 
-        stripped = raw.strip()
-        if not stripped:
-            continue
+class IdScanVisitor(LineVisitor):
+    """``run_line_pass`` visitor collecting Cypilot ID hits (see scan_cpt_ids)."""
+
+    __slots__ = ("hits",)
+
+    def __init__(self) -> None:
+        self.hits: List[IdHit] = []
+
+    # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-foreach-line
+    def visit(self, lineno: int, raw: str, stripped: str, fenced: bool) -> None:
+        # Every ID pattern contains a literal "cpt-"; most lines have none.
+        if fenced or "cpt-" not in stripped:
+            return
+        hits = self.hits
 
         # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-match-def
         m = _ID_DEF_RE.match(stripped)
@@ -97,18 +107,13 @@ def scan_cpt_ids(path: Path) -> List[Dict[str, object]]:
             checked = (m.group("task") or "").lower().find("x") != -1
             priority = m.group("priority") or m.group("priority_only") or m.group("priority_only2")
             id_value = m.group("id") or m.group("id2") or m.group("id3") or m.group("id4")
-            h: Dict[str, object] = {
-                "id": id_value,
-                "line": idx0 + 1,
-                "type": "definition",
-                "checked": checked,
-                "has_task": m.group("task") is not None,
-                "has_priority": priority is not None and str(priority).strip() != "",
-            }
-            if priority:
-                h["priority"] = priority
-            hits.append(h)
-            continue
+            hits.append(IdHit(
+                id_value, lineno, "definition", checked,
+                m.group("task") is not None,
+                priority is not None and str(priority).strip() != "",
+                priority or None,
+            ))
+            return
         # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-if-def
 
         # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-match-ref
@@ -122,60 +127,51 @@ def scan_cpt_ids(path: Path) -> List[Dict[str, object]]:
         if mref:
             checked = (mref.group("task") or "").lower().find("x") != -1
             priority = mref.group("priority") or mref.group("priority_only")
-            h = {
-                "id": mref.group("id"),
-                "line": idx0 + 1,
-                "type": "reference",
-                "checked": checked,
-                "has_task": mref.group("task") is not None,
-                "has_priority": priority is not None and str(priority).strip() != "",
-            }
-            if priority:
-                h["priority"] = priority
-            hits.append(h)
-            continue
+            hits.append(IdHit(
+                mref.group("id"), lineno, "reference", checked,
+                mref.group("task") is not None,
+                priority is not None and str(priority).strip() != "",
+                priority or None,
+            ))
+            return
         # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-match-ref
 
         # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-match-inline
         # Generic inline backticked references.
         for mm in _BACKTICK_ID_RE.finditer(raw):
-            hits.append({"id": mm.group(1), "line": idx0 + 1, "type": "reference", "checked": False})
+            hits.append(IdHit(mm.group(1), lineno, "reference", False))
         # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-match-inline
     # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-foreach-line
 
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-return-hits
-    return hits
+    def result(self) -> List[IdHit]:
+        return self.hits
     # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-return-hits
 
 # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-scan-ids-headings
-def headings_by_line(path: Path) -> List[List[str]]:
+def headings_by_line(path: Path) -> HeadingScopeMap:
     """Return active markdown heading titles for each line (1-indexed).
 
     Headings are detected outside fenced code blocks.
     """
     lines = read_text_safe(path)
     if lines is None:
-        return [[]]
+        return HeadingScopeMap((), 0)
+    return headings_by_line_from_lines(lines)
 
-    out: List[List[str]] = [[] for _ in range(len(lines) + 1)]
-    stack: List[Tuple[int, str]] = []
+def headings_by_line_from_lines(lines: List[str]) -> HeadingScopeMap:
+    """Return active heading titles for each line of already-decoded lines."""
+    events: List[Tuple[int, int, Optional[str]]] = []
     in_fence = False
     for idx0, raw in enumerate(lines):
-        line_no = idx0 + 1
         if _CODE_FENCE_RE.match(raw):
             in_fence = not in_fence
-            out[line_no] = [t for _, t in stack]
             continue
         if not in_fence:
             m = _HEADING_RE.match(raw)
             if m:
-                level = len(m.group(1))
-                title = str(m.group(2) or "").strip()
-                while stack and stack[-1][0] >= level:
-                    stack.pop()
-                stack.append((level, title))
-        out[line_no] = [t for _, t in stack]
-    return out
+                events.append((idx0 + 1, len(m.group(1)), str(m.group(2) or "").strip()))
+    return HeadingScopeMap(events, len(lines))
 # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-scan-ids-headings
 
 # @cpt-algo:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1
@@ -199,35 +195,40 @@ def scan_cdsl_instructions(path: Path) -> List[Dict[str, object]]:
     if lines is None:
         return []
     # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-read-file
+    return scan_cdsl_instructions_from_lines(lines)
 
-    hits: List[Dict[str, object]] = []
-    in_fence = False
-    last_defined_id: Optional[str] = None
+def scan_cdsl_instructions_from_lines(lines: List[str]) -> List[Dict[str, object]]:
+    """Scan already-decoded document lines for CDSL instructions (see scan_cdsl_instructions)."""
+    return run_line_pass(lines, {"cdsl_steps": CdslScanVisitor()})["cdsl_steps"]
 
-    # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-foreach-cdsl
-    for idx0, raw in enumerate(lines):
-        if _CODE_FENCE_RE.match(raw):
-            in_fence = not in_fence
-            continue
-        if in_fence:
-            continue
 
-        stripped = raw.strip()
-        if not stripped:
-            continue
+class CdslScanVisitor(LineVisitor):
+    """``run_line_pass`` visitor collecting CDSL instruction hits (see scan_cdsl_instructions)."""
+
+    __slots__ = ("hits", "last_defined_id")
+
+    def __init__(self) -> None:
+        self.hits: List[Dict[str, object]] = []
+        self.last_defined_id: Optional[str] = None
+
+    # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-foreach-cdsl
+    def visit(self, lineno: int, raw: str, stripped: str, fenced: bool) -> None:
+        # Only ID definitions ("cpt-") and instruction lines ("inst-") matter here.
+        if fenced or ("cpt-" not in stripped and "inst-" not in stripped):
+            return
 
         # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-track-parent
         mdef = _ID_DEF_RE.match(stripped)
         if mdef:
             id_value = mdef.group("id") or mdef.group("id2") or mdef.group("id3")
             if id_value:
-                last_defined_id = id_value
-            continue
+                self.last_defined_id = id_value
+            return
         # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-track-parent
 
         m = _CDSL_LINE_RE.match(raw)
         if not m:
-            continue
+            return
 
         # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-extract-inst
         check = str(m.group("check") or " ").strip().lower()
@@ -235,24 +236,25 @@ def scan_cdsl_instructions(path: Path) -> List[Dict[str, object]]:
         phase_raw = str(m.group("phase") or "").strip()
         mph = _CDSL_PHASE_NUM_RE.match(phase_raw)
         if not mph:
-            continue
+            return
         phase = int(mph.group("num"))
         # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-extract-inst
 
         # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-associate-parent
-        hits.append({
+        self.hits.append({
             "type": "cdsl",
             "checked": checked,
             "phase": phase,
             "inst": str(m.group("inst")),
-            "parent_id": last_defined_id,
-            "line": idx0 + 1,
+            "parent_id": self.last_defined_id,
+            "line": lineno,
         })
         # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-associate-parent
     # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-foreach-cdsl
 
     # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-return-cdsl
-    return hits
+    def result(self) -> List[Dict[str, object]]:
+        return self.hits
     # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-cdsl:p1:inst-return-cdsl
 
 # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-scan-ids-get-content
@@ -418,6 +420,101 @@ def get_content_scoped(
 # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-scan-ids-get-content
 
 # @cpt-begin:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-scan-ids-file-utils
+# Directory names never descended into by file walkers (VCS, caches, deps, build output).
+SKIP_DIRS = frozenset({
+    ".git", ".hg", ".svn", ".idea", ".vscode", "__pycache__",
+    ".pytest_cache", ".mypy_cache", ".ruff_cache",
+    "node_modules", "target", "dist", "build", ".venv", "venv",
+})
+
+def walk_files(
+    root: Path,
+    extensions: Sequence[str],
+    *,
+    rel_to: Optional[Path] = None,
+    ignore_file: Optional[Callable[[str], bool]] = None,
+    ignore_dir: Optional[Callable[[str], bool]] = None,
+    ignore_case: bool = False,
+) -> List[Path]:
+    """Walk *root* once and return files whose names end with any of *extensions*.
+
+    Each directory is listed once with ``os.scandir`` regardless of how many
+    extensions are requested. Directories in ``SKIP_DIRS`` are never entered and
+    symlinked directories are not followed.
+
+    *ignore_dir* / *ignore_file* receive the POSIX path relative to *rel_to*
+    (default: *root*); returning True prunes that subtree / drops that file. When
+    *root* lies outside *rel_to* no ignore callbacks are consulted.
+
+    Results are in lexicographic path order. A file *root* is returned as-is
+    when it matches.
+    """
+    import os
+
+    exts = tuple(e.lower() for e in extensions) if ignore_case else tuple(extensions)
+
+    def _matches(name: str) -> bool:
+        return (name.lower() if ignore_case else name).endswith(exts)
+
+    base = rel_to if rel_to is not None else root
+    try:
+        prefix: Optional[str] = root.resolve().relative_to(base.resolve()).as_posix()
+    except (OSError, ValueError):
+        prefix = None
+    if prefix == ".":
+        prefix = ""
+
+    def _rel(parent: Optional[str], name: str) -> Optional[str]:
+        if parent is None:
+            return None
+        return f"{parent}/{name}" if parent else name
+
+    if root.is_file():
+        if not _matches(root.name) or (ignore_file and prefix and ignore_file(prefix)):
+            return []
+        return [root]
+
+    out: List[Path] = []
+    # Stack of (path, rel, is_dir); children are pushed in reverse name order so
+    # that popping yields a lexicographic depth-first traversal.
+    stack: List[Tuple[str, Optional[str], bool]] = [(str(root), prefix, True)]
+    while stack:
+        path, rel, is_dir = stack.pop()
+        if not is_dir:
+            out.append(Path(path))
+            continue
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        children: List[Tuple[str, Optional[str], bool]] = []
+        for entry in entries:
+            child_rel = _rel(rel, entry.name)
+            try:
+                entry_is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if entry_is_dir:
+                if entry.name in SKIP_DIRS:
+                    continue
+                if ignore_dir and child_rel is not None and ignore_dir(child_rel):
+                    continue
+                children.append((entry.path, child_rel, True))
+                continue
+            if not _matches(entry.name):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if ignore_file and child_rel is not None and ignore_file(child_rel):
+                continue
+            children.append((entry.path, child_rel, False))
+        stack.extend(reversed(children))
+    return out
+
 def iter_text_files(
     root: Path,
     *,
@@ -443,18 +540,12 @@ def iter_text_files(
     if excludes is None:
         excludes = []
     
-    skip_dirs = {
-        ".git", ".hg", ".svn", ".idea", ".vscode", "__pycache__",
-        ".pytest_cache", ".mypy_cache", ".ruff_cache",
-        "node_modules", "target", "dist", "build", ".venv", "venv",
-    }
-    
     out: List[Path] = []
     root = root.resolve()
     
     for dirpath, dirnames, filenames in os.walk(root):
         # Filter out skip directories
-        dirnames[:] = sorted([d for d in dirnames if d not in skip_dirs and not d.startswith(".")])
+        dirnames[:] = sorted([d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")])
         
         for fn in sorted(filenames):
             fp = Path(dirpath) / fn
@@ -495,13 +586,20 @@ def read_text_safe(path: Path) -> Optional[List[str]]:
     Returns:
         List of lines or None if error
     """
-    import os
-
     try:
         raw = path.read_bytes()
     except OSError:
         return None
 
+    return decode_text_lines(raw)
+
+def decode_text_lines(raw: bytes) -> Optional[List[str]]:
+    """Decode raw file bytes to lines the same way ``read_text_safe`` does.
+
+    Returns None for binary content (NUL bytes).
+    """
+    import os
+
     if b"\x00" in raw:
         return None
 
@@ -533,12 +631,18 @@ def to_relative_posix(path: Path, root: Path) -> str:
     return rel.as_posix()
 
 __all__ = [
+    "SKIP_DIRS",
+    "walk_files",
     "iter_text_files",
     "read_text_safe",
+    "decode_text_lines",
     "to_relative_posix",
     "get_content_scoped",
     "scan_cpt_ids",
+    "scan_cpt_ids_from_lines",
     "scan_cdsl_instructions",
+    "scan_cdsl_instructions_from_lines",
     "headings_by_line",
+    "headings_by_line_from_lines",
 ]
 # @cpt-end:cpt-cypilot-algo-traceability-validation-scan-ids:p1:inst-scan-ids-file-utils
@@ -15,6 +15,7 @@ import os
 import re
 import subprocess
 import sys
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional, Tuple
 
@@ -101,11 +102,22 @@ def _apply_template(template: str, org: str, repo: str) -> str:
 
 
 # @cpt-begin:cpt-cypilot-algo-workspace-resolve-git-url:p1:inst-git-clone-or-fetch
-def _clone_if_missing(url: str, local_path: Path, branch: str) -> Optional[Path]:
+def _clone_if_missing(
+    url: str,
+    local_path: Path,
+    branch: str,
+    *,
+    depth: Optional[int] = None,
+    filter_spec: Optional[str] = None,
+    deadline: Optional[float] = None,
+) -> Optional[Path]:
     """Clone a git repo or return existing local path.
 
     For existing repos, returns local_path without network operations.
     Use sync_git_source() to fetch and update worktrees explicitly.
+    *depth* makes a shallow clone (``--depth``) and *filter_spec* a partial
+    clone (e.g. ``blob:none``), so first-time resolution of large sources
+    stays cheap.
     Returns local_path on success, None on clone failure.
     """
     if _parse_git_url(url) is None:
@@ -117,8 +129,12 @@ def _clone_if_missing(url: str, local_path: Path, branch: str) -> Optional[Path]
     clone_args = ["clone", "--quiet"]
     if branch != "HEAD":
         clone_args.extend(["--branch", branch])
+    if depth:
+        clone_args.extend(["--depth", str(int(depth))])
+    if filter_spec:
+        clone_args.append(f"--filter={filter_spec}")
     clone_args.extend([url, str(local_path)])
-    rc, _out, err = _run_git(clone_args)
+    rc, _out, err = _run_git_until(clone_args, deadline=deadline)
     if rc != 0:
         print(f"Warning: git clone failed for {_redact_url(url)}: {err}", file=sys.stderr)
         return None
@@ -127,26 +143,38 @@ def _clone_if_missing(url: str, local_path: Path, branch: str) -> Optional[Path]
 
 
 # @cpt-begin:cpt-cypilot-algo-workspace-resolve-git-url:p1:inst-git-run-command
-def _run_git(args: list, cwd: Optional[Path] = None) -> Tuple[int, str, str]:
+def _run_git(args: list, cwd: Optional[Path] = None, timeout: Optional[float] = None) -> Tuple[int, str, str]:
     """Run a git command via subprocess with timeout.
 
+    *timeout* (seconds) overrides the ``GIT_TIMEOUT`` default.
     Returns (returncode, stdout, stderr).
     Returns (1, "", error_message) if git is not found.
     """
+    limit = _GIT_TIMEOUT if timeout is None else timeout
     try:
         result = subprocess.run(
             ["git"] + args,
             cwd=cwd,
             capture_output=True,
             text=True,
-            timeout=_GIT_TIMEOUT,
+            timeout=limit,
             check=False,
         )
         return (result.returncode, result.stdout, result.stderr)
     except FileNotFoundError:
         return (1, "", "git command not found")
     except subprocess.TimeoutExpired:
-        return (1, "", f"git command timed out after {_GIT_TIMEOUT}s")
+        return (1, "", f"git command timed out after {limit:g}s")
+
+
+def _run_git_until(args: list, cwd: Optional[Path] = None, *, deadline: Optional[float] = None) -> Tuple[int, str, str]:
+    """``_run_git`` bounded by a ``time.monotonic()`` *deadline* shared by several commands."""
+    if deadline is None:
+        return _run_git(args, cwd=cwd)
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return (1, "", "timed out before running git " + (args[0] if args else ""))
+    return _run_git(args, cwd=cwd, timeout=min(remaining, _GIT_TIMEOUT))
 # @cpt-end:cpt-cypilot-algo-workspace-resolve-git-url:p1:inst-git-run-command
 
 
@@ -210,12 +238,16 @@ def resolve_git_source(
     source: "SourceEntry",
     resolve_config: "ResolveConfig",
     workspace_parent: Path,
+    *,
+    deadline: Optional[float] = None,
 ) -> Optional[Path]:
     """Resolve a Git URL source to a local directory path.
 
-    Parses the URL, applies namespace rules, clones on first access.
-    For existing repos, returns local path without network operations.
-    Use sync_git_source() to update worktrees explicitly.
+    Parses the URL, applies namespace rules, clones on first access
+    (shallow/partial when ``resolve_config.clone_depth`` /
+    ``clone_filter`` are set). For existing repos, returns local path
+    without network operations. Use sync_git_source() to update worktrees
+    explicitly.
     Returns the local path on success, None on failure (with stderr warning).
     """
     local_path = _compute_local_path(source, resolve_config, workspace_parent)
@@ -235,7 +267,12 @@ def resolve_git_source(
     branch = getattr(source, "branch", None) or "HEAD"
 
     # Clone or fetch
-    return _clone_if_missing(getattr(source, "url", ""), local_path, branch)
+    return _clone_if_missing(
+        getattr(source, "url", ""), local_path, branch,
+        depth=getattr(resolve_config, "clone_depth", None),
+        filter_spec=getattr(resolve_config, "clone_filter", None),
+        deadline=deadline,
+    )
 # @cpt-end:cpt-cypilot-algo-workspace-resolve-git-url:p1:inst-git-return-path
 # @cpt-end:cpt-cypilot-algo-workspace-resolve-git-url:p1:inst-git-if-fail
 # @cpt-end:cpt-cypilot-algo-workspace-resolve-git-url:p1:inst-git-else-clone
@@ -253,12 +290,12 @@ def resolve_git_source(
 # @cpt-begin:cpt-cypilot-algo-workspace-sync-git-source:p1:inst-sync-else-branch
 # @cpt-begin:cpt-cypilot-algo-workspace-sync-git-source:p1:inst-sync-if-update-fail
 # @cpt-begin:cpt-cypilot-algo-workspace-sync-git-source:p1:inst-sync-return-ok
-def is_worktree_dirty(local_path: Path) -> bool:
+def is_worktree_dirty(local_path: Path, *, deadline: Optional[float] = None) -> bool:
     """Check if a git worktree has uncommitted changes.
 
     Returns True if there are staged, unstaged, or untracked changes.
     """
-    rc, out, _err = _run_git(["status", "--porcelain"], cwd=local_path)
+    rc, out, _err = _run_git_until(["status", "--porcelain"], cwd=local_path, deadline=deadline)
     if rc != 0:
         return True  # Assume dirty on error (safe default)
     return bool(out.strip())
@@ -270,6 +307,7 @@ def sync_git_source(
     workspace_parent: Path,
     *,
     force: bool = False,
+    timeout: Optional[float] = None,
 ) -> dict:
     """Fetch and update worktree for a Git URL source.
 
@@ -283,9 +321,15 @@ def sync_git_source(
     working-tree changes.  For named branches, uses
     ``git checkout -B {branch} origin/{branch}`` which has the same effect.
 
+    *timeout* (seconds) bounds all git commands of this source together
+    (clone, status, fetch, update); by default each command gets
+    ``GIT_TIMEOUT``. Shallow clones are fetched shallow
+    (``resolve_config.clone_depth``).
+
     Returns dict with 'status' ('synced'|'failed') and optional 'error'.
     """
-    local_path = resolve_git_source(source, resolve_config, workspace_parent)
+    deadline = time.monotonic() + timeout if timeout else None
+    local_path = resolve_git_source(source, resolve_config, workspace_parent, deadline=deadline)
     if local_path is None:
         return {"status": "failed", "error": "resolve failed"}
 
@@ -293,7 +337,7 @@ def sync_git_source(
         return {"status": "failed", "error": "not a git repo"}
 
     # Safety check: abort if worktree has uncommitted changes
-    if not force and is_worktree_dirty(local_path):
+    if not force and is_worktree_dirty(local_path, deadline=deadline):
         return {
             "status": "failed",
             "error": "dirty worktree — commit or stash changes, or use --force",
@@ -302,20 +346,26 @@ def sync_git_source(
     branch = getattr(source, "branch", None) or "HEAD"
 
     # Fetch from origin
-    fetch_args = ["fetch", "--quiet", "origin"]
+    fetch_args = ["fetch", "--quiet"]
+    depth = getattr(resolve_config, "clone_depth", None)
+    if depth and (local_path / ".git" / "shallow").exists():
+        # Keep shallow clones shallow; full clones are never truncated.
+        fetch_args.extend(["--depth", str(int(depth))])
+    fetch_args.append("origin")
     if branch != "HEAD":
         fetch_args.append(branch)
-    rc, _out, err = _run_git(fetch_args, cwd=local_path)
+    rc, _out, err = _run_git_until(fetch_args, cwd=local_path, deadline=deadline)
     if rc != 0:
         return {"status": "failed", "error": f"git fetch failed: {err}"}
 
     # Update worktree
     if branch == "HEAD":
-        rc, _out, err = _run_git(["reset", "--hard", "FETCH_HEAD"], cwd=local_path)
+        rc, _out, err = _run_git_until(["reset", "--hard", "FETCH_HEAD"], cwd=local_path, deadline=deadline)
     else:
-        rc, _out, err = _run_git(
+        rc, _out, err = _run_git_until(
             ["checkout", "--quiet", "-B", branch, f"origin/{branch}"],
             cwd=local_path,
+            deadline=deadline,
         )
     if rc != 0:
         return {"status": "failed", "error": f"git update failed: {err}"}
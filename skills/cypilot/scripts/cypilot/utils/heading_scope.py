@@ -0,0 +1,98 @@
+"""
+Cypilot Validator - Heading Scope Map
+
+Compact model of which markdown headings are in scope at each line.
+
+Instead of materialising one list of active headings per line, a
+``HeadingScopeMap`` stores one interval per heading in parallel sorted arrays
+(start line, end line, level, label, parent interval). ``scopes_at(line)``
+finds the innermost interval with a bisect and walks the parent chain, so
+memory is proportional to the number of headings, not the number of lines.
+
+Headings with no label (e.g. a heading that matches no heading constraint)
+still close deeper scopes but do not appear in ``scopes_at``.
+
+For compatibility with the former ``List[List[str]]`` per-line results the
+map also behaves as a read-only sequence indexed by 1-based line number
+(index 0 is always empty).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+class HeadingScopeMap:
+    """Heading intervals of one document, queried by line number."""
+
+    __slots__ = ("line_count", "starts", "ends", "levels", "labels", "parents")
+
+    def __init__(self, events: Iterable[Tuple[int, int, Optional[str]]], line_count: int) -> None:
+        """Build from ``(line, level, label)`` heading events in document order."""
+        self.line_count = max(int(line_count), 0)
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.levels: List[int] = []
+        self.labels: List[Optional[str]] = []
+        self.parents: List[int] = []
+        stack: List[int] = []
+        for line, level, label in events:
+            while stack and self.levels[stack[-1]] >= level:
+                self.ends[stack.pop()] = line - 1
+            self.parents.append(stack[-1] if stack else -1)
+            stack.append(len(self.starts))
+            self.starts.append(line)
+            self.ends.append(self.line_count)
+            self.levels.append(level)
+            self.labels.append(label)
+
+    def innermost(self, line: int) -> Optional[int]:
+        """Index of the innermost heading interval containing *line*, if any."""
+        if line < 1 or line > self.line_count:
+            return None
+        i = bisect_right(self.starts, line) - 1
+        return i if i >= 0 else None
+
+    def scopes_at(self, line: int) -> List[str]:
+        """Labels of the headings in scope at *line*, outermost first."""
+        out: List[str] = []
+        i = self.innermost(line)
+        while i is not None and i >= 0:
+            label = self.labels[i]
+            if label is not None:
+                out.append(label)
+            i = self.parents[i]
+        out.reverse()
+        return out
+
+    def __len__(self) -> int:
+        return self.line_count + 1
+
+    def __getitem__(self, line: int) -> List[str]:
+        if not isinstance(line, int):
+            raise TypeError("HeadingScopeMap indices must be line numbers")
+        if line < 0:
+            line += len(self)
+        if line < 0 or line >= len(self):
+            raise IndexError(line)
+        return self.scopes_at(line)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for line in range(len(self)):
+            yield self.scopes_at(line)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (HeadingScopeMap, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"HeadingScopeMap(headings={len(self.starts)}, line_count={self.line_count})"
+
+
+__all__ = [
+    "HeadingScopeMap",
+]
@@ -0,0 +1,204 @@
+"""
+Cypilot Validator - ID Grammar
+
+Compiled resolver for the ``cpt-{system}-{kind}-{slug}`` structure of Cypilot
+IDs, shared by structure validation, cross-validation and the ID query
+commands.
+
+- Systems are matched by a longest-prefix trie over hyphen-separated tokens
+  (nested hierarchy prefixes such as ``app`` / ``app-auth`` resolve to the
+  longest registered slug).
+- ``-{kind}-`` tokens are found by a single left-to-right pass over the ID's
+  tokens against a trie of kind token sequences, instead of one ``find`` per
+  kind.
+- ``parse(id) -> (system, kind)`` is memoized per grammar, and grammars are
+  cached per (systems, kinds, composite kinds) so one context/validation run
+  compiles each grammar once.
+
+Matching is case-insensitive; IDs are lowercased before lookup.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+# token -> (child trie, value stored at this node)
+_Trie = Dict[str, Tuple["_Trie", Optional[str]]]
+
+
+def _trie_insert(trie: _Trie, tokens: List[str], value: str) -> None:
+    node = trie
+    for i, tok in enumerate(tokens):
+        child, stored = node.get(tok, ({}, None))
+        if i == len(tokens) - 1 and stored is None:
+            stored = value
+        node[tok] = (child, stored)
+        node = child
+
+
+class IdGrammar:
+    """System/kind resolver for one set of registered systems and kind tokens."""
+
+    def __init__(
+        self,
+        systems: Iterable[str],
+        kind_tokens: Iterable[str] = (),
+        composite_kinds: Optional[Mapping[str, Iterable[str]]] = None,
+    ) -> None:
+        self._systems: _Trie = {}
+        self.has_systems = False
+        # Longer slugs first so a case-insensitive duplicate keeps the longest spelling's value.
+        for s in sorted({str(s) for s in systems if str(s).strip()}, key=len, reverse=True):
+            _trie_insert(self._systems, s.lower().split("-"), s)
+            self.has_systems = True
+        self.kind_tokens: FrozenSet[str] = frozenset(str(k).strip().lower() for k in kind_tokens if str(k).strip())
+        self._kinds: _Trie = {}
+        for k in sorted(self.kind_tokens):
+            _trie_insert(self._kinds, k.split("-"), k)
+        self._composite: Dict[str, FrozenSet[str]] = {
+            str(base).strip().lower(): frozenset(str(n).strip().lower() for n in nested)
+            for base, nested in (composite_kinds or {}).items()
+        }
+        self._match_memo: Dict[str, Optional[str]] = {}
+        self._parse_memo: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    # -- systems -----------------------------------------------------------
+
+    def match_system(self, cpt: str) -> Optional[str]:
+        """Longest registered system whose ``cpt-{system}-`` prefix starts *cpt*."""
+        try:
+            return self._match_memo[cpt]
+        except KeyError:
+            pass
+        best: Optional[str] = None
+        tokens = cpt.lower().split("-")
+        if tokens[0] == "cpt":
+            node = self._systems
+            # A prefix needs a following "-", i.e. at least one token after it.
+            for i in range(1, len(tokens) - 1):
+                entry = node.get(tokens[i])
+                if entry is None:
+                    break
+                node, value = entry
+                if value is not None:
+                    best = value
+        self._match_memo[cpt] = best
+        return best
+
+    def split_system(self, cpt: str) -> Tuple[Optional[str], str]:
+        """``(system, remainder after "cpt-{system}-")``; ``(None, "")`` when no system matches."""
+        system = self.match_system(cpt)
+        if system is None:
+            return None, ""
+        return system, cpt[len(system) + 5:]
+
+    def is_external(self, cpt: str) -> bool:
+        """True for ``cpt-`` IDs whose system is not registered (only when systems are registered)."""
+        if not self.has_systems or not cpt.lower().startswith("cpt-"):
+            return False
+        return self.match_system(cpt) is None
+
+    # -- kinds -------------------------------------------------------------
+
+    def kind_positions(self, text: str) -> Dict[str, int]:
+        """First character offset (> 0) of each ``-{kind}-`` marker in lowercase *text*."""
+        found: Dict[str, int] = {}
+        tokens = text.split("-")
+        offset = 0
+        for i, tok in enumerate(tokens):
+            if i > 0 and offset > 1:
+                node = self._kinds
+                for j in range(i, len(tokens) - 1):
+                    entry = node.get(tokens[j])
+                    if entry is None:
+                        break
+                    node, value = entry
+                    if value is not None and value not in found:
+                        found[value] = offset - 1
+            offset += len(tok) + 1
+        return found
+
+    def system_of(self, cpt: str) -> Optional[str]:
+        """Registered system of *cpt*; without registered systems, infer it from kind tokens."""
+        if not cpt.lower().startswith("cpt-"):
+            return None
+        if self.has_systems:
+            return self.match_system(cpt)
+        # No registered systems (kit examples): prefer the RIGHTMOST kind-token
+        # split (longest system) so system names containing kind tokens
+        # (e.g. "task-flow" with kind "flow") are not truncated.
+        remainder = cpt[4:].lower()
+        positions = self.kind_positions(remainder)
+        if positions:
+            return remainder[:max(positions.values())]
+        parts = cpt.split("-")
+        return parts[1].lower() if len(parts) >= 3 else None
+
+    def kind_of(self, cpt: str, system: Optional[str]) -> Optional[str]:
+        """Kind of *cpt* given its *system* (composite and subsystem-segment aware)."""
+        if system is None or not cpt.lower().startswith(f"cpt-{system}-".lower()):
+            return None
+        remainder = cpt[len(system) + 5:]
+        parts = [p for p in remainder.split("-") if p]
+        if not parts:
+            return None
+        base = parts[0].strip().lower()
+        nested_kinds = self._composite.get(base)
+        if nested_kinds and len(parts) >= 4:
+            for p in reversed(parts[2:]):
+                pp = p.strip().lower()
+                if pp in nested_kinds and pp != base:
+                    return pp
+        # Standard IDs are cpt-{system}-{kind}-{slug}; with a registered root
+        # system (e.g. "cf") authors may add a subsystem segment before the
+        # kind (e.g. "cf-errors"), so fall back to the leftmost kind marker.
+        if base in self.kind_tokens:
+            return base
+        positions = self.kind_positions(remainder.lower())
+        if positions:
+            return min(positions, key=lambda k: (positions[k], -len(k)))
+        return base
+
+    def parse(self, cpt: str) -> Tuple[Optional[str], Optional[str]]:
+        """Memoized ``(system, kind)`` of *cpt*."""
+        try:
+            return self._parse_memo[cpt]
+        except KeyError:
+            pass
+        system = self.system_of(cpt)
+        result = (system, self.kind_of(cpt, system))
+        self._parse_memo[cpt] = result
+        return result
+
+
+@lru_cache(maxsize=64)
+def _compiled(
+    systems: FrozenSet[str],
+    kind_tokens: FrozenSet[str],
+    composite: FrozenSet[Tuple[str, FrozenSet[str]]],
+) -> IdGrammar:
+    return IdGrammar(systems, kind_tokens, dict(composite))
+
+
+def compile_id_grammar(
+    systems: Optional[Iterable[str]],
+    kind_tokens: Iterable[str] = (),
+    composite_kinds: Optional[Mapping[str, Iterable[str]]] = None,
+) -> IdGrammar:
+    """Return the shared (cached) grammar for these systems, kinds and composite kinds."""
+    composite = frozenset(
+        (str(base).strip().lower(), frozenset(str(n).strip().lower() for n in nested))
+        for base, nested in (composite_kinds or {}).items()
+    )
+    return _compiled(
+        frozenset(str(s) for s in (systems or ()) if str(s).strip()),
+        frozenset(str(k).strip().lower() for k in kind_tokens if str(k).strip()),
+        composite,
+    )
+
+
+__all__ = [
+    "IdGrammar",
+    "compile_id_grammar",
+]
@@ -0,0 +1,192 @@
+"""
+Cypilot Validator - Inverted ID Index
+
+Maps each Cypilot ID to every place it occurs: artifact definitions and
+references (with artifact type, line, checkbox state and workspace source)
+and, optionally, code scope/block/inline markers.
+
+The index is built in one pass over the per-file ID hits of an
+``ArtifactScanCache``; when that cache is backed by the persistent
+``ParseIndex`` (``{adapter_dir}/cache/index.json``) unchanged files are not
+re-read, and code marker summaries are restored from the same index. After
+the build every query is a dictionary lookup, so resolving many IDs costs
+one scan instead of one scan per ID.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .codebase import CodeFile
+    from .parse_index import ParseIndex
+    from .scan_cache import ArtifactScanCache
+
+# (artifact, artifact_type, line, hit type, checked, source)
+ArtifactHit = Tuple[str, str, int, str, bool, Optional[str]]
+
+
+class IdIndex:
+    """ID → occurrences lookup table over a fixed set of artifacts and code files."""
+
+    def __init__(self) -> None:
+        self._artifact_hits: Dict[str, List[ArtifactHit]] = {}
+        self._code_refs: Dict[str, List[Dict[str, object]]] = {}
+        self.artifacts_scanned = 0
+        self.code_files_scanned = 0
+
+    @classmethod
+    def build(
+        cls,
+        artifacts: Sequence[Tuple[Path, str]],
+        *,
+        path_to_source: Optional[Dict[str, str]] = None,
+        scan_cache: Optional["ArtifactScanCache"] = None,
+    ) -> "IdIndex":
+        """Index the ID hits of *artifacts* (``(path, artifact_type)`` pairs)."""
+        from .scan_cache import ArtifactScanCache
+
+        cache = scan_cache if scan_cache is not None else ArtifactScanCache()
+        sources = path_to_source or {}
+        idx = cls()
+        for artifact_path, artifact_type in artifacts:
+            path_s = str(artifact_path)
+            source = sources.get(path_s)
+            for h in cache.id_hits(artifact_path):
+                id_value = str(h.get("id") or "")
+                if not id_value:
+                    continue
+                idx._artifact_hits.setdefault(id_value, []).append((
+                    path_s,
+                    artifact_type,
+                    int(h.get("line", 1) or 1),
+                    str(h.get("type")),
+                    bool(h.get("checked", False)),
+                    source,
+                ))
+        idx.artifacts_scanned = len(artifacts)
+        return idx
+
+    def add_code_files(self, code_files: Iterable["CodeFile"]) -> None:
+        """Index the marker references of parsed *code_files*."""
+        for cf in code_files:
+            self.code_files_scanned += 1
+            for ref in cf.references:
+                r: Dict[str, object] = {
+                    "file": str(cf.path),
+                    "line": ref.line,
+                    "marker_type": ref.marker_type,
+                    "kind": ref.kind or "code",
+                }
+                if ref.phase is not None:
+                    r["phase"] = ref.phase
+                if ref.inst:
+                    r["inst"] = ref.inst
+                self._code_refs.setdefault(ref.id, []).append(r)
+
+    def definitions(self, id_value: str) -> List[Dict[str, object]]:
+        """Artifact definitions of *id_value*, in scan order."""
+        out: List[Dict[str, object]] = []
+        for path_s, artifact_type, line, hit_type, checked, source in self._artifact_hits.get(id_value, ()):
+            if hit_type != "definition":
+                continue
+            d: Dict[str, object] = {
+                "artifact": path_s,
+                "artifact_type": artifact_type,
+                "line": line,
+                "kind": None,
+                "checked": checked,
+            }
+            if source:
+                d["source"] = source
+            out.append(d)
+        return out
+
+    def references(self, id_value: str, *, include_definitions: bool = False) -> List[Dict[str, object]]:
+        """Artifact references of *id_value*, sorted by artifact and line."""
+        out: List[Dict[str, object]] = []
+        for path_s, artifact_type, line, hit_type, checked, source in self._artifact_hits.get(id_value, ()):
+            if hit_type == "definition" and not include_definitions:
+                continue
+            r: Dict[str, object] = {
+                "artifact": path_s,
+                "artifact_type": artifact_type,
+                "line": line,
+                "kind": None,
+                "type": hit_type,
+                "checked": checked,
+            }
+            if source:
+                r["source"] = source
+            out.append(r)
+        return sorted(out, key=lambda r: (str(r.get("artifact", "")), int(r.get("line", 0))))
+
+    def code_references(self, id_value: str) -> List[Dict[str, object]]:
+        """Code markers referencing *id_value*, sorted by file and line."""
+        refs = self._code_refs.get(id_value, [])
+        return sorted(refs, key=lambda r: (str(r.get("file", "")), int(r.get("line", 0))))
+
+
+def codebase_paths(ctx: object) -> List[Path]:
+    """Every registered codebase file of *ctx*, in registry order."""
+    from .codebase import collect_code_files
+
+    meta = getattr(ctx, "meta", None)
+    project_root = getattr(ctx, "project_root", None)
+    if meta is None or not isinstance(project_root, Path):
+        return []
+    paths: List[Path] = []
+    for cb_entry, _system_node in meta.iter_all_codebase():
+        code_path = (project_root / cb_entry.path).resolve()
+        if not code_path.exists():
+            continue
+        paths.extend(collect_code_files(code_path, cb_entry.extensions or [".py"], project_root=project_root, meta=meta))
+    return paths
+
+
+def _load_codebase_files(ctx: object, index: Optional["ParseIndex"] = None) -> List["CodeFile"]:
+    """Parse every registered codebase file of *ctx* (cached summaries from *index*)."""
+    from .codebase import load_code_files
+
+    return [cf for cf, errs in load_code_files(codebase_paths(ctx), index) if cf is not None and not errs]
+
+
+def build_id_index(
+    ctx: object,
+    artifacts: Sequence[Tuple[Path, str]],
+    path_to_source: Dict[str, str],
+    *,
+    include_code: bool = False,
+    use_cache: bool = True,
+) -> IdIndex:
+    """Build the ID index a query command needs.
+
+    Reuses the process-wide scan cache when one is installed (``cpt serve``);
+    otherwise scans through the persistent parse index under
+    ``{adapter_dir}/cache/`` (unless *use_cache* is False) and saves it back.
+    """
+    from .parse_index import ParseIndex
+    from .scan_cache import ArtifactScanCache, get_shared_scan_cache
+
+    parse_index: Optional[ParseIndex] = None
+    scan_cache = get_shared_scan_cache()
+    if scan_cache is None:
+        adapter_dir = getattr(ctx, "adapter_dir", None)
+        if use_cache and isinstance(adapter_dir, Path):
+            parse_index = ParseIndex.for_adapter(adapter_dir)
+        scan_cache = ArtifactScanCache(parse_index)
+
+    idx = IdIndex.build(artifacts, path_to_source=path_to_source, scan_cache=scan_cache)
+    if include_code:
+        idx.add_code_files(_load_codebase_files(ctx, parse_index))
+    if parse_index is not None:
+        parse_index.save()
+    return idx
+
+
+__all__ = [
+    "IdIndex",
+    "build_id_index",
+    "codebase_paths",
+]
@@ -0,0 +1,65 @@
+"""
+Cypilot Validator - Single-Pass Line Reader
+
+Runs several per-line scanners over the decoded lines of one artifact in a
+single loop.
+
+Each scanner is a ``LineVisitor``: ``run_line_pass`` walks the lines once,
+tracks ``` fences and strips each line once, and hands every line to every
+active visitor. ID, CDSL, heading and content-language scans are all
+visitors, so adding a check adds a visitor to the loop rather than another
+full pass over the file.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, List, Mapping, Sequence
+
+_CODE_FENCE_RE = re.compile(r"^\s*```")
+
+
+class LineVisitor:
+    """A per-line scanner fed by ``run_line_pass``."""
+
+    __slots__ = ()
+
+    def start(self, lines: Sequence[str]) -> bool:  # pylint: disable=unused-argument  # hook for subclasses
+        """Prepare for *lines*; return False to skip the per-line visits entirely."""
+        return True
+
+    def visit(self, lineno: int, raw: str, stripped: str, fenced: bool) -> None:  # pylint: disable=unused-argument  # hook for subclasses
+        """Consume one line; the default ignores it.
+
+        *lineno* is 1-based, *stripped* is ``raw.strip()`` and *fenced* is True
+        for ``` fence lines and every line between them.
+        """
+        return None
+
+    def result(self) -> object:
+        """Return what was collected; the default collects nothing."""
+        return None
+
+
+def run_line_pass(lines: Sequence[str], visitors: Mapping[str, LineVisitor]) -> Dict[str, object]:
+    """Feed *lines* to every visitor in one loop; return ``{name: visitor.result()}``."""
+    visits: List[Callable[[int, str, str, bool], None]] = [v.visit for v in visitors.values() if v.start(lines)]
+    if visits:
+        fence_match = _CODE_FENCE_RE.match
+        in_fence = False
+        for lineno, raw in enumerate(lines, 1):
+            if fence_match(raw) is not None:
+                in_fence = not in_fence
+                fenced = True
+            else:
+                fenced = in_fence
+            stripped = raw.strip()
+            for visit in visits:
+                visit(lineno, raw, stripped, fenced)
+    return {name: v.result() for name, v in visitors.items()}
+
+
+__all__ = [
+    "LineVisitor",
+    "run_line_pass",
+]
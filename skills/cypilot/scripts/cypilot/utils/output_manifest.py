@@ -0,0 +1,206 @@
+"""
+Cypilot - Generated Output Manifest
+
+Change detection and write coalescing for files emitted by
+``generate-agents``. Every output is first *staged*: its content hash is
+compared with the hash of what is on disk, and only a differing output is
+queued. ``flush`` then writes the queue in one batch, each file through a
+temporary sibling and ``os.replace`` so a reader never sees a half-written
+file.
+
+The manifest stored at ``{adapter_dir}/cache/generated.json`` records, per
+output path, the sha256 of its text and the ``(mtime_ns, size)`` signature
+it had when the hash was taken. While the signature still matches, the
+recorded hash is trusted and the file is not read, so re-running the
+generator on an unchanged project only stats its outputs. A moved
+signature falls back to reading and hashing the file. Hashes are taken over
+the text as read with universal newlines, matching the string comparison
+the generator used before.
+
+The whole manifest is discarded when the cypilot version changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .parse_index import CACHE_DIRNAME, load_json_cache, save_json_cache
+from .scan_cache import file_signature
+
+OUTPUT_MANIFEST_SCHEMA = 1
+OUTPUT_MANIFEST_FILENAME = "generated.json"
+
+ACTION_CREATED = "created"
+ACTION_UPDATED = "updated"
+ACTION_UNCHANGED = "unchanged"
+
+
+def _manifest_header() -> Dict[str, object]:
+    from .. import __version__
+
+    return {"schema": OUTPUT_MANIFEST_SCHEMA, "cypilot_version": __version__}
+
+
+def text_digest(text: str) -> str:
+    """SHA-256 hex digest of *text* encoded as UTF-8."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class OutputManifest:
+    """Content hashes of generated outputs plus a queue of pending writes.
+
+    With ``path=None`` nothing is persisted; the instance still coalesces
+    writes and skips unchanged outputs for the lifetime of one run.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self._files: Dict[str, Dict[str, object]] = {}
+        self._pending: Dict[str, Tuple[str, str]] = {}
+        self._made_dirs: set = set()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "OutputManifest":
+        """Load the manifest at *path*; a missing, corrupt or outdated file yields an empty one."""
+        manifest = cls(path)
+        manifest._files, manifest._dirty = load_json_cache(path, _manifest_header(), "files")
+        return manifest
+
+    @classmethod
+    def for_adapter(cls, adapter_dir: Path) -> "OutputManifest":
+        """Load the manifest stored under ``{adapter_dir}/cache/``."""
+        return cls.load(adapter_dir / CACHE_DIRNAME / OUTPUT_MANIFEST_FILENAME)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    @property
+    def pending(self) -> List[str]:
+        """Paths queued for writing, in staging order."""
+        return list(self._pending)
+
+    def _record(self, key: str, digest: str) -> None:
+        sig = file_signature(key)
+        if sig is None:
+            if self._files.pop(key, None) is not None:
+                self._dirty = True
+            return
+        entry = {"sha256": digest, "mtime_ns": sig[0], "size": sig[1]}
+        if self._files.get(key) != entry:
+            self._files[key] = entry
+            self._dirty = True
+
+    def current_digest(self, path: Path) -> Optional[str]:
+        """Hash of the text *path* will hold after ``flush``; None when it will not exist.
+
+        A queued write wins over the disk; a file whose signature matches
+        its manifest entry is not read.
+        """
+        key = path.as_posix()
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending[1]
+        sig = file_signature(key)
+        if sig is None:
+            return None
+        entry = self._files.get(key)
+        if entry is not None and (entry.get("mtime_ns"), entry.get("size")) == sig:
+            return str(entry.get("sha256"))
+        digest = _read_digest(path)
+        if digest is None:
+            # Unreadable outputs always count as changed
+            return ""
+        self._record(key, digest)
+        return digest
+
+    def stage(self, path: Path, content: str, dry_run: bool = False) -> str:
+        """Compare *content* with *path* and queue a write unless unchanged or *dry_run*.
+
+        Returns ``created``, ``updated`` or ``unchanged``.
+        """
+        digest = text_digest(content)
+        current = self.current_digest(path)
+        if current == digest:
+            return ACTION_UNCHANGED
+        if not dry_run:
+            self._pending[path.as_posix()] = (content, digest)
+        return ACTION_CREATED if current is None else ACTION_UPDATED
+
+    def flush(self) -> int:
+        """Write every queued output atomically and persist the manifest.
+
+        Returns the number of files written. On a write error the failing
+        output and all later ones stay queued and the error is raised.
+        """
+        written = 0
+        try:
+            for key in list(self._pending):
+                content, digest = self._pending[key]
+                _atomic_write_text(Path(key), content, self._made_dirs)
+                del self._pending[key]
+                self._record(key, digest)
+                written += 1
+        finally:
+            self.save()
+        return written
+
+    def save(self) -> bool:
+        """Write the manifest if it changed; entries for deleted files are dropped.
+
+        Returns True when the file was written.
+        """
+        if self.path is None:
+            return False
+        written = save_json_cache(self.path, _manifest_header(), "files", self._files, dirty=self._dirty)
+        if written:
+            self._dirty = False
+        return written
+
+
+def _read_digest(path: Path) -> Optional[str]:
+    """``text_digest`` of the file at *path*, or None when it cannot be read as UTF-8."""
+    try:
+        return text_digest(path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _atomic_write_text(path: Path, content: str, made_dirs: set) -> None:
+    """Replace *path* with *content* via a temporary sibling, keeping its permission bits.
+
+    A symlinked *path* is resolved first, so the link's target is rewritten
+    and the link itself is kept.
+    """
+    path = path.resolve()
+    parent = path.parent
+    if parent not in made_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        made_dirs.add(parent)
+    tmp = parent / f".{path.name}.{os.getpid()}.tmp"
+    try:
+        tmp.write_text(content, encoding="utf-8")
+        try:
+            os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+__all__ = [
+    "ACTION_CREATED",
+    "ACTION_UNCHANGED",
+    "ACTION_UPDATED",
+    "OUTPUT_MANIFEST_FILENAME",
+    "OutputManifest",
+    "text_digest",
+]
@@ -0,0 +1,76 @@
+"""
+Cypilot Validator - Parallel File Mapping
+
+Order-preserving process-pool map for CPU-bound per-file parsing
+(code-marker scans, coverage scans).
+
+Small inputs and ``jobs <= 1`` run in-process; a pool that cannot be started
+or breaks mid-run falls back to the serial path, so callers always get one
+result per input in input order.
+
+Workers import *fn* by module name. When the package was loaded from a file
+spec without its directory on ``sys.path`` (the ``cpt`` proxy's in-process
+mode), spawn/forkserver workers could not import ``cypilot``; the package's
+parent directory is therefore put on ``sys.path`` while the pool is alive,
+which start methods pass on to the workers they launch.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Below this many inputs process start-up costs more than the parsing itself.
+MIN_PARALLEL_ITEMS = 64
+
+
+def default_jobs() -> int:
+    """Default worker count: the number of CPUs available to this process."""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        return max(1, os.cpu_count() or 1)
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Normalize a ``--jobs`` value (None → CPU count, values below 1 → 1)."""
+    if jobs is None:
+        return default_jobs()
+    return max(1, int(jobs))
+
+
+def map_ordered(fn: Callable[[T], R], items: Sequence[T], jobs: int) -> List[R]:
+    """Apply module-level *fn* to every item, spreading chunks across *jobs* processes.
+
+    *fn* and its arguments/results must be picklable. Results are returned in
+    input order.
+    """
+    items = list(items)
+    if jobs <= 1 or len(items) < MIN_PARALLEL_ITEMS:
+        return [fn(it) for it in items]
+    workers = min(jobs, len(items))
+    chunksize = max(1, -(-len(items) // (workers * 4)))
+    # Directory holding the cypilot package, so workers import the same copy
+    import_root = str(Path(__file__).resolve().parents[2])
+    sys.path.insert(0, import_root)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            return list(ex.map(fn, items, chunksize=chunksize))
+    except (BrokenProcessPool, OSError, NotImplementedError, ImportError):
+        return [fn(it) for it in items]
+    finally:
+        sys.path.remove(import_root)
+
+
+__all__ = [
+    "MIN_PARALLEL_ITEMS",
+    "map_ordered",
+    "resolve_jobs",
+]
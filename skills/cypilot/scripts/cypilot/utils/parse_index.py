@@ -0,0 +1,234 @@
+"""
+Cypilot Validator - Persistent Parse Index
+
+On-disk cache of per-file parse results shared across ``cpt validate`` runs.
+
+Each file entry is keyed by its resolved path and records the file's
+``mtime_ns``, ``size`` and SHA-256 content hash together with named parse
+facets (e.g. ``"artifact"`` for ID/CDSL/heading scans, ``"code"`` for
+traceability marker summaries). An entry is reused when the ``(mtime_ns, size)``
+signature matches; when only the mtime differs (fresh checkout, restored CI
+cache) the content hash decides.
+
+The whole index is discarded when the cypilot version or the parser regex
+fingerprint changes, so parser fixes never serve stale results.
+
+Stored at ``{adapter_dir}/cache/index.json``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from .records import json_default
+from .scan_cache import FileSignature, file_signature
+
+PathLike = Union[str, Path]
+
+INDEX_SCHEMA = 1
+CACHE_DIRNAME = "cache"
+INDEX_FILENAME = "index.json"
+
+
+def regex_fingerprint() -> str:
+    """Hash of every compiled regex used by the artifact and code-marker parsers."""
+    from . import codebase, constraints, document, line_pass
+
+    h = hashlib.sha256()
+    for mod in (document, line_pass, constraints, codebase):
+        for name, value in sorted(vars(mod).items()):
+            if isinstance(value, re.Pattern):
+                h.update(f"{mod.__name__}.{name}:{value.flags}:{value.pattern}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _index_header() -> Dict[str, object]:
+    from .. import __version__
+
+    return {
+        "schema": INDEX_SCHEMA,
+        "cypilot_version": __version__,
+        "regex_fingerprint": regex_fingerprint(),
+    }
+
+
+def prepare_cache_dir(cache_dir: Path) -> None:
+    """Create an adapter cache directory that git ignores wholesale."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    gitignore = cache_dir / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text("*\n", encoding="utf-8")
+
+
+def load_json_cache(path: Path, header: Dict[str, object], key: str) -> Tuple[Dict[str, Dict[str, object]], bool]:
+    """Entries stored under *key* in the JSON cache at *path*, and whether it must be rewritten.
+
+    A missing or corrupt file yields no entries; a file whose header differs
+    from *header* yields none and is flagged for rewriting.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}, False
+    if not isinstance(data, dict) or data.get("header") != header:
+        return {}, True
+    entries = data.get(key)
+    if not isinstance(entries, dict):
+        return {}, False
+    return {k: v for k, v in entries.items() if isinstance(v, dict)}, False
+
+
+def save_json_cache(
+    path: Path,
+    header: Dict[str, object],
+    key: str,
+    entries: Dict[str, Dict[str, object]],
+    *,
+    dirty: bool,
+    exists: Callable[[str], bool] = os.path.exists,
+    default: Optional[Callable[[object], object]] = None,
+) -> bool:
+    """Drop entries whose path fails *exists*, then atomically rewrite *path* if anything changed.
+
+    Returns True when the file was written. Write failures are ignored —
+    these caches are a pure optimization.
+    """
+    stale = [k for k in entries if not exists(k)]
+    for k in stale:
+        del entries[k]
+    if not dirty and not stale:
+        return False
+    payload = {"header": header, key: entries}
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        prepare_cache_dir(path.parent)
+        tmp.write_text(json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=default), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def content_digest(raw: bytes) -> str:
+    """SHA-256 hex digest of raw file content."""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _digest_file(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return content_digest(f.read())
+    except OSError:
+        return None
+
+
+class ParseIndex:
+    """Persistent per-file parse results, validated by signature and content hash."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._files: Dict[str, Dict[str, object]] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "ParseIndex":
+        """Load the index at *path*; a missing, corrupt or outdated file yields an empty index."""
+        idx = cls(path)
+        idx._files, idx._dirty = load_json_cache(path, _index_header(), "files")
+        return idx
+
+    @classmethod
+    def for_adapter(cls, adapter_dir: Path) -> "ParseIndex":
+        """Load the index stored under ``{adapter_dir}/cache/``."""
+        return cls.load(adapter_dir / CACHE_DIRNAME / INDEX_FILENAME)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    @staticmethod
+    def _key(path: PathLike) -> str:
+        return str(Path(path).resolve())
+
+    def get(self, path: PathLike, facet: str) -> Optional[object]:
+        """Return stored *facet* data for *path* if the file is unchanged, else None."""
+        key = self._key(path)
+        rec = self._files.get(key)
+        facets = rec.get("facets") if rec is not None else None
+        if not isinstance(facets, dict) or facet not in facets:
+            self.misses += 1
+            return None
+        sig = file_signature(key)
+        if sig is None:
+            self.misses += 1
+            return None
+        if (rec.get("mtime_ns"), rec.get("size")) != sig:
+            if rec.get("size") != sig[1] or _digest_file(key) != rec.get("sha256"):
+                self.misses += 1
+                return None
+            rec["mtime_ns"] = sig[0]
+            self._dirty = True
+        self.hits += 1
+        return facets[facet]
+
+    def put(
+        self,
+        path: PathLike,
+        facet: str,
+        data: object,
+        *,
+        signature: Optional[FileSignature],
+        digest: Optional[str] = None,
+    ) -> None:
+        """Store *facet* data for *path* parsed at *signature*.
+
+        Nothing is stored when the file changed since *signature* was taken.
+        *digest* is computed from the file when not supplied.
+        """
+        key = self._key(path)
+        if signature is None or file_signature(key) != signature:
+            return
+        if digest is None:
+            digest = _digest_file(key)
+            if digest is None:
+                return
+        rec = self._files.get(key)
+        if rec is None or rec.get("sha256") != digest or not isinstance(rec.get("facets"), dict):
+            rec = {"sha256": digest, "facets": {}}
+            self._files[key] = rec
+        rec["mtime_ns"], rec["size"] = signature
+        rec["facets"][facet] = data
+        self._dirty = True
+
+    def save(self) -> bool:
+        """Write the index if it changed; entries for deleted files are dropped.
+
+        Returns True when the file was written.
+        """
+        written = save_json_cache(
+            self.path, _index_header(), "files", self._files, dirty=self._dirty, default=json_default,
+        )
+        if written:
+            self._dirty = False
+        return written
+
+
+__all__ = [
+    "CACHE_DIRNAME",
+    "ParseIndex",
+    "content_digest",
+    "load_json_cache",
+    "prepare_cache_dir",
+    "regex_fingerprint",
+    "save_json_cache",
+]
@@ -0,0 +1,255 @@
+"""
+Cypilot Validator - Pipeline Records
+
+Compact ``__slots__`` record types used inside the validation pipeline in
+place of per-item dicts:
+
+- ``IdHit``: one ID occurrence found by ``scan_cpt_ids``.
+- ``IdRow``: one indexed hit in ``cross_validate_artifacts``.
+- ``Issue``: one validation error or warning (the ``error()`` factories).
+
+Records are read like the dicts they replace (``get``, ``[]``, ``in``,
+``keys``/``items``), so formatters and callers written against the dict form
+keep working; hot paths use attribute access. ``Issue`` is also mutable like
+a dict (``issue["reasons"] = ...``, ``issue.pop("path")``) for enrichment.
+
+Records become plain dicts only at the JSON boundary: pass ``json_default``
+as ``json.dumps(..., default=json_default)`` or call ``to_dict()``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, ClassVar, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class _Record:
+    """Dict-compatible read access over a slotted record."""
+
+    __slots__ = ()
+    # Field order of the dict form.
+    _fields: ClassVar[Tuple[str, ...]] = ()
+    # Fields left out of the dict form while None (keys the dict form only had sometimes).
+    _optional: ClassVar[FrozenSet[str]] = frozenset()
+
+    def _lookup(self, key: str) -> object:
+        if key not in self._fields:
+            return _MISSING
+        v = getattr(self, key)
+        if v is None and key in self._optional:
+            return _MISSING
+        return v
+
+    def to_dict(self) -> Dict[str, object]:
+        """Plain-dict form (the pre-record JSON shape)."""
+        out: Dict[str, object] = {}
+        for f in self._fields:
+            v = getattr(self, f)
+            if v is None and f in self._optional:
+                continue
+            out[f] = v
+        return out
+
+    def get(self, key: str, default: Any = None) -> Any:
+        v = self._lookup(key)
+        return default if v is _MISSING else v
+
+    def __getitem__(self, key: str) -> Any:
+        v = self._lookup(key)
+        if v is _MISSING:
+            raise KeyError(key)
+        return v
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._lookup(key) is not _MISSING
+
+    def keys(self) -> List[str]:
+        return list(self.to_dict())
+
+    def items(self) -> List[Tuple[str, object]]:
+        return list(self.to_dict().items())
+
+    def values(self) -> List[object]:
+        return list(self.to_dict().values())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class IdHit(_Record):
+    """One Cypilot ID occurrence in an artifact (definition or reference)."""
+
+    __slots__ = ("id", "line", "type", "checked", "has_task", "has_priority", "priority")
+    _fields = __slots__
+    _optional = frozenset({"has_task", "has_priority", "priority"})
+
+    def __init__(
+        self,
+        id: str,  # pylint: disable=redefined-builtin  # mirrors the "id" key of the dict form
+        line: int,
+        type: str,  # pylint: disable=redefined-builtin  # mirrors the "type" key of the dict form
+        checked: bool,
+        has_task: Optional[bool] = None,
+        has_priority: Optional[bool] = None,
+        priority: Optional[str] = None,
+    ) -> None:
+        self.id = id
+        self.line = line
+        self.type = type
+        self.checked = checked
+        self.has_task = has_task
+        self.has_priority = has_priority
+        self.priority = priority
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "IdHit":
+        return cls(
+            d.get("id"), d.get("line"), d.get("type"), d.get("checked"),
+            d.get("has_task"), d.get("has_priority"), d.get("priority"),
+        )
+
+
+class IdRow(_Record):
+    """A scanned ID hit resolved to its artifact, system, kind and heading scope."""
+
+    __slots__ = (
+        "id", "line", "checked", "priority", "has_task", "has_priority",
+        "artifact_kind", "artifact_path", "system", "id_kind", "headings",
+    )
+    _fields = __slots__
+
+    def __init__(
+        self,
+        hit: IdHit,
+        artifact_kind: str,
+        artifact_path: object,
+        system: Optional[str],
+        id_kind: Optional[str],
+        headings: List[str],
+    ) -> None:
+        self.id = hit.id
+        self.line = int(hit.line or 1)
+        self.checked = bool(hit.checked)
+        self.priority = hit.priority
+        self.has_task = bool(hit.has_task)
+        self.has_priority = bool(hit.has_priority)
+        self.artifact_kind = artifact_kind
+        self.artifact_path = artifact_path
+        self.system = system
+        self.id_kind = id_kind
+        self.headings = headings
+
+
+class Issue(_Record):
+    """A validation error or warning.
+
+    ``location`` (``PATH:LINE``) is derived on demand; any keyword details
+    beyond the core fields live in a per-issue ``extra`` dict.
+    """
+
+    __slots__ = ("type", "message", "line", "code", "path", "extra", "_location")
+    _fields = ("type", "message", "line", "code", "path", "location")
+    _optional = frozenset(_fields)
+
+    def __init__(
+        self,
+        type: str,  # pylint: disable=redefined-builtin  # mirrors the "type" key of the dict form
+        message: str,
+        line: int,
+        path: Optional[str],
+        code: Optional[str] = None,
+        extra: Optional[Dict[str, object]] = None,
+    ) -> None:
+        self.type = type
+        self.message = message
+        self.line = line
+        self.code = code or None
+        self.path = path
+        self.extra = extra or None
+        self._location: Optional[str] = None
+
+    @property
+    def location(self) -> Optional[str]:
+        path_s = self.path
+        if self._location is not None or path_s is None:
+            return self._location
+        return f"{path_s}:{self.line}" if (path_s and not path_s.startswith("<")) else path_s
+
+    def _lookup(self, key: str) -> object:
+        if key in self._fields:
+            return super()._lookup(key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        return _MISSING
+
+    def to_dict(self) -> Dict[str, object]:
+        out = super().to_dict()
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    def __setitem__(self, key: str, value: object) -> None:
+        if key == "location":
+            self._location = value
+            return
+        if key in self._fields:
+            setattr(self, key, value)
+            return
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        v = self._lookup(key)
+        if v is _MISSING:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        if key == "path":
+            # The dict form kept "location" after "path" was stripped.
+            self._location = self.location
+            self.path = None
+        elif key == "location":
+            self._location = None
+            self.path = None
+        elif key in self._fields:
+            setattr(self, key, None)
+        else:
+            del self.extra[key]
+        return v
+
+
+# Records are read-only mappings as far as ``isinstance(x, Mapping)`` checks go.
+Mapping.register(_Record)
+
+
+def json_default(obj: object) -> object:
+    """``json.dumps`` hook that serializes pipeline records as their dict form."""
+    if isinstance(obj, _Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+__all__ = [
+    "IdHit",
+    "IdRow",
+    "Issue",
+    "json_default",
+]
@@ -0,0 +1,311 @@
+"""
+Cypilot Validator - Artifact Scan Cache
+
+Per-invocation cache of parsed artifact files.
+
+A single ``cpt validate`` run looks at the same Markdown artifacts from many
+phases (structure validation, cross-validation, traceability collection,
+reference coverage). ``ArtifactScanCache`` reads and decodes each file once and
+memoizes every derived facet (ID hits, CDSL steps, headings, heading scopes)
+so that each file is parsed exactly once per run. Heading scopes are
+``HeadingScopeMap`` intervals derived from the scanned headings, never
+per-line lists.
+
+The ID, CDSL and heading scans run as ``LineVisitor``s in one
+``run_line_pass`` loop over the decoded lines. Commands can register extra
+visitors (e.g. the content-language check) with ``add_line_visitor``; they
+join the same pass and their results are read back with ``line_facet``.
+
+Entries are keyed by resolved path and invalidated when the file's
+``(mtime_ns, size)`` signature changes.
+
+When backed by a persistent ``ParseIndex`` the scan facets of unchanged files
+are restored from disk and the file body is only read if a phase asks for the
+raw lines.
+
+A long-lived process (``cpt serve``) installs one cache with
+``set_shared_scan_cache`` so repeated queries reuse parsed artifacts;
+query commands pick it up via ``get_shared_scan_cache``.
+
+Returned lists are shared between callers and MUST be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .document import CdslScanVisitor, IdScanVisitor, decode_text_lines
+from .heading_scope import HeadingScopeMap
+from .line_pass import LineVisitor, run_line_pass
+from .records import IdHit
+
+if TYPE_CHECKING:
+    from .constraints import HeadingConstraint
+    from .parse_index import ParseIndex
+
+PathLike = Union[str, Path]
+FileSignature = Tuple[int, int]
+VisitorFactory = Callable[[Path], LineVisitor]
+
+# Facets persisted to the parse index under the "artifact" key.
+_PERSISTED_FACETS = ("id_hits", "cdsl_steps", "headings", "line_count")
+
+_UNREAD = object()
+
+
+class _ScanEntry:
+    """Parsed facets of a single artifact file at a given signature."""
+
+    __slots__ = ("key", "signature", "lines", "read_error", "facets")
+
+    def __init__(self, key: str, signature: Optional[FileSignature]) -> None:
+        self.key = key
+        self.signature = signature
+        self.lines: object = _UNREAD
+        # Why the file is not strict UTF-8 text (OSError or decode error); set with lines.
+        self.read_error: Optional[str] = None
+        self.facets: Dict[object, object] = {}
+
+
+def file_signature(path: PathLike) -> Optional[FileSignature]:
+    """Return ``(mtime_ns, size)`` for *path*, or None when it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (int(st.st_mtime_ns), int(st.st_size))
+
+
+def _strict_decode_error(raw: bytes) -> Optional[str]:
+    """The strict UTF-8 decode error of *raw*, or None when it is valid UTF-8."""
+    if raw.isascii():
+        return None
+    try:
+        raw.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        return str(exc)
+    return None
+
+
+def _scan_facets(
+    path: str,
+    lines: Optional[List[str]],
+    extra: Optional[Dict[str, VisitorFactory]] = None,
+    *,
+    builtin: bool = True,
+) -> Dict[str, object]:
+    """Compute the scan facets of decoded *lines* in a single pass.
+
+    *builtin* selects the persisted facets; *extra* adds registered visitors.
+    """
+    from .constraints import HeadingScanVisitor
+
+    visitors: Dict[str, LineVisitor] = {}
+    if builtin:
+        visitors.update(id_hits=IdScanVisitor(), cdsl_steps=CdslScanVisitor(), headings=HeadingScanVisitor())
+    for name, factory in (extra or {}).items():
+        visitors[name] = factory(Path(path))
+    facets = run_line_pass(lines if lines is not None else (), visitors)
+    if builtin:
+        facets["line_count"] = len(lines) if lines is not None else None
+    return facets
+
+
+class ArtifactScanCache:
+    """Memoize artifact reads and scans for the duration of one command run."""
+
+    def __init__(self, index: Optional["ParseIndex"] = None) -> None:
+        self._entries: Dict[str, _ScanEntry] = {}
+        self._index = index
+        self._visitors: Dict[str, VisitorFactory] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _entry(self, path: PathLike) -> _ScanEntry:
+        key = str(Path(path).resolve())
+        sig = file_signature(key)
+        entry = self._entries.get(key)
+        if entry is not None and sig is not None and entry.signature == sig:
+            return entry
+        entry = _ScanEntry(key, sig)
+        if sig is not None:
+            self._entries[key] = entry
+            if self._index is not None:
+                self._restore_or_persist(entry)
+        return entry
+
+    def _restore_or_persist(self, entry: _ScanEntry) -> None:
+        stored = self._index.get(entry.key, "artifact")
+        if isinstance(stored, dict) and all(f in stored for f in _PERSISTED_FACETS):
+            entry.facets.update({f: stored[f] for f in _PERSISTED_FACETS})
+            entry.facets["id_hits"] = [IdHit.from_dict(h) for h in stored["id_hits"]]
+            return
+        from .parse_index import content_digest
+
+        raw = self._load(entry)
+        facets = _scan_facets(entry.key, entry.lines, self._visitors)
+        entry.facets.update(facets)
+        if raw is not None:
+            persisted = {f: facets[f] for f in _PERSISTED_FACETS}
+            self._index.put(entry.key, "artifact", persisted, signature=entry.signature, digest=content_digest(raw))
+
+    def _read_bytes(self, path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _load(self, entry: _ScanEntry) -> Optional[bytes]:
+        """Read and decode *entry* once, recording why it is not strict UTF-8 text."""
+        try:
+            raw = self._read_bytes(entry.key)
+        except OSError as exc:
+            entry.lines = None
+            entry.read_error = str(exc)
+            return None
+        entry.lines = decode_text_lines(raw)
+        entry.read_error = _strict_decode_error(raw)
+        return raw
+
+    def _lines_of(self, entry: _ScanEntry) -> Optional[List[str]]:
+        if entry.lines is _UNREAD:
+            self._load(entry)
+        return entry.lines
+
+    def _facet(self, path: PathLike, name: object, build) -> object:
+        entry = self._entry(path)
+        if name not in entry.facets:
+            entry.facets[name] = build(entry)
+        return entry.facets[name]
+
+    def _scan_facet(self, path: PathLike, name: str) -> object:
+        def _build(entry: _ScanEntry) -> object:
+            extra = {k: f for k, f in self._visitors.items() if k not in entry.facets}
+            facets = _scan_facets(entry.key, self._lines_of(entry), extra)
+            for k, v in facets.items():
+                entry.facets.setdefault(k, v)
+            return facets[name]
+
+        return self._facet(path, name, _build)
+
+    def add_line_visitor(self, name: str, factory: VisitorFactory) -> None:
+        """Run ``factory(path)`` as an extra visitor in every file's scan pass.
+
+        Its result becomes the ``line_facet(path, name)`` facet. Files scanned
+        before registration (or restored from the parse index) get a pass
+        with the missing visitors only, on the already-decoded lines.
+        """
+        self._visitors[name] = factory
+
+    def has_line_visitor(self, name: str) -> bool:
+        return name in self._visitors
+
+    def line_facet(self, path: PathLike, name: str) -> object:
+        """Result of the visitor registered as *name* for *path*."""
+        def _build(entry: _ScanEntry) -> object:
+            extra = {k: f for k, f in self._visitors.items() if k not in entry.facets}
+            facets = _scan_facets(entry.key, self._lines_of(entry), extra, builtin=False)
+            for k, v in facets.items():
+                entry.facets.setdefault(k, v)
+            return facets[name]
+
+        if name not in self._visitors:
+            raise KeyError(name)
+        return self._facet(path, name, _build)
+
+    def lines(self, path: PathLike) -> Optional[List[str]]:
+        """Decoded lines of *path* (None for unreadable or binary files)."""
+        return self._lines_of(self._entry(path))
+
+    def read_error(self, path: PathLike) -> Optional[str]:
+        """Why *path* cannot be read as strict UTF-8 text, or None.
+
+        ``lines`` is lenient and drops undecodable bytes; checks that must
+        reject invalid UTF-8 (the content-language check) consult this.
+        """
+        entry = self._entry(path)
+        self._lines_of(entry)
+        return entry.read_error
+
+    def id_hits(self, path: PathLike) -> List[IdHit]:
+        """Equivalent of ``document.scan_cpt_ids(path)``."""
+        return self._scan_facet(path, "id_hits")
+
+    def definitions(self, path: PathLike) -> List[IdHit]:
+        """ID hits of type ``definition`` with a non-empty id."""
+        return self._facet(
+            path,
+            "definitions",
+            lambda _e: [h for h in self.id_hits(path) if h.get("type") == "definition" and h.get("id")],
+        )
+
+    def cdsl_steps(self, path: PathLike) -> List[Dict[str, object]]:
+        """Equivalent of ``document.scan_cdsl_instructions(path)``."""
+        return self._scan_facet(path, "cdsl_steps")
+
+    def headings(self, path: PathLike) -> List[Dict[str, object]]:
+        """Equivalent of ``constraints._scan_headings(path)``."""
+        return self._scan_facet(path, "headings")
+
+    def heading_titles_by_line(self, path: PathLike) -> HeadingScopeMap:
+        """Equivalent of ``document.headings_by_line(path)``, built from the scanned headings."""
+        def _build(_entry: _ScanEntry) -> HeadingScopeMap:
+            line_count = self._scan_facet(path, "line_count")
+            if line_count is None:
+                return HeadingScopeMap((), 0)
+            return HeadingScopeMap(
+                ((int(h["line"]), int(h["level"]), str(h.get("raw_title") or "")) for h in self.headings(path)),
+                line_count,
+            )
+
+        return self._facet(path, "heading_titles_by_line", _build)
+
+    def heading_ids_by_line(
+        self,
+        path: PathLike,
+        heading_constraints: Sequence["HeadingConstraint"],
+    ) -> HeadingScopeMap:
+        """Equivalent of ``constraints.heading_constraint_ids_by_line(path, heading_constraints)``."""
+        from .constraints import heading_constraint_ids_from_headings
+
+        def _build(_entry: _ScanEntry) -> HeadingScopeMap:
+            line_count = self._scan_facet(path, "line_count")
+            if line_count is None:
+                return HeadingScopeMap((), 0)
+            return heading_constraint_ids_from_headings(self.headings(path), line_count, heading_constraints)
+
+        return self._facet(path, ("heading_ids_by_line", tuple(heading_constraints)), _build)
+
+    def heading_scopes(
+        self,
+        path: PathLike,
+        heading_constraints: Optional[Sequence["HeadingConstraint"]] = None,
+    ) -> HeadingScopeMap:
+        """Active heading scopes per line: constraint ids when available, else raw titles."""
+        if heading_constraints:
+            return self.heading_ids_by_line(path, heading_constraints)
+        return self.heading_titles_by_line(path)
+
+
+# Process-wide cache installed by long-lived servers (None for one-shot CLI runs).
+_shared_scan_cache: Optional[ArtifactScanCache] = None
+
+
+def get_shared_scan_cache() -> Optional[ArtifactScanCache]:
+    """Return the process-wide scan cache, if one is installed."""
+    return _shared_scan_cache
+
+
+def set_shared_scan_cache(cache: Optional[ArtifactScanCache]) -> None:
+    """Install (or clear with None) the process-wide scan cache."""
+    global _shared_scan_cache  # pylint: disable=global-statement  # module-level singleton, mirrors set_context
+    _shared_scan_cache = cache
+
+
+__all__ = [
+    "ArtifactScanCache",
+    "file_signature",
+    "get_shared_scan_cache",
+    "set_shared_scan_cache",
+]
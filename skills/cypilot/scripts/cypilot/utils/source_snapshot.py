@@ -0,0 +1,263 @@
+"""
+Cypilot Context - Workspace Source Snapshots
+
+On-disk cache of what each remote workspace source contributes to a run:
+its autodetect-expanded artifact list, its set of definition IDs and the
+registered systems / ID kinds of its adapter context. With a
+valid snapshot, validating the primary repo skips loading the source's kits,
+expanding its autodetect rules and re-parsing its artifacts.
+
+A snapshot is keyed by the source's state:
+
+- git sources: ``HEAD`` plus a digest of ``git status --porcelain`` and the
+  ``(mtime_ns, size)`` of every dirty path, so commits, checkouts and
+  uncommitted edits all change the key;
+- other sources: a digest of the adapter ``config/`` file signatures.
+
+Either way the snapshot also records the signature of every artifact file
+and of each artifact's parent directory; a changed, added or removed file
+invalidates it even when the state key did not move (e.g. git-ignored
+artifacts, non-git sources).
+
+The whole cache is discarded when the cypilot version or the parser regex
+fingerprint changes. Stored at ``{adapter_dir}/cache/sources.json``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+from .parse_index import CACHE_DIRNAME, load_json_cache, regex_fingerprint, save_json_cache
+from .scan_cache import file_signature
+
+if TYPE_CHECKING:
+    from .context import SourceContext
+
+SNAPSHOT_SCHEMA = 1
+SNAPSHOTS_FILENAME = "sources.json"
+
+# (artifact path relative to the source root, artifact kind)
+ArtifactEntry = Tuple[str, str]
+
+
+def _snapshot_header() -> Dict[str, object]:
+    from .. import __version__
+
+    return {
+        "schema": SNAPSHOT_SCHEMA,
+        "cypilot_version": __version__,
+        "regex_fingerprint": regex_fingerprint(),
+    }
+
+
+def _porcelain_paths(out: str) -> Iterable[str]:
+    """Paths named by ``git status --porcelain -z`` output (rename sources included)."""
+    for token in out.split("\0"):
+        if len(token) > 3 and token[2] == " ":
+            yield token[3:]
+        elif token:
+            yield token
+
+
+def _git_state(root: Path) -> Optional[str]:
+    """``git:HEAD:dirty-digest`` for a git worktree, or None when *root* is not one."""
+    from .git_utils import _run_git
+
+    rc, head, _err = _run_git(["rev-parse", "HEAD"], cwd=root)
+    if rc != 0:
+        return None
+    rc, status, _err = _run_git(["status", "--porcelain", "-z", "--untracked-files=all"], cwd=root)
+    if rc != 0:
+        return None
+    rc, top, _err = _run_git(["rev-parse", "--show-toplevel"], cwd=root)
+    top_dir = Path(top.strip()) if rc == 0 and top.strip() else root
+    h = hashlib.sha256(status.encode("utf-8"))
+    for rel in sorted(set(_porcelain_paths(status))):
+        h.update(f"\n{rel}:{file_signature(top_dir / rel)}".encode("utf-8"))
+    return f"git:{head.strip()}:{h.hexdigest()}"
+
+
+def _config_state(adapter_dir: Optional[Path]) -> str:
+    """``mtime:digest`` of the signatures of every file under the adapter ``config/``."""
+    h = hashlib.sha256()
+    if adapter_dir is not None:
+        config_dir = adapter_dir / "config"
+        for dirpath, dirnames, filenames in os.walk(config_dir):
+            dirnames.sort()
+            for fname in sorted(filenames):
+                p = os.path.join(dirpath, fname)
+                h.update(f"{os.path.relpath(p, config_dir)}:{file_signature(p)}\n".encode("utf-8"))
+    return f"mtime:{h.hexdigest()}"
+
+
+def _file_signatures(root: Path, artifacts: Iterable[ArtifactEntry]) -> Dict[str, List[int]]:
+    """Signatures of each artifact file and its parent directory (missing files are skipped)."""
+    sigs: Dict[str, List[int]] = {}
+    for rel, _kind in artifacts:
+        art_path = (root / rel).resolve()
+        for p in (art_path, art_path.parent):
+            key = str(p)
+            if key in sigs:
+                continue
+            sig = file_signature(key)
+            if sig is not None:
+                sigs[key] = list(sig)
+    return sigs
+
+
+def _opt_set(value: object) -> Optional[Set[str]]:
+    return set(value) if isinstance(value, list) else None
+
+
+class SourceSnapshot:
+    """What one source contributes to a run.
+
+    ``registered_systems`` / ``id_kinds`` come from the source's own adapter
+    context and are None when it could not be loaded; ``definition_ids`` is
+    None until the source's artifacts have been scanned.
+    """
+
+    __slots__ = ("artifacts", "registered_systems", "id_kinds", "definition_ids")
+
+    def __init__(
+        self,
+        artifacts: List[ArtifactEntry],
+        registered_systems: Optional[Set[str]] = None,
+        id_kinds: Optional[Set[str]] = None,
+        definition_ids: Optional[Set[str]] = None,
+    ) -> None:
+        self.artifacts = artifacts
+        self.registered_systems = registered_systems
+        self.id_kinds = id_kinds
+        self.definition_ids = definition_ids
+
+
+class SourceSnapshotCache:
+    """Persistent per-source artifact lists and definition-ID sets.
+
+    With ``path=None`` nothing is read or persisted; snapshots then last for
+    one run only (``--no-cache``).
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self._sources: Dict[str, Dict[str, object]] = {}
+        self._states: Dict[str, str] = {}
+        # State keys computed before the last expire_states(), until compared once
+        self._expired: Dict[str, str] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "SourceSnapshotCache":
+        """Load the cache at *path*; a missing, corrupt or outdated file yields an empty cache."""
+        cache = cls(path)
+        cache._sources, cache._dirty = load_json_cache(path, _snapshot_header(), "sources")
+        return cache
+
+    @classmethod
+    def for_adapter(cls, adapter_dir: Path) -> "SourceSnapshotCache":
+        """Load the cache stored under ``{adapter_dir}/cache/``."""
+        return cls.load(adapter_dir / CACHE_DIRNAME / SNAPSHOTS_FILENAME)
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    @staticmethod
+    def _key(sc: "SourceContext") -> str:
+        return str(Path(sc.path).resolve())
+
+    def _state(self, sc: "SourceContext") -> str:
+        """State key of *sc*, computed once per run (or per ``expire_states`` call)."""
+        key = self._key(sc)
+        state = self._states.get(key)
+        if state is None:
+            root = Path(sc.path)
+            state = _git_state(root) or _config_state(sc.adapter_dir)
+            state = f"{state}|{sc.role}|{sc.adapter_dir}"
+            self._states[key] = state
+        return state
+
+    def expire_states(self) -> None:
+        """Recompute every source's state key on its next lookup.
+
+        Long-lived processes (``cpt serve``) call this per request so that
+        commits, checkouts and edits in a source are seen without a restart.
+        """
+        self._expired.update(self._states)
+        self._states.clear()
+
+    def state_moved(self, sc: "SourceContext") -> bool:
+        """True (once) when *sc*'s state key changed across ``expire_states``."""
+        old = self._expired.pop(self._key(sc), None)
+        return old is not None and old != self._state(sc)
+
+    def _entry(self, sc: "SourceContext") -> Optional[Dict[str, object]]:
+        rec = self._sources.get(self._key(sc))
+        if rec is None or rec.get("state") != self._state(sc):
+            return None
+        files = rec.get("files")
+        if not isinstance(files, dict):
+            return None
+        for p, sig in files.items():
+            if file_signature(p) != tuple(sig):
+                return None
+        return rec
+
+    def get(self, sc: "SourceContext") -> Optional[SourceSnapshot]:
+        """Snapshot of *sc* if its state and files are unchanged, else None."""
+        rec = self._entry(sc)
+        arts = rec.get("artifacts") if rec is not None else None
+        if not isinstance(arts, list):
+            return None
+        ids = rec.get("definition_ids")
+        return SourceSnapshot(
+            [(str(p), str(k)) for p, k in arts],
+            _opt_set(rec.get("registered_systems")),
+            _opt_set(rec.get("id_kinds")),
+            set(ids) if isinstance(ids, list) else None,
+        )
+
+    def put(self, sc: "SourceContext", snapshot: SourceSnapshot) -> None:
+        """Record the snapshot of *sc* taken at its current state."""
+        rec: Dict[str, object] = {
+            "state": self._state(sc),
+            "files": _file_signatures(Path(sc.path), snapshot.artifacts),
+            "artifacts": [list(a) for a in snapshot.artifacts],
+        }
+        for name in ("registered_systems", "id_kinds", "definition_ids"):
+            value = getattr(snapshot, name)
+            if value is not None:
+                rec[name] = sorted(value)
+        self._sources[self._key(sc)] = rec
+        self._dirty = True
+
+    def put_definition_ids(self, sc: "SourceContext", ids: Set[str]) -> None:
+        """Add the definition IDs of *sc* to its current snapshot (no-op when there is none)."""
+        rec = self._entry(sc)
+        if rec is None:
+            return
+        rec["definition_ids"] = sorted(ids)
+        self._dirty = True
+
+    def save(self) -> bool:
+        """Write the cache if it changed; entries for vanished sources are dropped.
+
+        Returns True when the file was written.
+        """
+        if self.path is None:
+            return False
+        written = save_json_cache(
+            self.path, _snapshot_header(), "sources", self._sources, dirty=self._dirty, exists=os.path.isdir,
+        )
+        if written:
+            self._dirty = False
+        return written
+
+__all__ = [
+    "ArtifactEntry",
+    "SourceSnapshot",
+    "SourceSnapshotCache",
+]
@@ -267,6 +267,15 @@ def insert_toc_markers(
     if not headings:
         return content
 
+    return _insert_toc_markers_lines(lines, headings, indent_size)
+
+
+def _insert_toc_markers_lines(
+    lines: List[str],
+    headings: List[Tuple[int, str]],
+    indent_size: int,
+) -> str:
+    """Marker insertion for already split *lines* and parsed *headings*."""
     toc_text = build_toc(headings, indent_size=indent_size)
 
     # Find existing markers
@@ -472,40 +481,52 @@ def _strip_manual_toc(content: str) -> Tuple[str, bool]:
 # @cpt-end:cpt-cypilot-algo-traceability-validation-toc-utils:p1:inst-toc-util-helpers
 
 # @cpt-begin:cpt-cypilot-algo-traceability-validation-toc-utils:p1:inst-toc-util-process-file
-def process_file(
-    filepath: Path,
+def update_toc_content(
+    content: str,
     *,
     max_level: int = 6,
-    dry_run: bool = False,
     indent_size: int = 2,
-) -> dict:
-    """Generate/update TOC in a single markdown file using HTML markers.
+) -> Tuple[str, int, bool]:
+    """Apply the ``cypilot toc`` transformation to *content* in memory.
 
-    Detects and removes standalone ``## Table of Contents`` sections
-    (manual TOCs) before inserting/updating the marker-based TOC.
+    Strips a manual ``## Table of Contents`` section and inserts/updates the
+    marker-based TOC, parsing headings once.
 
-    Returns a result dict with status info.
+    Returns ``(new_content, heading_count, manual_toc_removed)``; with no
+    headings in range ``new_content`` is the stripped content.
     """
-    if not filepath.is_file():
-        return {"file": str(filepath), "status": "ERROR", "message": "File not found"}
-
-    content = filepath.read_text(encoding="utf-8")
+    stripped, manual_removed = _strip_manual_toc(content)
+    lines = stripped.split("\n")
+    headings = parse_headings(lines, min_level=2, max_level=max_level)
+    if not headings:
+        return stripped, 0, manual_removed
+    return _insert_toc_markers_lines(lines, headings, indent_size), len(headings), manual_removed
 
-    # Strip any manual ## Table of Contents section (duplicates marker-based TOC)
-    content, manual_removed = _strip_manual_toc(content)
 
-    new_content = insert_toc_markers(content, max_level=max_level, indent_size=indent_size)
+def process_content(
+    filepath: Path,
+    original: str,
+    *,
+    max_level: int = 6,
+    dry_run: bool = False,
+    indent_size: int = 2,
+) -> Tuple[dict, str]:
+    """Generate/update the TOC of *filepath* whose current text is *original*.
 
-    lines = content.split("\n")
-    heading_count = len(parse_headings(lines, min_level=2, max_level=max_level))
+    Writes the file when it changes (unless *dry_run*). Returns the result
+    dict and the resulting file content, so callers can validate it without
+    reading the file again.
+    """
+    new_content, heading_count, manual_removed = update_toc_content(
+        original, max_level=max_level, indent_size=indent_size,
+    )
 
     if heading_count == 0:
-        return {"file": str(filepath), "status": "SKIP", "message": "No headings found"}
+        return {"file": str(filepath), "status": "SKIP", "message": "No headings found"}, original
 
     # If only manual TOC was removed but markers unchanged, still write
-    original = filepath.read_text(encoding="utf-8")
     if new_content == original:
-        return {"file": str(filepath), "status": "UNCHANGED", "heading_count": heading_count}
+        return {"file": str(filepath), "status": "UNCHANGED", "heading_count": heading_count}, original
 
     if not dry_run:
         filepath.write_text(new_content, encoding="utf-8")
@@ -514,7 +535,7 @@ def process_file(
     result: dict = {"file": str(filepath), "status": action, "heading_count": heading_count}
     if manual_removed:
         result["manual_toc_removed"] = True
-    return result
+    return result, (original if dry_run else new_content)
 # @cpt-end:cpt-cypilot-algo-traceability-validation-toc-utils:p1:inst-toc-util-process-file
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,407 @@
+"""
+Batch TOC processing for the ``toc`` and ``validate-toc`` commands.
+
+File arguments may be Markdown files, directories (searched recursively for
+``*.md``, skipping hidden directories and ``document.SKIP_DIRS``) or glob
+patterns (``**`` supported).
+Every file is read once and handled by one task; tasks run across worker
+processes (``utils.parallel``) and results keep the argument order.
+
+When the current project has a Cypilot adapter, per-file outcomes are kept in
+``{adapter_dir}/cache/toc.json``. An entry records the file's
+``(mtime_ns, size)`` signature, a hash of its heading structure (see
+``heading_fingerprint``) and the *clean* outcomes seen for that structure —
+an up-to-date TOC for given ``--max-level``/``--indent`` options, a passing
+validation for a given ``--max-level``. A file whose signature is unchanged is
+not read at all; a file whose signature moved but whose heading hash is
+unchanged skips TOC regeneration and validation. Only clean outcomes are
+cached, so files with errors, warnings or pending updates are always
+re-checked. The whole cache is discarded when the cypilot version changes.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .document import walk_files
+from .parallel import map_ordered, resolve_jobs
+from .parse_index import CACHE_DIRNAME, load_json_cache, save_json_cache
+from .scan_cache import file_signature
+from .toc import (
+    TOC_MARKER_END,
+    TOC_MARKER_START,
+    _find_toc_section,
+    parse_headings,
+    process_content,
+    validate_toc,
+)
+
+TOC_CACHE_SCHEMA = 1
+TOC_CACHE_FILENAME = "toc.json"
+
+MODE_TOC = "toc"
+MODE_VALIDATE = "validate"
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+# ---------------------------------------------------------------------------
+# Argument expansion
+# ---------------------------------------------------------------------------
+
+def _is_hidden_dir(rel: str) -> bool:
+    return rel.rsplit("/", 1)[-1].startswith(".")
+
+
+def expand_markdown_args(args: Sequence[str]) -> Tuple[List[Path], List[str]]:
+    """Resolve file, directory and glob arguments into Markdown files.
+
+    Returns ``(files, unmatched)``: resolved files in argument order (each
+    directory / pattern sorted, duplicates dropped) and the directory or glob
+    arguments that matched nothing. An existing file is never treated as a
+    pattern, even when its name contains ``*``, ``?`` or ``[``. Plain file
+    arguments are kept even when they do not exist so the caller can report
+    them.
+    """
+    files: List[Path] = []
+    unmatched: List[str] = []
+    seen = set()
+    for arg in args:
+        path = Path(arg)
+        if path.is_dir():
+            matches = walk_files(path, (".md",), ignore_dir=_is_hidden_dir)
+        elif path.is_file() or not _GLOB_CHARS.intersection(arg):
+            matches = [path]
+        else:
+            matches = [Path(m) for m in glob.glob(arg, recursive=True) if os.path.isfile(m)]
+        if not matches:
+            unmatched.append(arg)
+        for p in sorted(p.resolve() for p in matches):
+            if p not in seen:
+                seen.add(p)
+                files.append(p)
+    return files, unmatched
+
+
+# ---------------------------------------------------------------------------
+# Heading fingerprint
+# ---------------------------------------------------------------------------
+
+def _expand_region(lines: List[str], start: int, end: int) -> List[str]:
+    """``lines[start:end]`` widened over adjacent blank lines plus one context line."""
+    while start > 0 and lines[start - 1].strip() == "":
+        start -= 1
+    while end < len(lines) and lines[end].strip() == "":
+        end += 1
+    return lines[max(0, start - 1):end + 1]
+
+
+def heading_fingerprint(content: str) -> str:
+    """Hash of everything TOC generation and validation depend on.
+
+    Covers the fence-aware heading list and the text of the TOC regions
+    (``## Table of Contents`` section, ``<!-- toc -->`` block) including the
+    blank lines around them — edits elsewhere in the file leave it unchanged.
+    """
+    lines = content.split("\n")
+    h = hashlib.sha256()
+    for level, text in parse_headings(lines):
+        h.update(f"{level}:{text}\n".encode("utf-8"))
+    toc_info = _find_toc_section(lines)
+    if toc_info is not None and toc_info[2] == "heading":
+        h.update(b"\0heading\n")
+        h.update("\n".join(_expand_region(lines, toc_info[0], toc_info[1])).encode("utf-8"))
+    start_idx = None
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped == TOC_MARKER_START and start_idx is None:
+            start_idx = i
+        elif stripped == TOC_MARKER_END and start_idx is not None:
+            h.update(b"\0markers\n")
+            h.update("\n".join(_expand_region(lines, start_idx, i + 1)).encode("utf-8"))
+            break
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Per-file tasks (run in worker processes)
+# ---------------------------------------------------------------------------
+
+class TocTask(NamedTuple):
+    """One file to process; *entry* is its cache entry (or None)."""
+
+    path: str
+    mode: str
+    max_level: int
+    indent: int = 2
+    dry_run: bool = False
+    validate: bool = True
+    verbose: bool = False
+    entry: Optional[Dict[str, object]] = None
+
+    @property
+    def toc_key(self) -> str:
+        return f"{MODE_TOC}:{self.max_level}:{self.indent}"
+
+    @property
+    def validate_key(self) -> str:
+        return f"{MODE_VALIDATE}:{self.max_level}"
+
+
+def _validation_result(path: str, report: Dict[str, list], verbose: bool) -> Dict[str, object]:
+    """``validate-toc`` result for one file."""
+    errors = report.get("errors", [])
+    warnings = report.get("warnings", [])
+    result: Dict[str, object] = {
+        "file": path,
+        "status": "FAIL" if errors else ("WARN" if warnings else "PASS"),
+        "error_count": len(errors),
+        "warning_count": len(warnings),
+    }
+    if verbose or errors:
+        result["errors"] = errors
+    if verbose or warnings:
+        result["warnings"] = warnings
+    return result
+
+
+def _toc_validation(report: Dict[str, list]) -> Dict[str, object]:
+    """``toc`` post-generation validation summary for one file."""
+    errs = report.get("errors", [])
+    warns = report.get("warnings", [])
+    if not errs and not warns:
+        return {"status": "PASS"}
+    return {
+        "status": "FAIL" if errs else "WARN",
+        "errors": len(errs),
+        "warnings": len(warns),
+        "details": errs + warns,
+    }
+
+
+def _from_clean(task: TocTask, clean: Dict[str, object]) -> Optional[Dict[str, object]]:
+    """Result rebuilt from cached clean outcomes, or None when they do not cover *task*."""
+    if task.mode == MODE_VALIDATE:
+        if task.validate_key not in clean:
+            return None
+        result = _validation_result(task.path, {}, task.verbose)
+    else:
+        stored = clean.get(task.toc_key)
+        if not isinstance(stored, dict):
+            return None
+        result = {"file": task.path, **stored}
+        if task.validate and not task.dry_run and result.get("status") != "SKIP":
+            if task.validate_key not in clean:
+                return None
+            result["validation"] = {"status": "PASS"}
+    result["cached"] = True
+    return result
+
+
+def run_task(task: TocTask) -> Tuple[Dict[str, object], Optional[Dict[str, object]]]:
+    """Process one file. Returns ``(result, cache_entry)``; a None entry drops the file."""
+    path = Path(task.path)
+    sig = file_signature(path) if path.is_file() else None
+    if sig is None:
+        return {"file": task.path, "status": "ERROR", "message": "File not found"}, None
+
+    entry = task.entry or {}
+    clean = entry.get("clean")
+    clean = clean if isinstance(clean, dict) else {}
+    if entry.get("sig") == list(sig):
+        cached = _from_clean(task, clean)
+        if cached is not None:
+            return cached, entry
+
+    try:
+        content = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as exc:
+        return {"file": task.path, "status": "ERROR", "message": f"Cannot read file: {exc}"}, None
+
+    fingerprint = heading_fingerprint(content)
+    if entry.get("hash") == fingerprint:
+        cached = _from_clean(task, clean)
+        if cached is not None:
+            return cached, {"sig": list(sig), "hash": fingerprint, "clean": clean}
+    else:
+        clean = {}
+
+    new_clean: Dict[str, object] = {}
+    if task.mode == MODE_VALIDATE:
+        result = _validation_result(
+            task.path,
+            validate_toc(content, artifact_path=path, max_heading_level=task.max_level),
+            task.verbose,
+        )
+        if result["status"] == "PASS":
+            new_clean[task.validate_key] = {"status": "PASS"}
+    else:
+        result, final = process_content(
+            path, content, max_level=task.max_level, dry_run=task.dry_run, indent_size=task.indent,
+        )
+        status = result["status"]
+        if status == "UPDATED":
+            sig = file_signature(path) or sig
+            new_fingerprint = heading_fingerprint(final)
+            if new_fingerprint != fingerprint:
+                fingerprint, clean = new_fingerprint, {}
+        if status in ("UPDATED", "UNCHANGED", "SKIP"):
+            stored = {k: v for k, v in result.items() if k in ("status", "heading_count", "message")}
+            if status == "UPDATED":
+                stored["status"] = "UNCHANGED"
+            new_clean[task.toc_key] = stored
+        if task.validate and not task.dry_run and status not in ("ERROR", "SKIP"):
+            validation = _toc_validation(
+                validate_toc(final, artifact_path=path, max_heading_level=task.max_level)
+            )
+            result["validation"] = validation
+            if validation["status"] == "PASS":
+                new_clean[task.validate_key] = {"status": "PASS"}
+
+    clean = {**clean, **new_clean}
+    if not clean:
+        return result, None
+    return result, {"sig": list(sig), "hash": fingerprint, "clean": clean}
+
+
+# ---------------------------------------------------------------------------
+# Persistent cache
+# ---------------------------------------------------------------------------
+
+def _cache_header() -> Dict[str, object]:
+    from .. import __version__
+
+    return {"schema": TOC_CACHE_SCHEMA, "cypilot_version": __version__}
+
+
+def find_cache_dir(start: Path) -> Optional[Path]:
+    """Adapter cache directory of the project containing *start* (context is not loaded)."""
+    from .files import _read_cypilot_var, find_project_root
+
+    project_root = find_project_root(start)
+    if project_root is None:
+        return None
+    cypilot_rel = _read_cypilot_var(project_root)
+    if cypilot_rel is None:
+        return None
+    adapter_dir = project_root / cypilot_rel
+    if not (adapter_dir / "config").is_dir():
+        return None
+    return adapter_dir / CACHE_DIRNAME
+
+
+class TocCache:
+    """Persistent per-file heading hashes and clean TOC outcomes."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._files: Dict[str, Dict[str, object]] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "TocCache":
+        """Load the cache at *path*; a missing, corrupt or outdated file yields an empty cache."""
+        cache = cls(path)
+        cache._files, cache._dirty = load_json_cache(path, _cache_header(), "files")
+        return cache
+
+    @classmethod
+    def for_project(cls, start: Path) -> Optional["TocCache"]:
+        """Cache of the project containing *start*, or None outside a Cypilot project."""
+        cache_dir = find_cache_dir(start)
+        return cls.load(cache_dir / TOC_CACHE_FILENAME) if cache_dir is not None else None
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def get(self, path: str) -> Optional[Dict[str, object]]:
+        return self._files.get(path)
+
+    def put(self, path: str, entry: Optional[Dict[str, object]]) -> None:
+        """Store *entry* for *path* (None drops it)."""
+        if entry is None:
+            if self._files.pop(path, None) is not None:
+                self._dirty = True
+        elif self._files.get(path) != entry:
+            self._files[path] = entry
+            self._dirty = True
+
+    def save(self) -> bool:
+        """Write the cache if it changed; entries for deleted files are dropped.
+
+        Returns True when the file was written.
+        """
+        written = save_json_cache(self.path, _cache_header(), "files", self._files, dirty=self._dirty)
+        if written:
+            self._dirty = False
+        return written
+
+# ---------------------------------------------------------------------------
+# Batch driver
+# ---------------------------------------------------------------------------
+
+def run_batch(
+    files: Sequence[Path],
+    *,
+    mode: str,
+    max_level: int,
+    indent: int = 2,
+    dry_run: bool = False,
+    validate: bool = True,
+    verbose: bool = False,
+    jobs: Optional[int] = None,
+    use_cache: bool = True,
+) -> List[Dict[str, object]]:
+    """Run *mode* over *files* in parallel; returns one result per file, in order."""
+    cache = TocCache.for_project(Path.cwd()) if use_cache else None
+    tasks = [
+        TocTask(
+            str(p), mode, max_level, indent, dry_run, validate, verbose,
+            cache.get(str(p)) if cache is not None else None,
+        )
+        for p in files
+    ]
+    outcomes = map_ordered(run_task, tasks, resolve_jobs(jobs))
+    if cache is not None:
+        for task, (_result, entry) in zip(tasks, outcomes):
+            cache.put(task.path, entry)
+        cache.save()
+    return [result for result, _entry in outcomes]
+
+
+def summarize(results: Sequence[Dict[str, object]]) -> Dict[str, object]:
+    """Aggregate counts: per status, per validation status and cache hits."""
+    statuses: Dict[str, int] = {}
+    validation: Dict[str, int] = {}
+    cached = 0
+    for r in results:
+        status = str(r.get("status", "?"))
+        statuses[status] = statuses.get(status, 0) + 1
+        val = r.get("validation")
+        if isinstance(val, dict):
+            vstatus = str(val.get("status", "?"))
+            validation[vstatus] = validation.get(vstatus, 0) + 1
+        if r.get("cached"):
+            cached += 1
+    summary: Dict[str, object] = {"statuses": statuses, "cached": cached}
+    if validation:
+        summary["validation"] = validation
+    return summary
+
+
+__all__ = [
+    "MODE_TOC",
+    "MODE_VALIDATE",
+    "TocCache",
+    "TocTask",
+    "expand_markdown_args",
+    "find_cache_dir",
+    "heading_fingerprint",
+    "run_batch",
+    "run_task",
+    "summarize",
+]
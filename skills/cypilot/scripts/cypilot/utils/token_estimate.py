@@ -0,0 +1,101 @@
+"""
+Cypilot - Local LLM Token Estimation
+
+Fast, offline token-count estimators used to budget workflow input chunks
+(``chunk-input --max-tokens``). Estimates are deliberately conservative
+approximations of BPE tokenizers — no model vocabularies, no network.
+
+Built-in estimators:
+
+- ``heuristic`` (default): the larger of ``utf8_bytes / 4`` and
+  ``words + symbols / 2``, so prose is costed by length while dense
+  punctuation (minified JSON, code, tables) is costed by symbol count;
+- ``bytes``: ``utf8_bytes / 4``;
+- ``words``: ``words * 4 / 3``.
+
+Additional estimators can be registered in-process with
+``register_estimator`` or referenced as ``package.module:function`` — any
+callable taking a string and returning an int.
+"""
+
+from __future__ import annotations
+
+import importlib
+import math
+import re
+from typing import Callable, Dict, List
+
+TokenEstimator = Callable[[str], int]
+
+DEFAULT_ESTIMATOR = "heuristic"
+
+_WORD_RE = re.compile(r"\w+")
+_SYMBOL_RE = re.compile(r"[^\w\s]")
+
+
+def bytes_tokens(text: str) -> int:
+    """Roughly four UTF-8 bytes per token."""
+    return math.ceil(len(text.encode("utf-8")) / 4)
+
+
+def words_tokens(text: str) -> int:
+    """Roughly three words per four tokens."""
+    return math.ceil(len(_WORD_RE.findall(text)) * 4 / 3)
+
+
+def heuristic_tokens(text: str) -> int:
+    """Byte-length estimate, raised for punctuation-dense text."""
+    words = len(_WORD_RE.findall(text))
+    symbols = len(_SYMBOL_RE.findall(text))
+    return max(bytes_tokens(text), words + math.ceil(symbols / 2))
+
+
+_ESTIMATORS: Dict[str, TokenEstimator] = {
+    "heuristic": heuristic_tokens,
+    "bytes": bytes_tokens,
+    "words": words_tokens,
+}
+
+
+def register_estimator(name: str, fn: TokenEstimator) -> None:
+    """Make *fn* available under *name* (replacing any previous registration)."""
+    _ESTIMATORS[name] = fn
+
+
+def estimator_names() -> List[str]:
+    """Names of the registered estimators."""
+    return sorted(_ESTIMATORS)
+
+
+def get_estimator(spec: str) -> TokenEstimator:
+    """Resolve a registered estimator name or a ``module:function`` reference.
+
+    Raises ValueError when *spec* names nothing usable.
+    """
+    fn = _ESTIMATORS.get(spec)
+    if fn is not None:
+        return fn
+    module_name, sep, attr = spec.partition(":")
+    if not sep or not module_name or not attr:
+        raise ValueError(
+            f"Unknown token estimator: {spec} (expected one of {', '.join(estimator_names())} or module:function)"
+        )
+    try:
+        fn = getattr(importlib.import_module(module_name), attr)
+    except (ImportError, AttributeError) as exc:
+        raise ValueError(f"Cannot load token estimator {spec}: {exc}") from exc
+    if not callable(fn):
+        raise ValueError(f"Token estimator {spec} is not callable")
+    return fn
+
+
+__all__ = [
+    "DEFAULT_ESTIMATOR",
+    "TokenEstimator",
+    "bytes_tokens",
+    "estimator_names",
+    "get_estimator",
+    "heuristic_tokens",
+    "register_estimator",
+    "words_tokens",
+]
@@ -5,6 +5,9 @@ Cypilot CLI output utilities — dual-mode (human / JSON) rendering.
 
 Default mode (no flag): human-friendly output with colors, progress, explanations.
 With ``--json``: machine-readable JSON on stdout (for AI agents).
+With ``--ndjson``: one compact JSON object per line on stdout, written as soon
+as it is produced. Every line carries a ``"record"`` discriminator; the last
+line is always the ``"summary"`` record.
 
 Usage in commands::
 
@@ -23,7 +26,9 @@ Usage in commands::
 import json
 import os
 import sys
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from .records import json_default
 
 
 # ---------------------------------------------------------------------------
@@ -42,6 +47,20 @@ def is_json_mode() -> bool:
     return _json_mode
 
 
+_ndjson_mode: bool = False
+
+
+def set_ndjson_mode(enabled: bool) -> None:
+    """Toggle streaming NDJSON output (implies JSON mode: progress output is suppressed)."""
+    global _ndjson_mode  # pylint: disable=global-statement  # module-level output mode flag toggled once at CLI startup
+    _ndjson_mode = enabled
+    set_json_mode(enabled)
+
+
+def is_ndjson_mode() -> bool:
+    return _ndjson_mode
+
+
 # ---------------------------------------------------------------------------
 # ANSI helpers (stdlib only, no deps)
 # ---------------------------------------------------------------------------
@@ -199,10 +218,19 @@ def file_action(path: str, action: str) -> None:
 # Result output — the main dual-mode function
 # ---------------------------------------------------------------------------
 
+def emit(record: str, data: Mapping[str, Any]) -> None:
+    """Write one ``{"record": record, ...data}`` line to stdout right away (--ndjson only)."""
+    if not _ndjson_mode:
+        return
+    sys.stdout.write(json.dumps({"record": record, **data}, ensure_ascii=False, default=json_default) + "\n")
+    sys.stdout.flush()
+
+
 def result(
     data: Dict[str, Any],
     *,
     human_fn: Optional[Callable[[Dict[str, Any]], None]] = None,
+    stream: Optional[Tuple[str, str]] = None,
 ) -> None:
     """Output command result: JSON to stdout (--json) or human summary (default).
 
@@ -210,9 +238,19 @@ def result(
         data: The result dict (always printed as JSON in --json mode).
         human_fn: Optional formatter that renders *data* as human-friendly text
                   to stderr. If None, a generic fallback is used.
+        stream: ``(key, record)`` — in --ndjson mode each item of ``data[key]``
+                is emitted as its own *record* line ahead of the summary.
     """
+    if _ndjson_mode:
+        if stream is not None:
+            key, record = stream
+            for item in data.get(key) or []:
+                emit(record, item if isinstance(item, Mapping) else {"value": item})
+            data = {k: v for k, v in data.items() if k != key}
+        emit("summary", data)
+        return
     if _json_mode:
-        print(json.dumps(data, indent=2, ensure_ascii=False))
+        print(json.dumps(data, indent=2, ensure_ascii=False, default=json_default))
         return
 
     if human_fn is not None:
@@ -264,7 +302,9 @@ class _UI:
     table = staticmethod(table)
     file_action = staticmethod(file_action)
     result = staticmethod(result)
+    emit = staticmethod(emit)
     is_json = staticmethod(is_json_mode)
+    is_ndjson = staticmethod(is_ndjson_mode)
     relpath = staticmethod(relpath)
 
 
@@ -135,6 +135,9 @@ class ResolveConfig:
 
     workdir: str = ".workspace-sources"
     namespace: List["NamespaceRule"] = field(default_factory=list)
+    # First-time clones: shallow history depth and partial-clone filter (e.g. "blob:none").
+    clone_depth: Optional[int] = None
+    clone_filter: Optional[str] = None
 
     @classmethod
     def from_dict(cls, data: dict) -> "ResolveConfig":
@@ -145,12 +148,20 @@ class ResolveConfig:
             for host, template in raw_ns.items():
                 if isinstance(host, str) and isinstance(template, str):
                     namespace.append(NamespaceRule(host=host.strip(), template=template.strip()))
-        return cls(workdir=workdir, namespace=namespace)
+        raw_depth = (data or {}).get("clone_depth")
+        clone_depth = raw_depth if isinstance(raw_depth, int) and not isinstance(raw_depth, bool) and raw_depth > 0 else None
+        raw_filter = (data or {}).get("clone_filter")
+        clone_filter = raw_filter.strip() if isinstance(raw_filter, str) and raw_filter.strip() else None
+        return cls(workdir=workdir, namespace=namespace, clone_depth=clone_depth, clone_filter=clone_filter)
 
     def to_dict(self) -> dict:
         d: dict = {"workdir": self.workdir}
         if self.namespace:
             d["namespace"] = {r.host: r.template for r in self.namespace}
+        if self.clone_depth:
+            d["clone_depth"] = self.clone_depth
+        if self.clone_filter:
+            d["clone_filter"] = self.clone_filter
         return d
 # @cpt-end:cpt-cypilot-algo-workspace-resolve-git-url:p1:inst-git-datamodel
 
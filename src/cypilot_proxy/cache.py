@@ -4,24 +4,36 @@ Skill Bundle Cache Management
 Downloads skill bundle from GitHub releases into ~/.cypilot/cache/.
 Uses only Python stdlib (urllib.request) — no third-party dependencies.
 
+Every installed version is also kept in the multi-version skill store
+(see ``cypilot_proxy.store``); switching back to a stored version
+re-links it into the cache without downloading.
+
+Downloads are streamed in chunks to a temporary file and tarballs are
+extracted in a single pass (tar stream mode), so memory use does not grow
+with the bundle size. The new bundle is assembled in a sibling staging
+directory, moved into the store and linked over the cache only once it is
+complete, so a failed or interrupted update leaves the previous cache intact.
+
 @cpt-algo:cpt-cypilot-algo-core-infra-cache-skill:p1
 @cpt-dod:cpt-cypilot-dod-core-infra-skill-cache:p1
 """
 
 # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-cache-helpers
-import io
 import json
 import os
 import shutil
 import sys
 import tarfile
+import tempfile
 import zipfile
+from http.client import HTTPException
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
-from cypilot_proxy.resolve import get_cache_dir, get_version_file
+from cypilot_proxy.resolve import get_cache_dir, get_store_dir, get_version_file
+from cypilot_proxy.store import SkillStore, make_staging_dir
 
 # GitHub repository for skill bundle releases
 GITHUB_OWNER = "cyberfabric"
@@ -29,6 +41,12 @@ GITHUB_REPO = "cyber-pilot"
 GITHUB_API_BASE = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}"
 USER_AGENT = "cypilot-proxy/3.0"
 
+# Download read size; also the copy buffer for extracted members
+CHUNK_SIZE = 64 * 1024
+
+# progress(bytes_done, total_bytes_or_None), called after every chunk
+ProgressHook = Callable[[int, Optional[int]], None]
+
 
 def _patch_cached_version(cache_dir: Path, version: str) -> None:
     """Patch __version__ in cached skill's __init__.py with the resolved version."""
@@ -182,20 +200,19 @@ def copy_from_local(
         if cached_version == f"local:{local_version}":
             return True, f"Cache already up to date (local:{local_version})"
 
-    # Remove old cache and copy
-    if cache_dir.exists():
-        shutil.rmtree(cache_dir)
-    cache_dir.mkdir(parents=True, exist_ok=True)
-
-    # Copy source contents to cache
-    for item in source.iterdir():
-        dst = cache_dir / item.name
-        if item.is_dir():
-            shutil.copytree(item, dst)
-        elif item.is_file():
-            shutil.copy2(item, dst)
-
-    version_file.write_text(f"local:{local_version}", encoding="utf-8")
+    # Copy source contents into a staging dir, then install it over the old cache
+    staging = make_staging_dir(cache_dir)
+    try:
+        for item in source.iterdir():
+            dst = staging / item.name
+            if item.is_dir():
+                shutil.copytree(item, dst)
+            elif item.is_file():
+                shutil.copy2(item, dst)
+        (staging / version_file.name).write_text(f"local:{local_version}", encoding="utf-8")
+        _install_version(staging, f"local:{local_version}", cache_dir)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
 
     return True, (
         f"Cached: local:{local_version}\n"
@@ -204,10 +221,22 @@ def copy_from_local(
     )
 # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-cache-helpers
 
+def stderr_progress(done: int, total: Optional[int]) -> None:
+    """Progress hook that redraws a one-line download counter on stderr."""
+    mib = done / (1024 * 1024)
+    if total:
+        sys.stderr.write(f"\rDownloading... {done * 100 // total:3d}% ({mib:.1f} MiB)")
+        if done >= total:
+            sys.stderr.write("\n")
+    else:
+        sys.stderr.write(f"\rDownloading... {mib:.1f} MiB")
+    sys.stderr.flush()
+
 def download_and_cache(
     version: Optional[str] = None,
     force: bool = False,
     url: Optional[str] = None,
+    progress: Optional[ProgressHook] = None,
 ) -> Tuple[bool, str]:
     """
     Download skill bundle from GitHub and extract to cache directory.
@@ -216,6 +245,7 @@ def download_and_cache(
         version: Target version tag. If None, resolves to "latest".
         force: If True, re-download even if cache version matches.
         url: Custom GitHub repo URL (for forks). Format: "owner/repo" or full URL.
+        progress: Optional hook called with (bytes_done, total_or_None) per chunk.
 
     Returns:
         (success, message) tuple.
@@ -240,79 +270,77 @@ def download_and_cache(
     # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-resolve-version
 
     # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-if-cache-fresh
+    store = SkillStore(get_store_dir(cache_dir))
     if not force and version_file.is_file():
         cached_version = version_file.read_text(encoding="utf-8").strip()
         if cached_version == resolved_version:
             # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-return-cache-hit
+            store.touch(resolved_version)
             return True, f"Cache already up to date (version {resolved_version})"
             # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-return-cache-hit
+    if not force and store.has(resolved_version):
+        try:
+            store.materialize(resolved_version, cache_dir)
+        except OSError as e:
+            return False, f"Failed to update cache at {cache_dir}: {e}"
+        return True, f"Cache switched to stored version {resolved_version}"
     # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-if-cache-fresh
 
     if asset_url is None:
         return False, f"No download URL found for version {resolved_version}"
 
-    # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-download-archive
-    req = Request(asset_url, headers=_get_github_headers())
+    cache_dir.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=cache_dir.parent, prefix=".download-", suffix=".tmp")
+    archive = Path(tmp_name)
     try:
-        with urlopen(req, timeout=120) as resp:
-            archive_data = resp.read()
-    except HTTPError as e:
-        # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-if-download-error
-        # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-return-download-fail
-        return False, f"Download failed: HTTP {e.code} — {e.reason}. URL: {asset_url}"
-        # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-return-download-fail
-        # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-if-download-error
-    except URLError as e:
-        return False, f"Download failed: {e.reason}. Check network connectivity."
-    except OSError as e:
-        return False, f"Download failed: {e}. Check network connectivity."
-    # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-download-archive
-
-    # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-mkdir-cache
-    # Remove old cache to prevent version mixing
-    if cache_dir.exists():
-        shutil.rmtree(cache_dir)
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-mkdir-cache
-
-    # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-extract-archive
-    extracted = False
-    try:
-        # Try tar.gz first
-        buf = io.BytesIO(archive_data)
-        if tarfile.is_tarfile(buf):
-            buf.seek(0)
-            with tarfile.open(fileobj=buf, mode="r:*") as tf:
-                # GitHub tarballs have a top-level directory; strip it
-                members = tf.getmembers()
-                prefix = _find_common_prefix(members)
-                _extract_stripped(tf, members, prefix, cache_dir)
-                extracted = True
-    except (tarfile.TarError, OSError):
-        pass
-
-    if not extracted:
+        # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-download-archive
+        req = Request(asset_url, headers=_get_github_headers())
+        try:
+            with os.fdopen(fd, "wb") as out, urlopen(req, timeout=120) as resp:
+                _download_to(resp, out, progress)
+        except HTTPError as e:
+            # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-if-download-error
+            # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-return-download-fail
+            return False, f"Download failed: HTTP {e.code} — {e.reason}. URL: {asset_url}"
+            # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-return-download-fail
+            # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-if-download-error
+        except URLError as e:
+            return False, f"Download failed: {e.reason}. Check network connectivity."
+        except (OSError, HTTPException) as e:
+            return False, f"Download failed: {e}. Check network connectivity."
+        # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-download-archive
+
+        # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-mkdir-cache
+        # Build the new cache next to the old one; it replaces it only when complete
+        staging = make_staging_dir(cache_dir)
+        # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-mkdir-cache
+        try:
+            # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-extract-archive
+            bundle = _extract_tar_stream(archive, staging)
+            if bundle is None:
+                bundle = _extract_zip(archive, staging)
+            if bundle is None:
+                return False, "Failed to extract archive: unrecognized format"
+            # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-extract-archive
+
+            # Patch __version__ in cached skill's __init__.py with resolved version
+            _patch_cached_version(bundle, resolved_version)
+
+            # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-write-version
+            (bundle / version_file.name).write_text(resolved_version, encoding="utf-8")
+            try:
+                _install_version(bundle, resolved_version, cache_dir)
+            except OSError as e:
+                return False, f"Failed to update cache at {cache_dir}: {e}"
+            # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-write-version
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    finally:
         try:
-            buf = io.BytesIO(archive_data)
-            with zipfile.ZipFile(buf) as zf:
-                members = zf.namelist()
-                prefix = _find_zip_prefix(members)
-                _extract_zip_stripped(zf, members, prefix, cache_dir)
-                extracted = True
-        except (zipfile.BadZipFile, OSError):
+            archive.unlink()
+        except OSError:
             pass
 
-    if not extracted:
-        return False, "Failed to extract archive: unrecognized format"
-    # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-extract-archive
-
-    # Patch __version__ in cached skill's __init__.py with resolved version
-    _patch_cached_version(cache_dir, resolved_version)
-
-    # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-write-version
-    version_file.write_text(resolved_version, encoding="utf-8")
-    # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-write-version
-
     # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-return-cache-path-new
     return True, (
         f"Cached: {resolved_version}\n"
@@ -322,43 +350,78 @@ def download_and_cache(
     # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-return-cache-path-new
 
 # @cpt-begin:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-cache-helpers
-def _find_common_prefix(members: list) -> str:
-    """Find common top-level directory prefix in tar members."""
-    names = [m.name for m in members if m.name and "/" in m.name]
-    if not names:
-        return ""
-    first_parts = {n.split("/", 1)[0] for n in names}
+def _download_to(resp, out, progress: Optional[ProgressHook]) -> None:
+    """Copy the response body to *out* in ``CHUNK_SIZE`` chunks; raise OSError when truncated."""
+    length = resp.headers.get("Content-Length") if resp.headers is not None else None
+    total = int(length) if length and length.isdigit() else None
+    done = 0
+    while True:
+        chunk = resp.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        out.write(chunk)
+        done += len(chunk)
+        if progress is not None:
+            progress(done, total)
+    if total is not None and done < total:
+        raise OSError(f"connection closed after {done} of {total} bytes")
+
+def _install_version(bundle: Path, version: str, cache_dir: Path) -> None:
+    """Move *bundle* into the skill store as *version*, make it current, then evict old versions."""
+    store = SkillStore(get_store_dir(cache_dir))
+    store.add_tree(bundle, version)
+    store.materialize(version, cache_dir)
+    store.evict(keep={version})
+
+def _safe_rel(name: str) -> Optional[str]:
+    """Archive member name as a safe relative path, or None for absolute/parent paths."""
+    if not name or name.startswith("/") or ".." in name.split("/"):
+        return None
+    return name
+
+def _extract_tar_stream(archive: Path, dest: Path) -> Optional[Path]:
+    """Extract a tarball into *dest* in one pass; return the bundle root or None if not a tar.
+
+    GitHub tarballs have a single top-level directory. Members are written
+    under their full names; when all nested names share one top-level
+    directory that directory is the bundle root (the common prefix is
+    stripped by returning it), otherwise *dest* itself is.
+    """
+    first_parts = set()
+    try:
+        with open(archive, "rb") as f, tarfile.open(fileobj=f, mode="r|*") as tf:
+            for member in tf:
+                rel = _safe_rel(member.name)
+                if rel is None:
+                    continue
+                if "/" in rel:
+                    first_parts.add(rel.split("/", 1)[0])
+                target = dest / rel
+                if member.isdir():
+                    target.mkdir(parents=True, exist_ok=True)
+                elif member.isfile():
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    src = tf.extractfile(member)
+                    if src is not None:
+                        with open(target, "wb") as out:
+                            shutil.copyfileobj(src, out, CHUNK_SIZE)
+    except (tarfile.TarError, OSError):
+        return None
     if len(first_parts) == 1:
-        return first_parts.pop() + "/"
-    return ""
+        root = dest / first_parts.pop()
+        if root.is_dir():
+            return root
+    return dest
 
-def _extract_stripped(
-    tf: tarfile.TarFile,
-    members: list,
-    prefix: str,
-    dest: Path,
-) -> None:
-    """Extract tar members, stripping the common prefix."""
-    for member in members:
-        if not member.name.startswith(prefix):
-            continue
-        rel = member.name[len(prefix):]
-        if not rel:
-            continue
-        # Security: skip absolute paths and parent references
-        if rel.startswith("/") or ".." in rel.split("/"):
-            continue
-        member_copy = tarfile.TarInfo(name=rel)
-        member_copy.size = member.size
-        member_copy.mode = member.mode
-        target = dest / rel
-        if member.isdir():
-            target.mkdir(parents=True, exist_ok=True)
-        elif member.isfile():
-            target.parent.mkdir(parents=True, exist_ok=True)
-            f = tf.extractfile(member)
-            if f is not None:
-                target.write_bytes(f.read())
+def _extract_zip(archive: Path, dest: Path) -> Optional[Path]:
+    """Extract a zip archive into *dest*, stripping its common prefix; None if not a zip."""
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            members = zf.namelist()
+            _extract_zip_stripped(zf, members, _find_zip_prefix(members), dest)
+    except (zipfile.BadZipFile, OSError):
+        return None
+    return dest
 
 def _find_zip_prefix(members: list) -> str:
     """Find common top-level directory prefix in zip members."""
@@ -390,5 +453,6 @@ def _extract_zip_stripped(
             target.mkdir(parents=True, exist_ok=True)
         else:
             target.parent.mkdir(parents=True, exist_ok=True)
-            target.write_bytes(zf.read(name))
+            with zf.open(name) as src, open(target, "wb") as out:
+                shutil.copyfileobj(src, out, CHUNK_SIZE)
 # @cpt-end:cpt-cypilot-algo-core-infra-cache-skill:p1:inst-cache-helpers
@@ -12,6 +12,8 @@ All actual logic lives in the skill engine — this proxy only routes.
 """
 
 # @cpt-begin:cpt-cypilot-flow-core-infra-cli-invocation:p1:inst-cli-proxy-helpers
+import importlib.util
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -110,11 +112,14 @@ def main(argv: Optional[List[str]] = None) -> int:
 
                 success, message = copy_from_local(source_dir=source_dir, force=force_update)
             else:
-                from cypilot_proxy.cache import download_and_cache
+                from cypilot_proxy.cache import download_and_cache, stderr_progress
 
                 # @cpt-begin:cpt-cypilot-flow-core-infra-cli-invocation:p1:inst-explicit-cache-update
                 explicit = target_version or (args[1] if len(args) > 1 else None)
-                success, message = download_and_cache(version=explicit, force=force_update, url=custom_url)
+                success, message = download_and_cache(
+                    version=explicit, force=force_update, url=custom_url,
+                    progress=stderr_progress if sys.stderr.isatty() else None,
+                )
                 # @cpt-end:cpt-cypilot-flow-core-infra-cli-invocation:p1:inst-explicit-cache-update
 
             sys.stderr.write(f"{message}\n")
@@ -122,7 +127,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                 return 1
 
         # Step 2: Forward to skill engine for .core/ + kits + .gen/ update
-        skill_path = find_cached_skill()
+        skill_path = find_cached_skill(target_version)
         if skill_path is None:
             sys.stderr.write("Cache not found. Run 'cpt update' without --no-cache first.\n")
             # @cpt-begin:cpt-cypilot-state-core-infra-project-install:p1:inst-update-complete
@@ -153,13 +158,16 @@ def main(argv: Optional[List[str]] = None) -> int:
             sys.stderr.write("Updating cache from local source...\n")
             success, message = copy_from_local(source_dir=source_dir, force=force_update)
         else:
-            from cypilot_proxy.cache import download_and_cache
+            from cypilot_proxy.cache import download_and_cache, stderr_progress
 
             if target_version:
                 sys.stderr.write(f"Updating cache to version {target_version}...\n")
             else:
                 sys.stderr.write("Updating cache to latest version...\n")
-            success, message = download_and_cache(version=target_version, force=force_update, url=custom_url)
+            success, message = download_and_cache(
+                version=target_version, force=force_update, url=custom_url,
+                progress=stderr_progress if sys.stderr.isatty() else None,
+            )
         sys.stderr.write(f"{message}\n")
         if not success:
             return 1
@@ -177,7 +185,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         and "--help" not in args and "-h" not in args
     )
     if use_cache_for_init:
-        skill_path = find_cached_skill()
+        skill_path = find_cached_skill(target_version)
         source = "cache" if skill_path else "none"
     else:
         skill_path, source = resolve_skill()
@@ -250,14 +258,94 @@ def main(argv: Optional[List[str]] = None) -> int:
     # @cpt-end:cpt-cypilot-flow-core-infra-cli-invocation:p1:inst-return-exit
 
 # @cpt-begin:cpt-cypilot-flow-core-infra-cli-invocation:p1:inst-cli-proxy-helpers
+# Set to any non-empty value to always run the skill in a child interpreter.
+FORCE_SUBPROCESS_ENV = "CYPILOT_PROXY_SUBPROCESS"
+
+# Oldest skill major version whose cypilot.cli.main(argv) can be called in-process.
+_MIN_IN_PROCESS_MAJOR = 3
+
+# Commands that rewrite the skill's own files while running.
+_SUBPROCESS_COMMANDS = frozenset({"update"})
+
+def _skill_major_version(skill_path: Path) -> Optional[int]:
+    version = get_project_version(skill_path)
+    if not version:
+        return None
+    head = version.lstrip("vV").split(".", 1)[0]
+    return int(head) if head.isdigit() else None
+
+def _needs_isolation(skill_path: Path, args: List[str]) -> bool:
+    """Whether the skill must run in its own interpreter rather than in-process."""
+    if os.environ.get(FORCE_SUBPROCESS_ENV):
+        return True
+    if args and args[0] in _SUBPROCESS_COMMANDS:
+        return True
+    major = _skill_major_version(skill_path)
+    if major is None or major < _MIN_IN_PROCESS_MAJOR:
+        return True
+    # A different `cypilot` package is already imported in this interpreter.
+    loaded = sys.modules.get("cypilot")
+    if loaded is not None:
+        loaded_file = getattr(loaded, "__file__", None)
+        expected = skill_path.parent / "cypilot" / "__init__.py"
+        if loaded_file is None or Path(loaded_file).resolve() != expected.resolve():
+            return True
+    return False
+
+def _load_skill_main(skill_path: Path):
+    """Import the skill package from *skill_path* without touching sys.path."""
+    package_dir = skill_path.parent / "cypilot"
+    init_file = package_dir / "__init__.py"
+    if not init_file.is_file():
+        return None
+    module = sys.modules.get("cypilot")
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            "cypilot", init_file, submodule_search_locations=[str(package_dir)],
+        )
+        if spec is None or spec.loader is None:
+            return None
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["cypilot"] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules["cypilot"]
+            raise
+    from cypilot.cli import main as skill_main  # pylint: disable=import-outside-toplevel  # resolved from the spec registered above
+    return skill_main
+
+def _run_in_process(skill_path: Path, args: List[str]) -> Optional[int]:
+    """Run the skill's CLI in this interpreter; None when it must be isolated instead."""
+    if _needs_isolation(skill_path, args):
+        return None
+    try:
+        skill_main = _load_skill_main(skill_path)
+    except (ImportError, SyntaxError, OSError):
+        return None
+    if skill_main is None:
+        return None
+    try:
+        rc = skill_main(list(args))
+    except SystemExit as e:
+        rc = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    sys.stdout.flush()
+    return int(rc or 0)
+
 def _forward_to_skill(skill_path: Path, args: List[str]) -> int:
     """
-    Forward command to the resolved skill engine via subprocess.
+    Forward command to the resolved skill engine.
 
-    Uses the same Python interpreter that's running this proxy.
+    Compatible skills run in-process (imported from their own directory);
+    otherwise, or when FORCE_SUBPROCESS_ENV is set, the skill runs via
+    subprocess using the same Python interpreter that's running this proxy.
     """
     # @cpt-begin:cpt-cypilot-flow-core-infra-cli-invocation:p1:inst-forward-project
     # @cpt-begin:cpt-cypilot-flow-core-infra-cli-invocation:p1:inst-forward-cache
+    rc = _run_in_process(skill_path, args)
+    if rc is not None:
+        return rc
+
     cmd = [sys.executable, str(skill_path)] + args
 
     try:
@@ -124,6 +124,10 @@ def get_cache_dir() -> Path:
 def get_version_file() -> Path:
     """Return the version marker file path."""
     return get_cache_dir() / ".version"
+
+def get_store_dir(cache_dir: Optional[Path] = None) -> Path:
+    """Return the multi-version skill store next to the cache: ~/.cypilot/store/"""
+    return (cache_dir or get_cache_dir()).parent / "store"
 # @cpt-end:cpt-cypilot-algo-core-infra-resolve-skill:p1:inst-resolve-helpers
 
 def find_project_skill(start_dir: Optional[Path] = None) -> Optional[Path]:
@@ -164,14 +168,30 @@ def find_project_skill(start_dir: Optional[Path] = None) -> Optional[Path]:
 
     return None
 
-def find_cached_skill() -> Optional[Path]:
+def find_cached_skill(version: Optional[str] = None) -> Optional[Path]:
     """
     Check for cached skill at ~/.cypilot/cache/.
 
+    With *version*, a different current version is first switched to that
+    version's tree in the skill store (~/.cypilot/store/versions/) so a
+    project pinned to a version runs it even when another version is current.
+    The engine always runs from the cache: its init/update copy from the
+    cache, so it must hold the engine's own version. Falls back to the
+    current cache when *version* is not stored.
+
     Returns path to the skill entry point or None.
     """
     # @cpt-begin:cpt-cypilot-algo-core-infra-resolve-skill:p1:inst-check-global-cache
     cache_dir = get_cache_dir()
+    if version and get_cached_version() != version:
+        from cypilot_proxy.store import SkillStore
+
+        store = SkillStore(get_store_dir(cache_dir))
+        if store.has(version):
+            try:
+                store.materialize(version, cache_dir)
+            except OSError:
+                pass  # keep the current cache
     entry_point = cache_dir / "skills" / "cypilot" / "scripts" / "cypilot.py"
     if entry_point.is_file():
         # @cpt-begin:cpt-cypilot-algo-core-infra-resolve-skill:p1:inst-return-cache-path
@@ -0,0 +1,238 @@
+"""
+Skill Bundle Store
+
+Content-addressed, multi-version store for downloaded skill bundles at
+~/.cypilot/store/ (next to ~/.cypilot/cache/):
+
+- objects/<sha256[:2]>/<sha256[2:]>[.x] — one file per distinct content
+  (``.x`` marks executable files, whose mode is shared through the link);
+- versions/<name>/ — one tree per cached version, made of hard links into
+  objects/, with the version string in its ``.version`` marker.
+
+~/.cypilot/cache/ itself stays a plain tree of the current version (skill
+engines copy from it directly); it is materialized from versions/ as hard
+links, so switching to a version that is already stored needs no download
+and no copying. Identical files across versions are stored once.
+
+Versions are evicted least-recently-used first (by the mtime of their tree,
+refreshed whenever a version is selected) once the objects exceed the size
+budget (``CYPILOT_CACHE_MAX_MB``, default 512); an object is deleted when no
+version tree or cache file links to it any more. On filesystems without hard
+links files are copied instead and nothing is deduplicated.
+
+Uses only Python stdlib.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+# Environment variable with the object store size budget in MiB
+MAX_MB_ENV = "CYPILOT_CACHE_MAX_MB"
+DEFAULT_MAX_MB = 512
+
+VERSION_MARKER = ".version"
+
+_HASH_CHUNK = 64 * 1024
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def version_dirname(version: str) -> str:
+    """Filesystem-safe, collision-free directory name for *version*."""
+    safe = _UNSAFE_NAME_RE.sub("_", version)
+    if safe == version and not safe.startswith("."):
+        return safe
+    return f"{safe.lstrip('.')}-{hashlib.sha256(version.encode('utf-8')).hexdigest()[:8]}"
+
+
+def max_store_bytes() -> int:
+    """Size budget for the object store, from ``CYPILOT_CACHE_MAX_MB``."""
+    raw = os.environ.get(MAX_MB_ENV, "").strip()
+    mb = int(raw) if raw.isdigit() else DEFAULT_MAX_MB
+    return mb * 1024 * 1024
+
+
+def make_staging_dir(target: Path) -> Path:
+    """Create an empty staging directory on the same filesystem as *target*."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(dir=target.parent, prefix=f".{target.name}-staging-"))
+
+
+def swap_into_place(new_dir: Path, target: Path) -> None:
+    """Rename *new_dir* over *target*; the old *target* is restored if the rename fails."""
+    old = None
+    if target.exists():
+        old = Path(tempfile.mkdtemp(dir=target.parent, prefix=f".{target.name}-old-"))
+        os.rmdir(old)
+        os.replace(target, old)
+    try:
+        os.replace(new_dir, target)
+    except OSError:
+        if old is not None:
+            os.replace(old, target)
+        raise
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _iter_files(root: Path) -> Iterable[Path]:
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for fname in filenames:
+            yield Path(dirpath) / fname
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_HASH_CHUNK)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class SkillStore:
+    """Hard-linked, content-addressed trees of skill bundle versions."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.objects = root / "objects"
+        self.versions = root / "versions"
+
+    def version_dir(self, version: str) -> Path:
+        return self.versions / version_dirname(version)
+
+    def has(self, version: str) -> bool:
+        """Whether a complete tree for *version* is stored."""
+        marker = self.version_dir(version) / VERSION_MARKER
+        try:
+            return marker.read_text(encoding="utf-8").strip() == version
+        except OSError:
+            return False
+
+    def list_versions(self) -> List[str]:
+        """Stored versions, least recently used first."""
+        found = []
+        try:
+            entries = list(self.versions.iterdir())
+        except OSError:
+            return []
+        for d in entries:
+            try:
+                found.append((d.stat().st_mtime_ns, (d / VERSION_MARKER).read_text(encoding="utf-8").strip()))
+            except OSError:
+                continue
+        return [v for _mtime, v in sorted(found)]
+
+    def touch(self, version: str) -> None:
+        """Mark *version* as just used (LRU order)."""
+        try:
+            os.utime(self.version_dir(version))
+        except OSError:
+            pass
+
+    def _object_path(self, path: Path) -> Path:
+        digest = _file_digest(path)
+        suffix = ".x" if os.stat(path).st_mode & stat.S_IXUSR else ""
+        return self.objects / digest[:2] / f"{digest[2:]}{suffix}"
+
+    def add_tree(self, tree: Path, version: str) -> Path:
+        """Move the bundle at *tree* (its ``.version`` already written) into the store.
+
+        Each file is replaced by a hard link to its object (creating the
+        object from the file when the content is new); the tree then becomes
+        ``versions/<name>/``, replacing any previous tree for *version*.
+        """
+        for path in _iter_files(tree):
+            if path.is_symlink():
+                continue
+            obj = self._object_path(path)
+            try:
+                if obj.exists():
+                    tmp = path.with_name(f".{path.name}.link")
+                    os.link(obj, tmp)
+                    os.replace(tmp, path)
+                else:
+                    obj.parent.mkdir(parents=True, exist_ok=True)
+                    os.link(path, obj)
+            except OSError:
+                continue  # no hard links here: keep the plain file
+        self.versions.mkdir(parents=True, exist_ok=True)
+        target = self.version_dir(version)
+        swap_into_place(tree, target)
+        self.touch(version)
+        return target
+
+    def materialize(self, version: str, dest: Path) -> None:
+        """Replace *dest* with a hard-linked copy of the stored *version* tree."""
+        src = self.version_dir(version)
+        staging = make_staging_dir(dest)
+        try:
+            for path in _iter_files(src):
+                rel = path.relative_to(src)
+                if "__pycache__" in rel.parts:
+                    continue
+                target = staging / rel
+                target.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(path, target)
+                except OSError:
+                    shutil.copy2(path, target)
+            swap_into_place(staging, dest)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.touch(version)
+
+    def total_bytes(self) -> int:
+        """Size of all stored objects."""
+        return sum(p.stat().st_size for p in _iter_files(self.objects))
+
+    def collect_garbage(self) -> int:
+        """Delete objects no tree links to any more; return the bytes freed."""
+        freed = 0
+        for p in list(_iter_files(self.objects)):
+            try:
+                st = p.stat()
+                if st.st_nlink <= 1:
+                    p.unlink()
+                    freed += st.st_size
+            except OSError:
+                continue
+        return freed
+
+    def evict(self, max_bytes: Optional[int] = None, keep: Iterable[str] = ()) -> List[str]:
+        """Drop least recently used versions (except *keep*) until objects fit *max_bytes*.
+
+        Returns the evicted versions.
+        """
+        budget = max_store_bytes() if max_bytes is None else max_bytes
+        keep_set = set(keep)
+        self.collect_garbage()
+        total = self.total_bytes()
+        evicted: List[str] = []
+        for version in self.list_versions():
+            if total <= budget:
+                break
+            if version in keep_set:
+                continue
+            shutil.rmtree(self.version_dir(version), ignore_errors=True)
+            total -= self.collect_garbage()
+            evicted.append(version)
+        return evicted
+
+
+__all__ = [
+    "DEFAULT_MAX_MB",
+    "MAX_MB_ENV",
+    "SkillStore",
+    "make_staging_dir",
+    "max_store_bytes",
+    "swap_into_place",
+    "version_dirname",
+]
@@ -196,6 +196,23 @@ class TestArtifactsMeta(unittest.TestCase):
         self.assertNotIn("src/ignored", codebase_paths)
         self.assertIn("src/ok", codebase_paths)
 
+    def test_is_ignored_dir_only_for_whole_subtree_patterns(self):
+        data = {
+            "version": "1.1",
+            "project_root": "..",
+            "kits": {},
+            "ignore": [{"reason": "hide", "patterns": ["vendor/*", "docs", "*/generated/*", "src/*.tmp"]}],
+            "systems": [],
+        }
+        meta = ArtifactsMeta.from_dict(data)
+        self.assertTrue(meta.is_ignored_dir("vendor"))
+        self.assertTrue(meta.is_ignored_dir("vendor/lib"))
+        self.assertTrue(meta.is_ignored_dir("pkg/generated"))
+        # "docs" ignores only the path itself, not files below it.
+        self.assertTrue(meta.is_ignored("docs"))
+        self.assertFalse(meta.is_ignored_dir("docs"))
+        self.assertFalse(meta.is_ignored_dir("src"))
+
     def test_autodetect_system_root_without_system_placeholder(self):
         """system_root may omit {system}; still uses node.slug for other placeholders."""
         with TemporaryDirectory() as tmpdir:
@@ -0,0 +1,74 @@
+"""Tests for the benchmark suite's synthetic project generator and result comparison."""
+
+import io
+import json
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from synthetic import ProjectSpec, generate_project
+from suite import compare
+
+from cypilot.cli import main
+from cypilot.utils.context import set_context
+
+_SPEC = ProjectSpec(systems=2, features=2, ids_per_artifact=8, code_files=2)
+
+
+def _tree(root: Path):
+    return {
+        p.relative_to(root).as_posix(): p.read_bytes()
+        for p in sorted(root.rglob("*")) if p.is_file()
+    }
+
+
+class TestSyntheticProject(unittest.TestCase):
+    def test_generation_is_deterministic(self):
+        with TemporaryDirectory() as a, TemporaryDirectory() as b:
+            counts_a = generate_project(Path(a), _SPEC)
+            counts_b = generate_project(Path(b), _SPEC)
+            self.assertEqual(counts_a, counts_b)
+            self.assertEqual(_tree(Path(a)), _tree(Path(b)))
+            self.assertEqual(counts_a["artifacts"], 12)
+            self.assertEqual(counts_a["code_files"], 4)
+
+    def test_generated_project_validates_against_kit(self):
+        with TemporaryDirectory() as td:
+            root = Path(td).resolve()
+            generate_project(root, _SPEC)
+            cwd = os.getcwd()
+            self.addCleanup(os.chdir, cwd)
+            self.addCleanup(set_context, None)
+            os.chdir(root)
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                rc = main(["--json", "validate", "--no-cache"])
+            out = json.loads(buf.getvalue())
+            self.assertEqual(rc, 0, out.get("errors"))
+            self.assertEqual(out["status"], "PASS")
+            self.assertGreater(out["code_ids_found"], 0)
+
+
+class TestCompare(unittest.TestCase):
+    def test_flags_growth_past_threshold(self):
+        base = {"scenarios": {"a": {"median_ms": 100.0, "peak_kib": 10.0}, "b": {"median_ms": 10.0, "peak_kib": 10.0}}}
+        cur = {"scenarios": {
+            "a": {"median_ms": 110.0, "peak_kib": 10.0},
+            "b": {"median_ms": 10.0, "peak_kib": 20.0},
+            "new": {"median_ms": 1.0, "peak_kib": 1.0},
+        }}
+        rows = {r["scenario"]: r for r in compare(cur, base, 0.25)}
+        self.assertEqual(set(rows), {"a", "b"})
+        self.assertFalse(rows["a"]["regressed"])
+        self.assertTrue(rows["b"]["regressed"])
+        self.assertEqual(rows["b"]["peak_kib_ratio"], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import io
 import json
 import sys
@@ -651,6 +652,163 @@ class TestChunkInputCommand(unittest.TestCase):
 
             self.assertEqual(dry_payload["input_signature"], write_payload["input_signature"])
 
+    def test_unchanged_input_reuses_package_without_writing(self):
+        with TemporaryDirectory() as td:
+            src = Path(td) / "request.md"
+            out_dir = Path(td) / "input"
+            src.write_text(self._make_text(650), encoding="utf-8")
+
+            first_buf = io.StringIO()
+            with patch("sys.stdin", io.StringIO("prompt\n")), redirect_stdout(first_buf):
+                self.assertEqual(cmd_chunk_input([str(src), "--output-dir", str(out_dir), "--include-stdin"]), 0)
+            first_payload = json.loads(first_buf.getvalue())
+            self.assertFalse(first_payload["reused"])
+            mtimes = {p.name: p.stat().st_mtime_ns for p in out_dir.iterdir()}
+
+            second_buf = io.StringIO()
+            with patch("sys.stdin", io.StringIO("prompt\n")), \
+                    patch.object(chunk_input_module, "_write_chunks", side_effect=AssertionError("rewritten")), \
+                    redirect_stdout(second_buf):
+                rc = cmd_chunk_input([
+                    str(src), "--output-dir", str(out_dir), "--include-stdin", "--stdin-label", "other",
+                ])
+            self.assertEqual(rc, 0)
+            payload = json.loads(second_buf.getvalue())
+            self.assertTrue(payload["reused"])
+            for key in ("input_signature", "chunks", "direct_prompt_file", "total_lines", "chunk_count"):
+                self.assertEqual(payload[key], first_payload[key], key)
+            self.assertEqual({p.name: p.stat().st_mtime_ns for p in out_dir.iterdir()}, mtimes)
+
+    def test_reuse_requires_same_max_lines_and_intact_package(self):
+        with TemporaryDirectory() as td:
+            src = Path(td) / "request.md"
+            out_dir = Path(td) / "input"
+            src.write_text(self._make_text(12), encoding="utf-8")
+
+            def run(*extra):
+                buf = io.StringIO()
+                with redirect_stdout(buf):
+                    self.assertEqual(cmd_chunk_input([str(src), "--output-dir", str(out_dir), *extra]), 0)
+                return json.loads(buf.getvalue())
+
+            run("--max-lines", "6")
+            self.assertTrue(run("--max-lines", "6")["reused"])
+            payload = run("--max-lines", "5")
+            self.assertFalse(payload["reused"])
+            self.assertEqual(payload["chunk_count"], 3)
+            (out_dir / payload["chunks"][1]["file"]).unlink()
+            payload = run("--max-lines", "5")
+            self.assertFalse(payload["reused"])
+            self.assertTrue(Path(payload["chunks"][1]["path"]).is_file())
+
+    def test_streams_sources_into_chunks(self):
+        with TemporaryDirectory() as td:
+            src = Path(td) / "request.md"
+            out_dir = Path(td) / "input"
+            src.write_bytes(b"a\r\nb\rc\x0cd\n\ne")
+            original_read_text = Path.read_text
+
+            def guarded_read_text(path, *args, **kwargs):
+                if path == src:
+                    raise AssertionError("source read into memory")
+                return original_read_text(path, *args, **kwargs)
+
+            buf = io.StringIO()
+            with patch.object(Path, "read_text", guarded_read_text), redirect_stdout(buf):
+                rc = cmd_chunk_input([str(src), "--output-dir", str(out_dir), "--max-lines", "4"])
+            self.assertEqual(rc, 0)
+            payload = json.loads(buf.getvalue())
+            self.assertEqual(payload["total_lines"], 6)
+            self.assertEqual([(c["start_line"], c["end_line"], c["part_count"]) for c in payload["chunks"]],
+                             [(1, 4, 2), (5, 6, 2)])
+            self.assertEqual(Path(payload["chunks"][0]["path"]).read_text(encoding="utf-8"), "a\nb\nc\nd\n")
+            self.assertEqual(Path(payload["chunks"][1]["path"]).read_text(encoding="utf-8"), "\ne\n")
+            manifest = json.loads((out_dir / "manifest.json").read_text(encoding="utf-8"))
+            self.assertEqual(
+                manifest["sources"][0]["content_sha256"],
+                hashlib.sha256("a\nb\nc\x0cd\n\ne".encode("utf-8")).hexdigest(),
+            )
+
+    def test_max_tokens_packs_lines_by_estimate(self):
+        with TemporaryDirectory() as td:
+            prose = Path(td) / "prose.md"
+            data = Path(td) / "data.json"
+            out_dir = Path(td) / "input"
+            prose.write_text("".join(f"plain words {'x' * 8} {idx}\n" for idx in range(40)), encoding="utf-8")
+            data.write_text('{"a":[1,2,3],"b":{"c":"d"}}\n' * 40, encoding="utf-8")
+
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                rc = cmd_chunk_input([str(prose), str(data), "--output-dir", str(out_dir), "--max-tokens", "60"])
+            self.assertEqual(rc, 0)
+            payload = json.loads(buf.getvalue())
+            self.assertEqual((payload["max_lines"], payload["max_tokens"], payload["token_estimator"]),
+                             (None, 60, "heuristic"))
+            manifest = json.loads((out_dir / "manifest.json").read_text(encoding="utf-8"))
+            self.assertEqual(manifest["max_tokens"], 60)
+            by_source = {}
+            for chunk, stored in zip(payload["chunks"], manifest["chunks"]):
+                self.assertEqual(chunk["token_estimate"], stored["token_estimate"])
+                self.assertLessEqual(chunk["token_estimate"], 60)
+                by_source.setdefault(chunk["source_label"], []).append(chunk["line_count"])
+            # Punctuation-dense JSON costs more per line than prose of similar length
+            self.assertGreater(by_source["prose"][0], by_source["data"][0])
+            self.assertEqual([s["chunk_count"] for s in payload["sources"]],
+                             [len(by_source["prose"]), len(by_source["data"])])
+
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                cmd_chunk_input([str(prose), str(data), "--output-dir", str(out_dir), "--max-tokens", "60",
+                                 "--max-lines", "2"])
+            payload = json.loads(buf.getvalue())
+            self.assertFalse(payload["reused"])
+            self.assertEqual({chunk["line_count"] for chunk in payload["chunks"]}, {2})
+
+    def test_heading_breaks_cut_before_heading_outside_fences(self):
+        with TemporaryDirectory() as td:
+            src = Path(td) / "doc.md"
+            out_dir = Path(td) / "input"
+            lines = ["# Title"] + [f"body {idx}" for idx in range(5)] + ["```", "# comment", "```", "## Next"]
+            lines += [f"more {idx}" for idx in range(4)]
+            src.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+            def ranges(*extra):
+                buf = io.StringIO()
+                with redirect_stdout(buf):
+                    self.assertEqual(cmd_chunk_input([str(src), "--output-dir", str(out_dir), *extra]), 0)
+                return [(c["start_line"], c["end_line"]) for c in json.loads(buf.getvalue())["chunks"]]
+
+            self.assertEqual(ranges("--max-lines", "12"), [(1, 12), (13, 14)])
+            self.assertEqual(ranges("--max-lines", "12", "--heading-breaks"), [(1, 9), (10, 14)])
+            # Not cut when the part before the heading would be under half full
+            self.assertEqual(ranges("--max-lines", "20", "--heading-breaks"), [(1, 14)])
+
+    def test_token_estimator_spec_and_errors(self):
+        with TemporaryDirectory() as td:
+            src = Path(td) / "request.md"
+            out_dir = Path(td) / "input"
+            src.write_text(self._make_text(9), encoding="utf-8")
+
+            def run(*extra):
+                buf = io.StringIO()
+                with redirect_stdout(buf):
+                    rc = cmd_chunk_input([str(src), "--output-dir", str(out_dir), *extra])
+                return rc, json.loads(buf.getvalue())
+
+            rc, payload = run("--max-tokens", "3", "--token-estimator", "builtins:len", "--dry-run")
+            self.assertEqual(rc, 0)
+            self.assertEqual(payload["sources"][0]["chunk_count"], 9)
+            rc, payload = run("--max-tokens", "3", "--token-estimator", "no-such-estimator")
+            self.assertEqual((rc, payload["status"]), (1, "ERROR"))
+            rc, payload = run("--max-tokens", "0")
+            self.assertEqual((rc, payload["message"]), (1, "--max-tokens must be > 0"))
+            self.assertFalse(out_dir.exists())
+
+            run("--max-tokens", "20")
+            self.assertTrue(run("--max-tokens", "20")[1]["reused"])
+            self.assertFalse(run("--max-tokens", "21")[1]["reused"])
+            self.assertFalse(run("--max-tokens", "21", "--token-estimator", "bytes")[1]["reused"])
+
     def test_stdin_label_does_not_affect_signature(self):
         """Different --stdin-label values must produce the same input_signature for identical content."""
         with TemporaryDirectory() as td:
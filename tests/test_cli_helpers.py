@@ -22,6 +22,7 @@ from cypilot.utils.document import (
     scan_cdsl_instructions,
     scan_cpt_ids,
     to_relative_posix,
+    walk_files,
 )
 
 from cypilot.utils import document as doc
@@ -375,5 +376,57 @@ class TestIterTextFilesMoreCoverage(unittest.TestCase):
             self.assertEqual(hits, [])
 
 
+class TestWalkFiles(unittest.TestCase):
+    def _tree(self, root: Path) -> None:
+        for rel in [
+            "b.py", "a.ts", "c.txt", "z/y.tsx", "m/n.py", "m/n.py.bak",
+            "node_modules/dep.js", "vendor/lib/v.py", "docs/keep.py", "UP.MD",
+        ]:
+            p = root / rel
+            p.parent.mkdir(parents=True, exist_ok=True)
+            p.write_text("x\n", encoding="utf-8")
+        (root / "dir.py").mkdir()
+
+    def test_single_walk_matches_all_extensions_in_path_order(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._tree(root)
+            hits = walk_files(root, [".py", ".ts", ".tsx", ".js"])
+            rels = [p.relative_to(root).as_posix() for p in hits]
+            self.assertEqual(rels, ["a.ts", "b.py", "docs/keep.py", "m/n.py", "vendor/lib/v.py", "z/y.tsx"])
+            self.assertEqual(hits, sorted(hits))
+
+    def test_ignore_callbacks_prune_and_filter(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir) / "proj"
+            root.mkdir()
+            self._tree(root / "src")
+            seen_dirs = []
+
+            def _ignore_dir(rel):
+                seen_dirs.append(rel)
+                return rel == "src/vendor"
+
+            hits = walk_files(
+                root / "src",
+                [".py"],
+                rel_to=root,
+                ignore_dir=_ignore_dir,
+                ignore_file=lambda rel: rel == "src/b.py",
+            )
+            rels = [p.relative_to(root).as_posix() for p in hits]
+            self.assertEqual(rels, ["src/docs/keep.py", "src/m/n.py"])
+            self.assertNotIn("src/vendor/lib", seen_dirs)
+
+    def test_ignore_case_and_file_root(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._tree(root)
+            self.assertEqual(walk_files(root, [".md"]), [])
+            self.assertEqual(walk_files(root, [".md"], ignore_case=True), [root / "UP.MD"])
+            self.assertEqual(walk_files(root / "b.py", [".py"]), [root / "b.py"])
+            self.assertEqual(walk_files(root / "b.py", [".ts"]), [])
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -5297,14 +5297,20 @@ class TestCLIGetContentCodePath(unittest.TestCase):
             self.assertIn(exit_code, (0, 2))
 
     def test_get_content_neither_artifact_nor_code(self):
-        """Cover ERROR when neither --artifact nor --code specified."""
-        stdout = io.StringIO()
-        with redirect_stdout(stdout):
-            exit_code = main(["get-content", "--id", "cpt-test-id"])
+        """Without --artifact/--code the ID is resolved through the project context."""
+        with TemporaryDirectory() as tmpdir:
+            cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                stdout = io.StringIO()
+                with redirect_stdout(stdout):
+                    exit_code = main(["get-content", "--id", "cpt-test-id"])
+            finally:
+                os.chdir(cwd)
         self.assertEqual(exit_code, 1)
         out = json.loads(stdout.getvalue())
         self.assertEqual(out.get("status"), "ERROR")
-        self.assertIn("must be specified", out.get("message", ""))
+        self.assertIn("not initialized", out.get("message", ""))
 
 
 class TestCLIWhereDefinedEdgeCases(unittest.TestCase):
@@ -291,7 +291,7 @@ def _run_ws_validate(args):
                 with patch.object(WC, "get_all_artifact_ids", return_value={"cpt-remote-1"}) as mi:
                     with patch("cypilot.commands.validate.validate_artifact_file", return_value={"errors": [], "warnings": []}):
                         with patch("cypilot.commands.validate.cross_validate_artifacts", return_value={"errors": [], "warnings": []}):
-                            with patch("cypilot.commands.validate.scan_cpt_ids", return_value=[]):
+                            with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", return_value=[]):
                                 with redirect_stdout(buf):
                                     rc = validate_cmd.cmd_validate(args)
         return rc, mi, buf
@@ -989,7 +989,7 @@ class TestCLIPyCoverageValidateBranches(unittest.TestCase):
             ctx = _FakeCtx(root, art_rel)
             buf = io.StringIO()
             with patch("cypilot.utils.context.get_context", return_value=ctx):
-                with patch("cypilot.commands.validate.scan_cpt_ids", side_effect=ValueError("scan boom")):
+                with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", side_effect=ValueError("scan boom")):
                     with patch(
                         "cypilot.commands.validate.validate_artifact_file",
                         return_value={"errors": [{"type": "x", "message": "boom", "path": str(root / art_rel), "line": 1}], "warnings": []},
@@ -1096,7 +1096,7 @@ class TestCLIPyCoverageValidateBranches(unittest.TestCase):
             with patch("cypilot.utils.context.get_context", return_value=ctx):
                 with patch("cypilot.commands.validate.validate_artifact_file", return_value={"errors": [], "warnings": []}):
                     with patch("cypilot.commands.validate.cross_validate_artifacts", return_value=fake_cross):
-                        with patch("cypilot.commands.validate.scan_cpt_ids", return_value=[]):
+                        with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", return_value=[]):
                             with redirect_stdout(buf):
                                 rc = validate_cmd.cmd_validate(["--skip-code", "--verbose"])
 
@@ -1163,7 +1163,7 @@ class TestCLIPyCoverageValidateBranches(unittest.TestCase):
             with patch("cypilot.utils.context.get_context", return_value=ctx):
                 with patch("cypilot.commands.validate.validate_artifact_file", return_value={"errors": [], "warnings": []}):
                     with patch("cypilot.commands.validate.cross_validate_artifacts", return_value={"errors": [], "warnings": []}):
-                        with patch("cypilot.commands.validate.scan_cpt_ids", side_effect=_scan):
+                        with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", side_effect=_scan):
                             with redirect_stdout(buf):
                                 rc = validate_cmd.cmd_validate(["--skip-code"])
 
@@ -1234,7 +1234,7 @@ class TestCLIPyCoverageValidateBranches(unittest.TestCase):
 
                 with patch("cypilot.utils.context.get_context", return_value=ctx):
                     with patch("cypilot.commands.validate.cross_validate_artifacts", return_value={"errors": [], "warnings": []}):
-                        with patch("cypilot.commands.validate.scan_cpt_ids", return_value=[]):
+                        with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", return_value=[]):
                             with patch(
                                 "cypilot.commands.validate.validate_artifact_file",
                                 return_value={"errors": [], "warnings": [{"type": "w", "message": "warn", "path": str(root / art_rel), "line": 1}]},
@@ -1310,7 +1310,7 @@ class TestCLIPyCoverageValidateBranches(unittest.TestCase):
                     return_value={"errors": _TruthyEmpty(), "warnings": []},
                 ):
                     with patch("cypilot.commands.validate.cross_validate_artifacts", return_value={"errors": [], "warnings": []}):
-                        with patch("cypilot.commands.validate.scan_cpt_ids", return_value=[]):
+                        with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", return_value=[]):
                             with redirect_stdout(buf):
                                 rc = validate_cmd.cmd_validate(["--skip-code"])
 
@@ -1973,6 +1973,45 @@ class TestCLIPyCoverageTopLevelHelp(unittest.TestCase):
         self.assertIn("cypilot", out["usage"])
 
 
+class TestCLIPyCoverageLazyContext(unittest.TestCase):
+    """Commands load only the context parts they declare, on first use."""
+
+    def test_context_free_commands_skip_loading(self):
+        from cypilot.cli import main
+        from cypilot.utils.context import set_context
+
+        self.addCleanup(set_context, None)
+        with TemporaryDirectory() as tmpdir:
+            _setup_list_ids_project(Path(tmpdir))
+            cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                with patch("cypilot.utils.context.CypilotContext.load") as mock_load, \
+                        redirect_stdout(io.StringIO()):
+                    main(["--help"])
+                    main(["toc", str(Path(tmpdir) / "missing.md")])
+                mock_load.assert_not_called()
+            finally:
+                os.chdir(cwd)
+
+    def test_declared_parts_are_loaded(self):
+        from cypilot.cli import main
+        from cypilot.utils.context import CONTEXT_REGISTRY, set_context
+
+        self.addCleanup(set_context, None)
+        with TemporaryDirectory() as tmpdir:
+            _setup_list_ids_project(Path(tmpdir))
+            cwd = os.getcwd()
+            try:
+                os.chdir(tmpdir)
+                with patch("cypilot.utils.context.CypilotContext.load", return_value=None) as mock_load, \
+                        redirect_stdout(io.StringIO()):
+                    main(["check-language", str(Path(tmpdir) / "docs")])
+                mock_load.assert_called_once_with(None, needs=CONTEXT_REGISTRY)
+            finally:
+                os.chdir(cwd)
+
+
 class TestCLIPyCoverageSlugValidation(unittest.TestCase):
     """Tests for slug validation errors in self-check (lines 301-306)."""
 
@@ -2880,7 +2919,7 @@ class TestCLIPyCoverageValidateWorkspaceBranches(unittest.TestCase):
                 with patch.object(WorkspaceContext, "resolve_artifact_path", return_value=art_path):
                     with patch("cypilot.commands.validate.validate_artifact_file", return_value={"errors": [], "warnings": []}):
                         with patch("cypilot.commands.validate.cross_validate_artifacts", return_value={"errors": [], "warnings": []}):
-                            with patch("cypilot.commands.validate.scan_cpt_ids", return_value=[]):
+                            with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", return_value=[]):
                                 with redirect_stdout(buf):
                                     rc = validate_cmd.cmd_validate(["--skip-code"])
             self.assertEqual(rc, 0)
@@ -2953,7 +2992,7 @@ class TestCLIPyCoverageValidateWorkspaceBranches(unittest.TestCase):
                 with patch.object(WorkspaceContext, "resolve_artifact_path", return_value=art_resolved):
                     with patch("cypilot.commands.validate.validate_artifact_file", return_value={"errors": [], "warnings": []}):
                         with patch("cypilot.commands.validate.cross_validate_artifacts", return_value={"errors": [], "warnings": []}):
-                            with patch("cypilot.commands.validate.scan_cpt_ids", return_value=[]):
+                            with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", return_value=[]):
                                 with redirect_stdout(buf):
                                     rc = validate_cmd.cmd_validate(["--skip-code"])
             self.assertEqual(rc, 0)
@@ -2977,7 +3016,7 @@ class TestCLIPyCoverageValidateWorkspaceBranches(unittest.TestCase):
             with patch("cypilot.utils.context.get_context", return_value=ctx):
                 with patch("cypilot.commands.validate.validate_artifact_file", return_value={"errors": [], "warnings": []}):
                     with patch("cypilot.commands.validate.cross_validate_artifacts", return_value={"errors": [], "warnings": []}):
-                        with patch("cypilot.commands.validate.scan_cpt_ids", return_value=scan):
+                        with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", return_value=scan):
                             with redirect_stdout(buf):
                                 rc = validate_cmd.cmd_validate(["--skip-code"])
             self.assertIn(rc, [0, 2])
@@ -3015,7 +3054,7 @@ class TestCLIPyCoverageValidateWorkspaceBranches(unittest.TestCase):
             with patch("cypilot.utils.context.get_context", return_value=ctx):
                 with patch("cypilot.commands.validate.validate_artifact_file", return_value={"errors": [], "warnings": []}):
                     with patch("cypilot.commands.validate.cross_validate_artifacts", return_value={"errors": [], "warnings": []}):
-                        with patch("cypilot.commands.validate.scan_cpt_ids", return_value=[]):
+                        with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", return_value=[]):
                             rc = validate_cmd.cmd_validate(["--skip-code", "--verbose", "--output", str(of)])
             self.assertEqual(rc, 0); self.assertTrue(of.is_file())
             self.assertTrue(of.read_text(encoding="utf-8").endswith("\n"))
@@ -3179,7 +3218,7 @@ class TestCLIPyCoverageValidateWorkspaceBranches(unittest.TestCase):
             with patch("cypilot.utils.context.get_context", return_value=ctx):
                 with patch("cypilot.commands.validate.validate_artifact_file", return_value={"errors": [], "warnings": []}):
                     with patch("cypilot.commands.validate.cross_validate_artifacts", return_value=fake_cross):
-                        with patch("cypilot.commands.validate.scan_cpt_ids", return_value=[]):
+                        with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", return_value=[]):
                             with redirect_stdout(buf):
                                 rc = validate_cmd.cmd_validate(["--skip-code"])
             self.assertEqual(rc, 0)
@@ -3222,8 +3261,8 @@ class TestCLIPyCoverageValidateWorkspaceBranches(unittest.TestCase):
             with patch("cypilot.utils.context.get_context", return_value=_Ctx()):
                 with patch("cypilot.commands.validate.validate_artifact_file", return_value={"errors": [], "warnings": []}):
                     with patch("cypilot.commands.validate.cross_validate_artifacts", return_value={"errors": [], "warnings": []}):
-                        with patch("cypilot.commands.validate.scan_cpt_ids", return_value=[]):
-                            with patch("cypilot.commands.validate.scan_cdsl_instructions", return_value=[]):
+                        with patch("cypilot.utils.scan_cache.ArtifactScanCache.id_hits", return_value=[]):
+                            with patch("cypilot.utils.scan_cache.ArtifactScanCache.cdsl_steps", return_value=[]):
                                 with redirect_stdout(buf):
                                     rc = validate_cmd.cmd_validate([])
             self.assertIn(rc, [0, 2])
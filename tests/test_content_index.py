@@ -0,0 +1,203 @@
+"""Tests for the content offset index and ID-only get-content."""
+
+import io
+import json
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+from cypilot.commands.get_content import cmd_get_content
+from cypilot.utils.content_index import ContentIndex, scoped_content_spans
+from cypilot.utils.context import CypilotContext, set_context
+from cypilot.utils.document import get_content_scoped
+
+_PRD = """# PRD
+
+## Requirements
+
+#### Login
+**ID**: `cpt-test-fr-login`
+Users log in with SSO.
+**ID**: `cpt-test-fr-logout`
+Users log out.
+
+#### Empty
+
+### cpt-test-fr-heading
+Heading scoped — ünïcode text.
+
+### Next
+
+##
+cpt-test-fr-fenced
+fenced body
+cpt-test-fr-empty
+##
+"""
+
+_CODE = """def login():
+    # @cpt-flow:cpt-test-fr-login:p1
+    # @cpt-begin:cpt-test-fr-login:p1:inst-check
+    check()
+    # @cpt-end:cpt-test-fr-login:p1:inst-check
+    # @cpt-begin:cpt-test-fr-code-only:p1:inst-run
+    run()
+    # @cpt-end:cpt-test-fr-code-only:p1:inst-run
+"""
+
+
+def _setup_project(root: Path) -> Path:
+    """Minimal project with one PRD and one codebase file. Returns the adapter dir."""
+    (root / ".git").mkdir()
+    (root / "AGENTS.md").write_text(
+        '<!-- @cpt:root-agents -->\n```toml\ncypilot_path = "adapter"\n```\n', encoding="utf-8",
+    )
+    adapter = root / "adapter"
+    (adapter / "config").mkdir(parents=True)
+    (adapter / "config" / "AGENTS.md").write_text("# Adapter\n", encoding="utf-8")
+    from cypilot.utils import toml_utils
+    toml_utils.dump({
+        "version": "1.0",
+        "project_root": "..",
+        "kits": {"cypilot": {"format": "Cypilot", "path": "kits/sdlc"}},
+        "systems": [{
+            "name": "Test",
+            "kits": "cypilot",
+            "artifacts": [{"path": "architecture/PRD.md", "kind": "PRD"}],
+            "codebase": [{"path": "src", "extensions": [".py"]}],
+        }],
+    }, adapter / "config" / "artifacts.toml")
+    (root / "architecture").mkdir()
+    (root / "architecture" / "PRD.md").write_text(_PRD, encoding="utf-8")
+    (root / "src").mkdir()
+    (root / "src" / "auth.py").write_text(_CODE, encoding="utf-8")
+    (root / "kits" / "sdlc" / "artifacts" / "PRD").mkdir(parents=True)
+    return adapter
+
+
+class TestScopedContentSpans(unittest.TestCase):
+    def test_matches_get_content_scoped(self):
+        with TemporaryDirectory() as td:
+            path = Path(td) / "PRD.md"
+            path.write_text(_PRD, encoding="utf-8")
+            spans, defined = scoped_content_spans(_PRD.splitlines())
+            self.assertEqual(defined, {"cpt-test-fr-login", "cpt-test-fr-logout"})
+            self.assertNotIn("cpt-test-fr-empty", spans)
+            for cid in ("cpt-test-fr-login", "cpt-test-fr-logout", "cpt-test-fr-heading",
+                        "cpt-test-fr-fenced", "cpt-test-fr-empty"):
+                expected = get_content_scoped(path, id_value=cid)
+                span = spans.get(cid)
+                self.assertEqual(span and (span[0] + 1, span[1] + 1), expected and expected[1:], cid)
+
+    def test_reads_only_the_byte_range_and_falls_back_for_invalid_utf8(self):
+        with TemporaryDirectory() as td:
+            path = Path(td) / "PRD.md"
+            path.write_text(_PRD, encoding="utf-8")
+            index = ContentIndex()
+            index.add_artifacts([(path, "PRD")])
+            loc = index.artifact_location("cpt-test-fr-heading")
+            self.assertEqual(loc.read_text(), "Heading scoped — ünïcode text.")
+            self.assertEqual(loc.byte_end - loc.byte_start, len("Heading scoped — ünïcode text.\n".encode("utf-8")))
+
+            path.write_bytes(_PRD.encode("utf-8") + b"\xff\n")
+            index = ContentIndex()
+            index.add_artifacts([(path, "PRD")])
+            loc = index.artifact_location("cpt-test-fr-login")
+            self.assertIsNone(loc.byte_start)
+            self.assertEqual(loc.read_text(), "Users log in with SSO.")
+
+    def test_binary_artifact_indexes_as_empty(self):
+        with TemporaryDirectory() as td:
+            path = Path(td) / "PRD.md"
+            path.write_bytes(b"# T\n\x00\n**ID**: `cpt-test-fr-login`\n")
+            index = ContentIndex()
+            index.add_artifacts([(path, "PRD")])
+            self.assertIsNone(index.artifact_location("cpt-test-fr-login"))
+
+
+class TestGetContentById(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.adapter = _setup_project(self.root)
+        set_context(CypilotContext.load(self.root))
+
+    def tearDown(self):
+        set_context(None)
+        self._tmp.cleanup()
+
+    def _run(self, argv):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            rc = cmd_get_content(argv)
+        return rc, json.loads(stdout.getvalue())
+
+    def test_single_id_without_path(self):
+        rc, out = self._run(["--id", "cpt-test-fr-login"])
+        self.assertEqual(rc, 0)
+        self.assertEqual(out["text"], "Users log in with SSO.")
+        self.assertEqual((out["start_line"], out["end_line"]), (7, 7))
+        self.assertEqual((out["kind"], out["system"]), ("PRD", "Test"))
+        self.assertEqual(Path(out["artifact"]), (self.root / "architecture" / "PRD.md").resolve())
+
+    def test_many_ids_with_code_fallback_and_inst(self):
+        rc, out = self._run(["--id", "cpt-test-fr-logout", "--id", "cpt-test-fr-code-only", "--id", "cpt-missing"])
+        self.assertEqual(rc, 2)
+        self.assertEqual(out["status"], "PARTIAL")
+        self.assertEqual([r["status"] for r in out["results"]], ["FOUND", "FOUND", "NOT_FOUND"])
+        code = out["results"][1]
+        self.assertEqual((code["text"], code["start_line"], code["end_line"]), ("    run()", 7, 7))
+        self.assertTrue(code["code"].endswith("auth.py"))
+
+        rc, out = self._run(["cpt-test-fr-login", "--inst", "inst-check"])
+        self.assertEqual(rc, 0)
+        self.assertEqual((out["text"], out["inst"]), ("    check()", "check"))
+
+    def test_binary_artifact_does_not_break_id_lookup(self):
+        (self.root / "architecture" / "PRD.md").write_bytes(_PRD.encode("utf-8") + b"\x00\n")
+        rc, out = self._run(["--id", "cpt-test-fr-logout", "--id", "cpt-test-fr-code-only"])
+        self.assertEqual(rc, 2)
+        self.assertEqual([r["status"] for r in out["results"]], ["NOT_FOUND", "FOUND"])
+
+    def test_index_persisted_and_reused(self):
+        self._run(["--id", "cpt-test-fr-login", "--id", "cpt-test-fr-code-only"])
+        self.assertTrue((self.adapter / "cache" / "index.json").is_file())
+        with patch("cypilot.utils.content_index._artifact_facet", side_effect=AssertionError("rescanned")), \
+                patch("cypilot.utils.content_index._code_facet", side_effect=AssertionError("rescanned")):
+            rc, out = self._run(["--id", "cpt-test-fr-fenced", "--id", "cpt-test-fr-code-only"])
+        self.assertEqual(rc, 0)
+        self.assertEqual(out["results"][0]["text"], "fenced body")
+
+        prd = self.root / "architecture" / "PRD.md"
+        prd.write_text(_PRD.replace("fenced body", "changed body"), encoding="utf-8")
+        rc, out = self._run(["--id", "cpt-test-fr-fenced"])
+        self.assertEqual(out["text"], "changed body")
+
+    def test_artifact_mode_reuses_global_context(self):
+        prd = self.root / "architecture" / "PRD.md"
+        with patch("cypilot.utils.context.CypilotContext.load", side_effect=AssertionError("reloaded")):
+            rc, out = self._run(["--artifact", str(prd), "--id", "cpt-test-fr-heading"])
+        self.assertEqual(rc, 0)
+        self.assertEqual(out["text"], "Heading scoped — ünïcode text.")
+
+    def test_no_context(self):
+        set_context(None)
+        cwd = os.getcwd()
+        try:
+            os.chdir(self._tmp.name)
+            (self.root / "AGENTS.md").unlink()
+            rc, out = self._run(["--id", "cpt-test-fr-login"])
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(rc, 1)
+        self.assertEqual(out["status"], "ERROR")
+
+
+if __name__ == "__main__":
+    unittest.main()
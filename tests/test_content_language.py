@@ -3,14 +3,17 @@
 Covers:
 - build_allowed_ranges() — merging Unicode ranges for language codes
 - is_allowed() — binary-search character check
+- disallowed_chars_re() — compiled negated character class
 - scan_file() — single-file scan with fences and skip patterns
 - scan_paths() — recursive directory scan
 - LangViolation helpers (bad_chars_preview, line_preview)
 - LangScanError on unreadable files
 """
 
+import pickle
 import sys
 import unittest
+from unittest.mock import patch
 from pathlib import Path
 from tempfile import TemporaryDirectory, NamedTemporaryFile
 
@@ -22,6 +25,7 @@ from cypilot.utils.content_language import (
     LangScanError,
     LangViolation,
     build_allowed_ranges,
+    disallowed_chars_re,
     is_allowed,
     scan_file,
     scan_paths,
@@ -335,6 +339,35 @@ class TestScanPaths(unittest.TestCase):
         violations = scan_paths([p], self.ranges, ignore_patterns=[])
         self.assertEqual(len(violations), 1)
 
+    def test_parallel_scan_matches_serial_order(self):
+        for i in range(6):
+            self._write(f"d{i}.md", "ok\n" if i % 2 else f"line {i}\nПривет {i}\n")
+        serial = scan_paths([self.root], self.ranges)
+        with patch("cypilot.utils.parallel.MIN_PARALLEL_ITEMS", 1):
+            parallel = scan_paths([self.root], self.ranges, jobs=2)
+        self.assertEqual([(v.path, v.lineno, v.chars) for v in parallel],
+                         [(v.path, v.lineno, v.chars) for v in serial])
+        self.assertEqual(len(parallel), 3)
+
+
+class TestDisallowedCharsRe(unittest.TestCase):
+    """disallowed_chars_re() agrees with is_allowed() and is cached."""
+
+    def test_agrees_with_binary_search(self):
+        ranges = build_allowed_ranges(["en", "ru"])
+        rx = disallowed_chars_re(ranges)
+        for cp in list(range(0, 0x3100)) + [0x1F525, 0x1FA00, 0x4E2D, 0xFEFF, 0x10FFFF]:
+            self.assertEqual(rx.match(chr(cp)) is None, is_allowed(cp, ranges), hex(cp))
+
+    def test_compiled_once_per_range_set(self):
+        self.assertIs(disallowed_chars_re(build_allowed_ranges(["en"])),
+                      disallowed_chars_re(list(build_allowed_ranges(["en"]))))
+
+    def test_scan_error_survives_pickling(self):
+        err = pickle.loads(pickle.dumps(LangScanError(Path("x.md"), OSError("gone"))))
+        self.assertEqual(err.path, Path("x.md"))
+        self.assertIn("gone", str(err))
+
 
 class TestSupportedLanguages(unittest.TestCase):
     """SUPPORTED_LANGUAGES constant is complete and sorted."""
@@ -15,10 +15,14 @@ from unittest.mock import MagicMock, patch
 sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
 
 from cypilot.utils.context import (
+    CONTEXT_FULL,
+    CONTEXT_KITS,
+    CONTEXT_REGISTRY,
     CypilotContext,
     LoadedKit,
     get_context,
     set_context,
+    defer_context,
     ensure_context,
     _global_context,
 )
@@ -175,6 +179,37 @@ class TestGlobalContextFunctions:
             mock_load.assert_not_called()
             assert result is existing_ctx
 
+    @patch("cypilot.utils.context.WorkspaceContext.load")
+    @patch("cypilot.utils.context.CypilotContext.load")
+    def test_deferred_context_loads_on_first_access(self, mock_load, mock_ws_load):
+        """defer_context loads only when get_context is first called, with the declared parts."""
+        mock_ctx = MagicMock(spec=CypilotContext)
+        mock_load.return_value = mock_ctx
+        defer_context(needs=CONTEXT_KITS)
+        mock_load.assert_not_called()
+
+        assert get_context() is mock_ctx
+        assert get_context() is mock_ctx
+        mock_load.assert_called_once_with(None, needs=CONTEXT_KITS)
+        mock_ws_load.assert_not_called()  # partial contexts are never upgraded
+
+    @patch("cypilot.utils.context.WorkspaceContext.load", return_value=None)
+    @patch("cypilot.utils.context.CypilotContext.load")
+    def test_deferred_full_context_attempts_workspace_upgrade(self, mock_load, mock_ws_load):
+        mock_load.return_value = MagicMock(spec=CypilotContext)
+        defer_context()
+        get_context()
+        mock_load.assert_called_once_with(None, needs=CONTEXT_FULL)
+        mock_ws_load.assert_called_once()
+
+    @patch("cypilot.utils.context.CypilotContext.load")
+    def test_set_context_cancels_deferred_load(self, mock_load):
+        defer_context()
+        existing_ctx = MagicMock(spec=CypilotContext)
+        set_context(existing_ctx)
+        assert ensure_context() is existing_ctx
+        mock_load.assert_not_called()
+
 
 class TestCypilotContextLoad:
     """Tests for CypilotContext.load() method."""
@@ -190,6 +225,23 @@ class TestCypilotContextLoad:
         result = CypilotContext.load()
         assert result is None
 
+    @patch("cypilot.utils.context._expand_autodetect_errors")
+    @patch("cypilot.utils.context._load_all_kits")
+    @patch("cypilot.utils.context.load_artifacts_meta")
+    @patch("cypilot.utils.files.find_cypilot_directory")
+    def test_partial_load_skips_kits_and_autodetect(self, mock_find, mock_load_meta, mock_load_kits, mock_expand):
+        mock_find.return_value = Path("/proj/adapter")
+        mock_load_meta.return_value = (ArtifactsMeta.from_dict({"version": "1.1", "project_root": "..", "systems": []}), None)
+        mock_load_kits.return_value = ({}, [])
+
+        ctx = CypilotContext.load(needs=CONTEXT_REGISTRY)
+        assert ctx is not None and ctx.kits == {}
+        mock_load_kits.assert_not_called()
+
+        CypilotContext.load(needs=CONTEXT_KITS)
+        mock_load_kits.assert_called_once()
+        mock_expand.assert_not_called()
+
     @patch("cypilot.utils.context.load_constraints_toml")
     @patch("cypilot.utils.context.load_artifacts_meta")
     @patch("cypilot.utils.files.find_cypilot_directory")
@@ -0,0 +1,167 @@
+"""Tests for the resident query daemon (`cpt serve`) and CLI forwarding."""
+
+import io
+import json
+import os
+import sys
+import threading
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+from cypilot.cli import main
+from cypilot.utils import toml_utils
+from cypilot.utils.daemon import (
+    NO_DAEMON_ENV,
+    QueryServer,
+    daemon_supported,
+    send_request,
+    socket_path,
+    try_forward,
+)
+from cypilot.utils.scan_cache import set_shared_scan_cache
+
+
+def _setup_project(root: Path) -> Path:
+    (root / ".git").mkdir()
+    (root / "AGENTS.md").write_text(
+        '<!-- @cpt:root-agents -->\n```toml\ncypilot_path = "adapter"\n```\n',
+        encoding="utf-8",
+    )
+    adapter = root / "adapter"
+    (adapter / "config").mkdir(parents=True)
+    (adapter / "config" / "AGENTS.md").write_text("# Test adapter\n", encoding="utf-8")
+    art = root / "docs" / "reqs.md"
+    art.parent.mkdir()
+    art.write_text("- [x] `p1` - **ID**: `cpt-test-req-1`\n", encoding="utf-8")
+    toml_utils.dump(
+        {
+            "version": "1.0", "project_root": "..", "kits": {},
+            "systems": [{"name": "Test", "slug": "test", "artifacts": [{"path": "docs/reqs.md", "kind": "req"}]}],
+        },
+        adapter / "config" / "artifacts.toml",
+    )
+    return art
+
+
+def _run_cli(argv):
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        rc = main(argv)
+    return rc, buf.getvalue()
+
+
+@unittest.skipUnless(daemon_supported(), "Unix domain sockets not available")
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        td = TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.root = Path(td.name).resolve()
+        self.art = _setup_project(self.root)
+        env = patch.dict(os.environ, {"XDG_RUNTIME_DIR": str(self.root)})
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop(NO_DAEMON_ENV, None)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.root)
+        self.addCleanup(set_shared_scan_cache, None)
+
+    def _start_server(self) -> QueryServer:
+        server = QueryServer(self.root, socket_path(self.root), idle_timeout=30)
+        srv = server.bind()
+        thread = threading.Thread(target=server.serve_forever, args=(srv,), daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(send_request, server.path, {"op": "stop"})
+        return server
+
+    def test_no_socket_falls_back(self):
+        self.assertIsNone(try_forward(["list-ids"], json_mode=True))
+        rc, out = _run_cli(["--json", "list-ids"])
+        self.assertEqual(rc, 0)
+        self.assertIn("cpt-test-req-1", out)
+
+    def test_socket_is_owner_only(self):
+        server = self._start_server()
+        self.assertEqual(server.path.stat().st_mode & 0o777, 0o600)
+
+    def test_default_socket_dir_is_private(self):
+        with patch.dict(os.environ, {"XDG_RUNTIME_DIR": ""}), patch("tempfile.tempdir", str(self.root)):
+            server = self._start_server()
+            self.assertEqual(server.path.parent, self.root / f"cpt-{os.getuid()}")
+            self.assertEqual(server.path.parent.stat().st_mode & 0o777, 0o700)
+            self.assertTrue(send_request(server.path, {"op": "ping"})["ok"])
+
+    def test_planted_non_socket_is_not_trusted(self):
+        path = socket_path(self.root)
+        path.write_text("", encoding="utf-8")
+        self.assertIsNone(send_request(path, {"op": "ping"}))
+        self.assertIsNone(try_forward(["list-ids"], json_mode=True))
+        with self.assertRaises(OSError):
+            QueryServer(self.root, path).bind()
+        self.assertTrue(path.is_file())
+
+    def test_shared_socket_dir_is_refused(self):
+        server = self._start_server()
+        os.chmod(self.root, 0o777)
+        self.addCleanup(os.chmod, self.root, 0o700)
+        self.assertIsNone(send_request(server.path, {"op": "ping"}))
+        self.assertIsNone(try_forward(["list-ids"], json_mode=True))
+        self.assertEqual(server.requests, 0)
+
+    def test_foreign_socket_is_not_trusted(self):
+        server = self._start_server()
+        with patch("cypilot.utils.daemon._uid", return_value=os.getuid() + 1):
+            self.assertIsNone(send_request(server.path, {"op": "ping"}))
+            with self.assertRaises(OSError):
+                QueryServer(self.root, server.path).bind()
+
+    def test_forwarded_query_matches_in_process(self):
+        server = self._start_server()
+        with patch.dict(os.environ, {NO_DAEMON_ENV: "1"}):
+            expected = _run_cli(["--json", "where-defined", "--id", "cpt-test-req-1"])
+        self.assertEqual(server.requests, 0)
+
+        self.assertEqual(_run_cli(["--json", "where-defined", "--id", "cpt-test-req-1"]), expected)
+        self.assertEqual(server.requests, 1)
+        self.assertEqual(server.reloads, 1)
+
+    def test_edits_are_visible_without_restart(self):
+        server = self._start_server()
+        _rc, out = _run_cli(["--json", "list-ids"])
+        self.assertEqual(json.loads(out)["count"], 1)
+        self.art.write_text(
+            "- [x] `p1` - **ID**: `cpt-test-req-1`\n- [x] `p1` - **ID**: `cpt-test-req-22`\n",
+            encoding="utf-8",
+        )
+        _rc, out = _run_cli(["--json", "list-ids"])
+        self.assertEqual(json.loads(out)["count"], 2)
+        self.assertEqual(server.requests, 2)
+
+    def test_source_states_expire_on_every_warm_request(self):
+        server = self._start_server()
+        with patch("cypilot.utils.context.expire_source_states") as expire:
+            for _ in range(3):
+                _run_cli(["--json", "list-ids"])
+        self.assertGreater(expire.call_count, 0)
+        self.assertEqual(expire.call_count, server.requests - server.reloads)
+
+    def test_version_mismatch_is_refused(self):
+        server = self._start_server()
+        resp = server.handle({"op": "ping", "protocol": 0, "version": "other"})
+        self.assertFalse(resp["ok"])
+
+    def test_stop(self):
+        server = self._start_server()
+        self.assertTrue(send_request(server.path, {"op": "ping"})["ok"])
+        self.assertTrue(send_request(server.path, {"op": "stop"})["ok"])
+        self.assertIsNone(send_request(server.path, {"op": "ping"}))
+        self.assertIsNone(try_forward(["list-ids"], json_mode=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Tests for the interval-based heading scope map."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+from cypilot.utils.document import headings_by_line_from_lines
+from cypilot.utils.heading_scope import HeadingScopeMap
+
+
+def _per_line_stack(events, line_count):
+    """Reference implementation: the former per-line active-stack lists."""
+    by_line = {ln: (lvl, label) for ln, lvl, label in events}
+    out = [[] for _ in range(line_count + 1)]
+    stack = []
+    for ln in range(1, line_count + 1):
+        if ln in by_line:
+            lvl, label = by_line[ln]
+            while stack and stack[-1][0] >= lvl:
+                stack.pop()
+            if label is not None:
+                stack.append((lvl, label))
+        out[ln] = [t for _, t in stack]
+    return out
+
+
+class TestHeadingScopeMap(unittest.TestCase):
+    def test_matches_per_line_stack(self):
+        events = [(1, 1, "doc"), (3, 2, "a"), (5, 3, "a1"), (8, 3, None), (9, 4, "deep"), (11, 2, "b"), (13, 1, None)]
+        m = HeadingScopeMap(events, 15)
+        self.assertEqual(m, _per_line_stack(events, 15))
+        self.assertEqual(m.scopes_at(10), ["doc", "a", "deep"])
+        self.assertEqual(m.scopes_at(14), [])
+
+    def test_intervals_and_bounds(self):
+        m = HeadingScopeMap([(2, 1, "t"), (4, 2, "a"), (7, 2, "b")], 9)
+        self.assertEqual(m.ends, [9, 6, 9])
+        self.assertIsNone(m.innermost(1))
+        self.assertEqual(m.innermost(5), 1)
+        self.assertEqual(m.scopes_at(0), [])
+        self.assertEqual(m.scopes_at(10), [])
+        self.assertEqual(len(m), 10)
+        with self.assertRaises(IndexError):
+            m[10]  # pylint: disable=pointless-statement
+
+    def test_empty_document_equals_legacy_result(self):
+        self.assertEqual(HeadingScopeMap((), 0), [[]])
+
+    def test_titles_ignore_fenced_headings(self):
+        lines = ["# Title", "```", "# not a heading", "```", "## Sub", "text"]
+        m = headings_by_line_from_lines(lines)
+        self.assertEqual(m[3], ["Title"])
+        self.assertEqual(m[6], ["Title", "Sub"])
+        self.assertEqual(len(m.starts), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
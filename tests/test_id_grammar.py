@@ -0,0 +1,73 @@
+"""Tests for the compiled system/kind resolver of Cypilot IDs."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+from cypilot.utils.id_grammar import IdGrammar, compile_id_grammar
+
+
+class TestSystemMatching(unittest.TestCase):
+    def test_longest_nested_prefix_wins(self):
+        g = IdGrammar(["app", "app-auth"])
+        self.assertEqual(g.match_system("cpt-app-auth-flow-login"), "app-auth")
+        self.assertEqual(g.match_system("cpt-app-flow-login"), "app")
+        self.assertEqual(g.split_system("cpt-app-auth-flow-login"), ("app-auth", "flow-login"))
+
+    def test_prefix_needs_following_token(self):
+        g = IdGrammar(["app"])
+        self.assertIsNone(g.match_system("cpt-app"))
+        self.assertEqual(g.split_system("cpt-other-flow-x"), (None, ""))
+
+    def test_case_insensitive_returns_registered_spelling(self):
+        g = IdGrammar(["MyApp"])
+        self.assertEqual(g.match_system("cpt-myapp-fr-x"), "MyApp")
+
+    def test_external_only_with_registered_systems(self):
+        self.assertTrue(IdGrammar(["app"]).is_external("cpt-other-fr-x"))
+        self.assertFalse(IdGrammar(["app"]).is_external("cpt-app-fr-x"))
+        self.assertFalse(IdGrammar([]).is_external("cpt-other-fr-x"))
+
+
+class TestKindResolution(unittest.TestCase):
+    def test_standard_kind(self):
+        g = IdGrammar(["app"], ["fr", "flow"])
+        self.assertEqual(g.parse("cpt-app-fr-login"), ("app", "fr"))
+
+    def test_subsystem_segment_before_kind(self):
+        g = IdGrammar(["cf"], ["fr", "flow"])
+        self.assertEqual(g.parse("cpt-cf-errors-flow-retry"), ("cf", "flow"))
+
+    def test_multi_token_kind(self):
+        g = IdGrammar(["cf"], ["fr", "usecase-actor"])
+        self.assertEqual(g.kind_positions("cf-errors-usecase-actor-x"), {"usecase-actor": 9})
+        self.assertEqual(g.parse("cpt-cf-errors-usecase-actor-x"), ("cf", "usecase-actor"))
+
+    def test_rightmost_kind_without_registered_systems(self):
+        g = IdGrammar([], ["flow", "fr"])
+        self.assertEqual(g.system_of("cpt-task-flow-fr-login"), "task-flow")
+        self.assertEqual(g.parse("cpt-task-flow-fr-login"), ("task-flow", "fr"))
+
+    def test_composite_nested_kind(self):
+        g = IdGrammar(["app"], ["feature", "flow"], {"feature": ["flow"]})
+        self.assertEqual(g.parse("cpt-app-feature-auth-flow-login"), ("app", "flow"))
+        self.assertEqual(g.parse("cpt-app-feature-auth"), ("app", "feature"))
+
+
+class TestCompileCache(unittest.TestCase):
+    def test_same_inputs_share_grammar(self):
+        a = compile_id_grammar({"app"}, ["fr"], {"feature": ["flow"]})
+        b = compile_id_grammar(["app"], {"FR"}, {"feature": {"flow"}})
+        self.assertIs(a, b)
+        self.assertIsNot(a, compile_id_grammar({"app"}, ["fr", "flow"]))
+
+    def test_parse_is_memoized(self):
+        g = compile_id_grammar({"memo"}, ["fr"])
+        first = g.parse("cpt-memo-fr-x")
+        self.assertIs(g.parse("cpt-memo-fr-x"), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
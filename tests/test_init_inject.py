@@ -6,6 +6,7 @@ Covers:
   B) Sibling-prefix escape is rejected
   C) Clearly outside-root path is rejected
   D) _inject_root_agents / _inject_root_claude wrappers still work
+  E) _verify_root_files skips re-injection while the fingerprint matches
 """
 
 import io
@@ -212,5 +213,43 @@ class TestPromptKitInstallFlag(unittest.TestCase):
             self.assertFalse(self._fn()(True))
 
 
+class TestVerifyRootFiles(unittest.TestCase):
+    """E: fingerprinted root integrity check."""
+
+    def test_unchanged_files_skip_full_check(self):
+        from cypilot.commands.init import _verify_root_files
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "cypilot" / "config").mkdir(parents=True)
+            self.assertTrue(_verify_root_files(root, "cypilot"))
+            self.assertTrue((root / "cypilot" / "cache" / "root-agents.json").is_file())
+            self.assertIn('cypilot_path = "cypilot"', (root / "CLAUDE.md").read_text())
+
+            with patch("cypilot.commands.init._inject_managed_block") as inject:
+                self.assertFalse(_verify_root_files(root, "cypilot"))
+            inject.assert_not_called()
+
+    def test_edited_file_triggers_reinjection(self):
+        from cypilot.commands.init import _verify_root_files
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "cypilot" / "config").mkdir(parents=True)
+            _verify_root_files(root, "cypilot")
+            (root / "CLAUDE.md").write_text("# user rewrote this file\n", encoding="utf-8")
+            self.assertTrue(_verify_root_files(root, "cypilot"))
+            self.assertIn('cypilot_path = "cypilot"', (root / "CLAUDE.md").read_text())
+            self.assertFalse(_verify_root_files(root, "cypilot"))
+
+    def test_install_dir_change_triggers_reinjection(self):
+        from cypilot.commands.init import _verify_root_files
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "cypilot" / "config").mkdir(parents=True)
+            _verify_root_files(root, "cypilot")
+            # Same directory, same state file, but a different managed block.
+            self.assertTrue(_verify_root_files(root, "./cypilot"))
+            self.assertIn('cypilot_path = "./cypilot"', (root / "AGENTS.md").read_text())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,137 @@
+"""Tests for the generated-output manifest and write-coalescing generate-agents."""
+
+import io
+import json
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+from cypilot.commands.agents import cmd_generate_agents
+from cypilot.utils import output_manifest
+from cypilot.utils.output_manifest import OutputManifest, text_digest
+from cypilot.utils.ui import set_json_mode
+
+
+def _spy_reads():
+    return patch.object(output_manifest, "_read_digest", side_effect=output_manifest._read_digest)
+
+
+class TestOutputManifest(unittest.TestCase):
+    def test_stage_flush_and_signature_fast_path(self):
+        with TemporaryDirectory() as td:
+            manifest_path = Path(td) / "cache" / "generated.json"
+            out = Path(td) / "a" / "b.md"
+            outputs = OutputManifest.load(manifest_path)
+            self.assertEqual(outputs.stage(out, "one\n", dry_run=True), "created")
+            self.assertEqual(outputs.pending, [])
+            self.assertEqual(outputs.stage(out, "one\n"), "created")
+            self.assertEqual(outputs.stage(out, "one\n"), "unchanged")  # queued write wins over disk
+            self.assertFalse(out.exists())
+            self.assertEqual(outputs.flush(), 1)
+            self.assertEqual(out.read_text(encoding="utf-8"), "one\n")
+
+            outputs = OutputManifest.load(manifest_path)
+            self.assertEqual(len(outputs), 1)
+            with patch("cypilot.utils.output_manifest._read_digest", side_effect=AssertionError("output re-read")):
+                self.assertEqual(outputs.stage(out, "one\n"), "unchanged")
+                self.assertEqual(outputs.stage(out, "two\n"), "updated")
+
+    def test_changed_signature_rehashes_and_keeps_mode(self):
+        with TemporaryDirectory() as td:
+            out = Path(td) / "b.md"
+            out.write_text("old\n", encoding="utf-8")
+            os.chmod(out, 0o640)
+            outputs = OutputManifest(Path(td) / "generated.json")
+            with _spy_reads() as reads:
+                self.assertEqual(outputs.stage(out, "old\n"), "unchanged")
+                self.assertEqual(reads.call_count, 1)
+                out.write_text("hand edited\n", encoding="utf-8")
+                self.assertEqual(outputs.stage(out, "old\n"), "updated")
+                self.assertEqual(reads.call_count, 2)
+            outputs.flush()
+            self.assertEqual(out.read_text(encoding="utf-8"), "old\n")
+            self.assertEqual(out.stat().st_mode & 0o777, 0o640)
+            self.assertEqual([p.name for p in Path(td).iterdir() if p.name.endswith(".tmp")], [])
+            data = json.loads((Path(td) / "generated.json").read_text(encoding="utf-8"))
+            self.assertEqual(data["files"][out.as_posix()]["sha256"], text_digest("old\n"))
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks not available")
+    def test_symlinked_output_writes_through_the_link(self):
+        with TemporaryDirectory() as td:
+            target = Path(td) / "shared" / "c.md"
+            target.parent.mkdir()
+            target.write_text("old\n", encoding="utf-8")
+            link = Path(td) / "c.md"
+            link.symlink_to(target)
+            outputs = OutputManifest(Path(td) / "generated.json")
+            self.assertEqual(outputs.stage(link, "new\n"), "updated")
+            outputs.flush()
+            self.assertTrue(link.is_symlink())
+            self.assertEqual(target.read_text(encoding="utf-8"), "new\n")
+            self.assertEqual(outputs.stage(link, "new\n"), "unchanged")
+
+    def test_outdated_header_discards_entries(self):
+        with TemporaryDirectory() as td:
+            path = Path(td) / "generated.json"
+            path.write_text(json.dumps({"header": {"schema": 0}, "files": {"x": {}}}), encoding="utf-8")
+            self.assertEqual(len(OutputManifest.load(path)), 0)
+
+
+class TestGenerateAgentsOutputs(unittest.TestCase):
+    def setUp(self):
+        set_json_mode(True)
+
+    def tearDown(self):
+        set_json_mode(False)
+
+    @staticmethod
+    def _make_project(root: Path) -> Path:
+        (root / "AGENTS.md").write_text("<!-- @cpt:root-agents -->\n## Cypilot\n", encoding="utf-8")
+        cypilot_root = root / ".bootstrap"
+        core = cypilot_root / ".core"
+        (core / "requirements").mkdir(parents=True)
+        (core / "workflows").mkdir(parents=True)
+        (cypilot_root / "config").mkdir(parents=True)
+        (core / "skills" / "cypilot").mkdir(parents=True)
+        (core / "skills" / "cypilot" / "SKILL.md").write_text(
+            "---\nname: cypilot\ndescription: Cypilot\n---\n# Cypilot\n", encoding="utf-8",
+        )
+        return cypilot_root
+
+    def test_rerun_on_unchanged_project_writes_and_reads_nothing(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            cypilot_root = self._make_project(root)
+            argv = ["--root", str(root), "--cypilot-root", str(cypilot_root), "--agent", "windsurf", "-y"]
+
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(cmd_generate_agents(argv), 0)
+            proxy = root / ".windsurf" / "workflows" / "cypilot.md"
+            generated = proxy.read_text(encoding="utf-8")
+            self.assertTrue((cypilot_root / "cache" / "generated.json").is_file())
+
+            buf = io.StringIO()
+            with patch("cypilot.utils.output_manifest._atomic_write_text", side_effect=AssertionError("rewritten")), \
+                    patch("cypilot.utils.output_manifest._read_digest", side_effect=AssertionError("output re-read")), \
+                    redirect_stdout(buf):
+                self.assertEqual(cmd_generate_agents(argv), 0)
+            skills = json.loads(buf.getvalue())["results"]["windsurf"]["skills"]
+            self.assertEqual((skills["created"], skills["updated"]), ([], []))
+
+            proxy.write_text("hand edited\n", encoding="utf-8")
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                self.assertEqual(cmd_generate_agents(argv), 0)
+            self.assertEqual(json.loads(buf.getvalue())["results"]["windsurf"]["skills"]["updated"],
+                             [proxy.resolve().as_posix()])
+            self.assertEqual(proxy.read_text(encoding="utf-8"), generated)
+
+
+if __name__ == "__main__":
+    unittest.main()
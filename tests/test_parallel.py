@@ -0,0 +1,90 @@
+"""Tests for order-preserving parallel file mapping."""
+
+import subprocess
+import sys
+import textwrap
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+from cypilot.utils.codebase import CodeFile, load_code_files
+from cypilot.utils.parallel import MIN_PARALLEL_ITEMS, map_ordered, resolve_jobs
+
+
+class TestMapOrdered(unittest.TestCase):
+    def test_results_keep_input_order(self):
+        items = list(range(-MIN_PARALLEL_ITEMS * 2, 0))
+        self.assertEqual(map_ordered(abs, items, 4), [abs(i) for i in items])
+
+    def test_small_inputs_run_in_process(self):
+        with patch("cypilot.utils.parallel.ProcessPoolExecutor") as pool:
+            self.assertEqual(map_ordered(abs, [-1, -2], 8), [1, 2])
+        pool.assert_not_called()
+
+    def test_pool_failure_falls_back_to_serial(self):
+        items = list(range(MIN_PARALLEL_ITEMS))
+        with patch("cypilot.utils.parallel.ProcessPoolExecutor", side_effect=OSError("no semaphores")):
+            self.assertEqual(map_ordered(abs, items, 4), items)
+
+    def test_spawn_workers_import_package_loaded_from_file_spec(self):
+        # The cpt proxy imports the skill from a file spec without touching sys.path
+        package_dir = Path(__file__).parent.parent / "skills" / "cypilot" / "scripts" / "cypilot"
+        script = textwrap.dedent(f"""
+            import importlib.util, multiprocessing, sys
+            if __name__ == "__main__":
+                multiprocessing.set_start_method("spawn")
+                spec = importlib.util.spec_from_file_location(
+                    "cypilot", {str(package_dir / "__init__.py")!r},
+                    submodule_search_locations=[{str(package_dir)!r}],
+                )
+                module = importlib.util.module_from_spec(spec)
+                sys.modules["cypilot"] = module
+                spec.loader.exec_module(module)
+                from cypilot.utils import parallel
+                items = list(range(parallel.MIN_PARALLEL_ITEMS))
+                assert parallel.map_ordered(parallel.resolve_jobs, items, 2) == [max(1, i) for i in items]
+                assert {str(package_dir.parent)!r} not in sys.path
+        """)
+        with TemporaryDirectory() as td:
+            (Path(td) / "main.py").write_text(script, encoding="utf-8")
+            proc = subprocess.run(
+                [sys.executable, "main.py"], cwd=td, capture_output=True, text=True, timeout=120, check=False,
+            )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertNotIn("No module named", proc.stderr)
+
+    def test_resolve_jobs(self):
+        self.assertEqual(resolve_jobs(0), 1)
+        self.assertEqual(resolve_jobs(3), 3)
+        self.assertGreaterEqual(resolve_jobs(None), 1)
+
+
+class TestParallelCodeScan(unittest.TestCase):
+    def test_parallel_matches_serial(self):
+        with TemporaryDirectory() as td:
+            paths = []
+            for i in range(MIN_PARALLEL_ITEMS + 6):
+                p = Path(td) / f"m{i:03d}.py"
+                body = f"# @cpt-flow:cpt-sys-flow-f{i}:p1\nx = {i}\n"
+                if i % 7 == 0:
+                    body += "# @cpt-begin:cpt-sys-flow-bad:p1:inst-open\n"
+                p.write_text(body, encoding="utf-8")
+                paths.append(p)
+
+            parallel = load_code_files(paths, jobs=4)
+            self.assertEqual(len(parallel), len(paths))
+            for p, (cf, errs) in zip(paths, parallel):
+                ref_cf, ref_errs = CodeFile.from_path(p)
+                self.assertEqual(errs, ref_errs)
+                if ref_cf is None:
+                    self.assertIsNone(cf)
+                else:
+                    self.assertEqual(cf.path, p)
+                    self.assertEqual(cf.references, ref_cf.references)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""Tests for the persistent on-disk parse index."""
+
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+from cypilot.utils.codebase import CodeFile, load_code_files
+from cypilot.utils.document import scan_cdsl_instructions, scan_cpt_ids
+from cypilot.utils.parse_index import ParseIndex, regex_fingerprint
+from cypilot.utils.scan_cache import ArtifactScanCache, file_signature
+
+
+_DOC = """# Title
+
+## Requirements
+
+- [ ] `p1` - **ID**: `cpt-sys-fr-login`
+
+1. [x] - `p1` - Validate input - `inst-validate`
+
+Refers to `cpt-sys-fr-other` inline.
+"""
+
+_CODE = """# @cpt-flow:cpt-sys-flow-login:p1
+def f():
+    # @cpt-begin:cpt-sys-flow-login:p1:inst-validate
+    return 1
+    # @cpt-end:cpt-sys-flow-login:p1:inst-validate
+"""
+
+
+def _touch_later(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+
+class TestParseIndex(unittest.TestCase):
+    def test_put_get_roundtrip_and_persist(self):
+        with TemporaryDirectory() as td:
+            f = Path(td) / "a.md"
+            f.write_text("x\n", encoding="utf-8")
+            idx = ParseIndex.for_adapter(Path(td) / "adapter")
+            idx.put(f, "artifact", {"k": 1}, signature=file_signature(f))
+            self.assertTrue(idx.save())
+            self.assertTrue((Path(td) / "adapter" / "cache" / "index.json").is_file())
+            self.assertEqual((Path(td) / "adapter" / "cache" / ".gitignore").read_text(encoding="utf-8"), "*\n")
+
+            again = ParseIndex.for_adapter(Path(td) / "adapter")
+            self.assertEqual(again.get(f, "artifact"), {"k": 1})
+            self.assertIsNone(again.get(f, "code"))
+            self.assertFalse(again.save())
+
+    def test_mtime_change_with_same_content_is_a_hit(self):
+        with TemporaryDirectory() as td:
+            f = Path(td) / "a.md"
+            f.write_text("x\n", encoding="utf-8")
+            idx = ParseIndex(Path(td) / "index.json")
+            idx.put(f, "artifact", [1], signature=file_signature(f))
+            _touch_later(f)
+            self.assertEqual(idx.get(f, "artifact"), [1])
+            f.write_text("y\n", encoding="utf-8")
+            _touch_later(f)
+            self.assertIsNone(idx.get(f, "artifact"))
+
+    def test_put_skipped_when_file_changed_since_signature(self):
+        with TemporaryDirectory() as td:
+            f = Path(td) / "a.md"
+            f.write_text("x\n", encoding="utf-8")
+            sig = file_signature(f)
+            f.write_text("longer\n", encoding="utf-8")
+            idx = ParseIndex(Path(td) / "index.json")
+            idx.put(f, "artifact", [1], signature=sig)
+            self.assertEqual(len(idx), 0)
+
+    def test_outdated_header_discards_entries(self):
+        with TemporaryDirectory() as td:
+            f = Path(td) / "a.md"
+            f.write_text("x\n", encoding="utf-8")
+            path = Path(td) / "index.json"
+            idx = ParseIndex(path)
+            idx.put(f, "artifact", [1], signature=file_signature(f))
+            idx.save()
+            data = json.loads(path.read_text(encoding="utf-8"))
+            self.assertEqual(data["header"]["regex_fingerprint"], regex_fingerprint())
+            data["header"]["regex_fingerprint"] = "stale"
+            path.write_text(json.dumps(data), encoding="utf-8")
+            self.assertEqual(len(ParseIndex.load(path)), 0)
+
+    def test_deleted_files_are_pruned_on_save(self):
+        with TemporaryDirectory() as td:
+            f = Path(td) / "a.md"
+            f.write_text("x\n", encoding="utf-8")
+            path = Path(td) / "index.json"
+            idx = ParseIndex(path)
+            idx.put(f, "artifact", [1], signature=file_signature(f))
+            idx.save()
+            f.unlink()
+            idx = ParseIndex.load(path)
+            self.assertTrue(idx.save())
+            self.assertEqual(len(ParseIndex.load(path)), 0)
+
+
+class TestIndexedScans(unittest.TestCase):
+    def test_warm_artifact_scan_skips_reading(self):
+        with TemporaryDirectory() as td:
+            doc = Path(td) / "PRD.md"
+            doc.write_text(_DOC, encoding="utf-8")
+            path = Path(td) / "index.json"
+
+            cold = ArtifactScanCache(ParseIndex.load(path))
+            with patch.object(ArtifactScanCache, "_read_bytes", autospec=True,
+                              side_effect=ArtifactScanCache._read_bytes) as reads:
+                cold.id_hits(doc)
+                cold._index.save()
+                self.assertEqual(reads.call_count, 1)
+
+                reads.reset_mock()
+                warm = ArtifactScanCache(ParseIndex.load(path))
+                self.assertEqual(warm.id_hits(doc), scan_cpt_ids(doc))
+                self.assertEqual(warm.cdsl_steps(doc), scan_cdsl_instructions(doc))
+                self.assertEqual(len(warm.heading_scopes(doc, None)), len(_DOC.splitlines()) + 1)
+                self.assertEqual(reads.call_count, 0)  # heading scopes come from the persisted headings
+            self.assertEqual(warm._index.hits, 1)
+
+    def test_code_file_summary_roundtrip(self):
+        with TemporaryDirectory() as td:
+            src = Path(td) / "mod.py"
+            src.write_text(_CODE, encoding="utf-8")
+            idx = ParseIndex(Path(td) / "index.json")
+            [(cold, errs)] = load_code_files([src], idx)
+            self.assertEqual(errs, [])
+            [(warm, errs)] = load_code_files([src], idx)
+            self.assertEqual(errs, [])
+            self.assertEqual(idx.hits, 1)
+            self.assertEqual(warm.list_ids(), cold.list_ids())
+            self.assertEqual(warm.references, cold.references)
+            self.assertEqual(warm.scope_markers, cold.scope_markers)
+            self.assertEqual([b.inst for b in warm.block_markers], ["validate"])
+            self.assertEqual(warm.validate(), cold.validate())
+
+    def test_code_file_errors_are_cached(self):
+        with TemporaryDirectory() as td:
+            src = Path(td) / "bad.py"
+            src.write_text("# @cpt-begin:cpt-sys-flow-x:p1:inst-a\n", encoding="utf-8")
+            idx = ParseIndex(Path(td) / "index.json")
+            [(_cf, errs)] = load_code_files([src], idx)
+            self.assertTrue(errs)
+            [(cf, cached)] = load_code_files([src], idx)
+            self.assertIsNone(cf)
+            self.assertEqual(cached, errs)
+            self.assertEqual(CodeFile.from_path(src)[1], errs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,232 @@
+"""Tests for cypilot_proxy skill bundle download, extraction and cache swap."""
+
+import io
+import os
+import sys
+import tarfile
+import unittest
+import zipfile
+from contextlib import redirect_stderr
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cypilot_proxy import cache as proxy_cache
+from cypilot_proxy import cli as proxy_cli
+from cypilot_proxy.resolve import find_cached_skill
+from cypilot_proxy.store import SkillStore, version_dirname
+
+_INIT = "skills/cypilot/scripts/cypilot/__init__.py"
+_ENTRY = "skills/cypilot/scripts/cypilot.py"
+
+
+def _tarball(files, prefix="owner-repo-abc123/"):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tf:
+        for name, data in files.items():
+            info = tarfile.TarInfo(prefix + name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _zipball(files, prefix="bundle/"):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, data in files.items():
+            zf.writestr(prefix + name, data)
+    return buf.getvalue()
+
+
+class _FakeResponse:
+    """Chunked urlopen response; *declared* overrides Content-Length to simulate truncation."""
+
+    def __init__(self, data, declared=None):
+        self._buf = io.BytesIO(data)
+        self.headers = {"Content-Length": str(len(data) if declared is None else declared)}
+        self.reads = []
+
+    def read(self, n=-1):
+        self.reads.append(n)
+        return self._buf.read(n)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class TestDownloadAndCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.home = Path(self._tmp.name)
+        self.cache_dir = self.home / ".cypilot" / "cache"
+        for target, value in (
+            ("get_cache_dir", lambda: self.cache_dir),
+            ("get_version_file", lambda: self.cache_dir / ".version"),
+        ):
+            p = patch(f"cypilot_proxy.cache.{target}", side_effect=value)
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _download(self, resp, version="v9.9.9", force=True, **kwargs):
+        with patch("cypilot_proxy.cache.urlopen", return_value=resp):
+            return proxy_cache.download_and_cache(version=version, force=force, **kwargs)
+
+    def _seed_old_cache(self):
+        self.cache_dir.mkdir(parents=True)
+        (self.cache_dir / "OLD").write_text("old", encoding="utf-8")
+        (self.cache_dir / ".version").write_text("v1.0.0", encoding="utf-8")
+
+    def _leftovers(self):
+        return sorted(p.name for p in self.cache_dir.parent.iterdir() if p.name not in ("cache", "store"))
+
+    def test_streams_tarball_into_cache(self):
+        self._seed_old_cache()
+        data = _tarball({_INIT: b'__version__ = "dev"\n', "README.md": b"x" * 200_000})
+        resp = _FakeResponse(data)
+        seen = []
+        ok, msg = self._download(resp, progress=lambda done, total: seen.append((done, total)))
+        self.assertTrue(ok, msg)
+        self.assertEqual((self.cache_dir / ".version").read_text(encoding="utf-8"), "v9.9.9")
+        self.assertIn('__version__ = "v9.9.9"', (self.cache_dir / _INIT).read_text(encoding="utf-8"))
+        self.assertEqual((self.cache_dir / "README.md").stat().st_size, 200_000)
+        self.assertFalse((self.cache_dir / "OLD").exists())
+        self.assertEqual(self._leftovers(), [])
+        self.assertTrue(all(n == proxy_cache.CHUNK_SIZE for n in resp.reads))
+        self.assertEqual(seen[-1], (len(data), len(data)))
+
+    def test_truncated_download_keeps_old_cache(self):
+        self._seed_old_cache()
+        data = _tarball({"a.txt": b"a"})
+        ok, msg = self._download(_FakeResponse(data, declared=len(data) + 10))
+        self.assertFalse(ok)
+        self.assertIn("Download failed", msg)
+        self.assertEqual((self.cache_dir / ".version").read_text(encoding="utf-8"), "v1.0.0")
+        self.assertTrue((self.cache_dir / "OLD").exists())
+        self.assertEqual(self._leftovers(), [])
+
+    def test_unrecognized_archive_keeps_old_cache(self):
+        self._seed_old_cache()
+        ok, msg = self._download(_FakeResponse(b"not an archive" * 100))
+        self.assertFalse(ok)
+        self.assertIn("unrecognized format", msg)
+        self.assertTrue((self.cache_dir / "OLD").exists())
+        self.assertEqual(self._leftovers(), [])
+
+    def test_zip_bundle_and_unsafe_members(self):
+        ok, msg = self._download(_FakeResponse(_zipball({"a/b.txt": b"b", "../evil.txt": b"e"})))
+        self.assertTrue(ok, msg)
+        self.assertEqual((self.cache_dir / "a" / "b.txt").read_bytes(), b"b")
+        self.assertFalse((self.cache_dir.parent / "evil.txt").exists())
+
+        ok, msg = self._download(_FakeResponse(_tarball({"c.txt": b"c", "../evil.txt": b"e"})))
+        self.assertTrue(ok, msg)
+        self.assertEqual(sorted(p.name for p in self.cache_dir.iterdir()), [".version", "c.txt"])
+        self.assertFalse((self.home / ".cypilot" / "evil.txt").exists())
+
+    def test_stored_versions_switch_without_download(self):
+        shared = b"shared" * 1000
+        for version in ("v1", "v2"):
+            data = _tarball({_ENTRY: version.encode(), "README.md": shared})
+            ok, msg = self._download(_FakeResponse(data), version=version, force=False)
+            self.assertTrue(ok, msg)
+        self.assertEqual((self.cache_dir / ".version").read_text(encoding="utf-8"), "v2")
+
+        with patch("cypilot_proxy.cache.urlopen", side_effect=AssertionError("no download expected")):
+            ok, msg = proxy_cache.download_and_cache(version="v1")
+        self.assertTrue(ok, msg)
+        self.assertIn("switched", msg)
+        self.assertEqual((self.cache_dir / _ENTRY).read_bytes(), b"v1")
+
+        store = SkillStore(self.home / ".cypilot" / "store")
+        self.assertEqual(sorted(store.list_versions()), ["v1", "v2"])
+        # README stored once, linked from both version trees and the cache;
+        # each .version marker has the same content as its entry point
+        self.assertEqual((self.cache_dir / "README.md").stat().st_nlink, 4)
+        self.assertEqual(store.total_bytes(), len(shared) + len("v1") + len("v2"))
+
+        with patch("cypilot_proxy.resolve.get_cache_dir", return_value=self.cache_dir):
+            self.assertEqual(find_cached_skill("v2"), self.cache_dir / _ENTRY)
+            self.assertEqual((self.cache_dir / _ENTRY).read_bytes(), b"v2")
+            self.assertEqual(find_cached_skill("v3"), self.cache_dir / _ENTRY)
+            self.assertEqual(find_cached_skill(), self.cache_dir / _ENTRY)
+        self.assertEqual((self.cache_dir / ".version").read_text(encoding="utf-8"), "v2")
+
+    def test_update_no_cache_pinned_version_runs_against_matching_cache(self):
+        for version in ("v1", "v2"):
+            ok, msg = self._download(_FakeResponse(_tarball({_ENTRY: version.encode()})), version=version, force=False)
+            self.assertTrue(ok, msg)
+
+        def forward(skill_path, args):
+            # the engine copies from the cache, so it must hold the engine's own version
+            self.assertEqual(skill_path, self.cache_dir / _ENTRY)
+            self.assertEqual(skill_path.read_bytes(), b"v1")
+            self.assertEqual((self.cache_dir / ".version").read_text(encoding="utf-8"), "v1")
+            return 0
+
+        with patch("cypilot_proxy.resolve.get_cache_dir", return_value=self.cache_dir), \
+                patch("cypilot_proxy.telemetry.track_invocation"), \
+                patch("cypilot_proxy.cache.urlopen", side_effect=AssertionError("no download expected")), \
+                patch.object(proxy_cli, "_forward_to_skill", side_effect=forward) as fwd, \
+                redirect_stderr(io.StringIO()):
+            self.assertEqual(proxy_cli.main(["update", "--no-cache", "--version", "v1"]), 0)
+        fwd.assert_called_once()
+
+
+class TestSkillStore(unittest.TestCase):
+    def _add(self, store, root, version, content):
+        tree = root / f"tree-{version}"
+        tree.mkdir()
+        (tree / "big.bin").write_bytes(content)
+        (tree / ".version").write_text(version, encoding="utf-8")
+        store.add_tree(tree, version)
+
+    def test_lru_eviction_and_garbage_collection(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            store = SkillStore(root / "store")
+            for i, version in enumerate(("v1", "v2", "v3")):
+                self._add(store, root, version, bytes([i]) * 1000)
+                os.utime(store.version_dir(version), ns=(i * 10**9, i * 10**9))
+            store.touch("v1")
+            self.assertEqual(store.list_versions(), ["v2", "v3", "v1"])
+
+            self.assertEqual(store.evict(max_bytes=2100, keep={"v2"}), ["v3"])
+            self.assertEqual(sorted(store.list_versions()), ["v1", "v2"])
+            self.assertLessEqual(store.total_bytes(), 2100)
+
+    def test_version_dirname_is_safe_and_unique(self):
+        self.assertEqual(version_dirname("v3.1.0"), "v3.1.0")
+        self.assertNotEqual(version_dirname("local:3.1"), version_dirname("local_3.1"))
+        self.assertNotIn("/", version_dirname("feature/x"))
+        self.assertFalse(version_dirname("..").startswith("."))
+
+
+class TestCopyFromLocal(unittest.TestCase):
+    def test_replaces_cache_via_staging(self):
+        with TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            cache_dir = tmp / "home" / "cache"
+            cache_dir.mkdir(parents=True)
+            (cache_dir / "OLD").write_text("old", encoding="utf-8")
+            src = tmp / "src"
+            (src / "skills").mkdir(parents=True)
+            (src / "skills" / "x.md").write_text("x", encoding="utf-8")
+            with patch("cypilot_proxy.cache.get_cache_dir", return_value=cache_dir), \
+                    patch("cypilot_proxy.cache.get_version_file", return_value=cache_dir / ".version"):
+                ok, _msg = proxy_cache.copy_from_local(str(src), force=True)
+            self.assertTrue(ok)
+            self.assertEqual(sorted(p.name for p in cache_dir.iterdir()), [".version", "skills"])
+            self.assertEqual((cache_dir / ".version").read_text(encoding="utf-8"), "local:local")
+            self.assertEqual(sorted(p.name for p in cache_dir.parent.iterdir()), ["cache", "store"])
+
+
+if __name__ == "__main__":
+    unittest.main()
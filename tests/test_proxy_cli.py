@@ -0,0 +1,77 @@
+"""Tests for cypilot_proxy skill dispatch (in-process vs subprocess)."""
+
+import io
+import json
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+import cypilot  # noqa: F401  # the skill package under test, loaded from this checkout
+from cypilot_proxy import cli as proxy_cli
+
+SKILL_ENTRY = Path(__file__).parent.parent / "skills" / "cypilot" / "scripts" / "cypilot.py"
+
+
+class TestNeedsIsolation(unittest.TestCase):
+    def setUp(self):
+        env = patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop(proxy_cli.FORCE_SUBPROCESS_ENV, None)
+
+    def test_compatible_skill_runs_in_process(self):
+        self.assertFalse(proxy_cli._needs_isolation(SKILL_ENTRY, ["list-ids"]))
+
+    def test_env_forces_subprocess(self):
+        os.environ[proxy_cli.FORCE_SUBPROCESS_ENV] = "1"
+        self.assertTrue(proxy_cli._needs_isolation(SKILL_ENTRY, ["list-ids"]))
+
+    def test_self_updating_command_is_isolated(self):
+        self.assertTrue(proxy_cli._needs_isolation(SKILL_ENTRY, ["update"]))
+
+    def test_old_or_unknown_skill_version_is_isolated(self):
+        with TemporaryDirectory() as td:
+            entry = Path(td) / "cypilot.py"
+            entry.write_text("", encoding="utf-8")
+            (Path(td) / "cypilot").mkdir()
+            self.assertTrue(proxy_cli._needs_isolation(entry, ["info"]))
+            (Path(td) / "cypilot" / "__init__.py").write_text('__version__ = "v2.9.0"\n', encoding="utf-8")
+            self.assertTrue(proxy_cli._needs_isolation(entry, ["info"]))
+
+    def test_other_loaded_cypilot_package_is_isolated(self):
+        with TemporaryDirectory() as td:
+            entry = Path(td) / "cypilot.py"
+            (Path(td) / "cypilot").mkdir()
+            (Path(td) / "cypilot" / "__init__.py").write_text('__version__ = "v3.9.0"\n', encoding="utf-8")
+            self.assertTrue(proxy_cli._needs_isolation(entry, ["info"]))
+
+
+class TestForwardToSkill(unittest.TestCase):
+    def test_in_process_dispatch_skips_subprocess(self):
+        from cypilot.utils.ui import set_json_mode
+        self.addCleanup(set_json_mode, False)
+        buf = io.StringIO()
+        with patch.dict(os.environ), patch("cypilot_proxy.cli.subprocess.run") as run, redirect_stdout(buf):
+            os.environ.pop(proxy_cli.FORCE_SUBPROCESS_ENV, None)
+            rc = proxy_cli._forward_to_skill(SKILL_ENTRY, ["--json", "--help"])
+        run.assert_not_called()
+        self.assertEqual(rc, 0)
+        self.assertIn("commands", json.loads(buf.getvalue()))
+
+    def test_isolated_dispatch_uses_subprocess(self):
+        with patch.dict(os.environ, {proxy_cli.FORCE_SUBPROCESS_ENV: "1"}), \
+                patch("cypilot_proxy.cli.subprocess.run", return_value=MagicMock(returncode=3)) as run:
+            rc = proxy_cli._forward_to_skill(SKILL_ENTRY, ["info"])
+        self.assertEqual(rc, 3)
+        self.assertEqual(run.call_args[0][0][1:], [str(SKILL_ENTRY), "info"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Tests for the slotted pipeline records and their dict-compatible views."""
+
+import json
+import sys
+import unittest
+from collections.abc import Mapping
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+from cypilot.utils.constraints import error
+from cypilot.utils.document import scan_cpt_ids_from_lines
+from cypilot.utils.records import IdHit, Issue, json_default
+
+
+class TestIdHit(unittest.TestCase):
+    def test_dict_form_matches_legacy_shape(self):
+        hits = scan_cpt_ids_from_lines([
+            "- [x] `p1` - **ID**: `cpt-app-fr-login`",
+            "See `cpt-app-fr-other` here.",
+        ])
+        self.assertEqual(hits[0], {
+            "id": "cpt-app-fr-login", "line": 1, "type": "definition", "checked": True,
+            "has_task": True, "has_priority": True, "priority": "p1",
+        })
+        self.assertEqual(hits[1].to_dict(), {"id": "cpt-app-fr-other", "line": 2, "type": "reference", "checked": False})
+        self.assertNotIn("priority", hits[1])
+        self.assertIsNone(hits[1].get("has_task"))
+        with self.assertRaises(KeyError):
+            hits[1]["has_task"]  # pylint: disable=pointless-statement
+
+    def test_round_trips_through_json(self):
+        hit = IdHit("cpt-app-fr-x", 3, "reference", False, False, False)
+        restored = IdHit.from_dict(json.loads(json.dumps(hit, default=json_default)))
+        self.assertEqual(restored, hit)
+        self.assertEqual(restored.line, 3)
+
+
+class TestIssue(unittest.TestCase):
+    def test_factory_matches_legacy_dict(self):
+        e = error("structure", "boom", path=Path("/p/a.md"), line=4, code="X", id="cpt-a", kit=None)
+        self.assertIsInstance(e, Mapping)
+        self.assertEqual(dict(e), {
+            "type": "structure", "message": "boom", "line": 4, "code": "X",
+            "path": "/p/a.md", "location": "/p/a.md:4", "id": "cpt-a",
+        })
+        self.assertEqual(error("file", "m", path="<stdin>").get("location"), "<stdin>")
+
+    def test_mutation_like_a_dict(self):
+        e = Issue("structure", "boom", 2, "/p/a.md")
+        e["reasons"] = ["r"]
+        self.assertEqual(e.pop("path"), "/p/a.md")
+        self.assertIsNone(e.pop("path", None))
+        self.assertEqual(json.loads(json.dumps(e, default=json_default)), {
+            "type": "structure", "message": "boom", "line": 2, "location": "/p/a.md:2", "reasons": ["r"],
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
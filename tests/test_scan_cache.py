@@ -0,0 +1,165 @@
+"""Tests for the per-invocation artifact scan cache."""
+
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+from cypilot.utils.constraints import (
+    HeadingConstraint,
+    _scan_headings,
+    cross_validate_artifacts,
+    ArtifactRecord,
+    heading_constraint_ids_by_line,
+)
+from cypilot.utils.document import headings_by_line, scan_cdsl_instructions, scan_cpt_ids
+from cypilot.utils.line_pass import LineVisitor
+from cypilot.utils.scan_cache import ArtifactScanCache, file_signature
+
+
+def _spy_reads():
+    """Spy on ``ArtifactScanCache._read_bytes``; its ``call_count`` is the number of file reads."""
+    return patch.object(ArtifactScanCache, "_read_bytes", autospec=True, side_effect=ArtifactScanCache._read_bytes)
+
+
+_DOC = """# Title
+
+## Requirements
+
+- [ ] `p1` - **ID**: `cpt-sys-fr-login`
+
+1. [x] - `p1` - Validate input - `inst-validate`
+
+### Details
+
+Refers to `cpt-sys-fr-other` inline.
+
+```
+**ID**: `cpt-sys-fr-fenced`
+```
+"""
+
+
+class TestArtifactScanCache(unittest.TestCase):
+    def _write(self, td: str, text: str = _DOC) -> Path:
+        p = Path(td) / "PRD.md"
+        p.write_text(text, encoding="utf-8")
+        return p
+
+    def test_facets_match_uncached_scanners(self):
+        with TemporaryDirectory() as td:
+            p = self._write(td)
+            cache = ArtifactScanCache()
+            self.assertEqual(cache.id_hits(p), scan_cpt_ids(p))
+            self.assertEqual(cache.cdsl_steps(p), scan_cdsl_instructions(p))
+            self.assertEqual(cache.headings(p), _scan_headings(p))
+            self.assertEqual(cache.heading_titles_by_line(p), headings_by_line(p))
+            hcs = [HeadingConstraint(level=2, pattern="Requirements", id="reqs")]
+            self.assertEqual(cache.heading_ids_by_line(p, hcs), heading_constraint_ids_by_line(p, hcs))
+            self.assertEqual(
+                [h["id"] for h in cache.definitions(p)],
+                ["cpt-sys-fr-login"],
+            )
+
+    def test_file_read_once_across_facets(self):
+        with TemporaryDirectory() as td, _spy_reads() as reads:
+            p = self._write(td)
+            cache = ArtifactScanCache()
+            cache.id_hits(p)
+            cache.cdsl_steps(p)
+            cache.headings(p)
+            cache.heading_scopes(p, None)
+            cache.definitions(p)
+            self.assertEqual(reads.call_count, 1)
+            self.assertIs(cache.id_hits(p), cache.id_hits(p))
+
+    def test_changed_signature_invalidates_entry(self):
+        with TemporaryDirectory() as td, _spy_reads() as reads:
+            p = self._write(td)
+            cache = ArtifactScanCache()
+            before = file_signature(p)
+            self.assertEqual(len(cache.definitions(p)), 1)
+            p.write_text(_DOC + "\n**ID**: `cpt-sys-fr-added`\n", encoding="utf-8")
+            self.assertNotEqual(file_signature(p), before)
+            self.assertEqual(len(cache.definitions(p)), 2)
+            self.assertEqual(reads.call_count, 2)
+
+    def test_missing_file_yields_empty_facets(self):
+        with TemporaryDirectory() as td:
+            missing = Path(td) / "nope.md"
+            cache = ArtifactScanCache()
+            self.assertIsNone(cache.lines(missing))
+            self.assertEqual(cache.id_hits(missing), [])
+            self.assertEqual(cache.heading_titles_by_line(missing), [[]])
+            self.assertIsNone(file_signature(missing))
+            self.assertEqual(len(cache), 0)
+            self.assertIn("No such file", cache.read_error(missing))
+
+    def test_read_error_reports_invalid_utf8_from_the_same_read(self):
+        with TemporaryDirectory() as td:
+            p = Path(td) / "PRD.md"
+            p.write_bytes(b"# T\n\xff\n")
+            cache = ArtifactScanCache()
+            with _spy_reads() as reads:
+                self.assertEqual(cache.lines(p), ["# T", ""])
+                self.assertIn("invalid start byte", cache.read_error(p))
+            self.assertEqual(reads.call_count, 1)
+            self.assertIsNone(cache.read_error(self._write(td)))
+
+    def test_cross_validate_uses_shared_cache(self):
+        with TemporaryDirectory() as td, _spy_reads() as reads:
+            p = self._write(td)
+            cache = ArtifactScanCache()
+            cache.id_hits(p)
+            cross_validate_artifacts(
+                [ArtifactRecord(path=p, artifact_kind="PRD", constraints=None)],
+                registered_systems={"sys"},
+                scan_cache=cache,
+            )
+            self.assertEqual(reads.call_count, 1)
+
+    def test_registered_visitor_joins_scan_pass(self):
+        from cypilot.utils.content_language import LangScanVisitor, build_allowed_ranges, scan_file
+
+        with TemporaryDirectory() as td, _spy_reads() as reads:
+            p = self._write(td, _DOC + "\nПривет\n")
+            ranges = build_allowed_ranges(["en"])
+            cache = ArtifactScanCache()
+            cache.add_line_visitor("language", lambda path: LangScanVisitor(path, ranges))
+            self.assertEqual(len(cache.id_hits(p)), 2)
+            with patch("cypilot.utils.scan_cache.run_line_pass", side_effect=AssertionError("second pass")):
+                violations = cache.line_facet(p, "language")
+            self.assertEqual([(v.lineno, v.chars) for v in violations],
+                             [(v.lineno, v.chars) for v in scan_file(p, ranges)])
+            self.assertEqual(reads.call_count, 1)
+            with self.assertRaises(KeyError):
+                cache.line_facet(p, "unregistered")
+
+    def test_visitor_registered_late_reuses_decoded_lines(self):
+        with TemporaryDirectory() as td, _spy_reads() as reads:
+            p = self._write(td)
+            cache = ArtifactScanCache()
+            cache.id_hits(p)
+            cache.add_line_visitor("count", lambda _path: _CountingVisitor())
+            self.assertEqual(cache.line_facet(p, "count"), len(_DOC.splitlines()))
+            self.assertEqual(reads.call_count, 1)
+
+
+class _CountingVisitor(LineVisitor):
+    __slots__ = ("n",)
+
+    def __init__(self):
+        self.n = 0
+
+    def visit(self, lineno, raw, stripped, fenced):
+        self.n += 1
+
+    def result(self):
+        return self.n
+
+
+if __name__ == "__main__":
+    unittest.main()
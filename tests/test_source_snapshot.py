@@ -0,0 +1,183 @@
+"""Tests for the per-source workspace snapshot cache."""
+
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+from cypilot.utils.artifacts_meta import ArtifactsMeta
+from cypilot.utils import context as context_mod
+from cypilot.utils.context import CypilotContext, SourceContext, WorkspaceContext
+from cypilot.utils.source_snapshot import SourceSnapshotCache, _git_state
+
+
+def _meta(*paths):
+    meta = MagicMock(spec=ArtifactsMeta)
+    meta.iter_all_artifacts.return_value = [(SimpleNamespace(path=p, kind="PRD"), None) for p in paths]
+    return meta
+
+
+def _workspace(tmp: Path, source: SourceContext) -> WorkspaceContext:
+    primary = CypilotContext(
+        adapter_dir=tmp / "adapter", project_root=tmp,
+        meta=_meta(), kits={}, registered_systems=set(),
+    )
+    return WorkspaceContext(primary=primary, sources={source.name: source})
+
+
+def _source(root: Path, meta=None, adapter_context=None) -> SourceContext:
+    return SourceContext(
+        name="remote", path=root, role="full", meta=meta or _meta("A.md", "docs/B.md"),
+        adapter_context=adapter_context, _adapter_resolved=True,
+    )
+
+
+def _spy_expansions():
+    """Spy on ``get_expanded_meta``; its ``call_count`` is the number of snapshot misses."""
+    return patch.object(context_mod, "get_expanded_meta", side_effect=context_mod.get_expanded_meta)
+
+
+def _touch_later(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+
+class TestSourceSnapshots(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.remote = self.tmp / "remote"
+        (self.remote / "docs").mkdir(parents=True)
+        (self.remote / "A.md").write_text("**ID**: `cpt-remote-fr-a`\n", encoding="utf-8")
+        (self.remote / "docs" / "B.md").write_text("**ID**: `cpt-remote-fr-b`\n", encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _ids(self, sc=None):
+        return _workspace(self.tmp, sc or _source(self.remote)).get_all_artifact_ids()
+
+    def test_warm_run_skips_expansion_and_rescan(self):
+        self.assertEqual(self._ids(), {"cpt-remote-fr-a", "cpt-remote-fr-b"})
+        self.assertTrue((self.tmp / "adapter" / "cache" / "sources.json").is_file())
+
+        warm_meta = _meta("A.md", "docs/B.md")
+        with patch("cypilot.utils.document.scan_cpt_ids") as scan:
+            self.assertEqual(self._ids(_source(self.remote, meta=warm_meta)), {"cpt-remote-fr-a", "cpt-remote-fr-b"})
+        scan.assert_not_called()
+        warm_meta.iter_all_artifacts.assert_not_called()
+
+    def test_changed_or_added_file_invalidates(self):
+        self._ids()
+        (self.remote / "A.md").write_text("**ID**: `cpt-remote-fr-a2`\n", encoding="utf-8")
+        _touch_later(self.remote / "A.md")
+        self.assertEqual(self._ids(), {"cpt-remote-fr-a2", "cpt-remote-fr-b"})
+
+        (self.remote / "docs" / "C.md").write_text("**ID**: `cpt-remote-fr-c`\n", encoding="utf-8")
+        _touch_later(self.remote / "docs")
+        self.assertIn("cpt-remote-fr-c", self._ids(_source(self.remote, meta=_meta("A.md", "docs/B.md", "docs/C.md"))))
+
+    def test_failed_scan_is_not_cached(self):
+        with patch("cypilot.utils.document.scan_cpt_ids", side_effect=OSError("boom")):
+            self.assertEqual(self._ids(), set())
+        self.assertEqual(self._ids(), {"cpt-remote-fr-a", "cpt-remote-fr-b"})
+
+    def test_snapshot_stands_in_for_adapter_context(self):
+        adapter_ctx = MagicMock()
+        adapter_ctx.meta = _meta("A.md")
+        adapter_ctx.registered_systems = {"remote", "remote-child"}
+        adapter_ctx.get_known_id_kinds.return_value = {"fr", "epic"}
+        cold = _workspace(self.tmp, _source(self.remote, adapter_context=adapter_ctx))
+        self.assertEqual(len(cold.source_artifacts(cold.sources["remote"])), 1)
+        cold.source_snapshots().save()
+
+        warm = _workspace(self.tmp, _source(self.remote, meta=_meta("A.md")))
+        with _spy_expansions() as expand:
+            self.assertEqual(warm.source_artifacts(warm.sources["remote"]), [((self.remote / "A.md").resolve(), "PRD")])
+        expand.assert_not_called()
+        self.assertEqual(warm.get_all_registered_systems(), cold.get_all_registered_systems())
+        self.assertEqual(warm.get_known_id_kinds(), {"fr", "epic"})
+
+    def test_expired_state_is_rechecked_in_long_lived_context(self):
+        adapter_ctx = MagicMock()
+        adapter_ctx.meta = _meta("A.md")
+        adapter_ctx.registered_systems = {"remote"}
+        adapter_ctx.get_known_id_kinds.return_value = {"fr"}
+        ws = _workspace(self.tmp, _source(self.remote, adapter_context=adapter_ctx))
+        sc = ws.sources["remote"]
+        with _spy_expansions() as expand:
+            with patch("cypilot.utils.source_snapshot._git_state", return_value="git:one"):
+                self.assertEqual(len(ws.source_artifacts(sc)), 1)
+            with patch("cypilot.utils.source_snapshot._git_state", return_value="git:two") as state:
+                self.assertEqual(len(ws.source_artifacts(sc)), 1)
+                state.assert_not_called()
+
+                ws.expire_source_states()
+                # The stale adapter context is dropped; the source meta now lists both files.
+                self.assertEqual(len(ws.source_artifacts(sc)), 2)
+                self.assertIsNone(sc.adapter_context)
+                self.assertEqual(state.call_count, 1)
+                self.assertEqual(len(ws.source_artifacts(sc)), 2)
+        self.assertEqual(expand.call_count, 2)
+
+    def test_no_cache_neither_reads_nor_writes_snapshots(self):
+        path = self.tmp / "adapter" / "cache" / "sources.json"
+        ws = _workspace(self.tmp, _source(self.remote))
+        self.assertEqual(ws.get_all_artifact_ids(use_cache=False), {"cpt-remote-fr-a", "cpt-remote-fr-b"})
+        self.assertFalse(path.exists())
+
+        self._ids()
+        stale_meta = _meta("A.md")
+        ws = _workspace(self.tmp, _source(self.remote, meta=stale_meta))
+        with patch.object(Path, "read_text", side_effect=AssertionError("sources.json read")):
+            self.assertEqual(len(ws.source_artifacts(ws.sources["remote"], use_cache=False)), 1)
+        stale_meta.iter_all_artifacts.assert_called_once()
+
+    def test_outdated_header_discards_cache(self):
+        self._ids()
+        path = self.tmp / "adapter" / "cache" / "sources.json"
+        self.assertEqual(len(SourceSnapshotCache.load(path)), 1)
+        with patch("cypilot.utils.source_snapshot.regex_fingerprint", return_value="other"):
+            self.assertEqual(len(SourceSnapshotCache.load(path)), 0)
+
+
+@unittest.skipUnless(shutil.which("git"), "git not available")
+class TestGitState(unittest.TestCase):
+    def _git(self, root, *args):
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=root, check=True, capture_output=True,
+        )
+
+    def test_head_and_dirty_edits_change_state(self):
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self.assertIsNone(_git_state(root))
+            self._git(root, "init", "-q")
+            (root / "A.md").write_text("one\n", encoding="utf-8")
+            self._git(root, "add", "A.md")
+            self._git(root, "commit", "-q", "-m", "init")
+            clean = _git_state(root)
+            self.assertTrue(clean.startswith("git:"))
+            self.assertEqual(_git_state(root), clean)
+
+            (root / "A.md").write_text("two\n", encoding="utf-8")
+            dirty = _git_state(root)
+            self.assertNotEqual(dirty, clean)
+            (root / "A.md").write_text("three\n", encoding="utf-8")
+            _touch_later(root / "A.md")
+            self.assertNotEqual(_git_state(root), dirty)
+
+            self._git(root, "commit", "-q", "-am", "next")
+            self.assertNotIn(_git_state(root), (clean, dirty))
+
+
+if __name__ == "__main__":
+    unittest.main()
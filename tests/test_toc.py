@@ -12,9 +12,9 @@ from cypilot.commands.toc import cmd_toc
 from cypilot.utils.toc import (
     build_toc as _build_toc,
     parse_headings as _parse_headings,
-    process_file as _process_file,
     github_anchor as _slugify,
 )
+from cypilot.utils.toc_batch import MODE_TOC, TocTask, run_task
 from cypilot.commands.validate_toc import cmd_validate_toc
 from cypilot.utils.toc import (
     build_toc,
@@ -126,6 +126,12 @@ class TestBuildToc:
 # _process_file
 # ---------------------------------------------------------------------------
 
+def _process_file(filepath: Path, *, max_level: int = 6, dry_run: bool = False) -> dict:
+    """One uncached TOC task without validation, as ``cpt toc`` runs per file."""
+    result, _entry = run_task(TocTask(str(filepath), MODE_TOC, max_level, dry_run=dry_run, validate=False))
+    return result
+
+
 class TestProcessFile:
     def test_file_not_found(self, tmp_path: Path):
         result = _process_file(tmp_path / "nope.md")
@@ -713,7 +719,7 @@ class TestCmdTocValidation:
 
         from unittest.mock import patch as _p
         fake = {"errors": ["bad toc entry"], "warnings": []}
-        with _p("cypilot.commands.toc._validate_toc", return_value=fake):
+        with _p("cypilot.utils.toc_batch.validate_toc", return_value=fake):
             import io, json
             buf = io.StringIO()
             from contextlib import redirect_stdout
@@ -733,7 +739,7 @@ class TestCmdTocValidation:
 
         from unittest.mock import patch as _p
         fake = {"errors": [], "warnings": ["minor issue"]}
-        with _p("cypilot.commands.toc._validate_toc", return_value=fake):
+        with _p("cypilot.utils.toc_batch.validate_toc", return_value=fake):
             import io, json
             buf = io.StringIO()
             from contextlib import redirect_stdout
@@ -788,3 +794,107 @@ class TestArtifactKindConstraintsToc:
         assert not errs
         assert kc is not None
         assert kc.by_kind["TEST"].toc is True
+
+
+# ---------------------------------------------------------------------------
+# Batch mode: directory/glob arguments, heading cache, parallel workers
+# ---------------------------------------------------------------------------
+
+_BATCH_DOC = "# Title\n\n## Alpha\n\nText.\n\n## Beta\n\nMore.\n"
+
+
+def _batch_project(root: Path) -> Path:
+    """Cypilot project with a docs tree; returns the docs dir."""
+    (root / "AGENTS.md").write_text(
+        '<!-- @cpt:root-agents -->\n```toml\ncypilot_path = "adapter"\n```\n', encoding="utf-8",
+    )
+    (root / "adapter" / "config").mkdir(parents=True)
+    docs = root / "docs"
+    (docs / "sub").mkdir(parents=True)
+    (docs / ".hidden").mkdir()
+    (docs / "a.md").write_text(_BATCH_DOC, encoding="utf-8")
+    (docs / "sub" / "b.md").write_text(_BATCH_DOC.replace("Beta", "Gamma"), encoding="utf-8")
+    (docs / ".hidden" / "c.md").write_text(_BATCH_DOC, encoding="utf-8")
+    (docs / "notes.txt").write_text("## Not markdown\n", encoding="utf-8")
+    return docs
+
+
+def _run_json(fn, argv):
+    import io
+    from contextlib import redirect_stdout
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        rc = fn(argv)
+    return rc, json.loads(buf.getvalue())
+
+
+class TestTocBatch:
+    def test_directory_and_glob_expansion(self, tmp_path: Path):
+        from cypilot.utils.toc_batch import expand_markdown_args
+
+        docs = _batch_project(tmp_path)
+        files, unmatched = expand_markdown_args([str(docs), str(docs / "**" / "b.md"), str(tmp_path / "*.rst")])
+        assert files == [(docs / "a.md").resolve(), (docs / "sub" / "b.md").resolve()]
+        assert unmatched == [str(tmp_path / "*.rst")]
+
+    def test_existing_file_with_glob_characters_is_not_a_pattern(self, tmp_path: Path):
+        from cypilot.utils.toc_batch import expand_markdown_args
+
+        docs = _batch_project(tmp_path)
+        (docs / "node_modules").mkdir()
+        (docs / "node_modules" / "d.md").write_text(_BATCH_DOC, encoding="utf-8")
+        draft = docs / "[draft].md"
+        draft.write_text(_BATCH_DOC, encoding="utf-8")
+        assert expand_markdown_args([str(draft)]) == ([draft.resolve()], [])
+        files, _ = expand_markdown_args([str(docs)])
+        assert files == [draft.resolve(), (docs / "a.md").resolve(), (docs / "sub" / "b.md").resolve()]
+
+    def test_cache_skips_unchanged_files(self, tmp_path: Path, monkeypatch):
+        docs = _batch_project(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        rc, out = _run_json(cmd_toc, [str(docs)])
+        assert rc == 0
+        assert out["summary"] == {"statuses": {"UPDATED": 2}, "cached": 0, "validation": {"PASS": 2}}
+        assert (tmp_path / "adapter" / "cache" / "toc.json").is_file()
+
+        from unittest.mock import patch as _p
+        with _p("cypilot.utils.toc_batch.process_content", side_effect=AssertionError("regenerated")), \
+                _p("cypilot.utils.toc_batch.validate_toc", side_effect=AssertionError("revalidated")), \
+                _p("cypilot.utils.toc_batch.heading_fingerprint", side_effect=AssertionError("read")):
+            rc, out = _run_json(cmd_toc, [str(docs)])
+            assert rc == 0
+            assert out["summary"]["cached"] == 2
+            assert [r["status"] for r in out["results"]] == ["UNCHANGED", "UNCHANGED"]
+            assert out["results"][0]["validation"] == {"status": "PASS"}
+            rc, out = _run_json(cmd_validate_toc, [str(docs)])
+            assert (rc, out["status"], out["summary"]["cached"]) == (0, "PASS", 2)
+
+        # Body-only edit: file is read again but regeneration and validation are skipped
+        a = docs / "a.md"
+        a.write_text(a.read_text(encoding="utf-8").replace("More.", "More text."), encoding="utf-8")
+        with _p("cypilot.utils.toc_batch.process_content", side_effect=AssertionError("regenerated")):
+            rc, out = _run_json(cmd_toc, [str(a)])
+        assert (rc, out["results"][0]["cached"]) == (0, True)
+
+        # Heading edit: regenerated and revalidated
+        a.write_text(a.read_text(encoding="utf-8") + "\n## Delta\n", encoding="utf-8")
+        rc, out = _run_json(cmd_validate_toc, [str(a)])
+        assert (rc, out["status"]) == (2, "FAIL")
+        rc, out = _run_json(cmd_toc, [str(a)])
+        assert out["results"][0]["status"] == "UPDATED"
+        assert "cached" not in out["results"][0]
+        assert "[Delta](#delta)" in a.read_text(encoding="utf-8")
+
+    def test_no_cache_and_parallel_workers(self, tmp_path: Path, monkeypatch):
+        docs = _batch_project(tmp_path)
+        for i in range(6):
+            (docs / f"extra{i}.md").write_text(_BATCH_DOC, encoding="utf-8")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("cypilot.utils.parallel.MIN_PARALLEL_ITEMS", 2)
+        rc, out = _run_json(cmd_toc, ["--no-cache", "--jobs", "2", str(docs)])
+        assert rc == 0
+        assert out["files_processed"] == 8
+        assert [Path(r["file"]).name for r in out["results"]][:2] == ["a.md", "extra0.md"]
+        assert not (tmp_path / "adapter" / "cache").exists()
+        rc, out = _run_json(cmd_validate_toc, ["--jobs", "2", str(docs / "*.md")])
+        assert (rc, out["status"], out["files_validated"]) == (0, "PASS", 7)
@@ -0,0 +1,47 @@
+"""Tests for local token estimators."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "skills" / "cypilot" / "scripts"))
+
+from cypilot.utils import token_estimate
+from cypilot.utils.token_estimate import (
+    bytes_tokens,
+    get_estimator,
+    heuristic_tokens,
+    register_estimator,
+    words_tokens,
+)
+
+
+class TestEstimators(unittest.TestCase):
+    def test_builtin_estimates(self):
+        self.assertEqual(bytes_tokens(""), 0)
+        self.assertEqual(bytes_tokens("abcde"), 2)
+        self.assertEqual(bytes_tokens("ü"), 1)
+        self.assertEqual(words_tokens("one two three"), 4)
+        prose = "the quick brown fox jumps over the lazy dog"
+        self.assertEqual(heuristic_tokens(prose), bytes_tokens(prose))
+        dense = '{"a":[1,2],"b":{}}'
+        self.assertGreater(heuristic_tokens(dense), bytes_tokens(dense))
+
+    def test_get_estimator(self):
+        self.assertIs(get_estimator("heuristic"), heuristic_tokens)
+        self.assertIs(get_estimator("builtins:len"), len)
+        for spec in ("nope", "no_such_module_xyz:fn", "builtins:no_such_fn", "math:pi"):
+            with self.assertRaises(ValueError):
+                get_estimator(spec)
+
+    def test_register_estimator(self):
+        try:
+            register_estimator("constant", lambda text: 1)
+            self.assertEqual(get_estimator("constant")("anything"), 1)
+            self.assertIn("constant", token_estimate.estimator_names())
+        finally:
+            token_estimate._ESTIMATORS.pop("constant", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -279,6 +279,34 @@ class TestCmdUpdatePipeline(unittest.TestCase):
             finally:
                 os.chdir(cwd)
 
+    def test_validate_kits_issue_records_are_listed_by_message(self):
+        """validate-kits errors (Issue records) are shown as path: message, not reprs."""
+        from cypilot.commands.update import cmd_update
+        from cypilot.utils.records import Issue
+        from cypilot.utils.ui import ui
+        with TemporaryDirectory() as td:
+            root = Path(td) / "proj"
+            root.mkdir()
+            cache = Path(td) / "cache"
+            _make_cache(cache)
+            _init_project(root, cache)
+
+            issue = Issue("kit", "Template missing", 1, "kits/sdlc/conf.toml")
+            report = {"status": "FAIL", "errors": [issue]}
+            cwd = os.getcwd()
+            try:
+                os.chdir(str(root))
+                with patch("cypilot.commands.update.CACHE_DIR", cache), \
+                        patch("cypilot.commands.validate_kits.run_validate_kits", return_value=(2, report)), \
+                        patch.object(ui, "substep") as substep:
+                    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+                        cmd_update([])
+            finally:
+                os.chdir(cwd)
+            shown = [c.args[0] for c in substep.call_args_list]
+            self.assertIn("  ✗ kits/sdlc/conf.toml: Template missing", shown)
+            self.assertFalse(any("Issue(" in line for line in shown))
+
     def test_update_dry_run(self):
         """--dry-run reports what would change without writing."""
         from cypilot.commands.update import cmd_update
@@ -12,7 +12,7 @@ from pathlib import Path
 import io
 import contextlib
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from tempfile import TemporaryDirectory
 
 
@@ -104,6 +104,59 @@ class TestMain(unittest.TestCase):
             self.assertIn(code, [1, 2])
 
 
+class TestValidateNdjson(unittest.TestCase):
+    """--ndjson streams issues, then final per-artifact reports, then the summary."""
+
+    def setUp(self):
+        from cypilot.utils.context import set_context
+        from cypilot.utils.ui import set_json_mode, set_ndjson_mode
+
+        self.addCleanup(set_context, None)
+        self.addCleanup(set_json_mode, False)
+        self.addCleanup(set_ndjson_mode, False)
+        self.addCleanup(os.chdir, os.getcwd())
+
+    def _validate(self, root: Path, prd_text: str) -> tuple:
+        from cypilot.utils import toml_utils
+
+        prd = root / "architecture" / "PRD.md"
+        prd.parent.mkdir(parents=True, exist_ok=True)
+        prd.write_text(prd_text, encoding="utf-8")
+        _bootstrap_registry(root, entries=[])
+        toml_utils.dump({
+            "version": "1.0",
+            "project_root": "..",
+            "kits": {"cypilot": {"format": "Cypilot", "path": "kits/sdlc"}},
+            "systems": [{"name": "Test", "kits": "cypilot", "artifacts": [{"path": "architecture/PRD.md", "kind": "PRD"}]}],
+        }, root / "adapter" / "config" / "artifacts.toml")
+        os.chdir(root)
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):
+            rc = cypilot_cli.main(["--ndjson", "validate", "--skip-code", "--no-cache"])
+        return rc, [json.loads(line) for line in buf.getvalue().splitlines()]
+
+    def test_artifact_record_reflects_cross_validation_errors(self):
+        with TemporaryDirectory() as td:
+            rc, recs = self._validate(
+                Path(td), "- [x] `p1` - **ID**: `cpt-test-item-1`\n\nSee `cpt-test-item-missing`.\n",
+            )
+        self.assertEqual(rc, 2)
+        kinds = [r["record"] for r in recs]
+        self.assertEqual(kinds[-2:], ["artifact", "summary"])
+        self.assertIn("error", kinds[:-2])
+        artifact = recs[-2]
+        self.assertEqual((artifact["status"], artifact["error_count"]), ("FAIL", 1))
+        self.assertEqual((recs[-1]["status"], recs[-1]["error_count"]), ("FAIL", 1))
+        self.assertNotIn("errors", recs[-1])
+
+    def test_passing_run_streams_artifact_then_summary(self):
+        with TemporaryDirectory() as td:
+            rc, recs = self._validate(Path(td), "- [x] `p1` - **ID**: `cpt-test-item-1`\n")
+        self.assertEqual(rc, 0)
+        self.assertEqual([r["record"] for r in recs if r["record"] != "warning"], ["artifact", "summary"])
+        self.assertEqual(recs[-2]["status"], "PASS")
+
+
 class TestParsingUtils(unittest.TestCase):
     """Tests for utils/parsing.py"""
 
@@ -477,6 +530,50 @@ class TestRunContentLanguageCheck(unittest.TestCase):
         results = self._call((mock_cfg, None))
         self.assertEqual(results, [])
 
+    def test_violations_come_from_shared_scan_pass(self):
+        from cypilot.commands.validate import _run_content_language_check
+        from cypilot.utils.scan_cache import ArtifactScanCache
+
+        with TemporaryDirectory() as td:
+            art = Path(td) / "PRD.md"
+            art.write_text("# PRD\n\nПривет\n", encoding="utf-8")
+            cache = ArtifactScanCache()
+            with patch.object(ArtifactScanCache, "_read_bytes", autospec=True,
+                              side_effect=ArtifactScanCache._read_bytes) as reads:
+                cache.id_hits(art)
+                results = _run_content_language_check(
+                    [(art, None, "PRD", "FULL", None)], Path(td), cache, (["en"], []),
+                )
+            self.assertEqual([(r["line"], r["code"]) for r in results], [(3, "LANG001")])
+            self.assertEqual(reads.call_count, 1)
+
+    def test_invalid_utf8_is_a_read_error_with_cause(self):
+        from cypilot.commands.validate import _run_content_language_check
+        from cypilot.utils.scan_cache import ArtifactScanCache
+
+        with TemporaryDirectory() as td:
+            art = Path(td) / "PRD.md"
+            art.write_bytes(b"# PRD\n\nbad \xff byte\n")
+            cache = ArtifactScanCache()
+            cache.id_hits(art)
+            results = _run_content_language_check(
+                [(art, None, "PRD", "FULL", None)], Path(td), cache, (["en"], []),
+            )
+            self.assertEqual([(r["line"], r["code"]) for r in results], [(1, "file-read-error")])
+            self.assertIn("can't decode byte 0xff", results[0]["message"])
+
+    def test_nul_bytes_in_valid_utf8_are_still_scanned(self):
+        from cypilot.commands.validate import _run_content_language_check
+        from cypilot.utils.scan_cache import ArtifactScanCache
+
+        with TemporaryDirectory() as td:
+            art = Path(td) / "PRD.md"
+            art.write_bytes("# PRD\n\x00\nПривет\n".encode("utf-8"))
+            results = _run_content_language_check(
+                [(art, None, "PRD", "FULL", None)], Path(td), ArtifactScanCache(), (["en"], []),
+            )
+            self.assertEqual([(r["line"], r["code"]) for r in results], [(3, "LANG001")])
+
 
 if __name__ == "__main__":
     unittest.main()
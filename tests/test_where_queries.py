@@ -435,6 +435,148 @@ class TestCmdWhereUsed(_ContextTestBase):
                 os.chdir(cwd)
 
 
+# =========================================================================
+# Batch mode and the ID index
+# =========================================================================
+
+class TestBatchQueries(_ContextTestBase):
+
+    def _run(self, fn, argv):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            rc = fn(argv)
+        return rc, json.loads(stdout.getvalue())
+
+    def test_where_defined_multiple_ids(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            _setup_project(root)
+            _with_context(root)
+            rc, out = self._run(cmd_where_defined, ["--id", "cpt-test-item-1", "--id", "cpt-missing"])
+            self.assertEqual(rc, 2)
+            self.assertEqual(out["status"], "PARTIAL")
+            self.assertEqual(out["count"], 2)
+            self.assertEqual([r["id"] for r in out["results"]], ["cpt-test-item-1", "cpt-missing"])
+            self.assertEqual([r["status"] for r in out["results"]], ["FOUND", "NOT_FOUND"])
+            self.assertEqual(out["results"][0]["definitions"][0]["line"], 1)
+
+    def test_where_defined_ids_from_file(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            _setup_project(root)
+            _with_context(root)
+            ids_file = root / "ids.txt"
+            ids_file.write_text("# wanted\ncpt-test-item-1\n\ncpt-test-item-1\n", encoding="utf-8")
+            rc, out = self._run(cmd_where_defined, ["--ids-from", str(ids_file)])
+            self.assertEqual(rc, 0)
+            self.assertEqual(out["status"], "FOUND")
+            self.assertEqual(out["count"], 1)
+
+    def test_ids_from_missing_file(self):
+        rc, out = self._run(cmd_where_used, ["--ids-from", "/nonexistent/ids.txt"])
+        self.assertEqual(rc, 1)
+        self.assertEqual(out["status"], "ERROR")
+
+    def test_single_id_output_unchanged(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            _setup_project(root)
+            with open(root / "architecture" / "PRD.md", "a", encoding="utf-8") as f:
+                f.write("Depends on `cpt-test-item-1`.\n")
+            _with_context(root)
+            _rc, out = self._run(cmd_where_used, ["--id", "cpt-test-item-1"])
+            self.assertEqual(set(out), {"id", "artifacts_scanned", "count", "references"})
+            self.assertEqual([(r["line"], r["type"]) for r in out["references"]], [(3, "reference")])
+
+    def test_where_used_include_code(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            adapter = _setup_project(root)
+            from cypilot.utils import toml_utils
+            cfg = toml_utils.load(adapter / "config" / "artifacts.toml")
+            cfg["systems"][0]["codebase"] = [{"path": "src", "extensions": [".py"]}]
+            toml_utils.dump(cfg, adapter / "config" / "artifacts.toml")
+            (root / "src").mkdir()
+            (root / "src" / "mod.py").write_text("# @cpt-flow:cpt-test-item-1:p1\n", encoding="utf-8")
+            _with_context(root)
+            rc, out = self._run(cmd_where_used, ["--id", "cpt-test-item-1", "--id", "cpt-other", "--include-code"])
+            self.assertEqual(rc, 0)
+            self.assertEqual(out["code_files_scanned"], 1)
+            code_refs = out["results"][0]["code_references"]
+            self.assertEqual(len(code_refs), 1)
+            self.assertEqual((code_refs[0]["marker_type"], code_refs[0]["kind"]), ("scope", "flow"))
+            self.assertEqual(out["results"][1]["code_references"], [])
+
+    def test_index_persisted_and_reused(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            adapter = _setup_project(root)
+            _with_context(root)
+            self._run(cmd_where_defined, ["cpt-test-item-1"])
+            self.assertTrue((adapter / "cache" / "index.json").is_file())
+            with patch("cypilot.utils.scan_cache.run_line_pass", side_effect=AssertionError("rescanned")):
+                rc, out = self._run(cmd_where_defined, ["cpt-test-item-1"])
+            self.assertEqual(rc, 0)
+            self.assertEqual(out["status"], "FOUND")
+
+
+class TestNdjsonOutput(_ContextTestBase):
+
+    def setUp(self):
+        from cypilot.utils.ui import set_ndjson_mode
+        set_ndjson_mode(True)
+        self.addCleanup(set_json_mode, True)
+        self.addCleanup(set_ndjson_mode, False)
+
+    def _records(self, fn, argv):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            rc = fn(argv)
+        return rc, [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+    def test_batch_streams_one_record_per_id(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            _setup_project(root)
+            _with_context(root)
+            rc, recs = self._records(cmd_where_defined, ["--id", "cpt-test-item-1", "--id", "cpt-missing"])
+            self.assertEqual(rc, 2)
+            self.assertEqual([r["record"] for r in recs], ["result", "result", "summary"])
+            self.assertEqual(recs[1]["status"], "NOT_FOUND")
+            self.assertEqual(recs[-1]["status"], "PARTIAL")
+            self.assertNotIn("results", recs[-1])
+
+    def test_validate_streams_issues_then_summary(self):
+        from cypilot.commands.validate import cmd_validate
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            _setup_project(root)
+            with open(root / "architecture" / "PRD.md", "a", encoding="utf-8") as f:
+                f.write("See `cpt-test-item-missing`.\n")
+            _with_context(root)
+            rc, recs = self._records(cmd_validate, ["--skip-code", "--no-cache"])
+            self.assertEqual(rc, 2)
+            self.assertEqual([r["record"] for r in recs], ["error", "artifact", "summary"])
+            self.assertEqual(recs[0]["id"], "cpt-test-item-missing")
+            self.assertEqual(recs[2]["error_count"], 1)
+            self.assertNotIn("errors", recs[2])
+
+    def test_validate_rejects_output_file(self):
+        from cypilot.commands.validate import cmd_validate
+        _rc, recs = self._records(cmd_validate, ["--output", "report.json"])
+        self.assertEqual(recs[-1]["status"], "ERROR")
+
+    def test_single_where_used_streams_references(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            _setup_project(root)
+            _with_context(root)
+            _rc, recs = self._records(cmd_where_used, ["--id", "cpt-test-item-1"])
+            self.assertEqual(recs[-1]["record"], "summary")
+            self.assertEqual(recs[-1]["count"], len(recs) - 1)
+            self.assertTrue(all(r["record"] == "reference" for r in recs[:-1]))
+
+
 # =========================================================================
 # Human formatters (need human mode)
 # =========================================================================
@@ -51,6 +51,7 @@ from cypilot.utils.context import (
 from cypilot.utils.artifacts_meta import ArtifactsMeta, Kit
 
 from cypilot.utils.git_utils import (
+    _run_git_until,
     is_worktree_dirty,
     _parse_git_url,
     _apply_template,
@@ -3276,6 +3277,134 @@ class TestCmdWorkspaceSync:
         assert rc == 0
         assert mock_sync.call_args[1]["force"] is False
 
+    def test_parallel_results_keep_source_order(self, capsys):
+        """With --jobs, slow early sources still come first in the results."""
+        import threading
+        import time as _time
+
+        with TemporaryDirectory() as tmpdir:
+            names = [f"repo{i}" for i in range(6)]
+            sources = {n: SourceEntry(name=n, path="", url=f"https://gitlab.com/t/{n}.git") for n in names}
+            ws_cfg = _make_git_ws_cfg(tmpdir, sources=sources)
+            threads = set()
+
+            def sync_side_effect(src, cfg, base, **kwargs):
+                threads.add(threading.get_ident())
+                _time.sleep(0.05 if src.name == "repo0" else 0.01)
+                if src.name == "repo3":
+                    raise RuntimeError("boom")
+                return {"status": "synced"}
+
+            with patch("cypilot.utils.files.find_project_root", return_value=Path(tmpdir)):
+                with patch("cypilot.utils.workspace.find_workspace_config", return_value=(ws_cfg, None)):
+                    with patch("cypilot.utils.git_utils.sync_git_source", side_effect=sync_side_effect):
+                        rc = cmd_workspace_sync(["--jobs", "3", "--timeout", "30"])
+        assert rc == 0
+        data = _parse_json(capsys)
+        assert [r["name"] for r in data["results"]] == names
+        assert data["results"][3] == {"status": "failed", "error": "boom", "name": "repo3"}
+        assert (data["synced"], data["failed"]) == (5, 1)
+        assert len(threads) > 1
+
+    def test_sources_sharing_a_worktree_sync_serially(self, capsys):
+        """One repo on two branches maps to one directory; never sync it concurrently."""
+        import threading
+        import time as _time
+
+        with TemporaryDirectory() as tmpdir:
+            sources = {
+                "lib-main": SourceEntry(name="lib-main", path="", url="https://gitlab.com/t/lib.git", branch="main"),
+                "other": SourceEntry(name="other", path="", url="https://gitlab.com/t/other.git"),
+                "lib-dev": SourceEntry(name="lib-dev", path="", url="https://gitlab.com/t/lib.git", branch="dev"),
+            }
+            ws_cfg = _make_git_ws_cfg(tmpdir, sources=sources)
+            lock = threading.Lock()
+            active = {}
+            overlaps = []
+
+            def sync_side_effect(src, cfg, base, **kwargs):
+                repo = src.url
+                with lock:
+                    if active.get(repo):
+                        overlaps.append(src.name)
+                    active[repo] = True
+                _time.sleep(0.02)
+                with lock:
+                    active[repo] = False
+                return {"status": "synced"}
+
+            with patch("cypilot.utils.files.find_project_root", return_value=Path(tmpdir)):
+                with patch("cypilot.utils.workspace.find_workspace_config", return_value=(ws_cfg, None)):
+                    with patch("cypilot.utils.git_utils.sync_git_source", side_effect=sync_side_effect) as mock_sync:
+                        rc = cmd_workspace_sync(["--jobs", "3"])
+        assert rc == 0
+        assert overlaps == []
+        assert mock_sync.call_count == 3
+        assert [r["name"] for r in _parse_json(capsys)["results"]] == ["lib-main", "other", "lib-dev"]
+
+    def test_timeout_and_clone_options_forwarded(self, capsys):
+        with TemporaryDirectory() as tmpdir:
+            ws_cfg = _make_git_ws_cfg(tmpdir)
+            with patch("cypilot.utils.files.find_project_root", return_value=Path(tmpdir)):
+                with patch("cypilot.utils.workspace.find_workspace_config", return_value=(ws_cfg, None)):
+                    with patch("cypilot.utils.git_utils.sync_git_source", return_value={"status": "synced"}) as mock_sync:
+                        rc = cmd_workspace_sync(["--timeout", "12.5", "--depth", "1", "--filter", "blob:none"])
+        assert rc == 0
+        assert mock_sync.call_args[1]["timeout"] == 12.5
+        cfg = mock_sync.call_args[0][1]
+        assert (cfg.clone_depth, cfg.clone_filter) == (1, "blob:none")
+
+
+class TestSyncTimeoutsAndShallowClones:
+    """Per-source deadlines and shallow/partial clone arguments."""
+
+    def test_shallow_partial_clone_args(self):
+        with TemporaryDirectory() as tmpdir:
+            target = Path(tmpdir) / "repo"
+            with patch("cypilot.utils.git_utils._run_git", side_effect=_clone_side_effect) as mock_git:
+                assert _clone_if_missing("https://gitlab.com/org/repo.git", target, "main",
+                                         depth=1, filter_spec="blob:none") == target
+            args = mock_git.call_args[0][0]
+            assert args[:6] == ["clone", "--quiet", "--branch", "main", "--depth", "1"]
+            assert "--filter=blob:none" in args
+            assert args[-1] == str(target)
+
+    def test_deadline_bounds_every_git_command(self):
+        with TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            repo_dir = tmp / ".workspace-sources" / "team" / "lib"
+            (repo_dir / ".git").mkdir(parents=True)
+            (repo_dir / ".git" / "shallow").write_text("", encoding="utf-8")
+            timeouts = []
+
+            def side_effect(args, cwd=None, timeout=None):
+                timeouts.append((args[0], timeout))
+                return (0, "", "")
+
+            cfg = ResolveConfig(clone_depth=3)
+            with patch("cypilot.utils.git_utils._run_git", side_effect=side_effect) as mock_git:
+                result = sync_git_source(_make_git_source(branch="main"), cfg, tmp, timeout=60)
+            assert result["status"] == "synced"
+            assert [name for name, _ in timeouts] == ["status", "fetch", "checkout"]
+            assert all(t is not None and 0 < t <= 60 for _, t in timeouts)
+            fetch_args = mock_git.call_args_list[1][0][0]
+            assert fetch_args[:4] == ["fetch", "--quiet", "--depth", "3"]
+
+    def test_expired_deadline_fails_without_running_git(self):
+        with TemporaryDirectory() as tmpdir:
+            with patch("cypilot.utils.git_utils._run_git") as mock_git:
+                rc, _out, err = _run_git_until(["fetch"], cwd=Path(tmpdir), deadline=0.0)
+            assert rc == 1 and "timed out" in err
+            mock_git.assert_not_called()
+
+    def test_resolve_config_clone_options_round_trip(self):
+        cfg = ResolveConfig.from_dict({"clone_depth": 1, "clone_filter": " blob:none "})
+        assert (cfg.clone_depth, cfg.clone_filter) == (1, "blob:none")
+        assert ResolveConfig.from_dict(cfg.to_dict()) == cfg
+        bad = ResolveConfig.from_dict({"clone_depth": True, "clone_filter": ""})
+        assert (bad.clone_depth, bad.clone_filter) == (None, None)
+        assert "clone_depth" not in ResolveConfig().to_dict()
+
 
 class TestHumanWorkspaceSync:
     """Tests for _human_workspace_sync formatter."""